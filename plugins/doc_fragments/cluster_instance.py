@@ -16,6 +16,9 @@ options:
   cluster_instance:
     description:
       - Scale Computing HyperCore instance information.
+      - If the C(SC_SESSION_CACHE_DIR) environment variable is set, the HyperCore login session
+        is stored in that directory and reused by the following tasks,
+        for C(SC_SESSION_CACHE_TTL) seconds (default 300).
     type: dict
     suboptions:
       host:
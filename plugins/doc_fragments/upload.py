@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    # language=yaml
+    DOCUMENTATION = r"""
+options:
+  upload_min_rate:
+    description:
+      - Minimal upload speed, in bytes per second.
+      - Upload is aborted if less than I(upload_min_rate) bytes per second
+        were sent during the last I(upload_stall_window) seconds.
+      - Set to C(0) to never abort a slow upload.
+    type: int
+    default: 1000
+    version_added: 1.7.0
+  upload_stall_window:
+    description:
+      - Time window for I(upload_min_rate) check, in seconds.
+      - Upload is aborted also if a single send does not make any progress for
+        I(upload_stall_window) seconds.
+    type: int
+    default: 30
+    version_added: 1.7.0
+  checksum:
+    description:
+      - If C(true), SHA-256 digest of I(source) is computed and compared with the digest
+        recorded when the existing object was uploaded.
+        If digests differ, the existing object is deleted and I(source) is uploaded again.
+      - If C(false), an existing object with the same name is never re-uploaded.
+      - HyperCore cannot store the digest, digests are stored on ansible controller in I(checksum_dir).
+        If there is no recorded digest for an existing object (it was uploaded without I(checksum=true)),
+        the current digest is recorded and a warning is shown.
+        An ISO image is then re-uploaded only if its size differs from I(source),
+        a virtual disk is assumed to be up to date.
+    type: bool
+    default: false
+    version_added: 1.7.0
+  checksum_dir:
+    description:
+      - Directory on ansible controller where digests of uploaded files are stored.
+      - Only used with I(checksum=true).
+    type: path
+    default: ~/.ansible/hypercore_checksums
+    version_added: 1.7.0
+"""
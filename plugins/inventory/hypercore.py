@@ -18,9 +18,11 @@ description:
   - Inventory uses tags to group VMs and to add variables to inventory.
   - VM can be added to multiple groups.
   - Available tags - ansible_host__, ansible_group__, ansible_user__, ansible_port__, ansible_ssh_private_key_file__.
-  - Does not support caching.
+  - Parsed inventory can be cached, see I(cache), I(cache_plugin) and I(cache_timeout).
 version_added: 1.0.0
 seealso: []
+extends_documentation_fragment:
+  - inventory_cache
 options:
   plugin:
     description:
@@ -66,6 +68,17 @@ plugin: scale_computing.hypercore.hypercore
 #   |  |--ci-inventory-vm3
 
 
+# Inventory is cached in JSON files for 10 minutes.
+# Use `ansible-playbook --flush-cache` to refresh it earlier.
+
+plugin: scale_computing.hypercore.hypercore  # yamllint disable rule:key-duplicates
+
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: /tmp/hypercore_inventory_cache
+cache_timeout: 600
+
+
 # Example with all available parameters and how to set them.
 # A group "my-group" is created where all the VMs with "ansbile_enable" tag are added.
 # For VM "ci-inventory-vm6" we added values for host and user, every other VM has default values.
@@ -145,6 +158,14 @@ import os
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
 
+# Host variables which can be set with tags like ansible_user__<value>.
+TAG_VARIABLES = (
+    "ansible_host",
+    "ansible_user",
+    "ansible_port",
+    "ansible_ssh_private_key_file",
+)
+
 
 class LdapBaseException(Exception):
     pass
@@ -163,46 +184,6 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             cfg = yaml.safe_load(inventory_src)
         return cfg
 
-    @classmethod
-    def add_user(cls, inventory, ansible_user, vm_name):
-        if ansible_user:
-            inventory.set_variable(vm_name, "ansible_user", ansible_user)
-        else:
-            # we set "root" as default user
-            inventory.set_variable(vm_name, "ansible_user", "root")
-        return inventory
-
-    @classmethod
-    def add_port(cls, inventory, ansible_port, vm_name):
-        if ansible_port:
-            inventory.set_variable(vm_name, "ansible_port", ansible_port)
-        else:  # default is 22
-            inventory.set_variable(vm_name, "ansible_port", 22)
-        return inventory
-
-    @classmethod
-    def add_group(cls, inventory, groups, vm_name):
-        if len(groups) > 0:
-            for group in groups:
-                inventory.add_group(group)
-                inventory.add_host(vm_name, group=group)
-        else:
-            inventory.add_host(vm_name, group=None)
-        return inventory
-
-    @classmethod
-    def add_host(cls, inventory, ansible_host, vm_name):
-        inventory.set_variable(vm_name, "ansible_host", ansible_host)
-        return inventory
-
-    @classmethod
-    def add_ssh_private_key_file(cls, inventory, ansible_ssh_private_key_file, vm_name):
-        if ansible_ssh_private_key_file:
-            inventory.set_variable(
-                vm_name, "ansible_ssh_private_key_file", ansible_ssh_private_key_file
-            )
-        return inventory
-
     def verify_file(self, path):
         """
         return true/false if this is possibly a valid file for this plugin to consume
@@ -217,9 +198,11 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             return False
         return True
 
-    def parse(self, inventory, loader, path, cache=False):
+    def parse(self, inventory, loader, path, cache=True):
         super(InventoryModule, self).parse(inventory, loader, path)
         cfg = self.read_config_data(path, os.environ)
+        # verify_file() accepts also the short plugin name, options need the full one.
+        self.set_options(direct=dict(cfg, plugin="scale_computing.hypercore.hypercore"))
 
         # get variables from env
         host = os.getenv("SC_HOST")
@@ -238,73 +221,120 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             raise errors.ScaleComputingError(
                 "Missing one or more parameters: sc_host, sc_username, sc_password."
             )
-        client = Client(host, username, password, timeout, auth_method)
-        rest_client = RestClient(client)
-        vms = rest_client.list_records("/rest/v1/VirDomain")
 
+        # Same inventory file can be used with different HyperCore hosts.
+        cache_key = self.get_cache_key(f"{path}:{host}")
+        user_cache_setting = self.get_option("cache")
+        # cache=False means --flush-cache was used, cache is refreshed.
+        attempt_to_read_cache = user_cache_setting and cache
+        cache_needs_update = user_cache_setting and not cache
+        hosts = None
+        if attempt_to_read_cache:
+            self.load_cache_plugin()
+            try:
+                hosts = self._cache[cache_key]
+            except KeyError:
+                cache_needs_update = True
+        if hosts is None:
+            client = Client(host, username, password, timeout, auth_method)
+            rest_client = RestClient(client)
+            vms = rest_client.iter_records("/rest/v1/VirDomain")
+            hosts = self.get_hosts(cfg, vms)
+        if cache_needs_update:
+            self.load_cache_plugin()
+            self._cache[cache_key] = hosts
+        self.populate(inventory, hosts)
+
+    @staticmethod
+    def parse_tags(tags):
+        """
+        Splits VM tags in a single pass.
+        Returns tags without "__" (like ansible_enable), groups from
+        ansible_group__<group> tags and values of ansible_<variable>__<value> tags.
+        """
+        flags = set()
+        # dict is used as an ordered set
+        groups = {}
+        variables = {}
+        for tag in tags.split(","):
+            name, separator, value = tag.partition("__")
+            if not separator:
+                flags.add(tag)
+            elif name == "ansible_group":
+                groups[value] = None
+            elif name in TAG_VARIABLES:
+                variables[name] = value
+        return flags, list(groups), variables
+
+    @classmethod
+    def get_hosts(cls, cfg, vms):
+        """
+        Returns list of hosts to be added to inventory, each host is
+        a dict with name, groups and ansible_* variables.
+        The list is JSON serializable, so it can be stored in inventory cache.
+        """
+        look_for_ansible_enable = bool(cfg.get("look_for_ansible_enable"))
+        look_for_ansible_disable = bool(cfg.get("look_for_ansible_disable"))
+        hosts = []
         for vm in vms:
-            groups = []
-            ansible_user = None
-            ansible_port = None
-            ansible_ssh_private_key_file = None
-            include = True
-            tags = vm["tags"].split(",")
-            if (
-                "look_for_ansible_enable" in cfg
-                and cfg["look_for_ansible_enable"]
-                and "look_for_ansible_disable" in cfg
-                and cfg["look_for_ansible_disable"]
-            ):
-                include = False
-                if "ansible_enable" in tags:
-                    include = True
-                if "ansible_disable" in tags:
-                    include = False
-            elif "look_for_ansible_enable" in cfg and cfg["look_for_ansible_enable"]:
-                include = False
-                if "ansible_enable" in tags:
-                    include = True
-            elif "look_for_ansible_disable" in cfg and cfg["look_for_ansible_disable"]:
-                include = True
-                if "ansible_disable" in tags:
-                    include = False
-            for tag in tags:
-                if (
-                    tag.startswith("ansible_group__")
-                    and tag[len("ansible_group__"):] not in groups
-                ):
-                    groups.append(tag[len("ansible_group__"):])
-                elif tag.startswith("ansible_user__"):
-                    ansible_user = tag[len("ansible_user__"):]
-                elif tag.startswith("ansible_port__"):
-                    ansible_port = int(tag[len("ansible_port__"):])
-                elif tag.startswith("ansible_ssh_private_key_file"):
-                    ansible_ssh_private_key_file = tag[
-                        len("ansible_ssh_private_key_file__"):
-                    ]
-            if include:
-                # Group
-                inventory = self.add_group(inventory, groups, vm["name"])
+            flags, groups, variables = cls.parse_tags(vm["tags"])
+            if look_for_ansible_enable and "ansible_enable" not in flags:
+                continue
+            if look_for_ansible_disable and "ansible_disable" in flags:
+                continue
+            # Find ansible_host
+            # For time being, just use the very first IP address.
+            # Later - get smarter. Use IP address from specific VLAN maybe.
+            # But end user is always most smart - use tag ansible_host if it is set;
+            # this will allow use of arbitrary IP or even DNS name.
+            ansible_host = variables.get("ansible_host")
+            if ansible_host is None:
                 ansible_host = vm["name"]
-                # Find ansible_host
-                # For time being, just use the very first IP address.
-                # Later - get smarter. Use IP address from specific VLAN maybe.
-                # But end user is always most smart - use tag ansible_host if it is set;
-                # this will allow use of arbitrary IP or even DNS name.
                 for nic in vm["netDevs"]:
                     if nic["ipv4Addresses"]:
                         ansible_host = nic["ipv4Addresses"][0]
                         break
-                for tag in tags:
-                    if tag.startswith("ansible_host__"):
-                        ansible_host = tag[len("ansible_host__"):]
-                # User
-                inventory = self.add_user(inventory, ansible_user, vm["name"])
-                # Port
-                inventory = self.add_port(inventory, ansible_port, vm["name"])
-                # Host
-                inventory = self.add_host(inventory, ansible_host, vm["name"])
-                # SSH private key file
-                inventory = self.add_ssh_private_key_file(
-                    inventory, ansible_ssh_private_key_file, vm["name"]
+            ansible_port = variables.get("ansible_port")
+            hosts.append(
+                dict(
+                    name=vm["name"],
+                    groups=groups,
+                    ansible_host=ansible_host,
+                    ansible_user=variables.get("ansible_user"),
+                    ansible_port=None if ansible_port is None else int(ansible_port),
+                    ansible_ssh_private_key_file=variables.get(
+                        "ansible_ssh_private_key_file"
+                    ),
                 )
+            )
+        return hosts
+
+    @staticmethod
+    def get_host_variables(host):
+        variables = dict(
+            # we set "root" as default user
+            ansible_user=host["ansible_user"] or "root",
+            # default is 22
+            ansible_port=host["ansible_port"] or 22,
+            ansible_host=host["ansible_host"],
+        )
+        if host["ansible_ssh_private_key_file"]:
+            variables["ansible_ssh_private_key_file"] = host[
+                "ansible_ssh_private_key_file"
+            ]
+        return variables
+
+    def populate(self, inventory, hosts):
+        # Every group is added only once, then hosts are added in VM order
+        # and linked to their groups.
+        for group in dict.fromkeys(
+            group for host in hosts for group in host["groups"]
+        ):
+            inventory.add_group(group)
+        for host in hosts:
+            vm_name = host["name"]
+            inventory.add_host(vm_name)
+            for group in host["groups"]:
+                inventory.add_child(group, vm_name)
+            for name, value in self.get_host_variables(host).items():
+                inventory.set_variable(vm_name, name, value)
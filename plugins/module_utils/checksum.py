@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+from __future__ import annotations
+
+__metaclass__ = type
+
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+from typing import Any, Optional
+
+DEFAULT_CHECKSUM_DIR = "~/.ansible/hypercore_checksums"
+# Size of a block passed to hash function.
+DIGEST_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(path: str, algorithm: str = "sha256") -> str:
+    """
+    Returns digest of file content, in "<algorithm>:<hexdigest>" format.
+    The file is memory mapped, so large images are hashed without
+    copying them into python buffers.
+    """
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        # Empty file cannot be mmap-ed.
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    for start in range(0, size, DIGEST_BLOCK_SIZE):
+                        end = start + DIGEST_BLOCK_SIZE
+                        digest.update(view[start:end])
+    return f"{algorithm}:{digest.hexdigest()}"
+
+
+class DigestStore:
+    """
+    Digests of uploaded files, so that next run can detect a changed source file.
+    HyperCore ISO and VirtualDisk objects have no field for custom metadata,
+    so digests are stored on ansible controller. One JSON file per HyperCore host,
+    key is object type and uuid (like "ISO/<uuid>").
+    """
+
+    def __init__(self, directory: str, host: str):
+        self.directory = os.path.expanduser(directory)
+        key = hashlib.sha256(host.encode("utf-8")).hexdigest()
+        self.path = os.path.join(self.directory, f"hypercore-digests-{key}.json")
+
+    @classmethod
+    def from_module_params(cls, params: dict[Any, Any]) -> DigestStore:
+        return cls(
+            params.get("checksum_dir") or DEFAULT_CHECKSUM_DIR,
+            params["cluster_instance"]["host"],
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        if not os.path.exists(self.path):
+            return None
+        return self._update(key, None, read_only=True)
+
+    def set(self, key: str, digest: str) -> None:
+        self._update(key, digest)
+
+    def delete(self, key: str) -> None:
+        if os.path.exists(self.path):
+            self._update(key, None)
+
+    def is_changed(self, key: str, digest: str) -> Optional[bool]:
+        """
+        Returns True if digest differs from the stored one.
+        If there is no stored digest (object was uploaded without checksum),
+        digest is stored as baseline for the next run, and None is returned.
+        Caller decides if the object can be assumed unchanged.
+        """
+        stored = self.get(key)
+        if stored is None:
+            self.set(key, digest)
+            return None
+        return stored != digest
+
+    def _update(
+        self, key: str, digest: Optional[str], read_only: bool = False
+    ) -> Optional[str]:
+        # Returns previous digest, and stores the new one (None removes it).
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        with open(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600), "r+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                data = json.loads(f.read() or "{}")
+            except ValueError:
+                # Corrupted file
+                data = {}
+            if not isinstance(data, dict):
+                data = {}
+            previous = data.get(key)
+            if read_only:
+                return previous
+            if digest is None:
+                data.pop(key, None)
+            else:
+                data[key] = digest
+            f.seek(0)
+            f.truncate()
+            json.dump(data, f)
+        return previous
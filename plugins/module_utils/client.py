@@ -11,7 +11,10 @@ __metaclass__ = type
 import json
 import os
 import ssl
-from typing import Any, Optional, Union
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Iterator, Optional, Union
 from io import BufferedReader
 import enum
 
@@ -24,6 +27,11 @@ from .errors import (
     ApiResponseNotJson,
 )
 from ..module_utils.typed_classes import TypedClusterInstance
+from ..module_utils.connection_pool import ConnectionPool
+from ..module_utils.json_stream import iter_json_array
+from ..module_utils.session_cache import SessionCache
+from ..module_utils.tracing import Tracer, body_size
+from ..module_utils.upload import UploadStream
 
 from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
 from ansible.module_utils.six.moves.urllib.parse import urlencode, quote
@@ -35,6 +43,9 @@ def _str_to_bool(s: str) -> bool:
     return s.lower() not in ["", "0", "false", "f", "no", "n"]
 
 
+# Reuse keep-alive connections to HyperCore, instead of opening a new one for each request.
+SC_HTTP_KEEP_ALIVE = _str_to_bool(os.environ.get("SC_HTTP_KEEP_ALIVE", "1"))
+
 SC_DEBUG_LOG_TRAFFIC = _str_to_bool(os.environ.get("SC_DEBUG_LOG_TRAFFIC", "0"))
 if SC_DEBUG_LOG_TRAFFIC:
     try:
@@ -45,6 +56,10 @@ if SC_DEBUG_LOG_TRAFFIC:
             pass
 
 
+# Max number of URLs with last response kept for conditional GET requests.
+CONDITIONAL_GET_MAXSIZE = 32
+
+
 class AuthMethod(str, enum.Enum):
     local = "local"
     oidc = "oidc"
@@ -57,7 +72,11 @@ class Response:
     # How is this used in other projects? Jure?
     # Maybe we need/want both.
     def __init__(
-        self, status: int, data: Any, headers: Optional[dict[Any, Any]] = None
+        self,
+        status: int,
+        data: Any,
+        headers: Optional[dict[Any, Any]] = None,
+        stream: Any = None,
     ):
         self.status = status
         self.data = data
@@ -67,6 +86,10 @@ class Response:
         )
 
         self._json = None
+        # Raw response with body not read yet, see iter_json().
+        self._stream = stream
+        # connect/tls/ttfb times and retries, if provided by ConnectionPool.
+        self.timing: dict[str, Any] = {}
 
     @property
     def json(self) -> Any:
@@ -77,6 +100,32 @@ class Response:
                 raise ApiResponseNotJson(self.data)
         return self._json
 
+    def iter_json(self) -> Iterator[Any]:
+        """
+        Yields elements of JSON array body one by one.
+        A streamed body is decoded while it is read from the socket,
+        so the whole body is never kept in memory.
+        """
+        if self._stream is None:
+            data = self.json
+            if isinstance(data, list):
+                yield from data
+            else:
+                yield data
+            return
+        stream = self._stream
+        self._stream = None
+        try:
+            yield from iter_json_array(stream.read)
+        finally:
+            stream.close()
+
+    def close(self) -> None:
+        # Releases the connection of a streamed response, which was not (fully) consumed.
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
 
 class Client:
     def __init__(
@@ -100,7 +149,20 @@ class Client:
         self.auth_method = auth_method
 
         self._auth_header: Optional[dict[str, str]] = None
-        self._client = Request()
+        self._auth_lock = threading.Lock()
+        # Session stored on disk by a previous module, if session cache is enabled.
+        self._session_cache = SessionCache.from_env(host, username, auth_method)
+        self._session_id_from_cache: Optional[str] = None
+        self._client: Union[ConnectionPool, Request] = (
+            ConnectionPool() if SC_HTTP_KEEP_ALIVE else Request()
+        )
+        # Request tracing is opt-in, see Tracer.from_env().
+        self.tracer = Tracer.from_env()
+        # Last response per URL, for conditional GET requests.
+        self._conditional_responses: OrderedDict[str, Response] = OrderedDict()
+        self._conditional_lock = threading.Lock()
+        self.conditional_hits = 0
+        self.conditional_misses = 0
 
     @classmethod
     def get_client(cls, cluster_instance: TypedClusterInstance) -> Client:
@@ -112,16 +174,59 @@ class Client:
             cluster_instance["auth_method"],
         )
 
+    @property
+    def connection_stats(self) -> dict[str, int]:
+        # How many connections were opened, and how many times an open connection was reused.
+        if isinstance(self._client, ConnectionPool):
+            return self._client.stats
+        return {}
+
+    @property
+    def conditional_stats(self) -> dict[str, int]:
+        # How many conditional GET requests returned unchanged resource.
+        return dict(
+            conditional_hits=self.conditional_hits,
+            conditional_misses=self.conditional_misses,
+        )
+
+    @property
+    def trace_summary(self) -> dict[str, Any]:
+        # Requests aggregated by endpoint, if tracing is enabled.
+        if self.tracer is None:
+            return {}
+        return self.tracer.summary
+
     @property
     def auth_header(self) -> dict[str, str]:
         if not self._auth_header:
-            self._auth_header = self._login()
+            with self._auth_lock:
+                if not self._auth_header:
+                    self._auth_header = self._login()
         return self._auth_header
 
     def _login(self) -> dict[str, str]:
-        return self._login_username_password()
+        if self._session_cache is None:
+            return self._login_username_password()
+        session_id, from_cache = self._session_cache.get_or_login(
+            self._login_username_password_session_id
+        )
+        self._session_id_from_cache = session_id if from_cache else None
+        return dict(Cookie=f"sessionID={session_id}")
+
+    def _invalidate_cached_session(self) -> bool:
+        # Returns True if the failed session was a cached one, and a new login makes sense.
+        session_id = self._session_id_from_cache
+        if self._session_cache is None or session_id is None:
+            return False
+        self._session_cache.invalidate(session_id)
+        self._session_id_from_cache = None
+        self._auth_header = None
+        return True
 
     def _login_username_password(self) -> dict[str, str]:
+        return dict(Cookie=f"sessionID={self._login_username_password_session_id()}")
+
+    def _login_username_password_session_id(self) -> str:
         headers = {
             "Accept": "application/json",
             "Content-type": "application/json",
@@ -140,17 +245,22 @@ class Client:
             headers=headers,
             timeout=self.timeout,
         )
-        return dict(Cookie=f"sessionID={resp.json['sessionID']}")
+        session_id: str = resp.json["sessionID"]
+        return session_id
 
     def _request(
         self,
         method: str,
         path: str,
-        data: Optional[Union[dict[Any, Any], bytes, str, BufferedReader]] = None,
+        data: Optional[
+            Union[dict[Any, Any], bytes, str, BufferedReader, UploadStream]
+        ] = None,
         headers: Optional[dict[Any, Any]] = None,
         timeout: Optional[float] = None,
+        stream: bool = False,
     ) -> Response:
-        # _request() with debug logging
+        # _request() with debug logging and tracing
+        start = monotonic()
         try:
             if SC_DEBUG_LOG_TRAFFIC:
                 effective_timeout = timeout
@@ -164,7 +274,7 @@ class Client:
                     headers=headers,
                     timeout=effective_timeout,
                 )
-            resp = self._request_no_log(method, path, data, headers, timeout)
+            resp = self._request_no_log(method, path, data, headers, timeout, stream)
             if SC_DEBUG_LOG_TRAFFIC:
                 request_out = dict(
                     status=resp.status,
@@ -172,23 +282,54 @@ class Client:
                     headers=resp.headers,
                 )
                 q_log(request_in, request_out)
+            if self.tracer:
+                self.tracer.record(
+                    method,
+                    path,
+                    resp.status,
+                    body_size(data, headers),
+                    body_size(
+                        resp._stream if resp.data is None else resp.data, resp.headers
+                    ),
+                    monotonic() - start,
+                    resp.timing,
+                )
             return resp
         except Exception as exception:
             if SC_DEBUG_LOG_TRAFFIC:
                 q_log(request_in, exception)
+            if self.tracer:
+                self.tracer.record(
+                    method,
+                    path,
+                    None,
+                    body_size(data, headers),
+                    None,
+                    monotonic() - start,
+                    error=type(exception).__name__,
+                )
             raise
 
     def _request_no_log(
         self,
         method: str,
         path: str,
-        data: Optional[Union[dict[Any, Any], bytes, str, BufferedReader]] = None,
+        data: Optional[
+            Union[dict[Any, Any], bytes, str, BufferedReader, UploadStream]
+        ] = None,
         headers: Optional[dict[Any, Any]] = None,
         timeout: Optional[float] = None,
+        stream: bool = False,
     ) -> Response:
         if timeout is None:
             # If timeout from request is not specifically provided, take it from the Client.
             timeout = self.timeout
+        # Request.open() returns unread response anyway.
+        open_kwargs = (
+            dict(stream=True)
+            if stream and isinstance(self._client, ConnectionPool)
+            else {}
+        )
         try:
             raw_resp = self._client.open(
                 method,
@@ -197,6 +338,7 @@ class Client:
                 headers=headers,
                 validate_certs=False,
                 timeout=timeout,
+                **open_kwargs,
             )
         except HTTPError as e:
             # Wrong username/password, or expired access token
@@ -208,7 +350,9 @@ class Client:
                 )
             # Other HTTP error codes do not necessarily mean errors.
             # This is for the caller to decide.
-            return Response(e.code, e.read(), e.headers)
+            return self._timed_response(
+                Response(e.code, e.read(), e.headers), getattr(e, "timing", None)
+            )
         except URLError as e:
             # TODO: Add other errors here; we need to handle them in modules.
             # TimeoutError is handled in the rest_client
@@ -232,7 +376,29 @@ class Client:
             ):
                 raise type(e.args[0])(e)
             raise ScaleComputingError(e.reason)
-        return Response(raw_resp.status, raw_resp.read(), raw_resp.headers)
+        timing = getattr(raw_resp, "timing", None)
+        if stream:
+            if raw_resp.status == 200:
+                return self._timed_response(
+                    Response(raw_resp.status, None, raw_resp.headers, raw_resp), timing
+                )
+            try:
+                return self._timed_response(
+                    Response(raw_resp.status, raw_resp.read(), raw_resp.headers),
+                    timing,
+                )
+            finally:
+                raw_resp.close()
+        return self._timed_response(
+            Response(raw_resp.status, raw_resp.read(), raw_resp.headers), timing
+        )
+
+    @staticmethod
+    def _timed_response(resp: Response, timing: Any) -> Response:
+        # Request.open() response has no timing, only ConnectionPool provides it.
+        if isinstance(timing, dict):
+            resp.timing = timing
+        return resp
 
     def request(
         self,
@@ -241,9 +407,17 @@ class Client:
         query: Optional[dict[Any, Any]] = None,
         data: Optional[dict[Any, Any]] = None,
         headers: Optional[dict[Any, Any]] = None,
-        binary_data: Optional[Union[bytes, BufferedReader]] = None,
+        binary_data: Optional[Union[bytes, BufferedReader, UploadStream]] = None,
         timeout: Optional[float] = None,
+        stream: bool = False,
+        conditional: bool = False,
     ) -> Response:
+        """
+        With stream=True, body of a successful response is not read,
+        use Response.iter_json() to consume it.
+        With conditional=True, an unchanged GET response is detected,
+        and the previous Response is returned, see _conditional_headers().
+        """
         # Make sure we only have one kind of payload
         if data is not None and binary_data is not None:
             raise AssertionError(
@@ -255,6 +429,78 @@ class Client:
         url = "{0}{1}".format(self.host, escaped_path)
         if query:
             url = "{0}?{1}".format(url, urlencode(query))
+        conditional = conditional and method == "GET" and not stream
+        previous = None
+        if conditional:
+            with self._conditional_lock:
+                previous = self._conditional_responses.get(url)
+            headers = self._conditional_headers(previous, headers)
+        try:
+            resp = self._request_with_auth(
+                method, url, data, headers, binary_data, timeout, stream
+            )
+        except AuthError:
+            # Cached session might have expired on HyperCore.
+            # Login again, but only once. A partially sent file cannot be resent.
+            if not self._invalidate_cached_session() or binary_data is not None:
+                raise
+            resp = self._request_with_auth(
+                method, url, data, headers, binary_data, timeout, stream
+            )
+        if conditional:
+            return self._conditional_response(url, previous, resp)
+        return resp
+
+    # Conditional GET is used for resources which are read repeatedly,
+    # like TaskTag or VM state in polling loops.
+    # If the previous response had ETag or Last-Modified validators, they are sent
+    # as If-None-Match/If-Modified-Since, and HyperCore can answer with 304 Not Modified.
+    # Otherwise the new body is compared to the previous one.
+    # For an unchanged resource the previous Response is returned, with JSON already decoded.
+    # The decoded JSON is shared, callers must not modify it.
+    @staticmethod
+    def _conditional_headers(
+        previous: Optional[Response], headers: Optional[dict[Any, Any]]
+    ) -> dict[Any, Any]:
+        headers = dict(headers or DEFAULT_HEADERS)
+        if previous is not None:
+            if "etag" in previous.headers:
+                headers["If-None-Match"] = previous.headers["etag"]
+            if "last-modified" in previous.headers:
+                headers["If-Modified-Since"] = previous.headers["last-modified"]
+        return headers
+
+    def _conditional_response(
+        self, url: str, previous: Optional[Response], resp: Response
+    ) -> Response:
+        # Responses can be shared by threads polling different resources.
+        with self._conditional_lock:
+            if previous is not None and (
+                resp.status == 304
+                or (resp.status == previous.status and resp.data == previous.data)
+            ):
+                self.conditional_hits += 1
+                if url in self._conditional_responses:
+                    self._conditional_responses.move_to_end(url)
+                return previous
+            self.conditional_misses += 1
+            if resp.status == 200:
+                self._conditional_responses[url] = resp
+                self._conditional_responses.move_to_end(url)
+                while len(self._conditional_responses) > CONDITIONAL_GET_MAXSIZE:
+                    self._conditional_responses.popitem(last=False)
+            return resp
+
+    def _request_with_auth(
+        self,
+        method: str,
+        url: str,
+        data: Optional[dict[Any, Any]],
+        headers: Optional[dict[Any, Any]],
+        binary_data: Optional[Union[bytes, BufferedReader, UploadStream]],
+        timeout: Optional[float],
+        stream: bool = False,
+    ) -> Response:
         headers = dict(headers or DEFAULT_HEADERS, **self.auth_header)
         if data is not None:
             headers["Content-type"] = "application/json"
@@ -270,15 +516,26 @@ class Client:
             return self._request(
                 method, url, data=binary_data, headers=headers, timeout=timeout
             )
-        return self._request(method, url, data=data, headers=headers, timeout=timeout)
+        return self._request(
+            method, url, data=data, headers=headers, timeout=timeout, stream=stream
+        )
 
     def get(
         self,
         path: str,
         query: Optional[dict[Any, Any]] = None,
         timeout: Optional[float] = None,
+        stream: bool = False,
+        conditional: bool = False,
     ) -> Request:
-        resp = self.request("GET", path, query=query, timeout=timeout)
+        if conditional:
+            resp = self.request(
+                "GET", path, query=query, timeout=timeout, conditional=True
+            )
+        else:
+            resp = self.request(
+                "GET", path, query=query, timeout=timeout, stream=stream
+            )
         if resp.status in (200, 404):
             return resp
         raise UnexpectedAPIResponse(response=resp)
@@ -313,7 +570,7 @@ class Client:
         data: Optional[dict[Any, Any]],
         query: Optional[dict[Any, Any]] = None,
         timeout: Optional[float] = None,
-        binary_data: Optional[Union[bytes, BufferedReader]] = None,
+        binary_data: Optional[Union[bytes, BufferedReader, UploadStream]] = None,
         headers: Optional[dict[Any, Any]] = None,
     ) -> Request:
         resp = self.request(
@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+from __future__ import annotations
+
+__metaclass__ = type
+
+import io
+import socket
+import ssl
+import threading
+from http.client import HTTPConnection, HTTPSConnection, HTTPException
+from typing import Any, Optional, Tuple, Union
+from io import BufferedReader
+from time import monotonic
+
+from ansible.module_utils.urls import Request
+from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
+from ansible.module_utils.six.moves.urllib.parse import urlsplit
+from ansible.module_utils.six.moves.urllib.request import getproxies, proxy_bypass
+
+from ..module_utils.upload import UploadStream
+
+# Max number of idle connections kept open per (scheme, host, port).
+DEFAULT_POOL_MAXSIZE = 10
+
+# Exceptions showing that the server closed an idle keep-alive connection.
+# A request sent over such connection is retried once over a fresh connection,
+# see ConnectionPool._can_retry().
+_STALE_CONNECTION_ERRORS = (
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    HTTPException,  # includes http.client.RemoteDisconnected
+)
+
+# Requests which can be safely sent again, if the response was lost.
+_IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT")
+
+_PoolKey = Tuple[str, str, int]
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """
+    HTTPConnection which measures how long connect() took.
+    """
+
+    connect_time: Optional[float] = None
+    tls_time: Optional[float] = None
+
+    def connect(self) -> None:
+        start = monotonic()
+        super().connect()
+        self.connect_time = monotonic() - start
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    """
+    HTTPSConnection which measures TCP connect and TLS handshake separately.
+    Connections through a proxy tunnel are not used (see ConnectionPool._needs_proxy).
+    """
+
+    connect_time: Optional[float] = None
+    tls_time: Optional[float] = None
+
+    def __init__(
+        self, host: str, port: int, timeout: Optional[float], context: ssl.SSLContext
+    ):
+        super().__init__(host, port, timeout=timeout, context=context)
+        self.ssl_context = context
+
+    def connect(self) -> None:
+        start = monotonic()
+        HTTPConnection.connect(self)
+        connected = monotonic()
+        self.sock = self.ssl_context.wrap_socket(self.sock, server_hostname=self.host)
+        self.connect_time = connected - start
+        self.tls_time = monotonic() - connected
+
+
+class PooledResponse:
+    """
+    Fully read HTTP response.
+    Mimics the object returned by ansible Request.open() - status, headers, read().
+    timing contains connect, tls and ttfb times in seconds (None if an already
+    open connection was used), and the number of retries.
+    """
+
+    def __init__(
+        self,
+        status: int,
+        reason: str,
+        headers: list[tuple[str, str]],
+        body: bytes,
+        timing: Optional[dict[str, Any]] = None,
+    ):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self._body = body
+        self.timing = timing or {}
+
+    def read(self) -> bytes:
+        return self._body
+
+
+class StreamedResponse:
+    """
+    HTTP response with body not read yet.
+    The connection is returned to the pool on close(), if the body was read completely.
+    """
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        key: _PoolKey,
+        conn: HTTPConnection,
+        resp: Any,
+        timing: Optional[dict[str, Any]] = None,
+    ):
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.getheaders()
+        self.timing = timing or {}
+        self._pool = pool
+        self._key = key
+        self._conn: Optional[HTTPConnection] = conn
+        self._resp = resp
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        data: bytes = self._resp.read(amt)
+        return data
+
+    def close(self) -> None:
+        conn = self._conn
+        if conn is None:
+            return
+        self._conn = None
+        # http.client marks response closed after the whole body is read.
+        if self._resp.isclosed() and not self._resp.will_close:
+            self._pool._checkin(self._key, conn)
+        else:
+            conn.close()
+
+    def __enter__(self) -> StreamedResponse:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) transport.
+    Connections are kept open after a request and reused by the next request
+    to the same host, so TCP and TLS handshakes are done only once per host.
+
+    The open() method has the same signature and error semantics as
+    ansible.module_utils.urls.Request.open(), so Client can use either of them.
+    Requests that need to go through an HTTP proxy are passed to Request.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_POOL_MAXSIZE):
+        if maxsize < 1:
+            raise AssertionError(f"ConnectionPool maxsize={maxsize} must be >= 1")
+        self.maxsize = maxsize
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self._idle: dict[_PoolKey, list[HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._fallback: Optional[Request] = None
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return dict(
+            connections_opened=self.connections_opened,
+            connections_reused=self.connections_reused,
+        )
+
+    def open(
+        self,
+        method: str,
+        url: str,
+        data: Any = None,
+        headers: Optional[dict[Any, Any]] = None,
+        validate_certs: bool = True,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Any:
+        """
+        With stream=True, a successful response is returned as StreamedResponse,
+        and the caller must close() it.
+        """
+        split_url = urlsplit(url)
+        scheme = split_url.scheme
+        host = split_url.hostname or ""
+        port = split_url.port or (443 if scheme == "https" else 80)
+        if self._needs_proxy(scheme, split_url.netloc):
+            return self._get_fallback().open(
+                method,
+                url,
+                data=data,
+                headers=headers,
+                validate_certs=validate_certs,
+                timeout=timeout,
+            )
+        selector = split_url.path or "/"
+        if split_url.query:
+            selector = "{0}?{1}".format(selector, split_url.query)
+        body: Optional[Union[bytes, BufferedReader, UploadStream]] = (
+            data.encode("utf-8") if isinstance(data, str) else data
+        )
+        key = (scheme, host, port)
+
+        conn, reused = self._checkout(key, validate_certs, timeout)
+        timing: dict[str, Any] = dict(retries=0)
+        try:
+            sent = False
+            try:
+                start = self._send(
+                    conn, method, selector, body, headers, timeout, timing
+                )
+                sent = True
+                resp = self._receive(conn, start, timing)
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if not self._can_retry(method, body, reused, sent):
+                    raise
+                conn = self._new_connection(key, validate_certs, timeout)
+                timing["retries"] += 1
+                start = self._send(
+                    conn, method, selector, body, headers, timeout, timing
+                )
+                resp = self._receive(conn, start, timing)
+            if stream and resp.status < 400:
+                return StreamedResponse(self, key, conn, resp, timing)
+            response_body = resp.read()
+        except Exception:
+            conn.close()
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(key, conn)
+
+        response = PooledResponse(
+            resp.status, resp.reason, resp.getheaders(), response_body, timing
+        )
+        if resp.status >= 400:
+            # Same as urllib - error status codes are reported as HTTPError.
+            error = HTTPError(
+                url,
+                resp.status,
+                resp.reason,
+                resp.msg,
+                io.BytesIO(response_body),
+            )
+            error.timing = timing
+            raise error
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            idle = self._idle
+            self._idle = {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    @staticmethod
+    def _can_retry(
+        method: str,
+        body: Optional[Union[bytes, BufferedReader, UploadStream]],
+        reused: bool,
+        sent: bool,
+    ) -> bool:
+        # Only a reused connection might have been closed by the server while idle.
+        if not reused:
+            return False
+        # A file body was (partially) consumed, it cannot be sent again.
+        if hasattr(body, "read"):
+            return False
+        # If the request was sent, HyperCore might have processed it already,
+        # and sending e.g. a POST again would create a second VM.
+        return not sent or method.upper() in _IDEMPOTENT_METHODS
+
+    @staticmethod
+    def _send(
+        conn: HTTPConnection,
+        method: str,
+        selector: str,
+        body: Optional[Union[bytes, BufferedReader, UploadStream]],
+        headers: Optional[dict[Any, Any]],
+        timeout: Optional[float],
+        timing: dict[str, Any],
+    ) -> float:
+        """
+        Sends the request, and returns the time when it was sent.
+        While an UploadStream body is sent, socket timeout is its send_timeout,
+        the request timeout applies to the response only.
+        """
+        # Timeout is per request, the connection might be reused with a different one.
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        timing.update(connect=None, tls=None)
+        send_timeout = (
+            body.send_timeout(conn.blocksize)
+            if isinstance(body, UploadStream)
+            else None
+        )
+        try:
+            if conn.sock is None:
+                conn.connect()
+                timing.update(
+                    connect=getattr(conn, "connect_time", None),
+                    tls=getattr(conn, "tls_time", None),
+                )
+            start = monotonic()
+            if send_timeout is not None:
+                conn.sock.settimeout(send_timeout)
+            try:
+                conn.request(method, selector, body=body, headers=headers or {})
+            except socket.timeout:
+                if send_timeout is None or not isinstance(body, UploadStream):
+                    raise
+                raise body.send_timeout_error(send_timeout)
+            if send_timeout is not None:
+                conn.sock.settimeout(timeout)
+        except _STALE_CONNECTION_ERRORS:
+            raise
+        except OSError as e:
+            # Same as urllib - errors while connecting/sending are reported as URLError.
+            # Errors while receiving the response (like TimeoutError) are not wrapped.
+            raise URLError(e)
+        return start
+
+    @staticmethod
+    def _receive(conn: HTTPConnection, start: float, timing: dict[str, Any]) -> Any:
+        resp = conn.getresponse()
+        # Time to first byte - from sending the request to receiving response headers.
+        timing["ttfb"] = monotonic() - start
+        return resp
+
+    def _checkout(
+        self, key: _PoolKey, validate_certs: bool, timeout: Optional[float]
+    ) -> tuple[HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.connections_reused += 1
+                return idle.pop(), True
+        return self._new_connection(key, validate_certs, timeout), False
+
+    def _checkin(self, key: _PoolKey, conn: HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.maxsize:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _new_connection(
+        self, key: _PoolKey, validate_certs: bool, timeout: Optional[float]
+    ) -> HTTPConnection:
+        scheme, host, port = key
+        conn: HTTPConnection
+        if scheme == "https":
+            context = ssl.create_default_context()
+            if not validate_certs:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            conn = TimedHTTPSConnection(host, port, timeout, context)
+        else:
+            conn = TimedHTTPConnection(host, port, timeout=timeout)
+        with self._lock:
+            self.connections_opened += 1
+        return conn
+
+    @staticmethod
+    def _needs_proxy(scheme: str, netloc: str) -> bool:
+        return scheme in getproxies() and not proxy_bypass(netloc)
+
+    def _get_fallback(self) -> Request:
+        if self._fallback is None:
+            self._fallback = Request()
+        return self._fallback
@@ -123,3 +123,9 @@ class TaskTagError(ScaleComputingError):
         self.task_status_state = task_status["state"]
         self.task_status = task_status
         super().__init__(self.message)
+
+
+class UploadStalledError(ScaleComputingError):
+    def __init__(self, data: Union[str, Exception]):
+        self.message = f"Upload too slow: {data}."
+        super(UploadStalledError, self).__init__(self.message)
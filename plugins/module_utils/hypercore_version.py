@@ -10,11 +10,14 @@ __metaclass__ = type
 
 import operator
 import re
+import ssl
 from functools import total_ordering
 from ansible.module_utils.basic import AnsibleModule
 from typing import List
+from ..module_utils import errors
 from ..module_utils.utils import PayloadMapper
 from ..module_utils.rest_client import RestClient
+from ..module_utils.wait import UPDATE_STATUS_BACKOFF, ProgressCallback, wait_until
 from ..module_utils.typed_classes import (
     TypedUpdateToAnsible,
     TypedUpdateStatusToAnsible,
@@ -251,6 +254,10 @@ class Update(PayloadMapper):
         )
 
 
+# update_status values after which HyperCore update is not running anymore.
+UPDATE_FINISHED_STATES = ("COMPLETE", "TERMINATING")
+
+
 class UpdateStatus(PayloadMapper):
     def __init__(
         self,
@@ -338,3 +345,47 @@ class UpdateStatus(PayloadMapper):
         if response.status == 404:  # .get() lets 200 and 404 through
             return None
         return cls.from_hypercore(response.json)
+
+    @classmethod
+    def wait_finished(
+        cls,
+        rest_client: RestClient,
+        timeout: float,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Optional[UpdateStatus]:
+        """
+        Polls update status until update is COMPLETE or TERMINATING.
+        HyperCore API is not reachable while it is restarting, connection, TLS and
+        other URL errors are treated as "update still in progress".
+        Authentication errors are raised.
+        The last known status is returned on timeout.
+        """
+        last_status: List[Optional[UpdateStatus]] = [None]
+
+        def poll() -> Optional[UpdateStatus]:
+            try:
+                status = cls.get(rest_client)
+            except errors.AuthError:
+                raise
+            except (
+                ConnectionError,
+                TimeoutError,
+                ssl.SSLError,
+                errors.ScaleComputingError,
+            ):
+                return None
+            last_status[0] = status
+            if status and status.update_status in UPDATE_FINISHED_STATES:
+                return status
+            return None
+
+        try:
+            return wait_until(
+                poll,
+                timeout=timeout,
+                backoff=UPDATE_STATUS_BACKOFF,
+                progress=progress,
+                description="HyperCore update finished",
+            )
+        except errors.ScaleTimeoutError:
+            return last_status[0]
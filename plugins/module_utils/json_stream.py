@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+from __future__ import annotations
+
+__metaclass__ = type
+
+import codecs
+import json
+from typing import Any, Callable, Iterator
+
+from .errors import ApiResponseNotJson
+
+# Bytes read from the socket at once.
+DEFAULT_READ_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+class _Buffer:
+    """
+    Decoded text read from a binary stream, with a read position.
+    Consumed text is dropped, so only the record being decoded is kept in memory.
+    """
+
+    def __init__(self, read: Callable[[int], bytes], read_size: int):
+        self._read = read
+        self._read_size = read_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> None:
+        # Read at least as much as is already buffered - a record larger
+        # than read_size is re-parsed only O(log(size)) times.
+        self.text = self.rest()
+        self.pos = 0
+        chunk = self._read(max(self._read_size, len(self.text)))
+        if not chunk:
+            self.eof = True
+        self.text += self._decoder.decode(chunk, final=self.eof)
+
+    def skip_whitespace(self) -> str:
+        # Returns next non-whitespace character, "" on end of stream.
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if self.eof:
+                return ""
+            self.fill()
+
+    def read_all(self) -> str:
+        while not self.eof:
+            self.fill()
+        return self.rest()
+
+    def rest(self) -> str:
+        # Buffered text, which was not consumed yet.
+        pos = self.pos
+        return self.text[pos:]
+
+
+def iter_json_array(
+    read: Callable[[int], bytes], read_size: int = DEFAULT_READ_SIZE
+) -> Iterator[Any]:
+    """
+    Yields elements of a JSON array one by one, while reading it from a stream.
+    read(size) returns the next bytes of the stream, b"" at the end.
+
+    HyperCore returns collections as JSON arrays. If the body is not an array,
+    it is decoded as a whole and yielded as a single element.
+    """
+    decoder = json.JSONDecoder()
+    buf = _Buffer(read, read_size)
+    if buf.skip_whitespace() != "[":
+        text = buf.read_all()
+        try:
+            yield json.loads(text)
+        except ValueError:
+            raise ApiResponseNotJson(text)
+        return
+    buf.pos += 1
+    empty = True
+    expect_element = True
+    while True:
+        char = buf.skip_whitespace()
+        if char == "]" and (empty or not expect_element):
+            return
+        if char == "," and not expect_element:
+            buf.pos += 1
+            expect_element = True
+            continue
+        if not char or not expect_element:
+            raise ApiResponseNotJson(buf.rest())
+        while True:
+            try:
+                element, end = decoder.raw_decode(buf.text, buf.pos)
+            except ValueError:
+                if buf.eof:
+                    raise ApiResponseNotJson(buf.rest())
+                # Element is not complete yet.
+                buf.fill()
+                continue
+            if end == len(buf.text) and not buf.eof:
+                # A number at the end of buffer might continue in the next chunk.
+                buf.fill()
+                continue
+            break
+        buf.pos = end
+        empty = False
+        expect_element = False
+        yield element
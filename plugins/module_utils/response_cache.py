@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+from __future__ import annotations
+
+__metaclass__ = type
+
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Iterable, Optional, Tuple
+
+# Max number of cached GET responses.
+DEFAULT_CACHE_MAXSIZE = 64
+
+# Collections which are cached, with time-to-live in seconds.
+# Other endpoints (TaskTag in particular) are never cached.
+DEFAULT_CACHE_TTLS = {
+    "/rest/v1/VirDomain": 30.0,
+    "/rest/v1/ISO": 60.0,
+    "/rest/v1/VirtualDisk": 60.0,
+    "/rest/v1/Node": 300.0,
+    "/rest/v1/Cluster": 300.0,
+}
+
+# A write to a collection changes also data embedded in other collections.
+# For example, VirDomain records contain blockDevs and netDevs,
+# and ISO records contain VMs where the ISO is mounted.
+RELATED_COLLECTIONS = {
+    "/rest/v1/VirDomain": (
+        "/rest/v1/VirDomainBlockDevice",
+        "/rest/v1/VirDomainNetDevice",
+        "/rest/v1/VirDomainSnapshot",
+        "/rest/v1/ISO",
+    ),
+    "/rest/v1/VirDomainBlockDevice": ("/rest/v1/VirDomain", "/rest/v1/ISO"),
+    "/rest/v1/VirDomainNetDevice": ("/rest/v1/VirDomain",),
+    "/rest/v1/VirDomainSnapshot": ("/rest/v1/VirDomain",),
+    "/rest/v1/ISO": ("/rest/v1/VirDomain",),
+}
+
+_Entry = Tuple[float, Any]
+
+
+def collection_of(endpoint: str) -> str:
+    # "/rest/v1/VirDomain/<uuid>/clone" -> "/rest/v1/VirDomain"
+    parts = endpoint.strip("/").split("/")
+    return "/" + "/".join(parts[:3])
+
+
+def affected_collections(endpoint: str) -> tuple[str, ...]:
+    collection = collection_of(endpoint)
+    return (collection,) + RELATED_COLLECTIONS.get(collection, ())
+
+
+class ResponseCache:
+    """
+    Decoded GET responses, keyed by requested endpoint.
+    HyperCore does not filter collections, so query is applied to cached records.
+
+    The cache is bounded - least recently used entries are evicted first.
+    Entries expire after the TTL of their collection.
+    Writes invalidate affected collections, see RestClient.
+    The cache can be shared by threads.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_CACHE_MAXSIZE,
+        ttls: Optional[dict[str, float]] = None,
+    ):
+        if maxsize < 1:
+            raise AssertionError(f"ResponseCache maxsize={maxsize} must be >= 1")
+        self.maxsize = maxsize
+        self.ttls = dict(DEFAULT_CACHE_TTLS if ttls is None else ttls)
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # Collections changed by HyperCore tasks which are still running, by task tag.
+        self._pending: dict[str, tuple[str, ...]] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return dict(hits=self.hits, misses=self.misses, size=len(self._entries))
+
+    def is_cacheable(self, endpoint: str) -> bool:
+        collection = collection_of(endpoint)
+        if collection not in self.ttls:
+            return False
+        # Data is changing until the task finishes.
+        with self._lock:
+            return not any(
+                collection in collections for collections in self._pending.values()
+            )
+
+    def get(self, endpoint: str) -> Optional[Any]:
+        # Returns None on cache miss.
+        with self._lock:
+            entry = self._entries.get(endpoint)
+            if entry is not None and entry[0] <= monotonic():
+                del self._entries[endpoint]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(endpoint)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, endpoint: str, data: Any) -> None:
+        with self._lock:
+            if not self.is_cacheable(endpoint):
+                return
+            expires = monotonic() + self.ttls[collection_of(endpoint)]
+            self._entries[endpoint] = (expires, data)
+            self._entries.move_to_end(endpoint)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, collections: Iterable[str]) -> None:
+        collections = set(collections)
+        with self._lock:
+            for endpoint in list(self._entries):
+                if collection_of(endpoint) in collections:
+                    del self._entries[endpoint]
+
+    def write_submitted(self, endpoint: str, task_tag: Optional[str]) -> None:
+        """
+        Called after a write request.
+        Affected collections are invalidated now, and are not cached
+        until the HyperCore task (if any) finishes.
+        """
+        collections = affected_collections(endpoint)
+        with self._lock:
+            self.invalidate(collections)
+            if task_tag:
+                self._pending[task_tag] = self._pending.get(task_tag, ()) + collections
+
+    def task_finished(self, task_tag: str) -> None:
+        with self._lock:
+            collections = self._pending.pop(task_tag, ())
+            self.invalidate(collections)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
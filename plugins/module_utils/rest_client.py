@@ -10,12 +10,34 @@ from . import errors
 from . import utils
 from ..module_utils.client import Client
 from ..module_utils.typed_classes import TypedTaskTag
+from ..module_utils.upload import UploadStream
+from ..module_utils.response_cache import (
+    ResponseCache,
+    affected_collections,
+    collection_of,
+)
 
 __metaclass__ = type
 
-from typing import Any, Optional, Union
+from typing import Any, Iterator, Optional, Union
 from io import BufferedReader
+import copy
 import json
+import threading
+
+
+# Collection endpoints where a single record can be read with GET {endpoint}/{uuid}.
+UUID_LOOKUP_ENDPOINTS = (
+    "/rest/v1/ISO",
+    "/rest/v1/Node",
+    "/rest/v1/User",
+    "/rest/v1/VirDomain",
+    "/rest/v1/VirDomainBlockDevice",
+    "/rest/v1/VirDomainNetDevice",
+    "/rest/v1/VirDomainSnapshot",
+    "/rest/v1/VirDomainSnapshotSchedule",
+    "/rest/v1/VirtualDisk",
+)
 
 
 def _query(original: Optional[dict[Any, Any]] = None) -> dict[Any, Any]:
@@ -24,9 +46,107 @@ def _query(original: Optional[dict[Any, Any]] = None) -> dict[Any, Any]:
     return dict(original or {})
 
 
+def plan_query(endpoint: str, query: Optional[dict[Any, Any]]) -> tuple[str, bool]:
+    """
+    Decide which part of the query HyperCore can evaluate.
+    HyperCore API does not filter collections by query parameters,
+    but a record can be read by uuid as {endpoint}/{uuid}.
+    Returns (endpoint to GET, True if endpoint is a single-record uuid lookup).
+    The whole query is still applied locally on the returned records.
+    """
+    uuid = (query or {}).get("uuid")
+    if (
+        endpoint.rstrip("/") in UUID_LOOKUP_ENDPOINTS
+        and isinstance(uuid, str)
+        and uuid
+        and "/" not in uuid
+    ):
+        return "{0}/{1}".format(endpoint.rstrip("/"), uuid), True
+    return endpoint, False
+
+
 class RestClient:
-    def __init__(self, client: Client):
+    def __init__(self, client: Client, response_cache: Optional[ResponseCache] = None):
+        """
+        With response_cache, GET responses of collections in cache.ttls are reused,
+        and invalidated by writes and by finished tasks, see ResponseCache.
+        Safe for modules which change HyperCore, as long as all changes are
+        done via this RestClient, and waited for with TaskTag.
+        """
         self.client = client
+        self.response_cache = response_cache
+        # Number of submitted writes by affected collection, see writes().
+        # Writes can be submitted from TaskTag.submit_and_wait worker threads.
+        self._writes: dict[str, int] = {}
+        self._writes_lock = threading.Lock()
+
+    def _get_cached(
+        self, endpoint: str, timeout: Optional[float], missing_ok: bool = False
+    ) -> Optional[Any]:
+        # Returns decoded response, None if missing_ok and endpoint does not exist (404).
+        cache = self.response_cache
+        if cache is not None and cache.is_cacheable(endpoint):
+            data = cache.get(endpoint)
+            if data is not None:
+                return data
+        try:
+            response = self.client.get(path=endpoint, timeout=timeout)
+        except TimeoutError as e:
+            raise errors.ScaleTimeoutError(e)
+        if missing_ok and response.status == 404:
+            return None
+        data = response.json
+        if cache is not None and response.status == 200:
+            cache.set(endpoint, data)
+        return data
+
+    def _cached_records(
+        self,
+        endpoint: str,
+        query: Optional[dict[Any, Any]],
+        timeout: Optional[float],
+    ) -> list[Any]:
+        # list_records() served from the response cache.
+        get_endpoint, uuid_lookup = plan_query(endpoint, query)
+        records = self._get_cached(get_endpoint, timeout, missing_ok=uuid_lookup)
+        if records is None:
+            return []
+        records = utils.filter_results(records, query)
+        # Callers may modify returned records, cached ones must stay intact.
+        return copy.deepcopy(records)
+
+    def _write_submitted(self, endpoint: str, response: Any) -> None:
+        with self._writes_lock:
+            for collection in affected_collections(endpoint):
+                self._writes[collection] = self._writes.get(collection, 0) + 1
+        if self.response_cache is None:
+            return
+        task_tag = response.get("taskTag") if isinstance(response, dict) else None
+        self.response_cache.write_submitted(
+            endpoint, str(task_tag) if task_tag else None
+        )
+
+    def writes(self, endpoint: str) -> int:
+        """
+        Number of writes submitted with this RestClient, which changed records
+        of the endpoint's collection (directly or via a related collection).
+        A record read earlier is outdated if the number changed since the read.
+        """
+        with self._writes_lock:
+            return self._writes.get(collection_of(endpoint), 0)
+
+    def invalidate(self, endpoint: str) -> None:
+        """
+        Drops cached records of the endpoint's collection.
+        Use before polling for changes not done by this RestClient (like VM state).
+        """
+        if self.response_cache is not None:
+            self.response_cache.invalidate([collection_of(endpoint)])
+
+    def task_finished(self, task_tag: str) -> None:
+        # Called by TaskTag when a task finished, changed data can be cached again.
+        if self.response_cache is not None:
+            self.response_cache.task_finished(str(task_tag))
 
     def list_records(
         self,
@@ -34,13 +154,55 @@ class RestClient:
         query: Optional[dict[Any, Any]] = None,
         timeout: Optional[float] = None,
     ) -> list[Any]:
-        """Results are obtained so that first off, all records are obtained and
-        then filtered manually"""
+        """
+        Records are filtered by query, see plan_query() for the part done by HyperCore.
+        The rest of filtering is done locally.
+        """
+        if self.response_cache is not None:
+            return self._cached_records(endpoint, query, timeout)
+        get_endpoint, uuid_lookup = plan_query(endpoint, query)
         try:
-            records = self.client.get(path=endpoint, timeout=timeout).json
+            response = self.client.get(path=get_endpoint, timeout=timeout)
         except TimeoutError as e:
             raise errors.ScaleTimeoutError(e)
-        return utils.filter_results(records, query)
+        if uuid_lookup and response.status == 404:
+            return []
+        return utils.filter_results(response.json, query)
+
+    def iter_records(
+        self,
+        endpoint: str,
+        query: Optional[dict[Any, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Any]:
+        """
+        Same as list_records(), but records are yielded one by one, while the
+        response is being read. Use for large collections, where the caller
+        filters or converts records and does not need all of them at once.
+        The connection is released when the iterator is exhausted or closed.
+        """
+        get_endpoint, uuid_lookup = plan_query(endpoint, query)
+        if self.response_cache is not None and self.response_cache.is_cacheable(
+            get_endpoint
+        ):
+            # Cached collection is decoded and kept as whole anyway.
+            yield from self._cached_records(endpoint, query, timeout)
+            return
+        try:
+            response = self.client.get(path=get_endpoint, timeout=timeout, stream=True)
+        except TimeoutError as e:
+            raise errors.ScaleTimeoutError(e)
+        if uuid_lookup and response.status == 404:
+            response.close()
+            return
+        try:
+            for record in response.iter_json():
+                if utils.is_superset(record, query):
+                    yield record
+        except TimeoutError as e:
+            raise errors.ScaleTimeoutError(e)
+        finally:
+            response.close()
 
     def list_records_raw(
         self,
@@ -65,6 +227,34 @@ class RestClient:
         timeout: Optional[float] = None,
     ) -> Optional[dict[Any, Any]]:
         records = self.list_records(endpoint=endpoint, query=query, timeout=timeout)
+        return self._single_record(records, endpoint, query, must_exist)
+
+    def poll_record(
+        self,
+        endpoint: str,
+        must_exist: bool = False,
+        timeout: Optional[float] = None,
+    ) -> Optional[dict[Any, Any]]:
+        """
+        get_record() for polling loops, which read the same record again and again.
+        Response cache is bypassed, and conditional GET is used,
+        so an unchanged record is not decoded again.
+        Returned record is shared between calls, and must not be modified.
+        """
+        try:
+            response = self.client.get(path=endpoint, timeout=timeout, conditional=True)
+        except TimeoutError as e:
+            raise errors.ScaleTimeoutError(e)
+        records = [] if response.status == 404 else response.json
+        return self._single_record(records, endpoint, None, must_exist)
+
+    @staticmethod
+    def _single_record(
+        records: list[Any],
+        endpoint: str,
+        query: Optional[dict[Any, Any]],
+        must_exist: bool,
+    ) -> Optional[dict[Any, Any]]:
         if len(records) > 1:
             raise errors.ScaleComputingError(
                 "{0} records from endpoint {1} match the {2} query.".format(
@@ -94,6 +284,7 @@ class RestClient:
             ).json
         except TimeoutError as e:
             raise errors.ScaleTimeoutError(e)
+        self._write_submitted(endpoint, response)
         return response
 
     def update_record(
@@ -112,6 +303,7 @@ class RestClient:
             ).json
         except TimeoutError as e:
             raise errors.ScaleTimeoutError(e)
+        self._write_submitted(endpoint, response)
         return response
 
     def delete_record(
@@ -124,6 +316,7 @@ class RestClient:
             response: TypedTaskTag = self.client.delete(endpoint, timeout=timeout).json
         except TimeoutError as e:
             raise errors.ScaleTimeoutError(e)
+        self._write_submitted(endpoint, response)
         return response
 
     def put_record(
@@ -133,7 +326,7 @@ class RestClient:
         check_mode: bool,
         query: Optional[dict[Any, Any]] = None,
         timeout: Optional[float] = None,
-        binary_data: Optional[Union[bytes, BufferedReader]] = None,
+        binary_data: Optional[Union[bytes, BufferedReader, UploadStream]] = None,
         headers: Optional[dict[Any, Any]] = None,
     ) -> TypedTaskTag:
         if check_mode:
@@ -150,13 +343,20 @@ class RestClient:
         except TimeoutError as e:
             raise errors.ScaleTimeoutError(e)
         except (json.JSONDecodeError, json.decoder.JSONDecodeError) as e:
+            # Binary upload endpoints do not return JSON, but data was changed.
+            self._write_submitted(endpoint, None)
             raise json.JSONDecodeError(e.msg, e.doc, e.pos)
+        except errors.ApiResponseNotJson:
+            self._write_submitted(endpoint, None)
+            raise
+        self._write_submitted(endpoint, response)
         return response
 
 
 class CachedRestClient(RestClient):
     # Use ONLY in case, that all task operations are read only. Should hould for all _info
     # modules.
+    # The whole collection is cached, so uuid lookups are not sent to HyperCore.
 
     def __init__(self, client: Client):
         super().__init__(client)
@@ -178,3 +378,12 @@ class CachedRestClient(RestClient):
             self.cache[endpoint] = records
 
         return utils.filter_results(records, query)
+
+    def iter_records(
+        self,
+        endpoint: str,
+        query: Optional[dict[Any, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Any]:
+        # The whole collection is cached anyway.
+        yield from self.list_records(endpoint, query, timeout)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+from __future__ import annotations
+
+__metaclass__ = type
+
+import fcntl
+import hashlib
+import json
+import os
+from time import time
+from typing import Callable, Optional
+
+# Seconds a cached session is used before a new login is done.
+DEFAULT_SESSION_CACHE_TTL = 300.0
+
+
+class SessionCache:
+    """
+    HyperCore sessionID stored on disk, so that consecutive modules
+    can reuse the session instead of doing a new login.
+
+    One file per host+username+auth_method is used, the file is readable
+    only by the owner. Password is not stored.
+    Reads and writes are serialized with flock, so parallel ansible forks
+    do a single login and then share the session.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        host: str,
+        username: str,
+        auth_method: str,
+        ttl: float = DEFAULT_SESSION_CACHE_TTL,
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        key = hashlib.sha256(
+            "\n".join((host, username, auth_method)).encode("utf-8")
+        ).hexdigest()
+        self.path = os.path.join(directory, f"hypercore-session-{key}.json")
+
+    @classmethod
+    def from_env(
+        cls, host: str, username: str, auth_method: str
+    ) -> Optional[SessionCache]:
+        # Session cache is opt-in, enabled by SC_SESSION_CACHE_DIR.
+        directory = os.environ.get("SC_SESSION_CACHE_DIR")
+        if not directory:
+            return None
+        ttl = float(os.environ.get("SC_SESSION_CACHE_TTL", DEFAULT_SESSION_CACHE_TTL))
+        return cls(directory, host, username, auth_method, ttl=ttl)
+
+    def get_or_login(self, login: Callable[[], str]) -> tuple[str, bool]:
+        """
+        Returns (session_id, from_cache).
+        If there is no valid cached session, login() is called, and the new session is stored.
+        """
+        fd = self._open()
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            session_id = self._read_valid(fd)
+            if session_id:
+                return session_id, True
+            session_id = login()
+            self._write(fd, dict(session_id=session_id, created=time()))
+            return session_id, False
+        finally:
+            os.close(fd)  # releases the lock
+
+    def invalidate(self, session_id: str) -> None:
+        """
+        Removes session_id from cache.
+        A newer session stored meanwhile by some other process is left intact.
+        """
+        if not os.path.exists(self.path):
+            return
+        fd = self._open()
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if self._read(fd).get("session_id") == session_id:
+                self._write(fd, {})
+        finally:
+            os.close(fd)
+
+    def _open(self) -> int:
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        # File might exist with wider permissions.
+        os.fchmod(fd, 0o600)
+        return fd
+
+    def _read_valid(self, fd: int) -> Optional[str]:
+        data = self._read(fd)
+        session_id = data.get("session_id")
+        created = data.get("created")
+        if not isinstance(session_id, str) or not isinstance(created, (int, float)):
+            return None
+        if not 0 <= time() - created < self.ttl:
+            return None
+        return session_id
+
+    @staticmethod
+    def _read(fd: int) -> dict[str, object]:
+        os.lseek(fd, 0, os.SEEK_SET)
+        chunks = []
+        while True:
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        try:
+            data = json.loads(b"".join(chunks))
+        except ValueError:
+            # Empty or corrupted file
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @staticmethod
+    def _write(fd: int, data: dict[str, object]) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.ftruncate(fd, 0)
+        os.write(fd, json.dumps(data).encode("utf-8"))
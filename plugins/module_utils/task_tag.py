@@ -9,12 +9,14 @@ from __future__ import annotations
 
 __metaclass__ = type
 
-from time import sleep
-
 from ..module_utils import errors
 from ..module_utils.rest_client import RestClient
 from ..module_utils.typed_classes import TypedTaskTag
-from typing import Optional, Dict, Any
+from ..module_utils.wait import TASK_TAG_BACKOFF, ProgressCallback, wait_until
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, List, TypeVar
+
+T = TypeVar("T")
 
 
 class TaskTag:
@@ -24,35 +26,161 @@ class TaskTag:
         rest_client: RestClient,
         task: Optional[TypedTaskTag],
         check_mode: bool = False,
+        timeout: Optional[float] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> None:
+        # timeout=None waits until the task finishes, however long it takes.
         if check_mode:
             return
-        if task is None:
+        task_tag = cls._get_task_tag(task)
+        if not task_tag:
             return
+
+        def poll() -> Optional[bool]:
+            return True if cls._is_finished(rest_client, task_tag) else None
+
+        wait_until(
+            poll,
+            timeout=timeout,
+            backoff=TASK_TAG_BACKOFF,
+            progress=progress,
+            description=f"TaskTag {task_tag} finished",
+        )
+
+    @classmethod
+    def wait_tasks(
+        cls,
+        rest_client: RestClient,
+        tasks: List[Optional[TypedTaskTag]],
+        check_mode: bool = False,
+        timeout: Optional[float] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        """
+        Waits until all tasks are finished.
+        All outstanding tasks are polled in the same poll loop,
+        so callers can submit independent operations first, and wait for them together.
+        If some tasks failed, TaskTagError of the first failed task is raised,
+        but only after all tasks are finished.
+        """
+        if check_mode:
+            return
+        failed = cls._wait_tasks(rest_client, tasks, timeout, progress)
+        if failed:
+            raise next(iter(failed.values()))
+
+    @classmethod
+    def submit_and_wait(
+        cls,
+        rest_client: RestClient,
+        submit: Callable[[T], Optional[TypedTaskTag]],
+        items: List[T],
+        concurrency: int,
+    ) -> List[Optional[Exception]]:
+        """
+        Calls submit(item) for each item in a thread pool, in batches of concurrency items.
+        Tasks of a batch are waited for in a single poll loop, before the next batch is submitted.
+        Returns an error for each item (None on success), in the order of items:
+        - exception raised by submit, or invalid task returned by submit,
+        - TaskTagError if the task finished in ERROR or UNINITIALIZED state.
+        An error of one item does not stop waiting for tasks of other items.
+        A task without TaskTag (empty taskTag, or TaskTag record is not found)
+        is finished successfully, same as in wait_tasks.
+        """
+        item_errors: List[Optional[Exception]] = [None] * len(items)
+        for start in range(0, len(items), concurrency):
+            end = min(start + concurrency, len(items))
+            with ThreadPoolExecutor(max_workers=end - start) as executor:
+                futures = {
+                    index: executor.submit(submit, items[index])
+                    for index in range(start, end)
+                }
+            tasks: Dict[int, Optional[TypedTaskTag]] = {}
+            for index, future in futures.items():
+                try:
+                    task = future.result()
+                    # Invalid task fails this item only, and not the poll loop.
+                    cls._get_task_tag(task)
+                except Exception as ex:
+                    item_errors[index] = ex
+                    continue
+                tasks[index] = task
+            failed = cls._wait_tasks(rest_client, list(tasks.values()))
+            for index, task in tasks.items():
+                task_tag = cls._get_task_tag(task)
+                if task_tag in failed:
+                    item_errors[index] = failed[task_tag]
+        return item_errors
+
+    @classmethod
+    def _wait_tasks(
+        cls,
+        rest_client: RestClient,
+        tasks: List[Optional[TypedTaskTag]],
+        timeout: Optional[float] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, errors.TaskTagError]:
+        # Returns TaskTagError of failed tasks by task tag, in the order of failure.
+        pending: List[str] = []
+        for task in tasks:
+            task_tag = cls._get_task_tag(task)
+            if task_tag and task_tag not in pending:
+                pending.append(task_tag)
+        failed: Dict[str, errors.TaskTagError] = {}
+        if not pending:
+            return failed
+
+        def poll() -> Optional[bool]:
+            for task_tag in list(pending):
+                try:
+                    finished = cls._is_finished(rest_client, task_tag)
+                except errors.TaskTagError as ex:
+                    failed[task_tag] = ex
+                    finished = True
+                if finished:
+                    pending.remove(task_tag)
+            return True if not pending else None
+
+        wait_until(
+            poll,
+            timeout=timeout,
+            backoff=TASK_TAG_BACKOFF,
+            progress=progress,
+            description="TaskTags {0} finished".format(", ".join(map(str, pending))),
+        )
+        return failed
+
+    @staticmethod
+    def _get_task_tag(task: Optional[TypedTaskTag]) -> Optional[str]:
+        if task is None:
+            return None
         if not isinstance(task, dict):
             raise errors.ScaleComputingError("task should be dictionary.")
         if "taskTag" not in task.keys():
             raise errors.ScaleComputingError("taskTag is not in task dictionary.")
-        if not task["taskTag"]:
-            return
+        return task["taskTag"] or None
 
-        while True:
-            task_status = rest_client.get_record(
-                "{0}/{1}".format("/rest/v1/TaskTag", task["taskTag"]), query={}
-            )
-            if task_status is None:  # No such task_status is found
-                break
-            if task_status.get("state", "") in (
-                "ERROR",
-                "UNINITIALIZED",
-            ):  # TaskTag has finished unsucessfully or was never initialized, both are errors.
-                raise errors.TaskTagError(task_status)
-            if task_status.get("state", "") not in (
-                "RUNNING",
-                "QUEUED",
-            ):  # TaskTag has finished
-                break
-            sleep(1)
+    @staticmethod
+    def _is_finished(rest_client: RestClient, task_tag: str) -> bool:
+        task_status = rest_client.poll_record(
+            "{0}/{1}".format("/rest/v1/TaskTag", task_tag)
+        )
+        if task_status is None:  # No such task_status is found
+            rest_client.task_finished(task_tag)
+            return True
+        if task_status.get("state", "") in (
+            "ERROR",
+            "UNINITIALIZED",
+        ):  # TaskTag has finished unsucessfully or was never initialized, both are errors.
+            rest_client.task_finished(task_tag)
+            raise errors.TaskTagError(task_status)
+        if task_status.get("state", "") not in (
+            "RUNNING",
+            "QUEUED",
+        ):  # TaskTag has finished
+            rest_client.task_finished(task_tag)
+            return True
+        return False
 
     @staticmethod
     def get_task_status(
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+from __future__ import annotations
+
+__metaclass__ = type
+
+import atexit
+import json
+import os
+import re
+import sys
+import threading
+from time import time
+from typing import Any, Optional
+
+from ansible.module_utils.six.moves.urllib.parse import urlsplit
+
+# Path segments replaced in endpoint template, so that requests
+# to different VMs are aggregated together.
+_UUID_RE = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}(:.*)?$",
+    re.IGNORECASE,
+)
+_NUMBER_RE = re.compile(r"^[0-9]+$")
+
+
+def endpoint_template(url: str) -> str:
+    """
+    Returns URL path without host and query, with ids replaced by placeholders.
+    "https://host/rest/v1/VirDomain/<uuid>/clone?a=b" -> "/rest/v1/VirDomain/{uuid}/clone"
+    """
+    segments = []
+    for segment in urlsplit(url).path.split("/"):
+        if _UUID_RE.match(segment):
+            segment = "{uuid}"
+        elif _NUMBER_RE.match(segment):
+            segment = "{id}"
+        segments.append(segment)
+    return "/".join(segments)
+
+
+def body_size(data: Any, headers: Optional[dict[Any, Any]] = None) -> Optional[int]:
+    # Size of request/response body in bytes, None if unknown (a not yet read stream).
+    if data is None:
+        return 0
+    if isinstance(data, str):
+        return len(data.encode("utf-8"))
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    for name, value in (headers or {}).items():
+        if name.lower() == "content-length":
+            return int(value)
+    return None
+
+
+def _round(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds, 6)
+
+
+class Tracer:
+    """
+    Structured tracing of HTTP requests sent by Client.
+
+    Every request is aggregated by method and endpoint template (count, errors,
+    time, bytes), see summary. If path is set, every request is also appended
+    to the file as a JSON line, and the summary is appended when the module exits.
+    Request bodies, headers and session cookies are never written.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._endpoints: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if path:
+            atexit.register(self.write_summary)
+
+    @classmethod
+    def from_env(cls) -> Optional[Tracer]:
+        # Tracing is opt-in, enabled by SC_TRACE_FILE.
+        path = os.environ.get("SC_TRACE_FILE")
+        if not path:
+            return None
+        return cls(os.path.expanduser(path))
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status: Optional[int],
+        bytes_out: Optional[int],
+        bytes_in: Optional[int],
+        total: float,
+        timing: Optional[dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        Records one HTTP request, and returns the trace record.
+        timing contains connect, tls and ttfb times and number of retries,
+        if known by the transport (see ConnectionPool).
+        """
+        timing = timing or {}
+        trace = dict(
+            method=method,
+            endpoint=endpoint_template(url),
+            status=status,
+            bytes_out=bytes_out,
+            bytes_in=bytes_in,
+            connect=_round(timing.get("connect")),
+            tls=_round(timing.get("tls")),
+            ttfb=_round(timing.get("ttfb")),
+            total=_round(total),
+            retries=timing.get("retries", 0),
+            error=error,
+        )
+        key = f"{method} {trace['endpoint']}"
+        with self._lock:
+            stats = self._endpoints.setdefault(
+                key,
+                dict(count=0, errors=0, total=0.0, max=0.0, bytes_out=0, bytes_in=0),
+            )
+            stats["count"] += 1
+            stats["errors"] += 1 if error or (status or 0) >= 400 else 0
+            stats["total"] += total
+            stats["max"] = max(stats["max"], total)
+            stats["bytes_out"] += bytes_out or 0
+            stats["bytes_in"] += bytes_in or 0
+        if self.path:
+            self._write(dict(trace, type="request", time=time(), pid=os.getpid()))
+        return trace
+
+    @property
+    def summary(self) -> dict[str, Any]:
+        """
+        Aggregated requests, endpoints with the largest total time first.
+        """
+        with self._lock:
+            endpoints = sorted(
+                (dict(stats, endpoint=key) for key, stats in self._endpoints.items()),
+                key=lambda stats: stats["total"],
+                reverse=True,
+            )
+        for stats in endpoints:
+            stats["total"] = round(stats["total"], 6)
+            stats["max"] = round(stats["max"], 6)
+        return dict(
+            requests=sum(stats["count"] for stats in endpoints),
+            total=round(sum(stats["total"] for stats in endpoints), 6),
+            endpoints=endpoints,
+        )
+
+    def write_summary(self) -> None:
+        if not self.path or not self._endpoints:
+            return
+        self._write(
+            dict(
+                self.summary,
+                type="summary",
+                time=time(),
+                pid=os.getpid(),
+                argv0=os.path.basename(sys.argv[0]),
+            )
+        )
+
+    def _write(self, line: dict[str, Any]) -> None:
+        # A single write() of a line opened in append mode is not interleaved
+        # with lines written by parallel ansible forks.
+        if not self.path:
+            return
+        data = (json.dumps(line, separators=(",", ":")) + "\n").encode("utf-8")
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
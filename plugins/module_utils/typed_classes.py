@@ -273,3 +273,16 @@ class TypedDiskToAnsible(TypedDict):
     tiering_priority_factor: int
     mount_points: list[str]
     read_only: bool
+
+
+# Number of records read from HyperCore and returned by an _info module.
+class TypedFilterStatsToAnsible(TypedDict):
+    scanned: int
+    returned: int
+
+
+# Upload statistics to ansible return dict.
+class TypedUploadToAnsible(TypedDict):
+    bytes_sent: int
+    elapsed: float
+    average_rate: float
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+from __future__ import annotations
+
+__metaclass__ = type
+
+from time import monotonic
+from typing import Any, BinaryIO, Optional
+
+from ..module_utils import errors
+from ..module_utils.typed_classes import TypedUploadToAnsible
+
+# Max size of a buffer read from file and sent.
+# http.client reads smaller blocks (8 KiB), so throughput is checked often enough.
+DEFAULT_UPLOAD_CHUNK_SIZE = 64 * 1024
+# Upload is aborted if less than UPLOAD_MIN_RATE bytes/sec
+# were sent during the last UPLOAD_STALL_WINDOW seconds.
+# Same limit as "Operation too slow" in yum/dnf.
+DEFAULT_UPLOAD_MIN_RATE = 1000
+DEFAULT_UPLOAD_STALL_WINDOW = 30
+
+
+class UploadMonitor:
+    """
+    Tracks throughput of a file upload.
+    The file is wrapped with wrap(), and the returned UploadStream is passed
+    to HTTP request as body. Each read() from the stream means the previous buffer
+    was sent, so bytes read over time is the upload rate.
+    """
+
+    def __init__(
+        self,
+        min_rate: float = DEFAULT_UPLOAD_MIN_RATE,
+        window: float = DEFAULT_UPLOAD_STALL_WINDOW,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+    ):
+        if window <= 0 or chunk_size <= 0:
+            raise AssertionError(
+                f"Invalid UploadMonitor window={window} chunk_size={chunk_size}"
+            )
+        self.min_rate = min_rate
+        self.window = window
+        self.chunk_size = chunk_size
+        self.bytes_sent = 0
+        self._start: Optional[float] = None
+        self._last: Optional[float] = None
+        self._window_start = 0.0
+        self._window_start_bytes = 0
+
+    @classmethod
+    def from_module_params(cls, params: dict[Any, Any]) -> UploadMonitor:
+        return cls(
+            min_rate=params.get("upload_min_rate", DEFAULT_UPLOAD_MIN_RATE),
+            window=params.get("upload_stall_window", DEFAULT_UPLOAD_STALL_WINDOW),
+        )
+
+    def wrap(self, fileobj: BinaryIO) -> UploadStream:
+        return UploadStream(fileobj, self)
+
+    def update(self, nbytes: int) -> None:
+        now = monotonic()
+        if self._start is None:
+            self._start = self._window_start = now
+        self._last = now
+        self.bytes_sent += nbytes
+        window_elapsed = now - self._window_start
+        if window_elapsed < self.window:
+            return
+        window_bytes = self.bytes_sent - self._window_start_bytes
+        if window_bytes < self.min_rate * window_elapsed:
+            raise errors.UploadStalledError(
+                f"{window_bytes} bytes sent in the last {window_elapsed:.0f} seconds, "
+                f"required is at least {self.min_rate} bytes/sec"
+            )
+        self._window_start = now
+        self._window_start_bytes = self.bytes_sent
+
+    @property
+    def stats(self) -> Optional[TypedUploadToAnsible]:
+        """Upload statistics, None if nothing was uploaded."""
+        if self._start is None or self._last is None:
+            return None
+        elapsed = self._last - self._start
+        return dict(
+            bytes_sent=self.bytes_sent,
+            elapsed=round(elapsed, 3),
+            average_rate=round(self.bytes_sent / elapsed, 1) if elapsed else 0.0,
+        )
+
+
+class UploadStream:
+    """
+    Read-only file wrapper passed as HTTP request body.
+    read() returns at most chunk_size bytes (like a raw stream),
+    and reports every read to the UploadMonitor.
+    """
+
+    def __init__(self, fileobj: BinaryIO, monitor: UploadMonitor):
+        self._fileobj = fileobj
+        self._monitor = monitor
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if size is None or size < 0 or size > self._monitor.chunk_size:
+            size = self._monitor.chunk_size
+        data = self._fileobj.read(size)
+        self._monitor.update(len(data))
+        return data
+
+    def send_timeout(self, blocksize: int) -> Optional[float]:
+        """
+        Socket timeout while the stream is sent in blocks of blocksize bytes.
+        A single send blocked for longer means the upload is stalled,
+        read() is not called again and UploadMonitor cannot detect it.
+        None if min_rate is not set.
+        """
+        if self._monitor.min_rate <= 0:
+            return None
+        return max(self._monitor.window, blocksize / self._monitor.min_rate)
+
+    def send_timeout_error(self, timeout: float) -> errors.UploadStalledError:
+        return errors.UploadStalledError(
+            f"Send did not make progress in {timeout:g} seconds, "
+            f"required is at least {self._monitor.min_rate} bytes/sec"
+        )
@@ -12,7 +12,7 @@ __metaclass__ = type
 import uuid
 
 from ..module_utils.errors import InvalidUuidFormatError
-from typing import Union, Any
+from typing import Union, Any, Optional
 from ..module_utils.typed_classes import (
     TypedTaskTag,
     TypedRegistrationToAnsible,
@@ -117,7 +117,7 @@ class PayloadMapper:
         return str(dict(ansible=self.to_ansible(), hypercore=self.to_hypercore()))
 
 
-def is_superset(superset, candidate):
+def is_superset(superset: Any, candidate: Optional[dict[Any, Any]]) -> bool:
     if not candidate:
         return True
     for k, v in candidate.items():
@@ -19,7 +19,10 @@ from typing import Dict, List, Any, Optional
 from .rest_client import RestClient
 from ..module_utils.utils import PayloadMapper
 from ..module_utils import errors
+from ..module_utils.upload import UploadMonitor
 
+# Socket timeout for upload response. Slow or stalled uploads are detected by UploadMonitor,
+# and by upload_stall_window socket timeout while data is sent.
 REQUEST_TIMEOUT_TIME = 3600
 
 
@@ -134,7 +137,10 @@ class VirtualDisk(PayloadMapper):
     # Filename and filesize need to be send as parameters in PUT request.
     @staticmethod
     def send_upload_request(
-        rest_client: RestClient, file_size: int, module: AnsibleModule
+        rest_client: RestClient,
+        file_size: int,
+        module: AnsibleModule,
+        upload: Optional[UploadMonitor] = None,
     ) -> TypedTaskTag:
         if (
             file_size is None
@@ -144,6 +150,7 @@ class VirtualDisk(PayloadMapper):
             raise errors.ScaleComputingError(
                 "Missing some virtual disk file values inside upload request."
             )
+        upload = upload or UploadMonitor.from_module_params(module.params)
         try:
             with open(module.params["source"], "rb") as source_file:
                 task = rest_client.put_record(
@@ -152,7 +159,7 @@ class VirtualDisk(PayloadMapper):
                     check_mode=False,
                     query=dict(filename=module.params["name"], filesize=file_size),
                     timeout=REQUEST_TIMEOUT_TIME,
-                    binary_data=source_file,
+                    binary_data=upload.wrap(source_file),
                     headers={
                         "Content-Type": "application/octet-stream",
                         "Accept": "application/json",
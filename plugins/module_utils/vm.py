@@ -10,11 +10,15 @@ from __future__ import annotations
 __metaclass__ = type
 
 import base64
-from time import sleep, time
-from typing import Dict, Any, Optional, List
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from time import monotonic
+from typing import Callable, Dict, Any, Optional, List, Tuple
 
 from ..module_utils.errors import DeviceNotUnique
 from ..module_utils.rest_client import RestClient
+from ..module_utils.response_cache import DEFAULT_CACHE_TTLS
 from ..module_utils.nic import Nic, NicType
 from ..module_utils.disk import Disk
 from ..module_utils.node import Node
@@ -31,6 +35,8 @@ from ..module_utils.utils import (
     filter_results,
 )
 from ..module_utils.task_tag import TaskTag
+from ..module_utils.typed_classes import TypedTaskTag
+from ..module_utils.wait import VM_SHUTDOWN_BACKOFF, wait_until
 from ..module_utils import errors
 from ..module_utils.snapshot_schedule import SnapshotSchedule
 from ..module_utils.hypercore_version import HyperCoreVersion
@@ -106,6 +112,28 @@ REBOOT_LOOKUP = dict(
     machine_type=True,
 )
 
+# Max number of VirDomainBlockDevice create/update tasks running at the same time.
+MAX_CONCURRENT_DISK_TASKS = 4
+
+# Max number of VMs updated at the same time by ManageVMParams.set_vm_params_many.
+MAX_CONCURRENT_VM_TASKS = 8
+
+# Max number of clone tasks running at the same time, when vm_clone creates many clones.
+# HyperCore clones only a few VMs at the same time, additional clone tasks are queued.
+MAX_CONCURRENT_CLONE_TASKS = 4
+
+# HyperCore states in which a VM is not running anymore, after shutdown or stop.
+POWERED_OFF_STATES = ("SHUTOFF", "CRASHED")
+
+# vm_fleet looks up snapshot schedules by name for every VM,
+# so the schedules read by FleetSnapshot are cached too.
+FLEET_CACHE_TTLS = dict(
+    DEFAULT_CACHE_TTLS, **{"/rest/v1/VirDomainSnapshotSchedule": 60.0}
+)
+
+# vm_fleet applies changes to existing VMs the same way as the vm module.
+VM_MODULE_PATH = "scale_computing.hypercore.vm"
+
 
 class VmMachineType:
     # In table below is left side output from 'sc vmmachinetypes show' command,
@@ -297,6 +325,8 @@ class VM(PayloadMapper):
         # .power_state in [] and any(_did_nice_shutdown_work, _did_force_shutdown_work) and _was_start_tried
         self._was_reboot_tried = False
         self._was_reset_tried = False
+        # VMState which created this object, see VMState.vm()
+        self.vm_state: Optional[VMState] = None
 
     @property
     def nic_list(self):
@@ -346,7 +376,47 @@ class VM(PayloadMapper):
             query={"uuid": vm_dict["affinityStrategy"]["backupNodeUUID"]},
             rest_client=rest_client,
         )
+        snapshot_schedule = SnapshotSchedule.get_snapshot_schedule(
+            query={"uuid": vm_dict["snapshotScheduleUUID"]}, rest_client=rest_client
+        )
+        return cls._from_hypercore_resolved(
+            vm_dict, preferred_node, backup_node, snapshot_schedule
+        )
 
+    @classmethod
+    def from_hypercore_many(cls, vm_dicts, rest_client) -> List[VM]:
+        """
+        Same as from_hypercore, for a list of VirDomain records.
+        Nodes and snapshot schedules are read once and shared by all VMs,
+        so the number of requests does not depend on the number of VMs.
+        """
+        if len(vm_dicts) <= 1:
+            return [cls.from_hypercore(vm_dict, rest_client) for vm_dict in vm_dicts]
+        nodes = {
+            node_dict["uuid"]: Node.from_hypercore(node_dict)
+            for node_dict in rest_client.list_records("/rest/v1/Node")
+        }
+        snapshot_schedules = {
+            schedule_dict["uuid"]: SnapshotSchedule.from_hypercore(schedule_dict)
+            for schedule_dict in rest_client.list_records(
+                "/rest/v1/VirDomainSnapshotSchedule"
+            )
+        }
+        return [
+            cls._from_hypercore_resolved(
+                vm_dict,
+                nodes.get(vm_dict["affinityStrategy"]["preferredNodeUUID"]),
+                nodes.get(vm_dict["affinityStrategy"]["backupNodeUUID"]),
+                snapshot_schedules.get(vm_dict["snapshotScheduleUUID"]),
+            )
+            for vm_dict in vm_dicts
+        ]
+
+    @classmethod
+    def _from_hypercore_resolved(
+        cls, vm_dict, preferred_node, backup_node, snapshot_schedule
+    ) -> VM:
+        # preferred_node, backup_node and snapshot_schedule are already read from HyperCore.
         node_affinity = dict(
             strict_affinity=vm_dict["affinityStrategy"]["strictAffinity"],
             preferred_node=(
@@ -371,9 +441,6 @@ class VM(PayloadMapper):
             ),  # for vm_node_affinity diff check,
         )
 
-        snapshot_schedule = SnapshotSchedule.get_snapshot_schedule(
-            query={"uuid": vm_dict["snapshotScheduleUUID"]}, rest_client=rest_client
-        )
         machine_type = VmMachineType.from_hypercore_to_ansible(vm_dict)
         return cls(
             uuid=vm_dict["uuid"],  # No uuid when creating object from ansible
@@ -494,10 +561,7 @@ class VM(PayloadMapper):
         )
         if not record:
             return []
-        return [
-            cls.from_hypercore(vm_dict=virtual_machine, rest_client=rest_client)
-            for virtual_machine in record
-        ]
+        return cls.from_hypercore_many(record, rest_client)
 
     @classmethod
     def get_or_fail(cls, query, rest_client):  # if vm is not found, raise exception
@@ -507,9 +571,48 @@ class VM(PayloadMapper):
         )
         if not record:
             raise errors.VMNotFound(query)
+        return cls.from_hypercore_many(record, rest_client)
+
+    @staticmethod
+    def list_records_by_names_or_tags(
+        rest_client: RestClient,
+        names: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Reads VirDomain once, and returns records of VMs with the given names
+        (in the given order), or records of VMs which have all the given tags.
+        VMNotFound is raised if some of the named VMs do not exist,
+        ScaleComputingError if some of the names match more than one VM.
+        Empty names select no VM. Empty tags would select every VM, so they are rejected.
+        """
+        vm_dicts = rest_client.list_records("/rest/v1/VirDomain")
+        if names is not None:
+            by_name: Dict[str, List[Dict[str, Any]]] = {}
+            for vm_dict in vm_dicts:
+                by_name.setdefault(vm_dict["name"], []).append(vm_dict)
+            missing = [name for name in names if name not in by_name]
+            if missing:
+                raise errors.VMNotFound("vm_names={0}".format(",".join(missing)))
+            duplicated = [
+                name for name in dict.fromkeys(names) if len(by_name[name]) > 1
+            ]
+            if duplicated:
+                raise errors.ScaleComputingError(
+                    "Multiple VMs match vm_names={0}, VM names are not unique.".format(
+                        ",".join(duplicated)
+                    )
+                )
+            return [by_name[name][0] for name in dict.fromkeys(names)]
+        if not tags:
+            raise errors.ScaleComputingError(
+                "vm_tags must not be empty, it would select all VMs."
+            )
+        tag_set = set(tags)
         return [
-            cls.from_hypercore(vm_dict=virtual_machine, rest_client=rest_client)
-            for virtual_machine in record
+            vm_dict
+            for vm_dict in vm_dicts
+            if tag_set.issubset(vm_dict["tags"].split(","))
         ]
 
     @classmethod
@@ -524,22 +627,51 @@ class VM(PayloadMapper):
         With given dict from playbook, finds the existing vm by name from the HyperCore api and constructs object VM if
         the record exists. If there is no record with such name, None is returned.
         """
+        hypercore_dict = cls.get_record_by_name(
+            ansible_dict, rest_client, must_exist=must_exist, name_field=name_field
+        )
+        vm_from_hypercore = cls.from_hypercore(hypercore_dict, rest_client)
+        return vm_from_hypercore
+
+    @staticmethod
+    def get_record_by_name(
+        ansible_dict: Dict[Any, Any],
+        rest_client: RestClient,
+        must_exist: bool = False,
+        name_field: str = "vm_name",
+    ) -> Optional[Dict[Any, Any]]:
+        """
+        Same as get_by_name, but returns the VirDomain record.
+        """
         # name_field won't be equal to "vm_name" in case of updating the vm.
         # In that case, it's going to be equal to vm_name_new.
         query = get_query(
             ansible_dict, name_field, ansible_hypercore_map={name_field: "name"}
         )
-        hypercore_dict = rest_client.get_record(
+        return rest_client.get_record(
             "/rest/v1/VirDomain", query, must_exist=must_exist
         )
-        vm_from_hypercore = cls.from_hypercore(hypercore_dict, rest_client)
-        return vm_from_hypercore
 
     @classmethod
     def get_by_old_or_new_name(cls, ansible_dict, rest_client, must_exist=False):
-        vm_old_name = VM.get_by_name(ansible_dict, rest_client)
+        hypercore_dict = cls.get_record_by_old_or_new_name(
+            ansible_dict, rest_client, must_exist=must_exist
+        )
+        return cls.from_hypercore(hypercore_dict, rest_client)
+
+    @classmethod
+    def get_record_by_old_or_new_name(
+        cls,
+        ansible_dict: Dict[Any, Any],
+        rest_client: RestClient,
+        must_exist: bool = False,
+    ) -> Optional[Dict[Any, Any]]:
+        """
+        Same as get_by_old_or_new_name, but returns the VirDomain record.
+        """
+        vm_old_name = cls.get_record_by_name(ansible_dict, rest_client)
         vm_new_name = (
-            VM.get_by_name(ansible_dict, rest_client, name_field="vm_name_new")
+            cls.get_record_by_name(ansible_dict, rest_client, name_field="vm_name_new")
             if ansible_dict.get("vm_name_new") is not None
             else None
         )
@@ -712,14 +844,20 @@ class VM(PayloadMapper):
             )
             for nic in module.params[nic_key] or []
         ]
-        for nic in self.nic_list:
-            if nic.vlan not in ansible_nic_uuid_list:
-                self.do_shutdown_steps(module, rest_client)
-                response = rest_client.delete_record(
-                    endpoint="/rest/v1/VirDomainNetDevice/" + nic.uuid, check_mode=False
-                )
-                TaskTag.wait_task(rest_client, response)
-                changed = True
+        nics_to_delete = [
+            nic for nic in self.nic_list if nic.vlan not in ansible_nic_uuid_list
+        ]
+        if nics_to_delete:
+            self.do_shutdown_steps(module, rest_client)
+        # Deletes are independent, submit all of them and then wait for all of them.
+        task_tags = []
+        for nic in nics_to_delete:
+            response = rest_client.delete_record(
+                endpoint="/rest/v1/VirDomainNetDevice/" + nic.uuid, check_mode=False
+            )
+            task_tags.append(response)
+            changed = True
+        TaskTag.wait_tasks(rest_client, task_tags)
         return changed
 
     def export_vm(self, rest_client, ansible_dict):
@@ -752,7 +890,8 @@ class VM(PayloadMapper):
         data = VM.create_clone_vm_payload(
             ansible_dict["vm_name"],
             ansible_dict["tags"],
-            self.tags,
+            # Payload tags are appended to the list, source VM can be cloned many times.
+            list(self.tags or []),
             cloud_init_data,
             preserve_mac_address=ansible_dict["preserve_mac_address"],
             source_nics=self.nics,
@@ -989,9 +1128,7 @@ class VM(PayloadMapper):
                 "Force shutdown is not supported by this module."
             )
         # Get fresh VM data, in case vm_params changed power state.
-        vm_fresh_data = rest_client.get_record(
-            f"/rest/v1/VirDomain/{self.uuid}", must_exist=True
-        )
+        vm_fresh_data = self._get_fresh_record(rest_client)
         if vm_fresh_data["state"] in ["SHUTOFF", "SHUTDOWN"]:
             return True
         if module.params["force_reboot"] and self._was_nice_shutdown_tried:
@@ -1005,12 +1142,10 @@ class VM(PayloadMapper):
 
     def wait_shutdown(self, module, rest_client):
         # Sends a shutdown request and waits for VM to responde.
-        # Send GET request every 10 seconds.
+        # Polls VM state, first often, then every 10 seconds.
         # Returns True if successful, False if unsuccessful
         # Get fresh VM data, there is an error if VM is not running and shutdown request is sent.
-        vm_fresh_data = rest_client.get_record(
-            f"/rest/v1/VirDomain/{self.uuid}", must_exist=True
-        )
+        vm_fresh_data = self._get_fresh_record(rest_client)
         if vm_fresh_data["state"] in ["SHUTOFF", "SHUTDOWN"]:
             return True
         if (
@@ -1020,20 +1155,41 @@ class VM(PayloadMapper):
         ):
             self.update_vm_power_state(module, rest_client, "shutdown", False)
             shutdown_timeout = module.params["shutdown_timeout"]
-            start = time()
-            while 1:
-                vm = rest_client.get_record(
+
+            def poll():
+                # VM state is changed by guest OS, not by a HyperCore task.
+                vm = rest_client.poll_record(
                     f"/rest/v1/VirDomain/{self.uuid}", must_exist=True
                 )
-                current_time = time() - start
                 if vm["state"] in ["SHUTDOWN", "SHUTOFF"]:
-                    self._did_nice_shutdown_work = True
+                    if self.vm_state is not None:
+                        # The last polled record is the current VM state.
+                        self.vm_state.update(vm)
                     return True
-                if current_time >= shutdown_timeout:
-                    return False
-                sleep(10)
+                return None
+
+            try:
+                wait_until(
+                    poll,
+                    timeout=shutdown_timeout,
+                    backoff=VM_SHUTDOWN_BACKOFF,
+                    description=f"VM {self.name} shutdown",
+                )
+            except errors.ScaleTimeoutError:
+                return False
+            self._did_nice_shutdown_work = True
+            return True
         return False
 
+    def _get_fresh_record(self, rest_client):
+        # VM state can be changed by guest OS, so the record is always read again.
+        if self.vm_state is not None:
+            return self.vm_state.refresh()
+        rest_client.invalidate(f"/rest/v1/VirDomain/{self.uuid}")
+        return rest_client.get_record(
+            f"/rest/v1/VirDomain/{self.uuid}", must_exist=True
+        )
+
     def vm_power_up(self, module, rest_client):
         # Powers up a VM in case:
         #   - VM was shutdown during module execution or
@@ -1049,6 +1205,13 @@ class VM(PayloadMapper):
         # it is None if VM instance was created with from_hypercore().
         requested_power_action = module.params.get("power_state")
         if requested_power_action == "start":
+            # Do not start VM which is running. Guest OS could have shut down
+            # the VM since it was read, so the record is read again.
+            if (
+                self.vm_state is not None
+                and self.vm_state.refresh()["state"] == "RUNNING"
+            ):
+                return
             self.update_vm_power_state(module, rest_client, "start", False)
 
     def was_vm_shutdown(self) -> bool:
@@ -1092,6 +1255,114 @@ class VM(PayloadMapper):
             )
 
 
+class VMState:
+    """
+    Last known VirDomain record of one VM, shared by all steps of a module run.
+
+    Steps use VM objects returned by vm() instead of reading the VM again.
+    The record is re-read (by uuid) only when it is outdated - when a write
+    submitted with the same RestClient changed VirDomain (each write is waited for
+    with TaskTag before the VM is used again), or when refresh() is called,
+    because the guest OS can change VM power state.
+    Nodes and snapshot schedule of the VM are read once per run,
+    or are passed in by caller which already read them (see FleetSnapshot).
+    """
+
+    def __init__(
+        self,
+        rest_client: RestClient,
+        record: Dict[str, Any],
+        nodes: Optional[Dict[str, Optional[Node]]] = None,
+        snapshot_schedules: Optional[Dict[str, Optional[SnapshotSchedule]]] = None,
+    ):
+        self.rest_client = rest_client
+        self.uuid = record["uuid"]
+        self._record = record
+        self._writes = rest_client.writes("/rest/v1/VirDomain")
+        self._nodes: Dict[str, Optional[Node]] = dict(nodes or {})
+        self._snapshot_schedules: Dict[str, Optional[SnapshotSchedule]] = dict(
+            snapshot_schedules or {}
+        )
+
+    @classmethod
+    def get_by_name(
+        cls,
+        ansible_dict: Dict[Any, Any],
+        rest_client: RestClient,
+        must_exist: bool = False,
+        name_field: str = "vm_name",
+    ) -> Optional[VMState]:
+        record = VM.get_record_by_name(
+            ansible_dict, rest_client, must_exist=must_exist, name_field=name_field
+        )
+        return cls(rest_client, record) if record else None
+
+    @classmethod
+    def get_by_old_or_new_name(
+        cls,
+        ansible_dict: Dict[Any, Any],
+        rest_client: RestClient,
+        must_exist: bool = False,
+    ) -> Optional[VMState]:
+        record = VM.get_record_by_old_or_new_name(
+            ansible_dict, rest_client, must_exist=must_exist
+        )
+        return cls(rest_client, record) if record else None
+
+    @property
+    def record(self) -> Dict[str, Any]:
+        if self.rest_client.writes("/rest/v1/VirDomain") != self._writes:
+            return self.refresh()
+        return self._record
+
+    def refresh(self) -> Dict[str, Any]:
+        endpoint = f"/rest/v1/VirDomain/{self.uuid}"
+        writes = self.rest_client.writes(endpoint)
+        self.rest_client.invalidate(endpoint)
+        self._record = self.rest_client.get_record(endpoint, must_exist=True)
+        self._writes = writes
+        return self._record
+
+    def update(self, record: Dict[str, Any]) -> None:
+        # record is the current VM record, read by caller (like a polling loop).
+        self._record = copy.deepcopy(record)
+        self._writes = self.rest_client.writes("/rest/v1/VirDomain")
+
+    def vm(self) -> VM:
+        """
+        Returns a new VM object, built from the last known record.
+        """
+        record = self.record
+        affinity = record["affinityStrategy"]
+        vm = VM._from_hypercore_resolved(
+            record,
+            self._node(affinity["preferredNodeUUID"]),
+            self._node(affinity["backupNodeUUID"]),
+            self._snapshot_schedule(record["snapshotScheduleUUID"]),
+        )
+        vm.vm_state = self
+        return vm
+
+    def _node(self, uuid: str) -> Optional[Node]:
+        # Empty uuid means no node, no need to ask HyperCore.
+        if not uuid:
+            return None
+        if uuid not in self._nodes:
+            self._nodes[uuid] = Node.get_node(
+                query={"uuid": uuid}, rest_client=self.rest_client
+            )
+        return self._nodes[uuid]
+
+    def _snapshot_schedule(self, uuid: str) -> Optional[SnapshotSchedule]:
+        if not uuid:
+            return None
+        if uuid not in self._snapshot_schedules:
+            self._snapshot_schedules[uuid] = SnapshotSchedule.get_snapshot_schedule(
+                query={"uuid": uuid}, rest_client=self.rest_client
+            )
+        return self._snapshot_schedules[uuid]
+
+
 class ManageVMParams(VM):
     @staticmethod
     def _build_payload(module, rest_client):
@@ -1246,6 +1517,12 @@ class ManageVMParams(VM):
             )
         }
         vm = VM.get_or_fail(query, rest_client)[0]
+        return ManageVMParams._build_after_diff_from_vm(vm, module)
+
+    @staticmethod
+    def _build_after_diff_from_vm(vm, module):
+        # vm is read from HyperCore after the change.
+        after = {}
         if module.params["operating_system"]:
             after["operating_system"] = vm.operating_system
         if module.params["vm_name_new"]:
@@ -1304,11 +1581,17 @@ class ManageVMParams(VM):
             ) and vm._power_action not in ["stop", "stopped", "shutdown"]:
                 vm.do_shutdown_steps(module, rest_client)
 
+            if vm.vm_state is not None and not module.check_mode:
+                after = ManageVMParams._build_after_diff_from_vm(
+                    vm.vm_state.vm(), module
+                )
+            else:
+                after = ManageVMParams._build_after_diff(module, rest_client)
             return (
                 True,
                 dict(
                     before=ManageVMParams._build_before_diff(vm, module),
-                    after=ManageVMParams._build_after_diff(module, rest_client),
+                    after=after,
                 ),
                 changed_parameters,
             )
@@ -1319,6 +1602,88 @@ class ManageVMParams(VM):
                 changed_parameters,
             )
 
+    @classmethod
+    def set_vm_params_many(cls, module, rest_client, vms: List[VM]):
+        """
+        Same as set_vm_params followed by the VM power changes, for many VMs.
+        Changes are computed from the already read VMs. VMs which need a change
+        are updated concurrently, up to MAX_CONCURRENT_VM_TASKS VMs at the same time.
+        VirDomain is read once more at the end, to build the after diffs.
+
+        Returns a result dict per VM, in the order of vms.
+        Failed VMs have error set, the other VMs are processed regardless.
+        Diffs of failed VMs show what was changed before the failure.
+        """
+        results = []
+        to_update = []
+        for vm in vms:
+            changed, changed_parameters = cls._to_be_changed(vm, module, [])
+            cls._check_if_required_disks_are_present(module, vm, changed_parameters)
+            result = dict(
+                vm_name=vm.name,
+                uuid=vm.uuid,
+                changed=changed,
+                vm_rebooted=False,
+                diff=dict(before=None, after=None),
+                error=None,
+            )
+            results.append(result)
+            if changed:
+                to_update.append((vm, changed_parameters, result))
+        if not to_update:
+            return results
+
+        # The payload is the same for all VMs, snapshot schedule is looked up once.
+        payload = cls._build_payload(module, rest_client)
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_VM_TASKS) as executor:
+            futures = [
+                executor.submit(
+                    cls._update_vm, module, rest_client, vm, payload, changed_parameters
+                )
+                for vm, changed_parameters, result in to_update
+            ]
+        updated = {}
+        for future, (vm, changed_parameters, result) in zip(futures, to_update):
+            try:
+                future.result()
+            except errors.ScaleComputingError as ex:
+                result["error"] = str(ex)
+            result["vm_rebooted"] = vm.was_vm_rebooted()
+            result["diff"]["before"] = cls._build_before_diff(vm, module)
+            updated[vm.uuid] = result
+
+        if updated:
+            vm_dicts = [
+                vm_dict
+                for vm_dict in rest_client.list_records("/rest/v1/VirDomain")
+                if vm_dict["uuid"] in updated
+            ]
+            for vm in VM.from_hypercore_many(vm_dicts, rest_client):
+                updated[vm.uuid]["diff"]["after"] = cls._build_after_diff_from_vm(
+                    vm, module
+                )
+        return results
+
+    @classmethod
+    def _update_vm(cls, module, rest_client, vm, payload, changed_parameters):
+        # Steps of vm_params module for a single VM, called from a worker thread.
+        if payload:
+            endpoint = "{0}/{1}".format("/rest/v1/VirDomain", vm.uuid)
+            task_tag = rest_client.update_record(endpoint, payload, module.check_mode)
+            TaskTag.wait_task(rest_client, task_tag)
+        if cls._needs_reboot(module, changed_parameters) and vm._power_action not in [
+            "stop",
+            "stopped",
+            "shutdown",
+        ]:
+            vm.do_shutdown_steps(module, rest_client)
+        if module.params["power_state"] not in ["shutdown", "stop"]:
+            vm.vm_power_up(module, rest_client)
+        if changed_parameters.get("power_state"):
+            vm.update_vm_power_state(
+                module, rest_client, module.params["power_state"], True
+            )
+
     @classmethod
     def _check_if_required_disks_are_present(
         cls, module, vm, changed_parameters: dict[str, bool]
@@ -1363,28 +1728,204 @@ class ManageVMParams(VM):
                 )
 
 
+class ManageVMPower:
+    """
+    Power actions for many VMs, see vm_power module.
+
+    Actions are sent concurrently, up to module.params["concurrency"] VMs at the same time.
+    Shutdown and stop are then waited for in a single polling loop,
+    which reads VirDomain once per poll for all VMs.
+    A VM which does not shut down within shutdown_timeout is stopped, if force_stop is set.
+    """
+
+    @staticmethod
+    def _needs_action(power_action, vm_dict):
+        power_state = FROM_HYPERCORE_TO_ANSIBLE_POWER_STATE.get(vm_dict["state"])
+        if power_action in ["reboot", "reset"]:
+            # Only a running VM can be rebooted or reset.
+            return power_state == "started"
+        if power_action == "shutdown" and power_state == "shutdown":
+            # VM is already shutting down, it only needs to be waited for.
+            return False
+        return (
+            power_state
+            != FROM_ANSIBLE_POWER_ACTION_TO_ANSIBLE_POWER_STATE[power_action]
+        )
+
+    @staticmethod
+    def _send_actions(rest_client, vm_uuids, power_action):
+        task_tag = rest_client.create_record(
+            "/rest/v1/VirDomain/action",
+            [
+                dict(
+                    virDomainUUID=vm_uuid,
+                    actionType=FROM_ANSIBLE_TO_HYPERCORE_POWER_ACTION[power_action],
+                    cause="INTERNAL",
+                )
+                for vm_uuid in vm_uuids
+            ],
+            False,
+        )
+        TaskTag.wait_task(rest_client, task_tag)
+
+    @classmethod
+    def _send_action(cls, rest_client, vm_uuid, power_action):
+        # Called from a worker thread, returns time when the action was sent.
+        sent = monotonic()
+        cls._send_actions(rest_client, [vm_uuid], power_action)
+        return sent
+
+    @classmethod
+    def set_power_state_many(
+        cls, module, rest_client: RestClient, vm_dicts: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns a result dict per VM, in the order of vm_dicts.
+        Failed VMs have error set, the other VMs are processed regardless.
+        """
+        power_action = module.params["power_state"]
+        results = []
+        to_change = []
+        for vm_dict in vm_dicts:
+            power_state = FROM_HYPERCORE_TO_ANSIBLE_POWER_STATE.get(vm_dict["state"])
+            result = dict(
+                vm_name=vm_dict["name"],
+                uuid=vm_dict["uuid"],
+                changed=cls._needs_action(power_action, vm_dict),
+                forced=False,
+                power_state_before=power_state,
+                power_state=power_state,
+                duration=None,
+                error=None,
+            )
+            results.append(result)
+            if result["changed"]:
+                to_change.append(result)
+            elif power_action == "shutdown" and power_state == "shutdown":
+                to_change.append(result)
+        if module.check_mode or not to_change:
+            return results
+
+        # Time when the action was sent, by VM uuid.
+        sent = {}
+        to_send = [result for result in to_change if result["changed"]]
+        with ThreadPoolExecutor(max_workers=module.params["concurrency"]) as executor:
+            futures = [
+                executor.submit(
+                    cls._send_action, rest_client, result["uuid"], power_action
+                )
+                for result in to_send
+            ]
+        for future, result in zip(futures, to_send):
+            try:
+                sent[result["uuid"]] = future.result()
+            except errors.ScaleComputingError as ex:
+                result["error"] = str(ex)
+                continue
+            if power_action not in ["shutdown", "stop"]:
+                result["power_state"] = "started"
+                result["duration"] = round(monotonic() - sent[result["uuid"]], 3)
+
+        if power_action in ["shutdown", "stop"]:
+            now = monotonic()
+            waiting = {
+                result["uuid"]: result for result in to_change if not result["error"]
+            }
+            for vm_uuid in waiting:
+                sent.setdefault(vm_uuid, now)
+            cls._wait_powered_off(module, rest_client, waiting, sent)
+        return results
+
+    @classmethod
+    def _wait_powered_off(cls, module, rest_client, waiting, sent):
+        # waiting - results of VMs which are not powered off yet, by VM uuid.
+        shutdown_timeout = module.params["shutdown_timeout"]
+        deadlines = {vm_uuid: sent[vm_uuid] + shutdown_timeout for vm_uuid in waiting}
+
+        def poll():
+            # VM state is changed by guest OS, so VirDomain is read again.
+            rest_client.invalidate("/rest/v1/VirDomain")
+            states = {
+                vm_dict["uuid"]: vm_dict["state"]
+                for vm_dict in rest_client.list_records("/rest/v1/VirDomain")
+            }
+            now = monotonic()
+            expired = []
+            for vm_uuid, result in list(waiting.items()):
+                state = states.get(vm_uuid)
+                if state is None or state in POWERED_OFF_STATES:
+                    # A VM deleted in the meantime is not running either.
+                    result["power_state"] = FROM_HYPERCORE_TO_ANSIBLE_POWER_STATE.get(
+                        state, "stopped"
+                    )
+                    result["duration"] = round(now - sent[vm_uuid], 3)
+                    del waiting[vm_uuid]
+                    continue
+                result["power_state"] = FROM_HYPERCORE_TO_ANSIBLE_POWER_STATE.get(state)
+                if now < deadlines[vm_uuid]:
+                    continue
+                if result["forced"] or not module.params["force_stop"]:
+                    result["error"] = "did not power off within {0} seconds.".format(
+                        shutdown_timeout
+                    )
+                    del waiting[vm_uuid]
+                    continue
+                expired.append(vm_uuid)
+            if expired:
+                # Escalate to a forced stop, all expired VMs in a single request.
+                try:
+                    cls._send_actions(rest_client, expired, "stop")
+                except errors.ScaleComputingError as ex:
+                    for vm_uuid in expired:
+                        waiting.pop(vm_uuid)["error"] = str(ex)
+                now = monotonic()
+                for vm_uuid in expired:
+                    if vm_uuid in waiting:
+                        waiting[vm_uuid]["forced"] = True
+                        waiting[vm_uuid]["changed"] = True
+                        deadlines[vm_uuid] = now + shutdown_timeout
+            return True if not waiting else None
+
+        wait_until(
+            poll,
+            backoff=VM_SHUTDOWN_BACKOFF,
+            description="VMs powered off",
+        )
+
+
 class ManageVMDisks:
     @staticmethod
-    def get_vm_by_name(module, rest_client):
+    def get_vm_by_name(module, rest_client, vm=None):
         """
         Wrapps VM's method get_by_name. Additionally, it raises exception if vm isn't found
         Returns vm object and list of ansible disks (this combo is commonly used in this module).
+        If vm created by VMState is given, current VM is returned by its VMState.
         """
-        # If there's no VM with such name, error is raised automatically
-        vm = VM.get_by_old_or_new_name(module.params, rest_client, must_exist=True)
+        if vm is not None and vm.vm_state is not None:
+            vm = vm.vm_state.vm()
+        else:
+            # If there's no VM with such name, error is raised automatically
+            vm = VM.get_by_old_or_new_name(module.params, rest_client, must_exist=True)
         return vm, [disk.to_ansible() for disk in vm.disks]
 
-    @staticmethod
-    def _create_block_device(module, rest_client, vm, desired_disk):
+    @classmethod
+    def _create_block_device(cls, module, rest_client, vm, desired_disk):
         # vm is instance of VM, desired_disk is instance of Disk
+        task_tag = cls._submit_create_block_device(
+            module, rest_client, vm, desired_disk
+        )
+        TaskTag.wait_task(rest_client, task_tag, module.check_mode)
+        return task_tag["createdUUID"]
+
+    @staticmethod
+    def _submit_create_block_device(module, rest_client, vm, desired_disk):
+        # Sends the create request, returns task_tag without waiting for it.
         payload = desired_disk.post_and_patch_payload(vm, None)
-        task_tag = rest_client.create_record(
+        return rest_client.create_record(
             "/rest/v1/VirDomainBlockDevice",
             payload,
             module.check_mode,
         )
-        TaskTag.wait_task(rest_client, task_tag, module.check_mode)
-        return task_tag["createdUUID"]
 
     @staticmethod
     def iso_image_management(module, rest_client, iso, uuid, attach):
@@ -1401,24 +1942,76 @@ class ManageVMDisks:
         # Disk's uuid is stored in task_tag if relevant in the future.
         TaskTag.wait_task(rest_client, task_tag, module.check_mode)
 
-    @staticmethod
+    @classmethod
     def _update_block_device(
-        module, rest_client, desired_disk, existing_disk: Disk, vm
+        cls, module, rest_client, desired_disk, existing_disk: Disk, vm
     ):
-        payload = desired_disk.post_and_patch_payload(vm, existing_disk)
         if existing_disk.needs_reboot("update", desired_disk):
             vm.do_shutdown_steps(module, rest_client)
-        task_tag = rest_client.update_record(
+        task_tag = cls._submit_update_block_device(
+            module, rest_client, desired_disk, existing_disk, vm
+        )
+        TaskTag.wait_task(rest_client, task_tag, module.check_mode)
+
+    @staticmethod
+    def _submit_update_block_device(
+        module, rest_client, desired_disk, existing_disk: Disk, vm
+    ):
+        # Sends the update request, returns task_tag without waiting for it.
+        # VM must be already shutdown if update needs reboot.
+        payload = desired_disk.post_and_patch_payload(vm, existing_disk)
+        return rest_client.update_record(
             "{0}/{1}".format("/rest/v1/VirDomainBlockDevice", existing_disk.uuid),
             payload,
             module.check_mode,
         )
-        TaskTag.wait_task(rest_client, task_tag, module.check_mode)
+
+    @classmethod
+    def _apply_block_device_changes(
+        cls, module, rest_client, vm, disks_to_create, disks_to_update
+    ):
+        """
+        Creates and updates VirDomainBlockDevices concurrently.
+        The operations are independent, so up to MAX_CONCURRENT_DISK_TASKS requests
+        are sent, and then all their TaskTags are waited for together.
+
+        disks_to_create is list of desired Disk,
+        disks_to_update is list of (desired Disk, existing Disk) tuples.
+        """
+        # Shutdown once before the first update that requires it,
+        # instead of shutting down in the middle of concurrent tasks.
+        if any(
+            existing_disk.needs_reboot("update", desired_disk)
+            for desired_disk, existing_disk in disks_to_update
+        ):
+            vm.do_shutdown_steps(module, rest_client)
+        submits = [
+            partial(
+                cls._submit_create_block_device, module, rest_client, vm, desired_disk
+            )
+            for desired_disk in disks_to_create
+        ] + [
+            partial(
+                cls._submit_update_block_device,
+                module,
+                rest_client,
+                desired_disk,
+                existing_disk,
+                vm,
+            )
+            for desired_disk, existing_disk in disks_to_update
+        ]
+        while submits:
+            batch = submits[:MAX_CONCURRENT_DISK_TASKS]
+            submits = submits[MAX_CONCURRENT_DISK_TASKS:]
+            task_tags = [submit() for submit in batch]
+            TaskTag.wait_tasks(rest_client, task_tags, module.check_mode)
 
     @classmethod
     def _delete_not_used_disks(cls, module, rest_client, vm, changed, disk_key):
-        updated_vm, updated_ansible_disks = cls.get_vm_by_name(module, rest_client)
+        updated_vm, updated_ansible_disks = cls.get_vm_by_name(module, rest_client, vm)
         # Ensure all disk that aren't listed in items don't exist in VM (ensure absent)
+        disks_to_delete = []
         for updated_ansible_disk in updated_ansible_disks:
             existing_disk = Disk.from_ansible(updated_ansible_disk)
             to_delete = True
@@ -1436,43 +2029,54 @@ class ManageVMDisks:
                 ):
                     to_delete = False
             if to_delete:
-                # HyperCore is sometimes able to delete disk on running VM,
-                # but sometimes we need to shutdown VM to remove disk.
-                # It is hard to know in advance if shutdown is required.
-                # We try to remove disk without shutdown, if delete fails, we shutdown VM and try again.
-                if existing_disk.needs_reboot("delete"):
-                    vm.do_shutdown_steps(module, rest_client)
-                task_tag = rest_client.delete_record(
-                    "{0}/{1}".format(
-                        "/rest/v1/VirDomainBlockDevice", existing_disk.uuid
-                    ),
-                    module.check_mode,
-                )
-                try:
-                    TaskTag.wait_task(rest_client, task_tag, module.check_mode)
-                except errors.TaskTagError as ex:
-                    # Delete failed, maybe because VM was running and disk was in use.
-                    # If VM is running, shutdown VM and retry delete.
-                    if ex.task_status_state != "ERROR":
-                        raise
-                    if not cls._disk_remove_failed_because_vm_running(ex.task_status):
-                        raise
-                    vm_fresh_data = rest_client.get_record(
-                        f"/rest/v1/VirDomain/{vm.uuid}", must_exist=True
-                    )
-                    if vm_fresh_data["state"] != "RUNNING":
-                        raise
-                    # shutdown and retry remove
-                    vm.do_shutdown_steps(module, rest_client)
-                    task_tag = rest_client.delete_record(
-                        "{0}/{1}".format(
-                            "/rest/v1/VirDomainBlockDevice", existing_disk.uuid
-                        ),
-                        module.check_mode,
-                    )
-                    TaskTag.wait_task(rest_client, task_tag, module.check_mode)
-                changed = True
-        return changed
+                disks_to_delete.append(existing_disk)
+        if not disks_to_delete:
+            return changed
+
+        # HyperCore is sometimes able to delete disk on running VM,
+        # but sometimes we need to shutdown VM to remove disk.
+        # It is hard to know in advance if shutdown is required.
+        # We try to remove disk without shutdown, if delete fails, we shutdown VM and try again.
+        if any(disk.needs_reboot("delete") for disk in disks_to_delete):
+            vm.do_shutdown_steps(module, rest_client)
+        # Deletes are independent, submit all of them and then wait for all of them.
+        task_tags = [
+            cls._delete_block_device(module, rest_client, disk)
+            for disk in disks_to_delete
+        ]
+        try:
+            TaskTag.wait_tasks(rest_client, task_tags, module.check_mode)
+        except errors.TaskTagError as ex:
+            # Delete failed, maybe because VM was running and disk was in use.
+            # If VM is running, shutdown VM and retry delete.
+            if ex.task_status_state != "ERROR":
+                raise
+            if not cls._disk_remove_failed_because_vm_running(ex.task_status):
+                raise
+            vm_fresh_data = rest_client.get_record(
+                f"/rest/v1/VirDomain/{vm.uuid}", must_exist=True
+            )
+            if vm_fresh_data["state"] != "RUNNING":
+                raise
+            # shutdown and retry remove of disks that still exist
+            vm.do_shutdown_steps(module, rest_client)
+            remaining_uuids = [
+                disk["uuid"] for disk in vm_fresh_data.get("blockDevs", [])
+            ]
+            task_tags = [
+                cls._delete_block_device(module, rest_client, disk)
+                for disk in disks_to_delete
+                if disk.uuid in remaining_uuids
+            ]
+            TaskTag.wait_tasks(rest_client, task_tags, module.check_mode)
+        return True
+
+    @staticmethod
+    def _delete_block_device(module, rest_client, existing_disk):
+        return rest_client.delete_record(
+            "{0}/{1}".format("/rest/v1/VirDomainBlockDevice", existing_disk.uuid),
+            module.check_mode,
+        )
 
     @staticmethod
     def _disk_remove_failed_because_vm_running(task_status: Dict):
@@ -1510,6 +2114,51 @@ class ManageVMDisks:
             TaskTag.wait_task(rest_client, task_tag, module.check_mode)
         return True, [], dict(before=disks_before, after=[]), False
 
+    @classmethod
+    def _ensure_cdrom(
+        cls,
+        module,
+        rest_client,
+        vm,
+        ansible_desired_disk,
+        ansible_existing_disk,
+        desired_disk,
+    ):
+        # Returns True if CD-ROM or attached ISO was changed.
+        changed = False
+        if ansible_existing_disk:
+            if ansible_existing_disk["iso_name"] == ansible_desired_disk["iso_name"]:
+                return False  # CD-ROM with such iso_name already exists
+            existing_disk = Disk.from_ansible(ansible_existing_disk)
+            uuid = existing_disk.uuid
+        else:
+            # Create new ide_cdrom disk
+            # size is not relevant when creating CD-ROM -->
+            # https://github.com/ScaleComputing/HyperCoreAnsibleCollection/issues/11
+            desired_disk.size = 0
+            uuid = cls._create_block_device(module, rest_client, vm, desired_disk)
+            changed = True
+        # Attach ISO image
+        # If ISO image's name is specified, it's assumed you want to attach ISO image
+        name = ansible_desired_disk["iso_name"]
+        if name:  # Not creating empty CD-ROM without attaching anything
+            iso = ISO.get_by_name(dict(name=name), rest_client, must_exist=True)
+            cls.iso_image_management(module, rest_client, iso, uuid, attach=True)
+            changed = True
+        else:
+            # Empty CD-ROM is requested. Detach ISO if needed.
+            if ansible_existing_disk:
+                name = ansible_existing_disk["iso_name"]  #
+                existing_iso = ISO.get_by_name(
+                    dict(name=name), rest_client, must_exist=False
+                )
+                if existing_iso:
+                    cls.iso_image_management(
+                        module, rest_client, existing_iso, uuid, attach=False
+                    )
+                    changed = True
+        return changed
+
     @classmethod
     def ensure_present_or_set(cls, module, rest_client, module_path, vm_before: VM):
         # At the moment, this method is called in modules vm_disk and vm
@@ -1527,6 +2176,12 @@ class ManageVMDisks:
             return cls._force_remove_all_disks(
                 module, rest_client, vm_before, disks_before
             )
+        # Plan the changes first - ide_cdrom disks are processed one by one,
+        # as ISO can be attached only after CD-ROM is created.
+        # Other disks are created/updated concurrently.
+        disks_to_create = []
+        disks_to_update = []
+        cdroms = []
         for ansible_desired_disk in module.params[disk_key]:
             # For the given VM, disk can be uniquely identified with disk_slot and type or
             # just name, if not empty string
@@ -1543,44 +2198,9 @@ class ManageVMDisks:
                     "Disk size can only be enlarged, never downsized."
                 )
             if ansible_desired_disk["type"] == "ide_cdrom":
-                if ansible_existing_disk:
-                    if (
-                        ansible_existing_disk["iso_name"]
-                        == ansible_desired_disk["iso_name"]
-                    ):
-                        continue  # CD-ROM with such iso_name already exists
-                    existing_disk = Disk.from_ansible(ansible_existing_disk)
-                    uuid = existing_disk.uuid
-                else:
-                    # Create new ide_cdrom disk
-                    # size is not relevant when creating CD-ROM -->
-                    # https://github.com/ScaleComputing/HyperCoreAnsibleCollection/issues/11
-                    desired_disk.size = 0
-                    uuid = cls._create_block_device(
-                        module, rest_client, vm_before, desired_disk
-                    )
-                    changed = True
-                # Attach ISO image
-                # If ISO image's name is specified, it's assumed you want to attach ISO image
-                name = ansible_desired_disk["iso_name"]
-                if name:  # Not creating empty CD-ROM without attaching anything
-                    iso = ISO.get_by_name(dict(name=name), rest_client, must_exist=True)
-                    cls.iso_image_management(
-                        module, rest_client, iso, uuid, attach=True
-                    )
-                    changed = True
-                else:
-                    # Empty CD-ROM is requested. Detach ISO if needed.
-                    if ansible_existing_disk:
-                        name = ansible_existing_disk["iso_name"]  #
-                        existing_iso = ISO.get_by_name(
-                            dict(name=name), rest_client, must_exist=False
-                        )
-                        if existing_iso:
-                            cls.iso_image_management(
-                                module, rest_client, existing_iso, uuid, attach=False
-                            )
-                            changed = True
+                cdroms.append(
+                    (ansible_desired_disk, ansible_existing_disk, desired_disk)
+                )
             else:
                 if ansible_existing_disk:
                     existing_disk = Disk.from_ansible(ansible_existing_disk)
@@ -1604,14 +2224,26 @@ class ManageVMDisks:
                         # There's nothing to do - all properties are already set the way we want them to be
                         continue
 
-                    cls._update_block_device(
-                        module, rest_client, desired_disk, existing_disk, vm_before
-                    )
+                    disks_to_update.append((desired_disk, existing_disk))
                 else:
-                    cls._create_block_device(
-                        module, rest_client, vm_before, desired_disk
-                    )
-                changed = True
+                    disks_to_create.append(desired_disk)
+        if disks_to_create or disks_to_update:
+            cls._apply_block_device_changes(
+                module, rest_client, vm_before, disks_to_create, disks_to_update
+            )
+            changed = True
+        for ansible_desired_disk, ansible_existing_disk, desired_disk in cdroms:
+            changed = (
+                cls._ensure_cdrom(
+                    module,
+                    rest_client,
+                    vm_before,
+                    ansible_desired_disk,
+                    ansible_existing_disk,
+                    desired_disk,
+                )
+                or changed
+            )
         if module.params["state"] == "set" or not called_from_vm_disk:
             changed = cls._delete_not_used_disks(
                 module, rest_client, vm_before, changed, disk_key
@@ -1799,9 +2431,12 @@ class ManageVMNics(Nic):
         # If the only change is to delete a NIC, then
         # the vm_before would not know VM was shutdown and reboot is needed.
         # The delete_unused_nics_to_hypercore_vm() must get updated VLANs.
-        updated_virtual_machine_TEMP = VM.get_by_old_or_new_name(
-            module.params, rest_client=rest_client
-        )
+        if vm_before.vm_state is not None:
+            updated_virtual_machine_TEMP = vm_before.vm_state.vm()
+        else:
+            updated_virtual_machine_TEMP = VM.get_by_old_or_new_name(
+                module.params, rest_client=rest_client
+            )
         updated_virtual_machine = vm_before
         updated_virtual_machine.nics = updated_virtual_machine_TEMP.nics
         del updated_virtual_machine_TEMP
@@ -1820,3 +2455,439 @@ class ManageVMNics(Nic):
                 dict(before=before, after=after),
             )
         return changed
+
+
+class FleetVM:
+    """
+    One VM of vm_fleet - desired spec, plan and result.
+    Stands in for AnsibleModule of the vm module, so code shared with
+    the vm module (ManageVMParams, ManageVMDisks, ...) can be used unchanged.
+    """
+
+    def __init__(self, module, vm_spec: Dict[str, Any]):
+        self._module = module
+        self.params = dict(
+            vm_spec,
+            vm_name_new=None,
+            force_reboot=module.params["force_reboot"],
+            shutdown_timeout=module.params["shutdown_timeout"],
+        )
+        self.check_mode = module.check_mode
+        # VirDomain record from FleetSnapshot, empty if VM does not exist.
+        self.record: Dict[str, Any] = {}
+        self.vm_state: Optional[VMState] = None
+        self.result: Dict[str, Any] = dict(
+            vm_name=vm_spec["vm_name"],
+            action="none",
+            changes=[],
+            changed=False,
+            vm_rebooted=False,
+            error=None,
+        )
+
+    @property
+    def vm_name(self) -> str:
+        return str(self.params["vm_name"])
+
+    def warn(self, warning: str) -> None:
+        self._module.warn(f"VM {self.vm_name}: {warning}")
+
+    def fail_json(self, msg: str, **kwargs: Any) -> None:
+        # A failed VM must not end processing of the other VMs.
+        raise errors.ScaleComputingError(msg)
+
+
+class FleetSnapshot:
+    """
+    VirDomain records, read once and shared by all VMs of vm_fleet.
+    Nodes and snapshot schedules are read once, when the first existing VM is needed.
+    ISOs are read when the first ISO is needed, and are then served by ResponseCache.
+    """
+
+    def __init__(self, rest_client: RestClient):
+        self.rest_client = rest_client
+        self._records: Dict[str, List[Dict[str, Any]]] = {}
+        for record in rest_client.list_records("/rest/v1/VirDomain"):
+            self._records.setdefault(record["name"], []).append(record)
+        self._nodes: Optional[Dict[str, Optional[Node]]] = None
+        self._snapshot_schedules: Optional[Dict[str, Optional[SnapshotSchedule]]] = None
+
+    def record(self, vm_name: str) -> Optional[Dict[str, Any]]:
+        records = self._records.get(vm_name, [])
+        if len(records) > 1:
+            raise errors.ScaleComputingError(
+                f"There are {len(records)} VMs with name {vm_name}."
+            )
+        return records[0] if records else None
+
+    def vm_state(self, record: Dict[str, Any]) -> VMState:
+        if self._nodes is None or self._snapshot_schedules is None:
+            self._nodes = {
+                node_dict["uuid"]: Node.from_hypercore(node_dict)
+                for node_dict in self.rest_client.list_records("/rest/v1/Node")
+            }
+            self._snapshot_schedules = {
+                schedule_dict["uuid"]: SnapshotSchedule.from_hypercore(schedule_dict)
+                for schedule_dict in self.rest_client.list_records(
+                    "/rest/v1/VirDomainSnapshotSchedule"
+                )
+            }
+        return VMState(self.rest_client, record, self._nodes, self._snapshot_schedules)
+
+
+class ManageVMFleet:
+    """
+    Reconciles many VMs with their desired specs (vm_fleet module).
+
+    The plan is computed from one FleetSnapshot.
+    Then VMs are deleted, created and updated, in this order.
+    Requests for different VMs are sent concurrently. Delete and create tasks
+    are waited for in batches of concurrency VMs (see TaskTag.submit_and_wait),
+    so a failed task is attributed to its VM.
+    """
+
+    @classmethod
+    def reconcile(
+        cls, module, rest_client: RestClient
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+        """
+        Returns a result dict per VM, in the order of module.params["vms"],
+        and the plan summary - VM names by action.
+        Failed VMs have error set, the other VMs are processed regardless.
+        """
+        snapshot = FleetSnapshot(rest_client)
+        fleet = cls.plan(module, rest_client, snapshot)
+        if not module.check_mode:
+            cls._delete_vms(module, rest_client, cls._planned(fleet, "delete"))
+            cls._create_vms(
+                module, rest_client, snapshot, cls._planned(fleet, "create")
+            )
+            cls._update_vms(module, rest_client, cls._planned(fleet, "update"))
+        results = [fleet_vm.result for fleet_vm in fleet]
+        summary: Dict[str, List[str]] = dict(
+            create=[], update=[], delete=[], unchanged=[], failed=[]
+        )
+        for result in results:
+            action = "unchanged" if result["action"] == "none" else result["action"]
+            summary[action].append(result["vm_name"])
+            if result["error"]:
+                summary["failed"].append(result["vm_name"])
+        return results, summary
+
+    @classmethod
+    def plan(
+        cls, module, rest_client: RestClient, snapshot: FleetSnapshot
+    ) -> List[FleetVM]:
+        vm_names = [vm_spec["vm_name"] for vm_spec in module.params["vms"]]
+        duplicated = sorted(
+            set(vm_name for vm_name in vm_names if vm_names.count(vm_name) > 1)
+        )
+        if duplicated:
+            raise errors.ScaleComputingError(
+                f"VM names must be unique, duplicated names: {', '.join(duplicated)}."
+            )
+        hcversion = HyperCoreVersion(rest_client)
+        fleet = [FleetVM(module, vm_spec) for vm_spec in module.params["vms"]]
+        for fleet_vm in fleet:
+            try:
+                cls._plan_vm(fleet_vm, snapshot, hcversion)
+            except errors.ScaleComputingError as ex:
+                fleet_vm.result["error"] = str(ex)
+        return fleet
+
+    @classmethod
+    def _plan_vm(
+        cls, fleet_vm: FleetVM, snapshot: FleetSnapshot, hcversion: HyperCoreVersion
+    ) -> None:
+        params = fleet_vm.params
+        fleet_vm.record = snapshot.record(fleet_vm.vm_name) or {}
+        if params["state"] == "absent":
+            if fleet_vm.record:
+                fleet_vm.result["action"] = "delete"
+            return
+        machine_type = params["machine_type"]
+        if machine_type and not VmMachineType.from_ansible_to_hypercore(
+            machine_type, hcversion
+        ):
+            raise errors.ScaleComputingError(
+                f"machine_type={machine_type} is not supported on HyperCore version {hcversion.version}."
+            )
+        compute_params_disk_slot(fleet_vm, "disks")
+        if not fleet_vm.record:
+            fleet_vm.result["action"] = "create"
+            return
+        fleet_vm.vm_state = snapshot.vm_state(fleet_vm.record)
+        changes = cls._changes(fleet_vm, fleet_vm.vm_state.vm())
+        if changes:
+            fleet_vm.result["action"] = "update"
+            fleet_vm.result["changes"] = changes
+
+    @classmethod
+    def _changes(cls, fleet_vm: FleetVM, vm: VM) -> List[str]:
+        # Names of params which differ from the existing VM, no requests are sent.
+        params = fleet_vm.params
+        changed, changed_parameters = ManageVMParams._to_be_changed(vm, fleet_vm, [])
+        changes = [name for name, value in changed_parameters.items() if value]
+        if cls._disks_changed(params["disks"] or [], vm):
+            changes.append("disks")
+        if cls._nics_changed(params["nics"] or [], vm):
+            changes.append("nics")
+        if (
+            params["boot_devices"] is not None
+            and vm.set_boot_devices_order(params["boot_devices"])
+            != vm.get_boot_device_order()
+        ):
+            changes.append("boot_devices")
+        return changes
+
+    @staticmethod
+    def _disks_changed(desired_disks: List[Dict[str, Any]], vm: VM) -> bool:
+        # Same comparison as ManageVMDisks.ensure_present_or_set.
+        for ansible_desired_disk in desired_disks:
+            ansible_existing_disk = vm.get_specific_disk(
+                filter_dict(ansible_desired_disk, "disk_slot", "type")
+            )
+            if not ansible_existing_disk:
+                return True
+            if ansible_desired_disk["type"] == "ide_cdrom":
+                if (
+                    ansible_existing_disk["iso_name"]
+                    != ansible_desired_disk["iso_name"]
+                ):
+                    return True
+                continue
+            ansible_desired_disk_filtered = {
+                k: v
+                for k, v in Disk.from_ansible(ansible_desired_disk).to_ansible().items()
+                if v is not None
+            }
+            if ansible_existing_disk["type"] == "nvram":
+                ansible_desired_disk_filtered["size"] = ansible_existing_disk["size"]
+            if not is_superset(ansible_existing_disk, ansible_desired_disk_filtered):
+                return True
+        # Disks which are not listed are removed, see ManageVMDisks._delete_not_used_disks.
+        desired_slots = [(disk["type"], disk["disk_slot"]) for disk in desired_disks]
+        return any(
+            (disk.type, disk.slot) not in desired_slots
+            and not (
+                disk.name and ("cloud-init" in disk.name or "guest-tools" in disk.name)
+            )
+            for disk in vm.disks
+        )
+
+    @staticmethod
+    def _nics_changed(desired_nics: List[Dict[str, Any]], vm: VM) -> bool:
+        # Same comparison as ManageVMNics.ensure_present_or_set.
+        for ansible_desired_nic in desired_nics:
+            desired_nic = Nic.from_ansible(ansible_data=ansible_desired_nic)
+            existing_nic, existing_nic_with_new = vm.find_nic(
+                vlan=desired_nic.vlan, mac=desired_nic.mac
+            )
+            if not existing_nic or Nic.is_update_needed(existing_nic, desired_nic):
+                return True
+        desired_vlans = [nic["vlan"] for nic in desired_nics]
+        return any(nic.vlan not in desired_vlans for nic in vm.nics)
+
+    @staticmethod
+    def _planned(fleet: List[FleetVM], action: str) -> List[FleetVM]:
+        return [
+            fleet_vm
+            for fleet_vm in fleet
+            if fleet_vm.result["action"] == action and not fleet_vm.result["error"]
+        ]
+
+    @staticmethod
+    def _run_concurrently(
+        module, fleet: List[FleetVM], func: Callable[[FleetVM], Any]
+    ) -> List[Tuple[FleetVM, Any]]:
+        # Returns (fleet_vm, return value) of VMs where func succeeded.
+        with ThreadPoolExecutor(max_workers=module.params["concurrency"]) as executor:
+            futures = [executor.submit(func, fleet_vm) for fleet_vm in fleet]
+        succeeded = []
+        for future, fleet_vm in zip(futures, fleet):
+            try:
+                succeeded.append((fleet_vm, future.result()))
+            except Exception as ex:
+                fleet_vm.result["error"] = str(ex)
+        return succeeded
+
+    @staticmethod
+    def _submit_and_wait(
+        module,
+        rest_client: RestClient,
+        fleet: List[FleetVM],
+        submit: Callable[[FleetVM], Optional[TypedTaskTag]],
+    ) -> List[FleetVM]:
+        # Returns VMs where submit and its task succeeded, error is set on the other VMs.
+        task_errors = TaskTag.submit_and_wait(
+            rest_client, submit, fleet, module.params["concurrency"]
+        )
+        succeeded = []
+        for fleet_vm, error in zip(fleet, task_errors):
+            if error:
+                fleet_vm.result["error"] = str(error)
+            else:
+                succeeded.append(fleet_vm)
+        return succeeded
+
+    @classmethod
+    def _delete_vms(cls, module, rest_client: RestClient, fleet: List[FleetVM]) -> None:
+        if not fleet:
+            return
+        # Running VMs are stopped first, all with a single request.
+        running = [
+            fleet_vm
+            for fleet_vm in fleet
+            if fleet_vm.record["state"] not in POWERED_OFF_STATES
+        ]
+        if running:
+            try:
+                ManageVMPower._send_actions(
+                    rest_client,
+                    [fleet_vm.record["uuid"] for fleet_vm in running],
+                    "stop",
+                )
+            except errors.ScaleComputingError as ex:
+                for fleet_vm in running:
+                    fleet_vm.result["error"] = str(ex)
+                fleet = [fleet_vm for fleet_vm in fleet if fleet_vm not in running]
+        deleted = cls._submit_and_wait(
+            module,
+            rest_client,
+            fleet,
+            lambda fleet_vm: rest_client.delete_record(
+                f"/rest/v1/VirDomain/{fleet_vm.record['uuid']}", False
+            ),
+        )
+        for fleet_vm in deleted:
+            fleet_vm.result["changed"] = True
+
+    @classmethod
+    def _create_vms(
+        cls,
+        module,
+        rest_client: RestClient,
+        snapshot: FleetSnapshot,
+        fleet: List[FleetVM],
+    ) -> None:
+        if not fleet:
+            return
+        # Payloads are built before the first VM is created,
+        # while ISOs are still served by the response cache.
+        payloads = {}
+        for fleet_vm in fleet:
+            new_vm = VM.from_ansible(fleet_vm.params)
+            try:
+                new_vm.check_vm_before_create()
+                payloads[fleet_vm.vm_name] = new_vm.post_vm_payload(
+                    rest_client, fleet_vm.params
+                )
+            except errors.ScaleComputingError as ex:
+                fleet_vm.result["error"] = str(ex)
+        submitted = [fleet_vm for fleet_vm in fleet if fleet_vm.vm_name in payloads]
+        succeeded = cls._submit_and_wait(
+            module,
+            rest_client,
+            submitted,
+            lambda fleet_vm: rest_client.create_record(
+                "/rest/v1/VirDomain", payloads[fleet_vm.vm_name], False
+            ),
+        )
+        records = {
+            vm_dict["name"]: vm_dict
+            for vm_dict in rest_client.list_records("/rest/v1/VirDomain")
+        }
+        created = []
+        for fleet_vm in submitted:
+            record = records.get(fleet_vm.vm_name)
+            # A failed create task might still leave the VM behind.
+            fleet_vm.result["changed"] = record is not None
+            if fleet_vm not in succeeded:
+                continue
+            if record is None:
+                fleet_vm.result["error"] = "VM was not created."
+                continue
+            fleet_vm.vm_state = snapshot.vm_state(record)
+            created.append(fleet_vm)
+        cls._run_concurrently(
+            module,
+            [
+                fleet_vm
+                for fleet_vm in created
+                if fleet_vm.params["boot_devices"] is not None
+            ],
+            partial(cls._set_boot_order, rest_client),
+        )
+        # New VMs are powered off, VMs to start are started with a single request.
+        to_start = [
+            fleet_vm
+            for fleet_vm in created
+            if fleet_vm.params["power_state"] == "start"
+            and not fleet_vm.result["error"]
+        ]
+        if to_start:
+            try:
+                ManageVMPower._send_actions(
+                    rest_client,
+                    [fleet_vm.vm_state.uuid for fleet_vm in to_start],
+                    "start",
+                )
+            except errors.ScaleComputingError as ex:
+                for fleet_vm in to_start:
+                    fleet_vm.result["error"] = str(ex)
+
+    @staticmethod
+    def _set_boot_order(rest_client: RestClient, fleet_vm: FleetVM) -> None:
+        vm = fleet_vm.vm_state.vm()
+        vm.set_boot_devices(
+            fleet_vm.params["boot_devices"],
+            fleet_vm,
+            rest_client,
+            vm.get_boot_device_order(),
+        )
+
+    @classmethod
+    def _update_vms(cls, module, rest_client: RestClient, fleet: List[FleetVM]) -> None:
+        for fleet_vm, changed in cls._run_concurrently(
+            module, fleet, partial(cls._update_vm, rest_client)
+        ):
+            fleet_vm.result["changed"] = changed
+
+    @staticmethod
+    def _update_vm(rest_client: RestClient, fleet_vm: FleetVM) -> bool:
+        # Same steps as for an existing VM in the vm module.
+        vm = fleet_vm.vm_state.vm()
+        existing_boot_order = vm.get_boot_device_order()
+        # machineType needs to be set first, next nvram/vtpm disk can be added.
+        changed_params_1, diff, changed_parameters = ManageVMParams.set_vm_params(
+            fleet_vm, rest_client, vm, ["machine_type"]
+        )
+        changed_disks = ManageVMDisks.ensure_present_or_set(
+            fleet_vm, rest_client, VM_MODULE_PATH, vm
+        )
+        changed_nics = ManageVMNics.ensure_present_or_set(
+            fleet_vm, rest_client, VM_MODULE_PATH, vm
+        )
+        changed_order = False
+        if fleet_vm.params["boot_devices"] is not None:
+            changed_order = vm.set_boot_devices(
+                fleet_vm.params["boot_devices"],
+                fleet_vm,
+                rest_client,
+                existing_boot_order,
+            )
+        # Boot order cannot be set when VM is running, so params are set last.
+        changed_params_2, diff, changed_parameters = ManageVMParams.set_vm_params(
+            fleet_vm, rest_client, vm, []
+        )
+        vm.vm_power_up(fleet_vm, rest_client)
+        fleet_vm.result["vm_rebooted"] = vm.was_vm_rebooted()
+        return any(
+            (
+                changed_params_1,
+                changed_disks,
+                changed_nics,
+                changed_order,
+                changed_params_2,
+            )
+        )
@@ -21,8 +21,9 @@ from ..module_utils.typed_classes import (
     TypedVMSnapshotToAnsible,
     TypedVMSnapshotFromAnsible,
     TypedTaskTag,
+    TypedFilterStatsToAnsible,
 )
-from typing import List, Any, Dict, Optional
+from typing import List, Any, Dict, Optional, Tuple
 import time
 import datetime
 
@@ -251,42 +252,57 @@ class VMSnapshot(PayloadMapper):
 
         return snapshots
 
+    @staticmethod
+    def hypercore_matches_params(
+        hypercore_dict: Dict[Any, Any],
+        params: Dict[
+            Any, Any
+        ],  # params must be a dict with keys: "vm_name", "serial", "label"
+    ) -> bool:
+        # Filter is evaluated on raw HyperCore data, before the (expensive) conversion.
+        # Optional "since_timestamp" skips snapshots older than the cursor.
+        # The cursor is inclusive, timestamp has a resolution of one second, and
+        # more snapshots can be created in the same second.
+        since_timestamp = params.get("since_timestamp")
+        if (
+            since_timestamp is not None
+            and hypercore_dict["timestamp"] < since_timestamp
+        ):
+            return False
+        if params["vm_name"] and hypercore_dict["domain"]["name"] != params["vm_name"]:
+            return False
+        if (
+            params["serial"]
+            and hypercore_dict["domain"]["snapshotSerialNumber"] != params["serial"]
+        ):
+            return False
+        if params["label"] and hypercore_dict["label"] != params["label"]:
+            return False
+        return True
+
     @classmethod
     def filter_snapshots_by_params(
         cls,
-        params: dict[
+        params: Dict[
             Any, Any
         ],  # params must be a dict with keys: "vm_name", "serial", "label"
         rest_client: RestClient,
-    ) -> List[TypedVMSnapshotToAnsible]:
-        vm_snapshots = cls.get_snapshots_by_query({}, rest_client)
-        if not params["vm_name"] and not params["serial"] and not params["label"]:
-            return (
-                vm_snapshots  # return all snapshots if none of the params are present
-            )
-
-        # else filter results by label, vm.name, vm.snapshotSerialNumber
-        new_snaps = vm_snapshots[
-            :
-        ]  # for some unknown reason, using just "vm_snapshots" returns empty list: []
-        if params["vm_name"]:
-            new_snaps = [
-                vm_snap
-                for vm_snap in new_snaps
-                if vm_snap["vm"]["name"] == params["vm_name"]  # type: ignore
-            ]
-        if params["serial"]:
-            new_snaps = [
-                vm_snap
-                for vm_snap in new_snaps
-                if vm_snap["vm"]["snapshot_serial_number"] == params["serial"]  # type: ignore
-            ]
-        if params["label"]:
-            new_snaps = [
-                vm_snap for vm_snap in new_snaps if vm_snap["label"] == params["label"]
-            ]
-
-        return new_snaps
+    ) -> Tuple[List[TypedVMSnapshotToAnsible], TypedFilterStatsToAnsible]:
+        """
+        Returns snapshots filtered by label, vm.name, vm.snapshotSerialNumber
+        and timestamp (if params["since_timestamp"] is set),
+        and number of scanned and returned snapshots.
+        Snapshots are streamed from HyperCore, and only matching ones are converted.
+        """
+        vm_snapshots = []
+        scanned = 0
+        for hypercore_dict in rest_client.iter_records("/rest/v1/VirDomainSnapshot"):
+            scanned += 1
+            if cls.hypercore_matches_params(hypercore_dict, params):
+                vm_snapshots.append(
+                    cls.from_hypercore(hypercore_data=hypercore_dict).to_ansible()  # type: ignore
+                )
+        return vm_snapshots, dict(scanned=scanned, returned=len(vm_snapshots))
 
     def send_create_request(self, rest_client: RestClient) -> TypedTaskTag:
         payload = self.to_hypercore()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+from __future__ import annotations
+
+__metaclass__ = type
+
+import random
+from time import monotonic, sleep
+from typing import Callable, Iterator, Optional, TypeVar
+
+from ..module_utils import errors
+
+T = TypeVar("T")
+
+# Called after every unsuccessful poll with (attempt, elapsed_seconds).
+ProgressCallback = Callable[[int, float], None]
+
+
+class Backoff:
+    """
+    Poll intervals - first polls are fast, then the interval grows
+    exponentially up to max_interval.
+    Each interval is randomly changed by +-jitter (relative), so that
+    parallel waiters do not poll HyperCore in lockstep.
+    """
+
+    def __init__(
+        self,
+        initial_interval: float = 0.2,
+        max_interval: float = 5.0,
+        factor: float = 1.5,
+        jitter: float = 0.1,
+    ):
+        if initial_interval <= 0 or max_interval < initial_interval:
+            raise AssertionError(
+                f"Invalid Backoff intervals initial={initial_interval} max={max_interval}"
+            )
+        if factor < 1 or not 0 <= jitter < 1:
+            raise AssertionError(f"Invalid Backoff factor={factor} jitter={jitter}")
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self.jitter = jitter
+
+    def intervals(self) -> Iterator[float]:
+        interval = self.initial_interval
+        while True:
+            yield interval * (1 + random.uniform(-self.jitter, self.jitter))
+            interval = min(interval * self.factor, self.max_interval)
+
+
+# TaskTag usually finishes in a second or two, but exports/clones can take hours.
+TASK_TAG_BACKOFF = Backoff(initial_interval=0.2, max_interval=5.0)
+# Guest OS needs at least a few seconds to react to ACPI shutdown.
+VM_SHUTDOWN_BACKOFF = Backoff(initial_interval=1.0, max_interval=10.0)
+# HyperCore update takes tens of minutes.
+UPDATE_STATUS_BACKOFF = Backoff(initial_interval=5.0, max_interval=30.0)
+
+
+def wait_until(
+    poll: Callable[[], Optional[T]],
+    timeout: Optional[float] = None,
+    backoff: Optional[Backoff] = None,
+    progress: Optional[ProgressCallback] = None,
+    description: str = "condition",
+) -> T:
+    """
+    Calls poll() until it returns something else than None, and returns that value.
+    Exceptions raised by poll() are propagated.
+
+    timeout is the overall deadline in seconds, None means wait forever.
+    The last poll is done at the deadline; if it still returns None,
+    ScaleTimeoutError is raised.
+    """
+    backoff = backoff or Backoff()
+    intervals = backoff.intervals()
+    start = monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        result = poll()
+        if result is not None:
+            return result
+        elapsed = monotonic() - start
+        if progress:
+            progress(attempt, elapsed)
+        interval = next(intervals)
+        if timeout is not None:
+            remaining = timeout - elapsed
+            if remaining <= 0:
+                raise errors.ScaleTimeoutError(
+                    f"{description} not reached after {elapsed:.1f} seconds and {attempt} polls"
+                )
+            interval = min(interval, remaining)
+        sleep(interval)
@@ -23,6 +23,7 @@ description:
 version_added: 1.0.0
 extends_documentation_fragment:
   - scale_computing.hypercore.cluster_instance
+  - scale_computing.hypercore.upload
 seealso:
   - module: scale_computing.hypercore.iso_info
 options:
@@ -66,6 +67,13 @@ EXAMPLES = r"""
     source: /path/to/my.iso  # filename on ansible controller, never http/smb link
     state: present
 
+- name: Create ISO image, upload it again if the local file was changed
+  scale_computing.hypercore.iso:
+    name: my-custom-image.iso
+    source: /path/to/my-custom-image.iso
+    state: present
+    checksum: true
+
 - name: Remove ISO image
   scale_computing.hypercore.iso:
     name: CentOS-Stream-9-latest-x86_64-dvd1.iso
@@ -147,6 +155,25 @@ results:
       description: Unique identifier
       type: str
       sample: 171afce9-2452-4294-9bc4-6e8ae49f7e4c
+upload:
+  description:
+    - Statistics of the image data upload.
+  returned: when ISO image was uploaded
+  type: dict
+  version_added: 1.7.0
+  contains:
+    bytes_sent:
+      description: Number of bytes sent
+      type: int
+      sample: 5110759424
+    elapsed:
+      description: Upload duration, in seconds
+      type: float
+      sample: 51.2
+    average_rate:
+      description: Average upload speed, in bytes per second
+      type: float
+      sample: 99819520.0
 """
 
 
@@ -159,25 +186,68 @@ from ..module_utils.client import Client
 from ..module_utils.rest_client import RestClient
 from ..module_utils.task_tag import TaskTag
 from ..module_utils.iso import ISO
+from ..module_utils.checksum import DEFAULT_CHECKSUM_DIR, DigestStore, file_digest
+from ..module_utils.upload import (
+    DEFAULT_UPLOAD_MIN_RATE,
+    DEFAULT_UPLOAD_STALL_WINDOW,
+    UploadMonitor,
+)
 
 """
-ISO_TIMEOUT_TIME is timeout for ISO data upload.
-Currently, assume we have 4.7 GB ISO and speed 1 MB/s -> 4700 seconds.
-Rounded to 3600.
-
-TODO: compute it from expected min upload speed and file size.
-Even better, try to detect stalled uploads and terminate if no data was transmitted for more than N seconds.
-Yum/dnf complain with error "Operation too slow. Less than 1000 bytes/sec transferred the last 30 seconds"
-in such case.
+ISO_TIMEOUT_TIME is socket timeout for ISO data upload response.
+It limits how long we wait for HyperCore response after all data is sent.
+Slow or stalled uploads are detected by UploadMonitor,
+using upload_min_rate and upload_stall_window module parameters.
+While data is sent, socket timeout is upload_stall_window,
+so a send blocked without any progress is detected too.
 """
 ISO_TIMEOUT_TIME = 3600
 
 
-def ensure_present(module, rest_client):
+def source_changed(module, iso_image, digest_store, digest):
+    # Is source file different from the already uploaded ISO image.
+    if iso_image.size != os.stat(module.params["source"]).st_size:
+        return True
+    changed = digest_store.is_changed(f"ISO/{iso_image.uuid}", digest)
+    if changed is None:
+        module.warn(
+            f"ISO image {iso_image.name} has no recorded checksum, only its size was compared. "
+            f"Checksum of {module.params['source']} is recorded for the next run."
+        )
+        return False
+    return changed
+
+
+def ensure_present(module, rest_client, upload=None):
     iso_image = ISO.get_by_name(module.params, rest_client)
+    digest_store = digest = None
+    if module.params.get("checksum"):
+        if not os.path.isfile(module.params["source"]):
+            raise errors.ScaleComputingError(
+                f"ISO file {module.params['source']} not found."
+            )
+        digest_store = DigestStore.from_module_params(module.params)
+        digest = file_digest(module.params["source"])
+    before = None
     if iso_image and iso_image.ready_for_insert:
-        # ISO object with image uploaded already present, so there is nothing to do
-        return False, iso_image.to_ansible(), dict()
+        if not digest_store or not source_changed(
+            module, iso_image, digest_store, digest
+        ):
+            # ISO object with image uploaded already present, so there is nothing to do
+            return False, iso_image.to_ansible(), dict()
+        # Source file was changed, replace the ISO image.
+        if iso_image.mounts:
+            raise errors.ScaleComputingError(
+                f"ISO image {iso_image.name} needs to be uploaded again, but it is attached to VMs "
+                f"{', '.join(mount['vm_name'] for mount in iso_image.mounts)}."
+            )
+        before = iso_image.to_ansible()
+        task_tag_delete = rest_client.delete_record(
+            endpoint="{0}/{1}".format("/rest/v1/ISO", iso_image.uuid),
+            check_mode=module.check_mode,
+        )
+        TaskTag.wait_task(rest_client, task_tag_delete)
+        digest_store.delete(f"ISO/{iso_image.uuid}")
     # We need to create and upload ISO
     iso_image = ISO(
         name=module.params["name"],
@@ -193,6 +263,7 @@ def ensure_present(module, rest_client):
     TaskTag.wait_task(rest_client, task_tag_create)
 
     # Uploading ISO image.
+    upload = upload or UploadMonitor.from_module_params(module.params)
     try:
         file_size = os.stat(module.params["source"]).st_size
         with open(module.params["source"], "rb") as source_file:
@@ -201,7 +272,7 @@ def ensure_present(module, rest_client):
                 payload=None,
                 check_mode=module.check_mode,
                 timeout=ISO_TIMEOUT_TIME,
-                binary_data=source_file,
+                binary_data=upload.wrap(source_file),
                 headers={
                     "Content-Type": "application/octet-stream",
                     "Accept": "application/json",
@@ -222,8 +293,10 @@ def ensure_present(module, rest_client):
         check_mode=module.check_mode,
     )
     TaskTag.wait_task(rest_client, task_tag_update)
+    if digest_store:
+        digest_store.set(f"ISO/{iso_uuid}", digest)
     iso_image = ISO.get_by_name(module.params, rest_client).to_ansible()
-    return True, iso_image, dict(before=None, after=iso_image)
+    return True, iso_image, dict(before=before, after=iso_image)
 
 
 def ensure_absent(module, rest_client):
@@ -239,10 +312,10 @@ def ensure_absent(module, rest_client):
     return False, {}, dict()
 
 
-def run(module, rest_client):
+def run(module, rest_client, upload=None):
     if module.params["state"] == "absent":
         return ensure_absent(module, rest_client)
-    return ensure_present(module, rest_client)
+    return ensure_present(module, rest_client, upload)
 
 
 def main():
@@ -262,6 +335,22 @@ def main():
             source=dict(
                 type="str",
             ),
+            upload_min_rate=dict(
+                type="int",
+                default=DEFAULT_UPLOAD_MIN_RATE,
+            ),
+            upload_stall_window=dict(
+                type="int",
+                default=DEFAULT_UPLOAD_STALL_WINDOW,
+            ),
+            checksum=dict(
+                type="bool",
+                default=False,
+            ),
+            checksum_dir=dict(
+                type="path",
+                default=DEFAULT_CHECKSUM_DIR,
+            ),
         ),
         required_if=[
             ("state", "present", ("source",)),
@@ -279,8 +368,12 @@ def main():
     try:
         client = Client.get_client(module.params["cluster_instance"])
         rest_client = RestClient(client)
-        changed, record, diff = run(module, rest_client)
-        module.exit_json(changed=changed, record=record, results=[record], diff=diff)
+        upload = UploadMonitor.from_module_params(module.params)
+        changed, record, diff = run(module, rest_client, upload)
+        result = dict(changed=changed, record=record, results=[record], diff=diff)
+        if upload.stats:
+            result["upload"] = upload.stats
+        module.exit_json(**result)
     except errors.ScaleComputingError as e:
         module.fail_json(msg=str(e))
 
@@ -20,6 +20,17 @@ description:
 version_added: 1.2.0
 extends_documentation_fragment:
   - scale_computing.hypercore.cluster_instance
+options:
+  wait_timeout:
+    description:
+      - If set, the module waits up to I(wait_timeout) seconds for the update
+        to reach C(COMPLETE) or C(TERMINATING) update status.
+      - Update status is polled with increasing interval, connection errors while HyperCore
+        is restarting are ignored.
+      - The last known status is returned if the update is still running after I(wait_timeout) seconds.
+      - If omitted, the current status is returned immediately.
+    type: int
+    version_added: 1.7.0
 seealso:
   - module: scale_computing.hypercore.version_update
   - module: scale_computing.hypercore.version_update_info
@@ -30,6 +41,11 @@ EXAMPLES = r"""
 - name: Get status of the latest update applied
   scale_computing.hypercore.version_update_status_info:
   register: result
+
+- name: Wait up to 30 minutes for the update to finish
+  scale_computing.hypercore.version_update_status_info:
+    wait_timeout: 1800
+  register: result
 """
 
 # language=yaml
@@ -85,8 +101,13 @@ from ..module_utils.hypercore_version import UpdateStatus
 from ..module_utils.typed_classes import TypedUpdateStatusToAnsible
 
 
-def run(rest_client: RestClient) -> Optional[TypedUpdateStatusToAnsible]:
-    status = UpdateStatus.get(rest_client)
+def run(
+    rest_client: RestClient, wait_timeout: Optional[int] = None
+) -> Optional[TypedUpdateStatusToAnsible]:
+    if wait_timeout:
+        status = UpdateStatus.wait_finished(rest_client, wait_timeout)
+    else:
+        status = UpdateStatus.get(rest_client)
     if status:
         return status.to_ansible()
     return None
@@ -97,13 +118,14 @@ def main() -> None:
         supports_check_mode=True,
         argument_spec=dict(
             arguments.get_spec("cluster_instance"),
+            wait_timeout=dict(type="int", required=False),
         ),
     )
 
     try:
         client = Client.get_client(module.params["cluster_instance"])
         rest_client = RestClient(client)
-        record = run(rest_client)
+        record = run(rest_client, module.params["wait_timeout"])
         module.exit_json(record=record)
 
     except errors.ScaleComputingError as e:
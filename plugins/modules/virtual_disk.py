@@ -21,6 +21,7 @@ description:
 version_added: 1.2.0
 extends_documentation_fragment:
   - scale_computing.hypercore.cluster_instance
+  - scale_computing.hypercore.upload
 seealso:
   - module: scale_computing.hypercore.virtual_disk_info
 options:
@@ -52,6 +53,13 @@ EXAMPLES = r"""
     source: "c:/files/foobar.qcow2"
   register: vd_upload_info
 
+- name: upload VD to HyperCore cluster, upload it again if the local file was changed
+  scale_computing.hypercore.virtual_disk:
+    state: present
+    name: foobar.qcow2
+    source: "c:/files/foobar.qcow2"
+    checksum: true
+
 - name: Delete VD from HyperCore cluster
   scale_computing.hypercore.virtual_disk:
     state: absent
@@ -87,10 +95,29 @@ record:
       description: Unique identifier
       type: str
       sample: 7983b298-c37a-4c99-8dfe-b2952e81b092
+upload:
+  description:
+    - Statistics of the virtual disk file upload.
+  returned: when virtual disk file was uploaded
+  type: dict
+  version_added: 1.7.0
+  contains:
+    bytes_sent:
+      description: Number of bytes sent
+      type: int
+      sample: 5110759424
+    elapsed:
+      description: Upload duration, in seconds
+      type: float
+      sample: 51.2
+    average_rate:
+      description: Average upload speed, in bytes per second
+      type: float
+      sample: 99819520.0
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from typing import Tuple, Optional
+from typing import Any, Dict, Tuple, Optional
 import os
 import time
 
@@ -106,6 +133,12 @@ from ..module_utils.utils import is_changed
 from ..module_utils.virtual_disk import VirtualDisk
 from ..module_utils.state import State
 from ..module_utils.task_tag import TaskTag
+from ..module_utils.checksum import DEFAULT_CHECKSUM_DIR, DigestStore, file_digest
+from ..module_utils.upload import (
+    DEFAULT_UPLOAD_MIN_RATE,
+    DEFAULT_UPLOAD_STALL_WINDOW,
+    UploadMonitor,
+)
 
 from ..module_utils.hypercore_version import (
     HyperCoreVersion,
@@ -141,21 +174,45 @@ def ensure_present(
     module: AnsibleModule,
     rest_client: RestClient,
     virtual_disk_obj: Optional[VirtualDisk],
+    upload: Optional[UploadMonitor] = None,
 ) -> Tuple[bool, Optional[TypedVirtualDiskToAnsible], TypedDiff]:
     before = None
     after = None
+    digest_store: Optional[DigestStore] = None
+    digest = ""
+    if module.params.get("checksum"):
+        read_disk_file(module)  # fails if source is missing
+        digest_store = DigestStore.from_module_params(module.params)
+        digest = file_digest(module.params["source"])
     if virtual_disk_obj:
         before = virtual_disk_obj.to_ansible()
-        return False, before, dict(before=before, after=before)
-    else:
-        file_size = read_disk_file(module)
-        if not file_size:
-            raise errors.ScaleComputingError(
-                f"Invalid size for file: {module.params['source']}"
+        if not digest_store:
+            return False, before, dict(before=before, after=before)
+        changed = digest_store.is_changed(
+            f"VirtualDisk/{virtual_disk_obj.uuid}", digest
+        )
+        if changed is None:
+            # capacityBytes is virtual size of the image, not comparable with file size.
+            module.warn(
+                f"Virtual disk {virtual_disk_obj.name} has no recorded checksum, it was not compared. "
+                f"Checksum of {module.params['source']} is recorded for the next run."
             )
-        task = VirtualDisk.send_upload_request(rest_client, file_size, module)
-        after = wait_task_and_get_updated(rest_client, module, task, must_exist=False)
-        return is_changed(before, after), after, dict(before=before, after=after)
+        if not changed:
+            return False, before, dict(before=before, after=before)
+        # Source file was changed, replace the virtual disk.
+        task = virtual_disk_obj.send_delete_request(rest_client)
+        TaskTag.wait_task(rest_client, task)
+        digest_store.delete(f"VirtualDisk/{virtual_disk_obj.uuid}")
+    file_size = read_disk_file(module)
+    if not file_size:
+        raise errors.ScaleComputingError(
+            f"Invalid size for file: {module.params['source']}"
+        )
+    task = VirtualDisk.send_upload_request(rest_client, file_size, module, upload)
+    after = wait_task_and_get_updated(rest_client, module, task, must_exist=False)
+    if digest_store and after:
+        digest_store.set(f"VirtualDisk/{after['uuid']}", digest)
+    return is_changed(before, after), after, dict(before=before, after=after)
 
 
 def ensure_absent(
@@ -184,11 +241,13 @@ def ensure_absent(
 
 # Virtual disk can only be created or deleted; No update actions available.
 def run(
-    module: AnsibleModule, rest_client: RestClient
+    module: AnsibleModule,
+    rest_client: RestClient,
+    upload: Optional[UploadMonitor] = None,
 ) -> Tuple[bool, Optional[TypedVirtualDiskToAnsible], TypedDiff]:
     virtual_disk_obj = VirtualDisk.get_by_name(rest_client, name=module.params["name"])
     if module.params["state"] == State.present:
-        return ensure_present(module, rest_client, virtual_disk_obj)
+        return ensure_present(module, rest_client, virtual_disk_obj, upload)
     return ensure_absent(module, rest_client, virtual_disk_obj)
 
 
@@ -212,6 +271,22 @@ def main() -> None:
                 type="str",
                 required=True,
             ),
+            upload_min_rate=dict(
+                type="int",
+                default=DEFAULT_UPLOAD_MIN_RATE,
+            ),
+            upload_stall_window=dict(
+                type="int",
+                default=DEFAULT_UPLOAD_STALL_WINDOW,
+            ),
+            checksum=dict(
+                type="bool",
+                default=False,
+            ),
+            checksum_dir=dict(
+                type="path",
+                default=DEFAULT_CHECKSUM_DIR,
+            ),
         ),
         required_if=[("state", "present", ("source",), False)],
     )
@@ -221,8 +296,12 @@ def main() -> None:
         rest_client = RestClient(client)
         hcversion = HyperCoreVersion(rest_client)
         hcversion.check_version(module, HYPERCORE_VERSION_REQUIREMENTS)
-        changed, record, diff = run(module, rest_client)
-        module.exit_json(changed=changed, record=record, diff=diff)
+        upload = UploadMonitor.from_module_params(module.params)
+        changed, record, diff = run(module, rest_client, upload)
+        result: Dict[str, Any] = dict(changed=changed, record=record, diff=diff)
+        if upload.stats:
+            result["upload"] = upload.stats
+        module.exit_json(**result)
     except errors.ScaleComputingError as e:
         module.fail_json(msg=str(e))
 
@@ -404,11 +404,13 @@ from typing import List
 from ..module_utils import arguments, errors
 from ..module_utils.client import Client
 from ..module_utils.rest_client import RestClient
+from ..module_utils.response_cache import ResponseCache
 from ..module_utils.vm import (
     VM,
     ManageVMParams,
     ManageVMDisks,
     ManageVMNics,
+    VMState,
     VmMachineType,
     compute_params_disk_slot,
 )
@@ -451,8 +453,10 @@ def _set_vm_params(module, rest_client, vm, param_subset: List[str]):
 
 
 def ensure_present(module, rest_client):
-    vm_before = VM.get_by_old_or_new_name(module.params, rest_client)
-    if vm_before:
+    # All steps share the last known VM record, VM is re-read only after it was changed.
+    vm_state = VMState.get_by_old_or_new_name(module.params, rest_client)
+    if vm_state:
+        vm_before = vm_state.vm()
         before = vm_before.to_ansible()  # for output
         existing_boot_order = vm_before.get_boot_device_order()
         # machineType needs to be set to uefi/vtpm first,
@@ -484,7 +488,6 @@ def ensure_present(module, rest_client):
         )
         vm_before.vm_power_up(module, rest_client)
         was_vm_rebooted = vm_before.was_vm_rebooted()
-        name_field = "vm_name_new" if module.params["vm_name_new"] else "vm_name"
     else:
         before = None  # for output
         # Create new VM object
@@ -499,7 +502,8 @@ def ensure_present(module, rest_client):
         )
         TaskTag.wait_task(rest_client, task_tag)
         # Set boot order
-        vm_created = VM.get_by_name(module.params, rest_client)
+        vm_state = VMState.get_by_name(module.params, rest_client, must_exist=True)
+        vm_created = vm_state.vm()
         existing_boot_order = vm_created.get_boot_device_order()
         _set_boot_order(module, rest_client, vm_created, existing_boot_order)
         # Set power state
@@ -508,9 +512,8 @@ def ensure_present(module, rest_client):
                 module, rest_client, module.params["power_state"], False
             )
         changed = True
-        name_field = "vm_name"
         was_vm_rebooted = False
-    vm_after = VM.get_by_name(module.params, rest_client, name_field=name_field)
+    vm_after = vm_state.vm()
     after = vm_after.to_ansible()
     return changed, [after], dict(before=before, after=after), was_vm_rebooted
 
@@ -523,8 +526,9 @@ def run(module, rest_client):
 
 def ensure_absent(module, rest_client):
     reboot = False
-    vm = VM.get_by_name(module.params, rest_client)
-    if vm:
+    vm_state = VMState.get_by_name(module.params, rest_client)
+    if vm_state:
+        vm = vm_state.vm()
         if vm._power_state != "shutdown":  # First, shut it off and then delete
             # TODO ==shutdown or ==stopped ??
             vm.update_vm_power_state(module, rest_client, "stop", False)
@@ -738,7 +742,7 @@ def main():
 
     try:
         client = Client.get_client(module.params["cluster_instance"])
-        rest_client = RestClient(client)
+        rest_client = RestClient(client, response_cache=ResponseCache())
         check_params(module, rest_client)
         compute_params(module)
         changed, record, diff, reboot = run(module, rest_client)
@@ -17,6 +17,10 @@ author:
 short_description: Handles cloning of the VM
 description:
   - Use M(scale_computing.hypercore.vm_clone) to clone a specified virtual machine.
+  - With I(clones), many clones are created from the same source VM or snapshot.
+    Source VM and snapshot are looked up once.
+    Clone tasks are submitted up to I(concurrency) at the same time,
+    and tasks submitted together are waited for together.
 version_added: 1.0.0
 extends_documentation_fragment:
   - scale_computing.hypercore.cluster_instance
@@ -27,8 +31,8 @@ options:
     description:
       - Name of the VM clone.
       - Used to identify a clone of the virtual machine by name.
+      - Exactly one of I(vm_name) and I(clones) is required.
     type: str
-    required: true
   source_vm_name:
     description:
       - Name of the source virtual machine, to be cloned.
@@ -55,6 +59,47 @@ options:
     description: Allows cloning VM from a specific snapshot using snapshot uuid.
     type: str
     version_added: 1.3.0
+  clones:
+    description:
+      - Clones to create from the source VM.
+      - Clones which already exist are not changed.
+      - Clone names must be unique, and the source VM name must match exactly one VM.
+    type: list
+    elements: dict
+    version_added: 1.7.0
+    suboptions:
+      vm_name:
+        description:
+          - Name of the VM clone.
+        type: str
+        required: true
+      tags:
+        description:
+          - Tags of this clone.
+          - If omitted, I(tags) is used.
+        type: list
+        elements: str
+      cloud_init:
+        description:
+          - Configuration to be used by cloud-init (Linux) or cloudbase-init (Windows) of this clone.
+          - If omitted, I(cloud_init) is used.
+        type: dict
+        suboptions:
+          user_data:
+            description:
+              - Configuration user-data to be used by cloud-init (Linux) or cloudbase-init (Windows).
+            type: str
+          meta_data:
+            description:
+              - Configuration meta-data to be used by cloud-init (Linux) or cloudbase-init (Windows).
+            type: str
+  concurrency:
+    description:
+      - Max number of clone tasks submitted at the same time, used with I(clones).
+      - HyperCore clones only a few VMs at the same time, additional clone tasks are queued.
+    type: int
+    default: 4
+    version_added: 1.7.0
 notes:
   - C(check_mode) is not supported.
 """
@@ -73,6 +118,21 @@ EXAMPLES = r"""
       - test
       - tag
   register: output
+
+- name: Clone many VMs from a template snapshot
+  scale_computing.hypercore.vm_clone:
+    source_vm_name: template-vm
+    source_snapshot_label: golden
+    tags:
+      - web
+    clones:
+      - vm_name: web-1
+      - vm_name: web-2
+      - vm_name: db-1
+        tags:
+          - db
+    concurrency: 2
+  register: output
 """
 
 # language=yaml
@@ -83,13 +143,35 @@ msg:
   returned: success
   type: str
   sample: Virtual machine - VM-TEST - cloning complete to - VM-TEST-clone
+clones:
+  description:
+    - Result for each clone in I(clones), in the same order.
+  returned: when I(clones) is set
+  type: list
+  elements: dict
+  version_added: 1.7.0
+  contains:
+    vm_name:
+      description: Name of the VM clone.
+      type: str
+      sample: web-1
+    changed:
+      description: Info if the clone was created.
+      type: bool
+      sample: true
+    error:
+      description: Error message, if cloning failed.
+      type: str
+      sample: null
 """
 
+from typing import Any, Dict, List, Tuple
+
 from ansible.module_utils.basic import AnsibleModule
 from ..module_utils import arguments, errors
 from ..module_utils.client import Client
 from ..module_utils.rest_client import RestClient
-from ..module_utils.vm import VM
+from ..module_utils.vm import MAX_CONCURRENT_CLONE_TASKS, VM
 from ..module_utils.vm_snapshot import VMSnapshot as Snapshot
 from ..module_utils.task_tag import TaskTag
 
@@ -175,6 +257,79 @@ def run(module, rest_client):
     )
 
 
+def get_clone_params(module: AnsibleModule, clone: Dict[str, Any]) -> Dict[str, Any]:
+    # Module params for one clone, tags and cloud_init of the clone take precedence.
+    clone_params = dict(module.params, vm_name=clone["vm_name"])
+    if clone["tags"] is not None:
+        clone_params["tags"] = clone["tags"]
+    if clone["cloud_init"]:
+        clone_params["cloud_init"] = clone["cloud_init"]
+    return clone_params
+
+
+def run_many(
+    module: AnsibleModule, rest_client: RestClient
+) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    # HyperCore allows duplicated VM names, but name-based modules cannot handle them.
+    vm_names = [clone["vm_name"] for clone in module.params["clones"]]
+    duplicated = sorted(
+        set(vm_name for vm_name in vm_names if vm_names.count(vm_name) > 1)
+    )
+    if duplicated:
+        raise errors.ScaleComputingError(
+            f"Clone names must be unique, duplicated names: {', '.join(duplicated)}."
+        )
+    # Target names and source VM are looked up in a single VirDomain listing.
+    vm_dicts = rest_client.list_records("/rest/v1/VirDomain")
+    existing_names = set(vm_dict["name"] for vm_dict in vm_dicts)
+    source_vm_dicts = [
+        vm_dict
+        for vm_dict in vm_dicts
+        if vm_dict["name"] == module.params["source_vm_name"]
+    ]
+    if not source_vm_dicts:
+        raise errors.VMNotFound(dict(name=module.params["source_vm_name"]))
+    if len(source_vm_dicts) > 1:
+        raise errors.ScaleComputingError(
+            f"{len(source_vm_dicts)} VMs are named {module.params['source_vm_name']}, "
+            "source VM must be unique."
+        )
+    virtual_machine_obj = VM.from_hypercore(source_vm_dicts[0], rest_client)
+
+    if module.params["source_snapshot_label"] or module.params["source_snapshot_uuid"]:
+        module = get_snapshot(module, rest_client, virtual_machine_obj)
+
+    results = [
+        dict(vm_name=clone["vm_name"], changed=False, error=None)
+        for clone in module.params["clones"]
+    ]
+    to_clone = [
+        (result, get_clone_params(module, clone))
+        for result, clone in zip(results, module.params["clones"])
+        if clone["vm_name"] not in existing_names
+    ]
+    # Clone tasks are submitted and waited for in batches of concurrency.
+    clone_errors = TaskTag.submit_and_wait(
+        rest_client,
+        lambda clone_params: virtual_machine_obj.clone_vm(rest_client, clone_params),
+        [clone_params for result, clone_params in to_clone],
+        module.params["concurrency"],
+    )
+    for (result, clone_params), error in zip(to_clone, clone_errors):
+        if isinstance(error, errors.TaskTagError):
+            result["error"] = (
+                f"There was a problem during cloning of {virtual_machine_obj.name}, cloning failed."
+            )
+        elif error:
+            result["error"] = str(error)
+        result["changed"] = not result["error"]
+    created = [result["vm_name"] for result in results if result["changed"]]
+    msg = f"Virtual machine - {module.params['source_vm_name']} - cloning complete to - {', '.join(created)}."
+    if not created:
+        msg = "All virtual machines already exist."
+    return bool(created), msg, results
+
+
 def main():
     module = AnsibleModule(
         supports_check_mode=False,
@@ -182,7 +337,6 @@ def main():
             arguments.get_spec("cluster_instance"),
             vm_name=dict(
                 type="str",
-                required=True,
             ),
             source_vm_name=dict(
                 type="str",
@@ -210,13 +364,56 @@ def main():
             source_snapshot_uuid=dict(
                 type="str",
             ),
+            clones=dict(
+                type="list",
+                elements="dict",
+                options=dict(
+                    vm_name=dict(
+                        type="str",
+                        required=True,
+                    ),
+                    tags=dict(type="list", elements="str"),
+                    cloud_init=dict(
+                        type="dict",
+                        options=dict(
+                            user_data=dict(type="str"),
+                            meta_data=dict(type="str"),
+                        ),
+                    ),
+                ),
+            ),
+            concurrency=dict(
+                type="int",
+                default=MAX_CONCURRENT_CLONE_TASKS,
+            ),
         ),
-        mutually_exclusive=[("source_snapshot_label", "source_snapshot_uuid")],
+        mutually_exclusive=[
+            ("source_snapshot_label", "source_snapshot_uuid"),
+            ("vm_name", "clones"),
+        ],
+        required_one_of=[("vm_name", "clones")],
     )
+    if module.params["concurrency"] < 1:
+        module.fail_json(msg="concurrency must be at least 1.")
 
     try:
         client = Client.get_client(module.params["cluster_instance"])
         rest_client = RestClient(client=client)
+        if module.params["clones"] is not None:
+            changed, msg, clones = run_many(module, rest_client)
+            failed = [clone for clone in clones if clone["error"]]
+            if failed:
+                module.fail_json(
+                    msg="Cloning failed for VMs - {0}".format(
+                        "; ".join(
+                            "{0}: {1}".format(clone["vm_name"], clone["error"])
+                            for clone in failed
+                        )
+                    ),
+                    changed=changed,
+                    clones=clones,
+                )
+            module.exit_json(changed=changed, msg=msg, clones=clones)
         changed, msg = run(module, rest_client)
         module.exit_json(changed=changed, msg=msg)
     except errors.ScaleComputingError as e:
@@ -292,6 +292,7 @@ from ..module_utils import arguments
 from ..module_utils.errors import ScaleComputingError
 from ..module_utils.client import Client
 from ..module_utils.rest_client import RestClient
+from ..module_utils.response_cache import ResponseCache
 from ..module_utils.vm import ManageVMDisks, compute_params_disk_slot
 from ..module_utils.task_tag import TaskTag
 from ..module_utils.disk import Disk
@@ -438,7 +439,7 @@ def main():
 
     try:
         client = Client.get_client(module.params["cluster_instance"])
-        rest_client = RestClient(client)
+        rest_client = RestClient(client, response_cache=ResponseCache())
         compute_params(module)
         changed, record, diff, reboot = run(module, rest_client)
         module.exit_json(changed=changed, record=record, diff=diff, vm_rebooted=reboot)
@@ -0,0 +1,524 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+# language=yaml
+DOCUMENTATION = r"""
+module: vm_fleet
+
+author:
+  - Justin Cinkelj (@justinc1)
+short_description: Create, update or delete many VMs.
+description:
+  - Declarative management of many VMs in a single task.
+    Each item in I(vms) describes one VM, with the same options as the M(scale_computing.hypercore.vm) module.
+  - VMs, nodes and snapshot schedules are read once for all VMs.
+    Then a plan is computed - which VMs need to be created, updated or deleted.
+  - The plan is applied in steps - delete, create, update.
+    Requests for different VMs are sent concurrently, up to I(concurrency) VMs at the same time.
+    Delete and create tasks are waited for in a single polling loop per batch of I(concurrency) VMs.
+  - Running VMs are stopped before they are deleted, with a single request for all VMs.
+    New VMs with I(power_state=start) are started with a single request for all VMs.
+  - Some changes cannot be applied to a running VM.
+    This includes CPU count change, memory change and (in some cases) disk remove.
+    In this cases VM is shutdown, change is applied, and VM is started back.
+  - A failure of one VM does not stop processing of the other VMs.
+    The module fails at the end, if any VM failed.
+version_added: 1.7.0
+extends_documentation_fragment:
+  - scale_computing.hypercore.cluster_instance
+  - scale_computing.hypercore.force_reboot
+seealso:
+  - module: scale_computing.hypercore.vm
+  - module: scale_computing.hypercore.vm_power
+  - module: scale_computing.hypercore.vm_params
+options:
+  vms:
+    description:
+      - Desired VMs.
+      - VM names must be unique.
+      - VMs which are not listed are not changed.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      vm_name:
+        description:
+          - Virtual machine name.
+        type: str
+        required: true
+      state:
+        description:
+          - Desired state of the VM.
+        choices: [ present, absent ]
+        type: str
+        default: present
+      description:
+        description:
+          - VM's description.
+        type: str
+      memory:
+        description:
+          - VM's physical memory in bytes.
+          - Required if I(state=present).
+        type: int
+      vcpu:
+        description:
+          - Number of Central processing units on the VM.
+          - Required if I(state=present).
+        type: int
+      power_state:
+        description:
+          - Desired VM state.
+          - See M(scale_computing.hypercore.vm) module.
+        choices: [ start, shutdown, stop, reboot, reset ]
+        type: str
+        default: start
+      snapshot_schedule:
+        description:
+          - The name of an existing snapshot_schedule to assign to VM.
+        type: str
+      tags:
+        description:
+          - Tags of the VM.
+        type: list
+        elements: str
+      disks:
+        description:
+          - List of disks.
+          - Disks which are not listed are removed from the VM.
+          - Required if I(state=present).
+        type: list
+        elements: dict
+        suboptions:
+          disk_slot:
+            type: int
+            description:
+              - Virtual slot the drive will occupy.
+            required: true
+          size:
+            type: int
+            description:
+              - Logical size of the device in bytes.
+          type:
+            type: str
+            description:
+              - The bus type the VM will use.
+            choices: [ ide_cdrom, virtio_disk, ide_disk, scsi_disk, ide_floppy, nvram, vtpm ]
+            required: true
+          iso_name:
+            type: str
+            description:
+              - The name of the ISO image to attach to the CD-ROM.
+              - Only relevant if I(type=ide_cdrom).
+          cache_mode:
+            type: str
+            description:
+              - The cache mode the VM will use.
+            choices: [ none, writeback, writethrough ]
+      nics:
+        description:
+          - List of network interfaces.
+          - Network interfaces which are not listed are removed from the VM.
+          - Required if I(state=present).
+        type: list
+        elements: dict
+        suboptions:
+          vlan:
+            type: int
+            default: 0
+            description:
+              - Network interface virtual LAN.
+          mac:
+            type: str
+            description:
+              - Mac address of the network interface.
+          type:
+            type: str
+            default: virtio
+            description:
+              - Defines type of the network interface.
+            choices: [ virtio, RTL8139, INTEL_E1000 ]
+          connected:
+            type: bool
+            default: true
+            description:
+              - Is network interface connected or not.
+      boot_devices:
+        description:
+          - Ordered list of boot devices (disks and nics).
+        type: list
+        elements: dict
+        suboptions:
+          type:
+            type: str
+            description:
+              - The type of device we want to set the boot order to.
+            choices: [ nic, ide_cdrom, virtio_disk, ide_disk, scsi_disk, ide_floppy, nvram ]
+            required: true
+          disk_slot:
+            type: int
+            description:
+              - Virtual slot the drive will occupy.
+          nic_vlan:
+            type: int
+            description:
+              - VLAN of the network interface.
+          iso_name:
+            type: str
+            description:
+              - The name of the ISO image attached to the CD-ROM.
+      attach_guest_tools_iso:
+        description:
+          - If supported by operating system, create an extra device to attach the Scale Guest OS tools ISO.
+          - Only relevant when VM is created.
+        default: false
+        type: bool
+      operating_system:
+        description:
+          - Operating system name.
+        type: str
+        choices: [ os_windows_server_2012, os_other ]
+        default: os_windows_server_2012
+      cloud_init:
+        description:
+          - Configuration to be used by cloud-init (Linux) or cloudbase-init (Windows).
+          - Only relevant when VM is created.
+        type: dict
+        default: {}
+        suboptions:
+          user_data:
+            description:
+              - Configuration user-data to be used by cloud-init (Linux) or cloudbase-init (Windows).
+            type: str
+          meta_data:
+            description:
+              - Configuration meta-data to be used by cloud-init (Linux) or cloudbase-init (Windows).
+            type: str
+      machine_type:
+        description:
+          - Changes VM machine type.
+        type: str
+        choices: [ BIOS, UEFI, vTPM+UEFI, vTPM+UEFI-compatible ]
+  concurrency:
+    description:
+      - Max number of VMs with changes in progress at the same time.
+    type: int
+    default: 8
+notes:
+  - C(check_mode) is supported.
+    The plan is computed and returned, but no change is made.
+"""
+
+
+# language=yaml
+EXAMPLES = r"""
+- name: Ensure web VMs exist, and the old web VM is removed
+  scale_computing.hypercore.vm_fleet:
+    vms:
+      - vm_name: web-1
+        memory: "{{ '1 GB' | human_to_bytes }}"
+        vcpu: 2
+        tags:
+          - web
+        disks:
+          - type: virtio_disk
+            disk_slot: 0
+            size: "{{ '10 GB' | human_to_bytes }}"
+        nics:
+          - vlan: 10
+      - vm_name: web-2
+        memory: "{{ '1 GB' | human_to_bytes }}"
+        vcpu: 2
+        tags:
+          - web
+        disks:
+          - type: virtio_disk
+            disk_slot: 0
+            size: "{{ '10 GB' | human_to_bytes }}"
+        nics:
+          - vlan: 10
+      - vm_name: web-old
+        state: absent
+    concurrency: 4
+
+- name: Show what would be changed
+  scale_computing.hypercore.vm_fleet:
+    vms: "{{ desired_vms }}"
+  check_mode: true
+  register: fleet_plan
+
+- name: Show VMs which would be created
+  ansible.builtin.debug:
+    var: fleet_plan.plan.create
+"""
+
+
+# language=yaml
+RETURN = r"""
+vms:
+  description:
+    - Result for each VM, in the order of I(vms).
+  returned: success
+  type: list
+  elements: dict
+  contains:
+    vm_name:
+      description: VM name.
+      type: str
+      sample: demo-vm
+    action:
+      description: Planned action.
+      type: str
+      sample: update
+    changes:
+      description: Names of options which differ from the existing VM.
+      type: list
+      elements: str
+      sample:
+        - memory
+        - disks
+    changed:
+      description: Info if VM was changed.
+      type: bool
+      sample: true
+    vm_rebooted:
+      description: Info if reboot of the VM was performed.
+      type: bool
+      sample: false
+    error:
+      description: Error message, if VM failed.
+      type: str
+      sample: null
+plan:
+  description:
+    - Plan summary - VM names by planned action.
+    - I(failed) lists VMs which failed, regardless of the action.
+  returned: success
+  type: dict
+  sample:
+    create:
+      - web-2
+    update:
+      - web-1
+    delete:
+      - web-old
+    unchanged: []
+    failed: []
+"""
+
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils import arguments, errors
+from ..module_utils.client import Client
+from ..module_utils.rest_client import RestClient
+from ..module_utils.response_cache import ResponseCache
+from ..module_utils.vm import FLEET_CACHE_TTLS, ManageVMFleet
+from typing import Any, Dict, List, Tuple
+
+
+def run(
+    module: AnsibleModule, rest_client: RestClient
+) -> Tuple[bool, List[Dict[str, Any]], Dict[str, List[str]]]:
+    vms, plan = ManageVMFleet.reconcile(module, rest_client)
+    if module.check_mode:
+        changed = any(vm["action"] != "none" for vm in vms)
+    else:
+        changed = any(vm["changed"] for vm in vms)
+    return changed, vms, plan
+
+
+def main() -> None:
+    module = AnsibleModule(
+        supports_check_mode=True,
+        argument_spec=dict(
+            arguments.get_spec("cluster_instance"),
+            vms=dict(
+                type="list",
+                elements="dict",
+                required=True,
+                options=dict(
+                    arguments.get_spec("machine_type"),
+                    vm_name=dict(
+                        type="str",
+                        required=True,
+                    ),
+                    state=dict(
+                        type="str",
+                        choices=["present", "absent"],
+                        default="present",
+                    ),
+                    description=dict(
+                        type="str",
+                    ),
+                    memory=dict(
+                        type="int",
+                    ),
+                    vcpu=dict(
+                        type="int",
+                    ),
+                    power_state=dict(
+                        type="str",
+                        choices=["start", "shutdown", "stop", "reboot", "reset"],
+                        default="start",
+                    ),
+                    snapshot_schedule=dict(
+                        type="str",
+                    ),
+                    tags=dict(type="list", elements="str"),
+                    disks=dict(
+                        type="list",
+                        elements="dict",
+                        options=dict(
+                            disk_slot=dict(
+                                type="int",
+                                required=True,
+                            ),
+                            size=dict(
+                                type="int",
+                            ),
+                            type=dict(
+                                type="str",
+                                choices=[
+                                    "ide_cdrom",
+                                    "virtio_disk",
+                                    "ide_disk",
+                                    "scsi_disk",
+                                    "ide_floppy",
+                                    "nvram",
+                                    "vtpm",
+                                ],
+                                required=True,
+                            ),
+                            iso_name=dict(
+                                type="str",
+                            ),
+                            cache_mode=dict(
+                                type="str",
+                                choices=["none", "writeback", "writethrough"],
+                            ),
+                        ),
+                    ),
+                    nics=dict(
+                        type="list",
+                        elements="dict",
+                        options=dict(
+                            vlan=dict(
+                                type="int",
+                                default=0,
+                            ),
+                            connected=dict(
+                                type="bool",
+                                default=True,
+                            ),
+                            type=dict(
+                                type="str",
+                                choices=["virtio", "RTL8139", "INTEL_E1000"],
+                                default="virtio",
+                            ),
+                            mac=dict(
+                                type="str",
+                            ),
+                        ),
+                    ),
+                    boot_devices=dict(
+                        type="list",
+                        elements="dict",
+                        options=dict(
+                            type=dict(
+                                type="str",
+                                choices=[
+                                    "nic",
+                                    "ide_cdrom",
+                                    "virtio_disk",
+                                    "ide_disk",
+                                    "scsi_disk",
+                                    "ide_floppy",
+                                    "nvram",
+                                ],
+                                required=True,
+                            ),
+                            disk_slot=dict(
+                                type="int",
+                            ),
+                            nic_vlan=dict(
+                                type="int",
+                            ),
+                            iso_name=dict(
+                                type="str",
+                            ),
+                        ),
+                    ),
+                    attach_guest_tools_iso=dict(type="bool", default=False),
+                    operating_system=dict(
+                        type="str",
+                        choices=["os_windows_server_2012", "os_other"],
+                        default="os_windows_server_2012",
+                    ),
+                    cloud_init=dict(
+                        type="dict",
+                        default={},
+                        options=dict(
+                            user_data=dict(type="str"),
+                            meta_data=dict(type="str"),
+                        ),
+                    ),
+                ),
+                required_if=[
+                    (
+                        "state",
+                        "present",
+                        ("memory", "vcpu", "disks", "nics"),
+                        False,
+                    ),
+                ],
+            ),
+            force_reboot=dict(
+                type="bool",
+                default=False,
+            ),
+            shutdown_timeout=dict(
+                type="float",
+                default=300,
+            ),
+            concurrency=dict(
+                type="int",
+                default=8,
+            ),
+        ),
+    )
+    if module.params["concurrency"] < 1:
+        module.fail_json(msg="concurrency must be at least 1.")
+
+    try:
+        client = Client.get_client(module.params["cluster_instance"])
+        rest_client = RestClient(
+            client, response_cache=ResponseCache(ttls=FLEET_CACHE_TTLS)
+        )
+        changed, vms, plan = run(module, rest_client)
+        failed = [vm for vm in vms if vm["error"]]
+        if failed:
+            module.fail_json(
+                msg="Failed VMs - {0}".format(
+                    "; ".join(
+                        "{0}: {1}".format(vm["vm_name"], vm["error"]) for vm in failed
+                    )
+                ),
+                changed=changed,
+                vms=vms,
+                plan=plan,
+            )
+        module.exit_json(changed=changed, vms=vms, plan=plan)
+    except errors.ScaleComputingError as e:
+        module.fail_json(msg=str(e))
+
+
+if __name__ == "__main__":
+    main()
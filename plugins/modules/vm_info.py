@@ -160,10 +160,8 @@ def run(module, rest_client):
         "vm_name",
         ansible_hypercore_map=dict(vm_name="name"),
     )
-    return [
-        VM.from_hypercore(vm_dict, rest_client).to_ansible()
-        for vm_dict in rest_client.list_records("/rest/v1/VirDomain", query)
-    ]
+    vm_dicts = rest_client.list_records("/rest/v1/VirDomain", query)
+    return [vm.to_ansible() for vm in VM.from_hypercore_many(vm_dicts, rest_client)]
 
 
 def main():
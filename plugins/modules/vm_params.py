@@ -25,14 +25,37 @@ description:
   - VM has C(shutdown_timeout) time to respond to shutdown request.
     If VM is not shutoff within I(shutdown_timeout),
     then a force shutdown will be issued if C(force_reboot=True).
+  - Many VMs can be changed in a single task, selected with I(vm_names) or I(vm_tags).
+    VMs are read once, and VMs which need a change are updated concurrently.
 version_added: 1.0.0
 extends_documentation_fragment:
   - scale_computing.hypercore.cluster_instance
-  - scale_computing.hypercore.vm_name
   - scale_computing.hypercore.force_reboot
   - scale_computing.hypercore.machine_type
 seealso: []
 options:
+  vm_name:
+    description:
+      - Virtual machine name.
+      - Used to identify selected virtual machine by name.
+      - Exactly one of I(vm_name), I(vm_names) and I(vm_tags) is required.
+    type: str
+  vm_names:
+    description:
+      - Names of virtual machines to change.
+      - All VMs must exist.
+      - Cannot be used together with I(vm_name_new).
+    type: list
+    elements: str
+    version_added: 1.7.0
+  vm_tags:
+    description:
+      - Change all virtual machines which have all of the listed tags.
+      - Must not be empty, an empty list would select all VMs.
+      - Cannot be used together with I(vm_name_new).
+    type: list
+    elements: str
+    version_added: 1.7.0
   vm_name_new:
     description:
       - VM's new name.
@@ -109,6 +132,19 @@ EXAMPLES = r"""
     description: ""
     tags: [""]
     snapshot_schedule: ""
+
+- name: Assign snapshot schedule to many VMs
+  scale_computing.hypercore.vm_params:
+    vm_names:
+      - demo-vm-1
+      - demo-vm-2
+    snapshot_schedule: demo-snap-schedule
+
+- name: Set description of all VMs with tag web
+  scale_computing.hypercore.vm_params:
+    vm_tags:
+      - web
+    description: web server
 """
 
 
@@ -120,6 +156,42 @@ vm_rebooted:
   returned: success
   type: bool
   sample: true
+vms:
+  description:
+    - Result for each selected VM, if I(vm_names) or I(vm_tags) is used.
+  returned: success
+  type: list
+  elements: dict
+  version_added: 1.7.0
+  contains:
+    vm_name:
+      description: VM name.
+      type: str
+      sample: demo-vm-1
+    uuid:
+      description: VM UUID.
+      type: str
+      sample: f0c91f97-cbfc-40f8-b918-ab77ae8ea7fb
+    changed:
+      description: Info if the VM was changed.
+      type: bool
+      sample: true
+    vm_rebooted:
+      description: Info if reboot of the VM was performed.
+      type: bool
+      sample: false
+    error:
+      description: Error message, if update of the VM failed.
+      type: str
+      sample: null
+    diff:
+      description: Changed VM parameters, before and after the change.
+      type: dict
+      sample:
+        before:
+          description: old description
+        after:
+          description: web server
 """
 
 
@@ -129,6 +201,7 @@ from ..module_utils import arguments
 from ..module_utils.errors import ScaleComputingError
 from ..module_utils.client import Client
 from ..module_utils.rest_client import RestClient
+from ..module_utils.response_cache import ResponseCache
 from ..module_utils.vm import VM, ManageVMParams
 
 
@@ -158,6 +231,33 @@ def run(module, rest_client):
     return changed, vm.was_vm_rebooted(), diff
 
 
+def get_vms(module, rest_client):
+    vm_dicts = VM.list_records_by_names_or_tags(
+        rest_client, module.params["vm_names"], module.params["vm_tags"]
+    )
+    return VM.from_hypercore_many(vm_dicts, rest_client)
+
+
+def run_many(module, rest_client):
+    vms = get_vms(module, rest_client)
+    results = ManageVMParams.set_vm_params_many(module, rest_client, vms)
+    changed_results = [result for result in results if result["changed"]]
+    diff = dict(
+        before={
+            result["vm_name"]: result["diff"]["before"] for result in changed_results
+        },
+        after={
+            result["vm_name"]: result["diff"]["after"] for result in changed_results
+        },
+    )
+    return (
+        bool(changed_results),
+        any(result["vm_rebooted"] for result in results),
+        diff,
+        results,
+    )
+
+
 def main():
     module = AnsibleModule(
         supports_check_mode=False,
@@ -168,7 +268,14 @@ def main():
             ),
             vm_name=dict(
                 type="str",
-                required=True,
+            ),
+            vm_names=dict(
+                type="list",
+                elements="str",
+            ),
+            vm_tags=dict(
+                type="list",
+                elements="str",
             ),
             vm_name_new=dict(
                 type="str",
@@ -203,13 +310,37 @@ def main():
                 type="str",
             ),
         ),
+        mutually_exclusive=[
+            ("vm_name", "vm_names", "vm_tags"),
+            ("vm_name_new", "vm_names"),
+            ("vm_name_new", "vm_tags"),
+        ],
+        required_one_of=[("vm_name", "vm_names", "vm_tags")],
     )
 
     try:
         client = Client.get_client(module.params["cluster_instance"])
-        rest_client = RestClient(client)
-        changed, reboot, diff = run(module, rest_client)
-        module.exit_json(changed=changed, vm_rebooted=reboot, diff=diff)
+        rest_client = RestClient(client, response_cache=ResponseCache())
+        if module.params["vm_name"] is None:
+            changed, reboot, diff, vms = run_many(module, rest_client)
+            failed = [vm for vm in vms if vm["error"]]
+            if failed:
+                module.fail_json(
+                    msg="Failed to update VMs - {0}".format(
+                        "; ".join(
+                            "{0}: {1}".format(vm["vm_name"], vm["error"])
+                            for vm in failed
+                        )
+                    ),
+                    changed=changed,
+                    vm_rebooted=reboot,
+                    diff=diff,
+                    vms=vms,
+                )
+            module.exit_json(changed=changed, vm_rebooted=reboot, diff=diff, vms=vms)
+        else:
+            changed, reboot, diff = run(module, rest_client)
+            module.exit_json(changed=changed, vm_rebooted=reboot, diff=diff)
     except ScaleComputingError as e:
         module.fail_json(msg=str(e))
 
@@ -0,0 +1,225 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+# language=yaml
+DOCUMENTATION = r"""
+module: vm_power
+
+author:
+  - Justin Cinkelj (@justinc1)
+short_description: Change power state of many VMs
+description:
+  - Start, shutdown, stop, reboot or reset many VMs in a single task.
+  - VMs are selected by name with I(vm_names), or by tags with I(vm_tags).
+  - Power actions are sent concurrently, up to I(concurrency) VMs at the same time.
+    Shutdown and stop are then waited for in a single polling loop for all VMs.
+  - VM has I(shutdown_timeout) time to respond to shutdown request.
+    If VM is not shutoff within I(shutdown_timeout),
+    then a force shutdown is issued if C(force_stop=true).
+version_added: 1.7.0
+extends_documentation_fragment:
+  - scale_computing.hypercore.cluster_instance
+seealso:
+  - module: scale_computing.hypercore.vm_params
+options:
+  vm_names:
+    description:
+      - Names of VMs.
+      - All VMs must exist.
+      - Exactly one of I(vm_names) and I(vm_tags) is required.
+    type: list
+    elements: str
+  vm_tags:
+    description:
+      - Select all VMs which have all of the listed tags.
+      - Must not be empty, an empty list would select all VMs.
+    type: list
+    elements: str
+  power_state:
+    description:
+      - Desired VM power action.
+      - I(start), I(shutdown) and I(stop) are sent only to VMs which are not
+        already in the desired state.
+      - I(reboot) and I(reset) are sent only to running VMs.
+      - Note that
+        - I(shutdown) will trigger a graceful ACPI shutdown.
+        - I(reboot) will trigger a graceful ACPI reboot.
+        - I(stop) will trigger an abrupt shutdown (force power off).
+          VM might loose data, and filesystem might be corrupted afterwards.
+        - I(reset) will trigger an abrupt reset (force power reset).
+          VM might loose data, and filesystem might be corrupted afterwards.
+    choices: [ start, shutdown, stop, reboot, reset ]
+    type: str
+    required: true
+  shutdown_timeout:
+    description:
+      - How long does ansible controller wait for VM to power off,
+        after shutdown or stop request was sent to the VM.
+      - In seconds.
+    type: float
+    default: 300
+  force_stop:
+    description:
+      - Stop VMs which did not shutdown within I(shutdown_timeout).
+    type: bool
+    default: false
+  concurrency:
+    description:
+      - Max number of VMs with power action in progress at the same time.
+    type: int
+    default: 8
+notes:
+  - C(check_mode) is supported.
+    Power actions are not sent, and C(changed) reports VMs which would be changed.
+"""
+
+
+# language=yaml
+EXAMPLES = r"""
+- name: Shutdown VMs, force stop them if they do not shutdown in 5 minutes
+  scale_computing.hypercore.vm_power:
+    vm_tags:
+      - maintenance
+    power_state: shutdown
+    shutdown_timeout: 300
+    force_stop: true
+  register: shutdown_result
+
+- name: Start VMs which were running before
+  scale_computing.hypercore.vm_power:
+    vm_names: "{{ shutdown_result.vms | selectattr('changed') | map(attribute='vm_name') }}"
+    power_state: start
+"""
+
+
+# language=yaml
+RETURN = r"""
+vms:
+  description:
+    - Result for each selected VM.
+  returned: success
+  type: list
+  elements: dict
+  contains:
+    vm_name:
+      description: VM name.
+      type: str
+      sample: demo-vm
+    uuid:
+      description: VM UUID.
+      type: str
+      sample: f0c91f97-cbfc-40f8-b918-ab77ae8ea7fb
+    changed:
+      description: Info if power action was sent to the VM.
+      type: bool
+      sample: true
+    forced:
+      description: Info if VM was stopped, because it did not shutdown within I(shutdown_timeout).
+      type: bool
+      sample: false
+    power_state_before:
+      description: VM power state before the power action.
+      type: str
+      sample: started
+    power_state:
+      description: VM power state after the power action.
+      type: str
+      sample: stopped
+    duration:
+      description:
+        - Seconds from sending power action until VM reached desired state.
+        - C(null) if power action was not sent.
+      type: float
+      sample: 12.345
+    error:
+      description: Error message, if power action failed.
+      type: str
+      sample: null
+"""
+
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils import arguments, errors
+from ..module_utils.client import Client
+from ..module_utils.rest_client import RestClient
+from ..module_utils.vm import VM, ManageVMPower
+from typing import Any, Dict, List, Tuple
+
+
+def run(
+    module: AnsibleModule, rest_client: RestClient
+) -> Tuple[bool, List[Dict[str, Any]]]:
+    vm_dicts = VM.list_records_by_names_or_tags(
+        rest_client, module.params["vm_names"], module.params["vm_tags"]
+    )
+    vms = ManageVMPower.set_power_state_many(module, rest_client, vm_dicts)
+    return any(vm["changed"] for vm in vms), vms
+
+
+def main() -> None:
+    module = AnsibleModule(
+        supports_check_mode=True,
+        argument_spec=dict(
+            arguments.get_spec("cluster_instance"),
+            vm_names=dict(
+                type="list",
+                elements="str",
+            ),
+            vm_tags=dict(
+                type="list",
+                elements="str",
+            ),
+            power_state=dict(
+                type="str",
+                choices=["start", "shutdown", "stop", "reboot", "reset"],
+                required=True,
+            ),
+            shutdown_timeout=dict(
+                type="float",
+                default=300,
+            ),
+            force_stop=dict(
+                type="bool",
+                default=False,
+            ),
+            concurrency=dict(
+                type="int",
+                default=8,
+            ),
+        ),
+        mutually_exclusive=[("vm_names", "vm_tags")],
+        required_one_of=[("vm_names", "vm_tags")],
+    )
+    if module.params["concurrency"] < 1:
+        module.fail_json(msg="concurrency must be at least 1.")
+
+    try:
+        client = Client.get_client(module.params["cluster_instance"])
+        rest_client = RestClient(client)
+        changed, vms = run(module, rest_client)
+        failed = [vm for vm in vms if vm["error"]]
+        if failed:
+            module.fail_json(
+                msg="Power action failed for VMs - {0}".format(
+                    "; ".join(
+                        "{0}: {1}".format(vm["vm_name"], vm["error"]) for vm in failed
+                    )
+                ),
+                changed=changed,
+                vms=vms,
+            )
+        module.exit_json(changed=changed, vms=vms)
+    except errors.ScaleComputingError as e:
+        module.fail_json(msg=str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -39,6 +39,22 @@ options:
     description:
       - List snapshots by this desired serial
     required: False
+  since_timestamp:
+    type: int
+    description:
+      - List only snapshots created at or after this Unix timestamp.
+      - Use I(cursor) returned by the previous run, so periodic runs
+        return only snapshots created since then.
+      - The cursor is inclusive, because snapshot timestamps have a resolution of one second.
+        Snapshots created in the same second as I(cursor) are returned again by the next run,
+        so callers should deduplicate snapshots by I(snapshot_uuid).
+      - Snapshots are selected by their creation I(timestamp).
+        Snapshots which arrive by replication keep the creation timestamp from the source cluster,
+        and are not returned if that timestamp is older than I(since_timestamp).
+      - HyperCore still sends all snapshots, but older ones are skipped
+        before they are converted and returned.
+    required: False
+    version_added: 1.7.0
 """
 
 
@@ -71,6 +87,11 @@ EXAMPLES = r"""
     vm_name: example-vm
     serial: 0
   register: vm_snapshot
+
+- name: List VM snapshots created since the previous run
+  scale_computing.hypercore.vm_snapshot_info:
+    since_timestamp: "{{ previous_vm_snapshot.cursor }}"
+  register: vm_snapshot
 """
 
 # language=yaml
@@ -144,6 +165,26 @@ records:
       description: name of the source VM
       type: str
       sample: snapshot-test-vm-1
+filter_stats:
+  description:
+    - Number of snapshots read from HyperCore, and number of snapshots matching the filter.
+  returned: success
+  type: dict
+  version_added: 1.7.0
+  sample:
+    scanned: 120
+    returned: 3
+cursor:
+  description:
+    - Largest I(timestamp) of the returned snapshots.
+    - If no snapshot is returned, this is I(since_timestamp),
+      or C(0) if I(since_timestamp) is not set.
+    - Pass it as I(since_timestamp) to the next run.
+      Snapshots with I(timestamp) equal to the cursor are returned again.
+  returned: success
+  type: int
+  version_added: 1.7.0
+  sample: 1679397326
 """
 
 
@@ -153,15 +194,24 @@ from ..module_utils import errors, arguments
 from ..module_utils.client import Client
 from ..module_utils.rest_client import RestClient
 from ..module_utils.vm_snapshot import VMSnapshot
-from ..module_utils.typed_classes import TypedVMSnapshotToAnsible
-from typing import List
+from ..module_utils.typed_classes import (
+    TypedVMSnapshotToAnsible,
+    TypedFilterStatsToAnsible,
+)
+from typing import List, Tuple
 
 
 def run(
     module: AnsibleModule, rest_client: RestClient
-) -> List[TypedVMSnapshotToAnsible]:
-    filtered = VMSnapshot.filter_snapshots_by_params(module.params, rest_client)
-    return filtered
+) -> Tuple[List[TypedVMSnapshotToAnsible], TypedFilterStatsToAnsible, int]:
+    filtered, filter_stats = VMSnapshot.filter_snapshots_by_params(
+        module.params, rest_client
+    )
+    cursor = max(
+        (snapshot["timestamp"] or 0 for snapshot in filtered),
+        default=module.params["since_timestamp"] or 0,
+    )
+    return filtered, filter_stats, cursor
 
 
 def main() -> None:
@@ -175,14 +225,17 @@ def main() -> None:
             ),
             label=dict(type="str", required=False),
             serial=dict(type="int", required=False),
+            since_timestamp=dict(type="int", required=False),
         ),
     )
 
     try:
         client = Client.get_client(module.params["cluster_instance"])
         rest_client = RestClient(client)
-        records = run(module, rest_client)
-        module.exit_json(changed=False, records=records)
+        records, filter_stats, cursor = run(module, rest_client)
+        module.exit_json(
+            changed=False, records=records, filter_stats=filter_stats, cursor=cursor
+        )
     except errors.ScaleComputingError as e:
         module.fail_json(msg=str(e))
 
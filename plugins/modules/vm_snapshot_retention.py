@@ -0,0 +1,337 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+# language=yaml
+DOCUMENTATION = r"""
+module: vm_snapshot_retention
+
+author:
+  - Justin Cinkelj (@justinc1)
+short_description: Delete VM snapshots which violate a retention policy
+description:
+  - Delete old VM snapshots on all VMs, or on selected VMs, in a single task.
+  - Snapshots are read once, and retention policy is evaluated for each VM separately.
+  - Snapshots are deleted concurrently, up to I(concurrency) snapshots at the same time.
+  - A snapshot with C(local_retain_until_timestamp) in the future is never deleted.
+version_added: 1.7.0
+extends_documentation_fragment:
+  - scale_computing.hypercore.cluster_instance
+seealso:
+  - module: scale_computing.hypercore.vm_snapshot
+  - module: scale_computing.hypercore.vm_snapshot_info
+options:
+  vm_names:
+    description:
+      - Apply retention policy only to snapshots of these VMs.
+      - If not set, snapshots of all VMs are processed.
+        An empty list selects no snapshot.
+    type: list
+    elements: str
+  label_pattern:
+    description:
+      - Apply retention policy only to snapshots with label matching this
+        Python regular expression.
+      - The pattern is searched for anywhere in the label, use C(^) and C($) to match the whole label.
+      - If not set, snapshots with any label are processed.
+    type: str
+  types:
+    description:
+      - Apply retention policy only to snapshots of these types.
+    type: list
+    elements: str
+    choices: [ user, automated, support ]
+    default: [ user ]
+  keep_last:
+    description:
+      - Keep this many newest processed snapshots of each VM,
+        and delete the older ones.
+      - At least one of I(keep_last) and I(max_age_days) is required.
+        If both are set, a snapshot is deleted if it violates any of them.
+      - C(keep_last=0) deletes all processed snapshots,
+        so it requires I(vm_names) or I(label_pattern).
+    type: int
+  max_age_days:
+    description:
+      - Delete processed snapshots older than this many days.
+      - C(max_age_days=0) deletes all processed snapshots,
+        so it requires I(vm_names) or I(label_pattern).
+    type: int
+  concurrency:
+    description:
+      - Max number of snapshot deletes in progress at the same time.
+    type: int
+    default: 8
+notes:
+  - C(check_mode) is supported.
+    Snapshots are not deleted, and C(snapshots) reports snapshots which would be deleted.
+"""
+
+
+# language=yaml
+EXAMPLES = r"""
+- name: Keep last 3 snapshots with label starting with "nightly-" on each VM
+  scale_computing.hypercore.vm_snapshot_retention:
+    label_pattern: "^nightly-"
+    keep_last: 3
+
+- name: Delete user snapshots of selected VMs older than 30 days
+  scale_computing.hypercore.vm_snapshot_retention:
+    vm_names:
+      - demo-vm-1
+      - demo-vm-2
+    max_age_days: 30
+    concurrency: 4
+  register: retention_result
+"""
+
+
+# language=yaml
+RETURN = r"""
+snapshots:
+  description:
+    - Snapshots which violate the retention policy.
+    - Snapshots which do not violate the policy are not listed.
+  returned: success
+  type: list
+  elements: dict
+  contains:
+    snapshot_uuid:
+      description: Snapshot's unique identifier.
+      type: str
+      sample: 28d6ff95-2c31-4a1a-b3d9-47535164d6de
+    vm_name:
+      description: Name of the source VM.
+      type: str
+      sample: demo-vm-1
+    vm_uuid:
+      description: UUID of the source VM.
+      type: str
+      sample: 5e50977c-14ce-450c-8a1a-bf5c0afbcf43
+    label:
+      description: Snapshot label.
+      type: str
+      sample: nightly-2024-01-01
+    timestamp:
+      description: Unix timestamp of when snapshot was created.
+      type: int
+      sample: 1679397326
+    reasons:
+      description: Violated policy options.
+      type: list
+      elements: str
+      sample:
+        - keep_last
+        - max_age_days
+    retained_until:
+      description:
+        - C(local_retain_until_timestamp) of the snapshot, if it is in the future.
+          Such snapshot is not deleted.
+        - C(null) otherwise.
+      type: int
+      sample: null
+    changed:
+      description: Info if snapshot was deleted.
+      type: bool
+      sample: true
+    error:
+      description: Error message, if delete failed.
+      type: str
+      sample: null
+"""
+
+
+import re
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils import arguments, errors
+from ..module_utils.client import Client
+from ..module_utils.rest_client import RestClient
+from ..module_utils.task_tag import TaskTag
+from ..module_utils.vm_snapshot import VMSnapshot
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def matches_scope(params: Dict[str, Any], hypercore_dict: Dict[str, Any]) -> bool:
+    # Empty vm_names selects nothing, only unset vm_names selects all VMs.
+    if (
+        params["vm_names"] is not None
+        and hypercore_dict["domain"]["name"] not in params["vm_names"]
+    ):
+        return False
+    if hypercore_dict["type"].lower() not in params["types"]:
+        return False
+    if params["label_pattern"] and not re.search(
+        params["label_pattern"], hypercore_dict["label"] or ""
+    ):
+        return False
+    return True
+
+
+def get_violations(
+    params: Dict[str, Any], hypercore_dicts: Iterable[Dict[str, Any]], now: float
+) -> List[Dict[str, Any]]:
+    """
+    Returns a result dict for each snapshot which violates the retention policy.
+    Policy is evaluated on raw HyperCore data, snapshots are grouped by VM UUID.
+    """
+    snapshots_by_vm: Dict[str, List[Dict[str, Any]]] = {}
+    for hypercore_dict in hypercore_dicts:
+        if matches_scope(params, hypercore_dict):
+            snapshots_by_vm.setdefault(hypercore_dict["domainUUID"], []).append(
+                hypercore_dict
+            )
+
+    results = []
+    for vm_snapshots in snapshots_by_vm.values():
+        vm_snapshots.sort(key=lambda snapshot: snapshot["timestamp"], reverse=True)
+        for index, hypercore_dict in enumerate(vm_snapshots):
+            reasons = []
+            if params["keep_last"] is not None and index >= params["keep_last"]:
+                reasons.append("keep_last")
+            if (
+                params["max_age_days"] is not None
+                and hypercore_dict["timestamp"]
+                < now - params["max_age_days"] * SECONDS_PER_DAY
+            ):
+                reasons.append("max_age_days")
+            if not reasons:
+                continue
+            retained_until: Optional[int] = hypercore_dict["localRetainUntilTimestamp"]
+            if not retained_until or retained_until <= now:
+                retained_until = None
+            results.append(
+                dict(
+                    snapshot_uuid=hypercore_dict["uuid"],
+                    vm_name=hypercore_dict["domain"]["name"],
+                    vm_uuid=hypercore_dict["domainUUID"],
+                    label=hypercore_dict["label"],
+                    timestamp=hypercore_dict["timestamp"],
+                    reasons=reasons,
+                    retained_until=retained_until,
+                    changed=retained_until is None,
+                    error=None,
+                )
+            )
+    return sorted(results, key=lambda result: (result["vm_name"], result["timestamp"]))
+
+
+def run(
+    module: AnsibleModule, rest_client: RestClient
+) -> Tuple[bool, List[Dict[str, Any]]]:
+    # All snapshots are read in a single listing.
+    results = get_violations(
+        module.params,
+        rest_client.iter_records("/rest/v1/VirDomainSnapshot"),
+        time.time(),
+    )
+    to_delete = [result for result in results if result["changed"]]
+    if to_delete and not module.check_mode:
+        # Deletes are sent and waited for in batches of concurrency.
+        delete_errors = TaskTag.submit_and_wait(
+            rest_client,
+            lambda result: VMSnapshot.send_delete_request(
+                rest_client, result["snapshot_uuid"]
+            ),
+            to_delete,
+            module.params["concurrency"],
+        )
+        for result, error in zip(to_delete, delete_errors):
+            if isinstance(error, errors.TaskTagError):
+                result["error"] = "Snapshot delete task failed."
+            elif error:
+                result["error"] = str(error)
+            result["changed"] = not result["error"]
+    return any(result["changed"] for result in results), results
+
+
+def main() -> None:
+    module = AnsibleModule(
+        supports_check_mode=True,
+        argument_spec=dict(
+            arguments.get_spec("cluster_instance"),
+            vm_names=dict(
+                type="list",
+                elements="str",
+            ),
+            label_pattern=dict(
+                type="str",
+            ),
+            types=dict(
+                type="list",
+                elements="str",
+                choices=["user", "automated", "support"],
+                default=["user"],
+            ),
+            keep_last=dict(
+                type="int",
+            ),
+            max_age_days=dict(
+                type="int",
+            ),
+            concurrency=dict(
+                type="int",
+                default=8,
+            ),
+        ),
+        required_one_of=[("keep_last", "max_age_days")],
+    )
+    if module.params["concurrency"] < 1:
+        module.fail_json(msg="concurrency must be at least 1.")
+    for option in ("keep_last", "max_age_days"):
+        if module.params[option] is not None and module.params[option] < 0:
+            module.fail_json(msg="{0} must not be negative.".format(option))
+        # A typo must not delete every snapshot on the cluster.
+        if (
+            module.params[option] == 0
+            and module.params["vm_names"] is None
+            and not module.params["label_pattern"]
+        ):
+            module.fail_json(
+                msg="{0}=0 deletes all snapshots, it requires vm_names or label_pattern.".format(
+                    option
+                )
+            )
+    if module.params["label_pattern"]:
+        try:
+            re.compile(module.params["label_pattern"])
+        except re.error as e:
+            module.fail_json(msg="Invalid label_pattern: {0}".format(e))
+
+    try:
+        client = Client.get_client(module.params["cluster_instance"])
+        rest_client = RestClient(client)
+        changed, snapshots = run(module, rest_client)
+        failed = [snapshot for snapshot in snapshots if snapshot["error"]]
+        if failed:
+            module.fail_json(
+                msg="Snapshot delete failed - {0}".format(
+                    "; ".join(
+                        "{0} {1}: {2}".format(
+                            snapshot["vm_name"],
+                            snapshot["snapshot_uuid"],
+                            snapshot["error"],
+                        )
+                        for snapshot in failed
+                    )
+                ),
+                changed=changed,
+                snapshots=snapshots,
+            )
+        module.exit_json(changed=changed, snapshots=snapshots)
+    except errors.ScaleComputingError as e:
+        module.fail_json(msg=str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,584 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Offline stand-in for HyperCore REST API.
+
+HyperCoreState holds records of the simulated cluster, HyperCoreSimulator serves
+them over HTTP on localhost, so modules can be run with the real Client and RestClient.
+Every request is recorded, which allows counting requests per module run.
+
+Only what modules need is simulated:
+- login/logout, session cookie is required
+- GET of a collection and of a single record ({endpoint}/{uuid})
+- POST/PATCH/DELETE on VirDomain, VirDomainBlockDevice, VirDomainNetDevice,
+  VirDomainSnapshot and ISO, VM power actions and clone
+- TaskTag, task is RUNNING for task_duration seconds
+
+VirDomain records embed blockDevs, netDevs and snapUUIDs, and VirDomainSnapshot
+records embed domain, same as in HyperCore.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import copy
+import json
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ansible.module_utils import basic
+from ansible.module_utils._text import to_bytes
+from ansible.module_utils.six.moves.urllib.parse import unquote, urlsplit
+
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.tracing import (
+    endpoint_template,
+)
+
+API = "/rest/v1/"
+HYPERCORE_VERSION = "9.4.0.123456"
+
+# Collections with records embedded into VirDomain, key is VirDomain field.
+VM_DEVICE_COLLECTIONS = dict(
+    blockDevs="VirDomainBlockDevice",
+    netDevs="VirDomainNetDevice",
+)
+
+POWER_ACTION_STATE = dict(
+    START="RUNNING",
+    REBOOT="RUNNING",
+    RESET="RUNNING",
+    SHUTDOWN="SHUTOFF",
+    STOP="SHUTOFF",
+)
+
+# vm module parameters matching "vm-0001" of HyperCoreState.synthetic().
+SYNTHETIC_VM_PARAMS = dict(
+    vm_name="vm-0001",
+    state="present",
+    memory=1073741824,
+    vcpu=2,
+    power_state="start",
+    operating_system="os_other",
+    disks=[
+        dict(type="virtio_disk", disk_slot=0, size=10**10),
+        dict(type="virtio_disk", disk_slot=1, size=10**10),
+    ],
+    nics=[dict(type="virtio", vlan=0)],
+)
+
+
+def node_record(uuid, index):
+    return dict(
+        uuid=uuid,
+        backplaneIP=f"10.0.0.{index + 1}",
+        lanIP=f"10.5.0.{index + 1}",
+        peerID=index + 1,
+    )
+
+
+def vm_record(uuid, name, node_uuid, tags="", state="RUNNING"):
+    # Without blockDevs, netDevs and snapUUIDs, they are added by HyperCoreState.
+    return dict(
+        uuid=uuid,
+        nodeUUID=node_uuid,
+        name=name,
+        tags=tags,
+        description="",
+        mem=1073741824,
+        state=state,
+        numVCPU=2,
+        bootDevices=[],
+        attachGuestToolsISO=False,
+        operatingSystem="os_other",
+        affinityStrategy=dict(
+            strictAffinity=False,
+            preferredNodeUUID=node_uuid,
+            backupNodeUUID="",
+        ),
+        snapshotScheduleUUID="",
+        machineType="scale-7.2",
+        sourceVirDomainUUID="",
+        cloudInitData=None,
+        latestTaskTag=None,
+        desiredDisposition=None,
+        snapshotSerialNumber=0,
+        created=0,
+    )
+
+
+def block_device_record(uuid, vm_uuid, slot, type="VIRTIO_DISK", capacity=10**10):
+    return dict(
+        uuid=uuid,
+        virDomainUUID=vm_uuid,
+        type=type,
+        cacheMode="WRITETHROUGH",
+        capacity=capacity,
+        slot=slot,
+        name="",
+        path="",
+        disableSnapshotting=False,
+        tieringPriorityFactor=8,
+        mountPoints=[],
+        readOnly=False,
+    )
+
+
+def net_device_record(uuid, vm_uuid, vlan=0, ipv4_addresses=None):
+    return dict(
+        uuid=uuid,
+        virDomainUUID=vm_uuid,
+        type="VIRTIO",
+        macAddress="7C:4C:58:{0:02X}:{1:02X}:{2:02X}".format(
+            *uuid.encode("ascii")[-3:]
+        ),
+        vlan=vlan,
+        connected=True,
+        ipv4Addresses=list(ipv4_addresses or []),
+    )
+
+
+def iso_record(uuid, name):
+    return dict(
+        uuid=uuid,
+        name=name,
+        path=f"scribe/{uuid}",
+        size=1048576,
+        readyForInsert=True,
+        mounts=[],
+    )
+
+
+def snapshot_record(uuid, vm_uuid, label, timestamp=0):
+    # Without domain, it is added by HyperCoreState.
+    return dict(
+        uuid=uuid,
+        domainUUID=vm_uuid,
+        label=label,
+        type="USER",
+        timestamp=timestamp,
+        automatedTriggerTimestamp=0,
+        localRetainUntilTimestamp=0,
+        remoteRetainUntilTimestamp=0,
+        blockCountDiffFromSerialNumber=0,
+        replication=True,
+        deviceSnapshots=[],
+    )
+
+
+def cluster_record(uuid):
+    return dict(uuid=uuid, clusterName="simulated", icosVersion=HYPERCORE_VERSION)
+
+
+class HyperCoreState:
+    """
+    Records of a simulated HyperCore cluster, by collection name and uuid.
+    Not thread safe, HyperCoreSimulator serializes access.
+    """
+
+    def __init__(self):
+        self.collections = {}
+        self.tasks = {}
+        # uuid of VM -> list of device/snapshot uuids
+        self._children = {}
+        self._next_id = 0
+        self.add("Cluster", cluster_record(self.new_uuid()))
+
+    def new_uuid(self):
+        # Deterministic, so that repeated benchmark runs send the same requests.
+        self._next_id += 1
+        return str(uuid.UUID(int=self._next_id))
+
+    @classmethod
+    def synthetic(
+        cls,
+        vms=10,
+        nodes=3,
+        disks_per_vm=2,
+        nics_per_vm=1,
+        snapshots_per_vm=1,
+        isos=3,
+    ):
+        """
+        Cluster with VMs named vm-0000, vm-0001, ... spread over nodes.
+        VMs are tagged with their group (every 10th VM is in the same group).
+        """
+        state = cls()
+        node_uuids = [
+            state.add("Node", node_record(state.new_uuid(), i))["uuid"]
+            for i in range(nodes)
+        ]
+        for i in range(isos):
+            state.add("ISO", iso_record(state.new_uuid(), f"iso-{i:04}.iso"))
+        for i in range(vms):
+            vm = state.add_vm(
+                f"vm-{i:04}",
+                node_uuids[i % nodes],
+                tags=f"group-{i % 10},ansible_group__group_{i % 10}",
+                disks=disks_per_vm,
+                nics=nics_per_vm,
+                ipv4_address=f"10.{i // 65536}.{i // 256 % 256}.{i % 256}",
+            )
+            for j in range(snapshots_per_vm):
+                state.add_snapshot(vm["uuid"], f"snap-{j}", timestamp=1700000000 + j)
+        return state
+
+    def add(self, collection, record):
+        self.collections.setdefault(collection, {})[record["uuid"]] = record
+        return record
+
+    def add_vm(
+        self, name, node_uuid="", tags="", disks=1, nics=1, ipv4_address=None, **kwargs
+    ):
+        vm = self.add("VirDomain", vm_record(self.new_uuid(), name, node_uuid, tags))
+        vm.update(kwargs)
+        self._children[vm["uuid"]] = []
+        for slot in range(disks):
+            self.add_device(
+                "VirDomainBlockDevice",
+                block_device_record(self.new_uuid(), vm["uuid"], slot),
+            )
+        for i in range(nics):
+            self.add_device(
+                "VirDomainNetDevice",
+                net_device_record(
+                    self.new_uuid(),
+                    vm["uuid"],
+                    vlan=i,
+                    ipv4_addresses=[ipv4_address] if ipv4_address and i == 0 else [],
+                ),
+            )
+        return vm
+
+    def add_device(self, collection, record):
+        self.add(collection, record)
+        self._children[record["virDomainUUID"]].append((collection, record["uuid"]))
+        return record
+
+    def add_snapshot(self, vm_uuid, label, timestamp=0):
+        snapshot = self.add(
+            "VirDomainSnapshot",
+            snapshot_record(self.new_uuid(), vm_uuid, label, timestamp),
+        )
+        self._children[vm_uuid].append(("VirDomainSnapshot", snapshot["uuid"]))
+        return snapshot
+
+    def remove(self, collection, uuid):
+        record = self.collections.get(collection, {}).pop(uuid)
+        vm_uuid = record.get("virDomainUUID") or record.get("domainUUID")
+        if vm_uuid in self._children:
+            self._children[vm_uuid].remove((collection, uuid))
+        for child in self._children.pop(uuid, []):
+            self.collections[child[0]].pop(child[1])
+        return record
+
+    def view(self, collection, record):
+        # Record as returned by HyperCore, with embedded records.
+        if collection == "VirDomain":
+            children = self._children[record["uuid"]]
+            record = dict(record)
+            for field, device_collection in VM_DEVICE_COLLECTIONS.items():
+                devices = [
+                    self.collections[c][child_uuid]
+                    for c, child_uuid in children
+                    if c == device_collection
+                ]
+                record[field] = sorted(devices, key=lambda d: d.get("slot", 0))
+            record["snapUUIDs"] = [
+                child_uuid for c, child_uuid in children if c == "VirDomainSnapshot"
+            ]
+        elif collection == "VirDomainSnapshot":
+            vm = self.collections["VirDomain"].get(record["domainUUID"])
+            record = dict(record, domain=self.view("VirDomain", vm) if vm else None)
+        return record
+
+    def list(self, collection):
+        return [
+            self.view(collection, record)
+            for record in self.collections.get(collection, {}).values()
+        ]
+
+    def get(self, collection, uuid):
+        record = self.collections.get(collection, {}).get(uuid)
+        return None if record is None else self.view(collection, record)
+
+    def new_task(self, object_uuid, duration):
+        task_tag = str(len(self.tasks) + 1)
+        self.tasks[task_tag] = dict(
+            taskTag=task_tag,
+            objectUUID=object_uuid,
+            finished=time.monotonic() + duration,
+        )
+        return dict(taskTag=task_tag, createdUUID=object_uuid)
+
+    def task_status(self, task_tag):
+        task = self.tasks.get(task_tag)
+        if task is None:
+            return None
+        complete = time.monotonic() >= task["finished"]
+        return dict(
+            taskTag=task_tag,
+            objectUUID=task["objectUUID"],
+            state="COMPLETE" if complete else "RUNNING",
+            progressPercent=100 if complete else 50,
+            formattedDescription="",
+            formattedMessage="",
+            messages=[],
+        )
+
+
+class HyperCoreSimulator:
+    """
+    HTTP server serving HyperCoreState on localhost, in a background thread.
+    latency (seconds) is added to every request, and every task is RUNNING
+    for task_duration seconds.
+
+        with HyperCoreSimulator(HyperCoreState.synthetic(vms=100)) as sim:
+            client = Client(sim.url, "admin", "admin", None, "local")
+            ...
+            sim.request_counts()
+    """
+
+    def __init__(self, state=None, latency=0.0, task_duration=0.0):
+        self.state = state or HyperCoreState()
+        self.latency = latency
+        self.task_duration = task_duration
+        self.requests = []
+        self.sessions = set()
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{0}".format(self._server.server_port)
+
+    def start(self):
+        simulator = self
+
+        class Handler(_Handler):
+            pass
+
+        Handler.simulator = simulator
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def reset_requests(self):
+        with self._lock:
+            self.requests = []
+
+    def request_counts(self):
+        """
+        Number of requests by "METHOD endpoint-template", like "GET /rest/v1/VirDomain/{uuid}".
+        """
+        with self._lock:
+            return Counter(
+                f"{method} {endpoint_template(path)}" for method, path in self.requests
+            )
+
+    def handle(self, method, path, headers, body):
+        # Returns (status, response data)
+        with self._lock:
+            self.requests.append((method, path))
+        if self.latency:
+            time.sleep(self.latency)
+        url_path = urlsplit(path).path
+        if not url_path.startswith(API):
+            return 404, dict(error="not found")
+        parts = [unquote(p) for p in url_path.replace(API, "", 1).split("/") if p]
+        if not parts:
+            return 404, dict(error="not found")
+        with self._lock:
+            if parts == ["login"] and method == "POST":
+                session_id = self.state.new_uuid()
+                self.sessions.add(session_id)
+                return 200, dict(sessionID=session_id)
+            cookie = headers.get("Cookie") or ""
+            if cookie.replace("sessionID=", "", 1) not in self.sessions:
+                return 401, dict(error="unauthorized")
+            if parts == ["logout"]:
+                return 200, {}
+            handler = getattr(self, "_" + method.lower(), None)
+            if handler is None:
+                return 405, dict(error="method not allowed")
+            return handler(parts, body)
+
+    def _get(self, parts, body):
+        if parts[0] == "TaskTag" and len(parts) == 2:
+            status = self.state.task_status(parts[1])
+            return (404, []) if status is None else (200, [status])
+        if len(parts) == 1:
+            return 200, self.state.list(parts[0])
+        record = self.state.get(parts[0], parts[1])
+        if record is None:
+            return 404, dict(error="not found")
+        return 200, [record]
+
+    def _post(self, parts, body):
+        state = self.state
+        if parts == ["VirDomain", "action"]:
+            for action in body:
+                vm = state.collections["VirDomain"][action["virDomainUUID"]]
+                vm["state"] = POWER_ACTION_STATE[action["actionType"]]
+            return 200, state.new_task("", self.task_duration)
+        if parts == ["VirDomain"]:
+            return 200, self._create_vm(body["dom"])
+        if len(parts) == 3 and parts[0] == "VirDomain" and parts[2] == "clone":
+            source = state.get("VirDomain", parts[1])
+            dom = dict(source, **body.get("template", {}))
+            return 200, self._create_vm(dom)
+        if parts == ["VirDomainSnapshot"]:
+            snapshot = state.add_snapshot(body["domainUUID"], body.get("label", ""))
+            return 200, state.new_task(snapshot["uuid"], self.task_duration)
+        if parts[0] in VM_DEVICE_COLLECTIONS.values() and len(parts) == 1:
+            record = self._new_device(parts[0], body)
+            return 200, state.new_task(record["uuid"], self.task_duration)
+        if parts == ["ISO"]:
+            record = state.add("ISO", iso_record(state.new_uuid(), body["name"]))
+            return 200, state.new_task(record["uuid"], self.task_duration)
+        return 404, dict(error="not found")
+
+    def _patch(self, parts, body):
+        record = self.state.collections.get(parts[0], {}).get(
+            parts[1] if len(parts) == 2 else ""
+        )
+        if record is None:
+            return 404, dict(error="not found")
+        record.update((k, v) for k, v in body.items() if k not in VM_DEVICE_COLLECTIONS)
+        return 200, self.state.new_task(record["uuid"], self.task_duration)
+
+    def _delete(self, parts, body):
+        if len(parts) != 2 or parts[1] not in self.state.collections.get(parts[0], {}):
+            return 404, dict(error="not found")
+        self.state.remove(parts[0], parts[1])
+        return 200, self.state.new_task("", self.task_duration)
+
+    def _create_vm(self, dom):
+        state = self.state
+        vm = state.add_vm(
+            dom["name"],
+            node_uuid=next(iter(state.collections.get("Node", {})), ""),
+            tags=dom.get("tags", ""),
+            disks=0,
+            nics=0,
+            state="SHUTOFF",
+        )
+        for field in ("description", "mem", "numVCPU", "operatingSystem"):
+            if field in dom:
+                vm[field] = dom[field]
+        for field, collection in VM_DEVICE_COLLECTIONS.items():
+            for device in dom.get(field, []):
+                self._new_device(collection, dict(device, virDomainUUID=vm["uuid"]))
+        return state.new_task(vm["uuid"], self.task_duration)
+
+    def _new_device(self, collection, body):
+        state = self.state
+        vm_uuid = body["virDomainUUID"]
+        if collection == "VirDomainBlockDevice":
+            record = block_device_record(
+                state.new_uuid(), vm_uuid, 0, body["type"], body.get("capacity", 0)
+            )
+            used_slots = [
+                disk["slot"]
+                for disk in state.view(
+                    "VirDomain", state.collections["VirDomain"][vm_uuid]
+                )["blockDevs"]
+                if disk["type"] == body["type"]
+            ]
+            record["slot"] = body.get("slot", max(used_slots, default=-1) + 1)
+        else:
+            record = net_device_record(state.new_uuid(), vm_uuid, body.get("vlan", 0))
+        record.update(
+            (k, copy.deepcopy(v))
+            for k, v in body.items()
+            if k in record and k not in ("uuid", "slot")
+        )
+        return state.add_device(collection, record)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Buffered, response headers and body are sent together (no Nagle delays).
+    wbufsize = -1
+    simulator = None
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        body = json.loads(raw_body) if raw_body[:1] in (b"{", b"[") else None
+        status, data = self.simulator.handle(
+            self.command, self.path, self.headers, body
+        )
+        payload = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+class ModuleExit(Exception):
+    def __init__(self, failed, result):
+        super(ModuleExit, self).__init__("Module exited")
+        self.failed = failed
+        self.result = result
+
+
+def run_module(mocker, module, simulator, params):
+    """
+    Runs module main() against the simulator, with real Client and RestClient.
+    Returns (failed, result).
+    """
+
+    def exit_json(self, **result):
+        raise ModuleExit(False, result)
+
+    def fail_json(self, **result):
+        raise ModuleExit(True, result)
+
+    args = dict(
+        _ansible_remote_tmp="/tmp",
+        _ansible_keep_remote_files=False,
+        cluster_instance=dict(
+            host=simulator.url,
+            username="admin",
+            password="admin",
+            timeout=None,
+            auth_method="local",
+        ),
+    )
+    args.update(params)
+    mocker.patch.object(
+        basic, "_ANSIBLE_ARGS", to_bytes(json.dumps(dict(ANSIBLE_MODULE_ARGS=args)))
+    )
+    mocker.patch.multiple(basic.AnsibleModule, exit_json=exit_json, fail_json=fail_json)
+    try:
+        module.main()
+    except ModuleExit as e:
+        return e.failed, e.result
+    raise AssertionError("Module is not calling exit_json or fail_json.")
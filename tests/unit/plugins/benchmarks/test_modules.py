@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Benchmarks - modules and inventory plugin are run against simulated clusters
+of increasing size, number of requests and wall time are recorded.
+
+By default small clusters are used, so the benchmarks also run as unit tests.
+Environ variables:
+- SC_BENCHMARK_SIZES - comma separated number of VMs, like "10,100,500,2000"
+- SC_BENCHMARK_LATENCY - seconds added to every simulated request, default 0
+- SC_BENCHMARK_OUTPUT - file where results are appended as JSON lines
+- SC_BENCHMARK_INVENTORY_VMS - number of VMs in inventory tag parsing benchmark,
+  default 10000
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import sys
+import time
+
+import pytest
+
+from ansible.inventory.data import InventoryData
+
+from ansible_collections.scale_computing.hypercore.plugins.inventory.hypercore import (
+    InventoryModule,
+)
+from ansible_collections.scale_computing.hypercore.plugins.modules import (
+    vm,
+    vm_disk,
+    vm_info,
+    vm_snapshot_info,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+from ansible_collections.scale_computing.hypercore.tests.unit.plugins.benchmarks.simulator import (
+    HyperCoreSimulator,
+    HyperCoreState,
+    SYNTHETIC_VM_PARAMS,
+    run_module,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+SIZES = [
+    int(size) for size in os.environ.get("SC_BENCHMARK_SIZES", "10,100").split(",")
+]
+LATENCY = float(os.environ.get("SC_BENCHMARK_LATENCY", "0"))
+INVENTORY_VMS = int(os.environ.get("SC_BENCHMARK_INVENTORY_VMS", "10000"))
+
+NEW_VM = dict(SYNTHETIC_VM_PARAMS, vm_name="new-vm")
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size}vms")
+def simulator(request):
+    state = HyperCoreState.synthetic(vms=request.param)
+    with HyperCoreSimulator(state, latency=LATENCY) as sim:
+        yield sim
+
+
+def record(name, simulator, elapsed):
+    counts = simulator.request_counts()
+    result = dict(
+        benchmark=name,
+        vms=len(simulator.state.collections["VirDomain"]),
+        requests=sum(counts.values()),
+        elapsed=round(elapsed, 6),
+        latency=simulator.latency,
+        request_counts=dict(counts),
+    )
+    write_result(result)
+    return result
+
+
+def write_result(result):
+    path = os.environ.get("SC_BENCHMARK_OUTPUT")
+    if path:
+        with open(path, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+
+def benchmark_module(mocker, simulator, name, module, params):
+    start = time.monotonic()
+    failed, result = run_module(mocker, module, simulator, params)
+    elapsed = time.monotonic() - start
+    assert not failed, result
+    return result, record(name, simulator, elapsed)
+
+
+class TestBenchmarkModules:
+    def test_vm_info_all(self, mocker, simulator):
+        result, stats = benchmark_module(mocker, simulator, "vm_info_all", vm_info, {})
+
+        assert len(result["records"]) == stats["vms"]
+
+    def test_vm_info_by_name(self, mocker, simulator):
+        result, stats = benchmark_module(
+            mocker, simulator, "vm_info_by_name", vm_info, dict(vm_name="vm-0001")
+        )
+
+        assert [record["vm_name"] for record in result["records"]] == ["vm-0001"]
+
+    def test_vm_unchanged(self, mocker, simulator):
+        result, stats = benchmark_module(
+            mocker, simulator, "vm_unchanged", vm, SYNTHETIC_VM_PARAMS
+        )
+
+        assert result["changed"] is False
+
+    def test_vm_create(self, mocker, simulator):
+        result, stats = benchmark_module(mocker, simulator, "vm_create", vm, NEW_VM)
+
+        assert result["changed"] is True
+        assert result["record"][0]["vm_name"] == "new-vm"
+
+    def test_vm_disk_add(self, mocker, simulator):
+        result, stats = benchmark_module(
+            mocker,
+            simulator,
+            "vm_disk_add",
+            vm_disk,
+            dict(
+                vm_name="vm-0001",
+                state="present",
+                items=[dict(type="virtio_disk", disk_slot=2, size=10**9)],
+            ),
+        )
+
+        assert result["changed"] is True
+        assert len(result["record"]) == 3
+
+    def test_vm_snapshot_info_all(self, mocker, simulator):
+        result, stats = benchmark_module(
+            mocker, simulator, "vm_snapshot_info_all", vm_snapshot_info, {}
+        )
+
+        assert len(result["records"]) == stats["vms"]
+
+    def test_vm_snapshot_info_by_vm(self, mocker, simulator):
+        result, stats = benchmark_module(
+            mocker,
+            simulator,
+            "vm_snapshot_info_by_vm",
+            vm_snapshot_info,
+            dict(vm_name="vm-0001"),
+        )
+
+        assert len(result["records"]) == 1
+
+
+class TestBenchmarkInventory:
+    def test_inventory(self, mocker, simulator):
+        mocker.patch.dict(
+            os.environ,
+            dict(SC_HOST=simulator.url, SC_USERNAME="admin", SC_PASSWORD="admin"),
+        )
+        plugin = InventoryModule()
+        mocker.patch.object(plugin, "read_config_data").return_value = dict(
+            plugin="scale_computing.hypercore.hypercore"
+        )
+        mocker.patch.object(plugin, "set_options")
+        mocker.patch.object(plugin, "get_option", return_value=False)
+        inventory = mocker.MagicMock()
+
+        start = time.monotonic()
+        plugin.parse(inventory, mocker.MagicMock(), "hypercore.yml", cache=False)
+        stats = record("inventory", simulator, time.monotonic() - start)
+
+        assert inventory.add_host.call_count == stats["vms"]
+
+    def test_inventory_tag_parsing(self):
+        # VirDomain payload is parsed and populated into a real inventory,
+        # without HTTP, so that only the plugin code is measured.
+        vms = HyperCoreState.synthetic(
+            vms=INVENTORY_VMS, disks_per_vm=0, snapshots_per_vm=0, isos=0
+        ).list("VirDomain")
+        for index, vm_dict in enumerate(vms):
+            vm_dict["tags"] = ",".join(
+                [
+                    vm_dict["tags"],
+                    "env-prod",
+                    f"team-{index % 7}",
+                    f"ansible_group__team_{index % 7}",
+                    f"ansible_group__tier_{index % 3}",
+                    "ansible_user__admin",
+                    f"ansible_port__22{index % 10}",
+                ]
+            )
+        plugin = InventoryModule()
+        inventory = InventoryData()
+
+        start = time.monotonic()
+        hosts = plugin.get_hosts(dict(), vms)
+        parsed = time.monotonic()
+        plugin.populate(inventory, hosts)
+        end = time.monotonic()
+        write_result(
+            dict(
+                benchmark="inventory_tag_parsing",
+                vms=len(vms),
+                parse=round(parsed - start, 6),
+                populate=round(end - parsed, 6),
+                elapsed=round(end - start, 6),
+            )
+        )
+
+        assert len(inventory.hosts) == len(vms)
+        assert len(inventory.groups["team_0"].hosts) == len(range(0, len(vms), 7))
+        host = inventory.hosts[vms[13]["name"]]
+        assert {"team_6", "tier_1"} <= {group.name for group in host.groups}
+        assert host.vars["ansible_user"] == "admin"
+        assert host.vars["ansible_port"] == 223
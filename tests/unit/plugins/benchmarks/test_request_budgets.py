@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Request-count budgets - every Client.request() call made by a module is recorded,
+and the number of requests must not exceed the budget of the scenario.
+Each scenario is run against clusters of different size, and
+the number of requests must not grow with number of VMs.
+
+If a change needs more requests, raise the budget in the same commit,
+so the increase is visible in review.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import sys
+from collections import Counter
+
+import pytest
+
+from ansible_collections.scale_computing.hypercore.plugins.inventory.hypercore import (
+    InventoryModule,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.client import (
+    Client,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.tracing import (
+    endpoint_template,
+)
+from ansible_collections.scale_computing.hypercore.plugins.modules import (
+    vm,
+    vm_clone,
+    vm_disk,
+    vm_fleet,
+    vm_info,
+    vm_params,
+    vm_power,
+    vm_snapshot_info,
+    vm_snapshot_retention,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+from ansible_collections.scale_computing.hypercore.tests.unit.plugins.benchmarks.simulator import (
+    HyperCoreSimulator,
+    HyperCoreState,
+    SYNTHETIC_VM_PARAMS,
+    run_module,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+# Number of VMs in simulated clusters.
+CLUSTER_SIZES = (5, 50)
+
+# scenario name: (module, params, max number of requests)
+MODULE_BUDGETS = dict(
+    vm_info_all=(vm_info, dict(), 3),
+    vm_info_by_name=(vm_info, dict(vm_name="vm-0001"), 3),
+    # power_state=start reads the VM again, guest OS might have shut it down.
+    vm_unchanged=(vm, SYNTHETIC_VM_PARAMS, 3),
+    vm_create=(vm, dict(SYNTHETIC_VM_PARAMS, vm_name="new-vm"), 9),
+    vm_changed_description=(vm, dict(SYNTHETIC_VM_PARAMS, description="new"), 6),
+    vm_changed_memory=(vm, dict(SYNTHETIC_VM_PARAMS, memory=2147483648), 11),
+    vm_absent=(vm, dict(vm_name="vm-0001", state="absent"), 6),
+    vm_clone_many=(
+        vm_clone,
+        dict(
+            source_vm_name="vm-0001",
+            clones=[dict(vm_name=f"clone-{i}") for i in range(3)],
+        ),
+        10,
+    ),
+    vm_disk_unchanged=(
+        vm_disk,
+        dict(
+            vm_name="vm-0001",
+            state="present",
+            items=[dict(type="virtio_disk", disk_slot=1, size=10**10)],
+        ),
+        5,
+    ),
+    vm_disk_add=(
+        vm_disk,
+        dict(
+            vm_name="vm-0001",
+            state="present",
+            items=[dict(type="virtio_disk", disk_slot=2, size=10**9)],
+        ),
+        8,
+    ),
+    vm_fleet_unchanged=(
+        vm_fleet,
+        dict(
+            vms=[
+                dict(SYNTHETIC_VM_PARAMS, vm_name=vm_name)
+                for vm_name in ["vm-0001", "vm-0002", "vm-0003"]
+            ]
+        ),
+        3,
+    ),
+    vm_fleet_mixed=(
+        vm_fleet,
+        dict(
+            vms=[
+                dict(SYNTHETIC_VM_PARAMS),
+                dict(SYNTHETIC_VM_PARAMS, vm_name="vm-0002", description="new"),
+                dict(SYNTHETIC_VM_PARAMS, vm_name="new-vm-1"),
+                dict(SYNTHETIC_VM_PARAMS, vm_name="new-vm-2"),
+                dict(vm_name="vm-0003", state="absent"),
+            ]
+        ),
+        20,
+    ),
+    vm_params_many_unchanged=(
+        vm_params,
+        dict(vm_names=["vm-0001", "vm-0002", "vm-0003"], description=""),
+        3,
+    ),
+    vm_params_many_changed=(
+        vm_params,
+        dict(vm_names=["vm-0001", "vm-0002", "vm-0003"], description="new"),
+        11,
+    ),
+    vm_power_shutdown=(
+        vm_power,
+        dict(vm_names=["vm-0001", "vm-0002", "vm-0003"], power_state="shutdown"),
+        8,
+    ),
+    vm_snapshot_info_all=(vm_snapshot_info, dict(), 1),
+    vm_snapshot_info_by_vm=(vm_snapshot_info, dict(vm_name="vm-0001"), 1),
+    vm_snapshot_info_since=(
+        vm_snapshot_info,
+        dict(since_timestamp=1700000000),
+        1,
+    ),
+    vm_snapshot_retention_delete=(
+        vm_snapshot_retention,
+        dict(vm_names=["vm-0001", "vm-0002", "vm-0003"], keep_last=0),
+        7,
+    ),
+)
+INVENTORY_BUDGET = 1
+
+
+class RequestRecorder:
+    """
+    Records Client.request() calls, login is not included.
+    """
+
+    def __init__(self, mocker):
+        self.spy = mocker.spy(Client, "request")
+
+    @property
+    def count(self):
+        return self.spy.call_count
+
+    @property
+    def by_endpoint(self):
+        return Counter(
+            f"{c.args[1]} {endpoint_template(c.args[2])}"
+            for c in self.spy.call_args_list
+        )
+
+
+def assert_within_budget(name, counts, budget):
+    # counts - requests by endpoint, for every cluster size
+    totals = [sum(c.values()) for c in counts]
+    details = "\n".join(
+        f"  {size} VMs: {dict(sorted(c.items()))}"
+        for size, c in zip(CLUSTER_SIZES, counts)
+    )
+    assert (
+        max(totals) <= budget
+    ), f"{name}: {max(totals)} requests, budget is {budget}\n{details}"
+    assert (
+        len(set(totals)) == 1
+    ), f"{name}: number of requests depends on number of VMs\n{details}"
+
+
+class TestModuleRequestBudgets:
+    @pytest.mark.parametrize("name", sorted(MODULE_BUDGETS))
+    def test_budget(self, mocker, name):
+        module, params, budget = MODULE_BUDGETS[name]
+        counts = []
+        for size in CLUSTER_SIZES:
+            with HyperCoreSimulator(HyperCoreState.synthetic(vms=size)) as sim:
+                recorder = RequestRecorder(mocker)
+                failed, result = run_module(mocker, module, sim, params)
+                assert not failed, result
+                counts.append(recorder.by_endpoint)
+                mocker.stop(recorder.spy)
+
+        assert_within_budget(name, counts, budget)
+
+
+class TestInventoryRequestBudget:
+    def test_budget(self, mocker):
+        counts = []
+        for size in CLUSTER_SIZES:
+            with HyperCoreSimulator(HyperCoreState.synthetic(vms=size)) as sim:
+                mocker.patch.dict(
+                    os.environ,
+                    dict(SC_HOST=sim.url, SC_USERNAME="admin", SC_PASSWORD="admin"),
+                )
+                plugin = InventoryModule()
+                mocker.patch.object(plugin, "read_config_data").return_value = dict(
+                    plugin="scale_computing.hypercore.hypercore"
+                )
+                mocker.patch.object(plugin, "set_options")
+                mocker.patch.object(plugin, "get_option", return_value=False)
+                recorder = RequestRecorder(mocker)
+                plugin.parse(
+                    mocker.MagicMock(), mocker.MagicMock(), "hypercore.yml", cache=False
+                )
+                counts.append(recorder.by_endpoint)
+                mocker.stop(recorder.spy)
+
+        assert_within_budget("inventory", counts, INVENTORY_BUDGET)
+
+
+class TestAssertWithinBudget:
+    def test_over_budget(self):
+        counts = [Counter({"GET /rest/v1/VirDomain": 2})] * len(CLUSTER_SIZES)
+
+        with pytest.raises(AssertionError, match="2 requests, budget is 1"):
+            assert_within_budget("x", counts, 1)
+
+    def test_grows_with_vms(self):
+        counts = [Counter({"GET /rest/v1/Node/{uuid}": size}) for size in CLUSTER_SIZES]
+
+        with pytest.raises(AssertionError, match="depends on number of VMs"):
+            assert_within_budget("x", counts, 1000)
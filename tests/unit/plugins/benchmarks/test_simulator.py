@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+
+from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
+    errors,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.client import (
+    Client,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.rest_client import (
+    RestClient,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.task_tag import (
+    TaskTag,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+from ansible_collections.scale_computing.hypercore.tests.unit.plugins.benchmarks.simulator import (
+    HyperCoreSimulator,
+    HyperCoreState,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+
+@pytest.fixture
+def simulator():
+    with HyperCoreSimulator(HyperCoreState.synthetic(vms=3)) as sim:
+        yield sim
+
+
+@pytest.fixture
+def rest_client(simulator):
+    return RestClient(Client(simulator.url, "admin", "admin", None, "local"))
+
+
+class TestHyperCoreSimulator:
+    def test_login_required(self, simulator):
+        client = Client(simulator.url, "admin", "admin", None, "local")
+        client._auth_header = dict(Cookie="sessionID=invalid")
+
+        with pytest.raises(errors.AuthError):
+            client.get("/rest/v1/VirDomain")
+
+    def test_list_and_get(self, simulator, rest_client):
+        vms = rest_client.list_records("/rest/v1/VirDomain")
+        vm = rest_client.get_record("/rest/v1/VirDomain", dict(uuid=vms[1]["uuid"]))
+
+        assert [vm["name"] for vm in vms] == ["vm-0000", "vm-0001", "vm-0002"]
+        assert vm == vms[1]
+        assert [disk["slot"] for disk in vm["blockDevs"]] == [0, 1]
+        assert vm["netDevs"][0]["ipv4Addresses"] == ["10.0.0.1"]
+        assert len(vm["snapUUIDs"]) == 1
+        assert simulator.request_counts() == {
+            "POST /rest/v1/login": 1,
+            "GET /rest/v1/VirDomain": 1,
+            "GET /rest/v1/VirDomain/{uuid}": 1,
+        }
+
+    def test_missing(self, rest_client):
+        assert rest_client.get_record("/rest/v1/VirDomain", dict(uuid="x")) is None
+
+    def test_snapshot_embeds_domain(self, rest_client):
+        snapshot = rest_client.list_records("/rest/v1/VirDomainSnapshot")[0]
+
+        assert snapshot["domain"]["name"] == "vm-0000"
+        assert snapshot["domainUUID"] == snapshot["domain"]["uuid"]
+
+    def test_create_device_and_wait(self, simulator, rest_client):
+        vm = rest_client.get_record("/rest/v1/VirDomain", dict(name="vm-0000"))
+
+        task_tag = rest_client.create_record(
+            "/rest/v1/VirDomainBlockDevice",
+            dict(virDomainUUID=vm["uuid"], type="VIRTIO_DISK", capacity=42),
+            False,
+        )
+        TaskTag.wait_task(rest_client, task_tag)
+
+        vm = rest_client.get_record("/rest/v1/VirDomain", dict(name="vm-0000"))
+        assert vm["blockDevs"][-1]["capacity"] == 42
+        assert vm["blockDevs"][-1]["slot"] == 2
+        assert vm["blockDevs"][-1]["uuid"] == task_tag["createdUUID"]
+
+    def test_task_duration(self, simulator, rest_client):
+        simulator.task_duration = 60
+        vm = rest_client.get_record("/rest/v1/VirDomain", dict(name="vm-0000"))
+
+        task_tag = rest_client.update_record(
+            f"/rest/v1/VirDomain/{vm['uuid']}", dict(description="new"), False
+        )
+
+        status = TaskTag.get_task_status(rest_client, task_tag)
+        assert status["state"] == "RUNNING"
+
+    def test_delete_vm(self, simulator, rest_client):
+        vm = rest_client.get_record("/rest/v1/VirDomain", dict(name="vm-0000"))
+
+        rest_client.delete_record(f"/rest/v1/VirDomain/{vm['uuid']}", False)
+
+        assert len(rest_client.list_records("/rest/v1/VirDomain")) == 2
+        assert len(rest_client.list_records("/rest/v1/VirDomainBlockDevice")) == 4
+        assert len(rest_client.list_records("/rest/v1/VirDomainSnapshot")) == 2
+
+    def test_power_action(self, simulator, rest_client):
+        vm = rest_client.get_record("/rest/v1/VirDomain", dict(name="vm-0000"))
+
+        rest_client.create_record(
+            "/rest/v1/VirDomain/action",
+            [dict(virDomainUUID=vm["uuid"], actionType="STOP")],
+            False,
+        )
+
+        assert simulator.state.collections["VirDomain"][vm["uuid"]]["state"] == (
+            "SHUTOFF"
+        )
+
+    def test_latency(self, simulator, rest_client, mocker):
+        sleep_mock = mocker.patch("time.sleep")
+        simulator.latency = 0.5
+
+        rest_client.list_records("/rest/v1/Node")
+
+        sleep_mock.assert_any_call(0.5)
@@ -45,7 +45,18 @@ def client(mocker):
 
 @pytest.fixture
 def rest_client(mocker):
-    return mocker.Mock(spec=RestClient(client=client))
+    rest_client = mocker.Mock(spec=RestClient(client=client))
+    # Every mocked write changes HyperCore data, like in RestClient.writes().
+    rest_client.writes.side_effect = lambda endpoint: sum(
+        write.call_count
+        for write in (
+            rest_client.create_record,
+            rest_client.update_record,
+            rest_client.delete_record,
+            rest_client.put_record,
+        )
+    )
+    return rest_client
 
 
 @pytest.fixture
@@ -58,6 +69,7 @@ def vm(mocker):
 def task_wait():
     task_tag = TaskTag
     task_tag.wait_task = MagicMock(return_value=None)
+    task_tag.wait_tasks = MagicMock(return_value=None)
     return task_tag
 
 
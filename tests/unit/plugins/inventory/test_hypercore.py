@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import sys
+
+import pytest
+
+from ansible_collections.scale_computing.hypercore.plugins.inventory import (
+    hypercore,
+)
+from ansible_collections.scale_computing.hypercore.plugins.inventory.hypercore import (
+    InventoryModule,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+VMS = [
+    dict(
+        name="vm1",
+        tags="ansible_group__grp0,ansible_user__admin,ansible_port__2222",
+        netDevs=[dict(ipv4Addresses=[]), dict(ipv4Addresses=["10.0.0.1"])],
+    ),
+    dict(
+        name="vm2",
+        tags="ansible_host__vm2.example.com,ansible_disable",
+        netDevs=[],
+    ),
+]
+
+
+class TestParseTags:
+    def test_parse_tags(self):
+        flags, groups, variables = InventoryModule.parse_tags(
+            "ansible_enable,ansible_group__b,web,ansible_group__a,ansible_group__b,"
+            "ansible_user__admin,ansible_port__2222,ansible_host__vm.example.com,"
+            "ansible_ssh_private_key_file__/keys/id_rsa,other__value"
+        )
+
+        assert flags == {"ansible_enable", "web"}
+        assert groups == ["b", "a"]
+        assert variables == dict(
+            ansible_user="admin",
+            ansible_port="2222",
+            ansible_host="vm.example.com",
+            ansible_ssh_private_key_file="/keys/id_rsa",
+        )
+
+    def test_parse_tags_empty(self):
+        assert InventoryModule.parse_tags("") == ({""}, [], {})
+
+
+class TestGetHosts:
+    def test_get_hosts(self):
+        hosts = InventoryModule.get_hosts(dict(), VMS)
+
+        assert hosts == [
+            dict(
+                name="vm1",
+                groups=["grp0"],
+                ansible_host="10.0.0.1",
+                ansible_user="admin",
+                ansible_port=2222,
+                ansible_ssh_private_key_file=None,
+            ),
+            dict(
+                name="vm2",
+                groups=[],
+                ansible_host="vm2.example.com",
+                ansible_user=None,
+                ansible_port=None,
+                ansible_ssh_private_key_file=None,
+            ),
+        ]
+
+    def test_get_hosts_ansible_disable(self):
+        hosts = InventoryModule.get_hosts(dict(look_for_ansible_disable=True), VMS)
+
+        assert [host["name"] for host in hosts] == ["vm1"]
+
+    @pytest.mark.parametrize(
+        "cfg,expected",
+        [
+            (dict(look_for_ansible_enable=True), ["vm-enabled", "vm-both"]),
+            (
+                dict(look_for_ansible_enable=True, look_for_ansible_disable=True),
+                ["vm-enabled"],
+            ),
+            (dict(look_for_ansible_disable=False), ["vm", "vm-enabled", "vm-both"]),
+        ],
+    )
+    def test_get_hosts_ansible_enable(self, cfg, expected):
+        vms = [
+            dict(name="vm", tags="", netDevs=[]),
+            dict(name="vm-enabled", tags="ansible_enable", netDevs=[]),
+            dict(name="vm-both", tags="ansible_enable,ansible_disable", netDevs=[]),
+        ]
+
+        hosts = InventoryModule.get_hosts(cfg, vms)
+
+        assert [host["name"] for host in hosts] == expected
+
+
+class TestPopulate:
+    def test_get_host_variables(self):
+        hosts = InventoryModule.get_hosts(dict(), VMS)
+
+        assert InventoryModule.get_host_variables(hosts[1]) == dict(
+            ansible_user="root",
+            ansible_port=22,
+            ansible_host="vm2.example.com",
+        )
+
+    def test_get_host_variables_ssh_key(self):
+        hosts = InventoryModule.get_hosts(
+            dict(),
+            [
+                dict(
+                    name="vm",
+                    tags="ansible_ssh_private_key_file__/keys/id_rsa",
+                    netDevs=[],
+                )
+            ],
+        )
+
+        assert InventoryModule.get_host_variables(hosts[0]) == dict(
+            ansible_user="root",
+            ansible_port=22,
+            ansible_host="vm",
+            ansible_ssh_private_key_file="/keys/id_rsa",
+        )
+
+    def test_populate(self, mocker):
+        vms = [
+            dict(
+                name=f"vm{i}",
+                tags="ansible_group__grp0,ansible_group__grp1",
+                netDevs=[],
+            )
+            for i in range(3)
+        ] + [dict(name="vm3", tags="", netDevs=[])]
+        inventory = mocker.MagicMock()
+
+        InventoryModule().populate(inventory, InventoryModule.get_hosts(dict(), vms))
+
+        assert inventory.add_group.call_args_list == [
+            mocker.call("grp0"),
+            mocker.call("grp1"),
+        ]
+        assert inventory.add_host.call_args_list == [
+            mocker.call(f"vm{i}") for i in range(4)
+        ]
+        assert inventory.add_child.call_count == 6
+        inventory.add_child.assert_any_call("grp1", "vm2")
+        inventory.set_variable.assert_any_call("vm3", "ansible_user", "root")
+
+
+class TestParseCache:
+    @pytest.fixture
+    def plugin(self, mocker):
+        mocker.patch.dict(
+            os.environ,
+            dict(SC_HOST="https://1.2.3.4", SC_USERNAME="admin", SC_PASSWORD="admin"),
+        )
+        mocker.patch.object(hypercore, "Client")
+        rest_client = mocker.patch.object(hypercore, "RestClient").return_value
+        rest_client.iter_records.return_value = VMS
+        plugin = InventoryModule()
+        mocker.patch.object(plugin, "read_config_data").return_value = dict(
+            plugin="scale_computing.hypercore.hypercore", cache=True
+        )
+        mocker.patch.object(plugin, "set_options")
+        mocker.patch.object(plugin, "load_cache_plugin")
+        plugin.options = dict(cache=True)
+        mocker.patch.object(
+            plugin, "get_option", side_effect=lambda name: plugin.options[name]
+        )
+        plugin._cache = dict()
+        return plugin, rest_client
+
+    def test_cache_miss(self, mocker, plugin):
+        plugin, rest_client = plugin
+        inventory = mocker.MagicMock()
+
+        plugin.parse(inventory, mocker.MagicMock(), "hypercore.yml", cache=True)
+
+        rest_client.iter_records.assert_called_once()
+        cache_key = plugin.get_cache_key("hypercore.yml:https://1.2.3.4")
+        assert plugin._cache[cache_key] == InventoryModule.get_hosts(dict(), VMS)
+        inventory.add_group.assert_called_once_with("grp0")
+        inventory.add_child.assert_called_once_with("grp0", "vm1")
+        inventory.set_variable.assert_any_call("vm1", "ansible_host", "10.0.0.1")
+
+    def test_cache_hit(self, mocker, plugin):
+        plugin, rest_client = plugin
+        inventory = mocker.MagicMock()
+        cache_key = plugin.get_cache_key("hypercore.yml:https://1.2.3.4")
+        plugin._cache[cache_key] = InventoryModule.get_hosts(dict(), VMS)
+
+        plugin.parse(inventory, mocker.MagicMock(), "hypercore.yml", cache=True)
+
+        rest_client.iter_records.assert_not_called()
+        inventory.add_host.assert_any_call("vm2")
+        inventory.set_variable.assert_any_call("vm1", "ansible_port", 2222)
+
+    def test_cache_flush(self, mocker, plugin):
+        plugin, rest_client = plugin
+        cache_key = plugin.get_cache_key("hypercore.yml:https://1.2.3.4")
+        plugin._cache[cache_key] = []
+
+        plugin.parse(
+            mocker.MagicMock(), mocker.MagicMock(), "hypercore.yml", cache=False
+        )
+
+        rest_client.iter_records.assert_called_once()
+        assert len(plugin._cache[cache_key]) == 2
+
+    def test_cache_disabled(self, mocker, plugin):
+        plugin, rest_client = plugin
+        plugin.options = dict(cache=False)
+
+        plugin.parse(
+            mocker.MagicMock(), mocker.MagicMock(), "hypercore.yml", cache=True
+        )
+
+        rest_client.iter_records.assert_called_once()
+        assert plugin._cache == {}
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import os
+import stat
+import sys
+
+import pytest
+
+from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
+    checksum,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.checksum import (
+    DigestStore,
+    file_digest,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+
+class TestFileDigest:
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.iso"
+        path.write_bytes(b"")
+        assert file_digest(str(path)) == "sha256:" + hashlib.sha256(b"").hexdigest()
+
+    def test_multiple_blocks(self, mocker, tmp_path):
+        mocker.patch.object(checksum, "DIGEST_BLOCK_SIZE", 7)
+        data = b"0123456789" * 10
+        path = tmp_path / "image.iso"
+        path.write_bytes(data)
+        assert file_digest(str(path)) == "sha256:" + hashlib.sha256(data).hexdigest()
+
+    def test_algorithm(self, tmp_path):
+        path = tmp_path / "image.iso"
+        path.write_bytes(b"data")
+        assert (
+            file_digest(str(path), "md5") == "md5:" + hashlib.md5(b"data").hexdigest()
+        )
+
+
+class TestDigestStore:
+    def test_from_module_params(self, tmp_path):
+        store = DigestStore.from_module_params(
+            dict(
+                checksum_dir=str(tmp_path),
+                cluster_instance=dict(host="https://1.2.3.4"),
+            )
+        )
+        assert store.directory == str(tmp_path)
+        assert store.path.startswith(str(tmp_path))
+        assert "1.2.3.4" not in store.path
+
+    def test_per_host(self, tmp_path):
+        store_a = DigestStore(str(tmp_path), "https://1.2.3.4")
+        store_b = DigestStore(str(tmp_path), "https://1.2.3.5")
+        store_a.set("ISO/id", "sha256:aa")
+        assert store_a.get("ISO/id") == "sha256:aa"
+        assert store_b.get("ISO/id") is None
+
+    def test_set_get_delete(self, tmp_path):
+        store = DigestStore(str(tmp_path / "sc"), "https://1.2.3.4")
+        assert store.get("ISO/id") is None
+        store.set("ISO/id", "sha256:aa")
+        store.set("VirtualDisk/id", "sha256:bb")
+        assert store.get("ISO/id") == "sha256:aa"
+
+        store.delete("ISO/id")
+
+        assert store.get("ISO/id") is None
+        assert store.get("VirtualDisk/id") == "sha256:bb"
+        assert stat.S_IMODE(os.stat(store.path).st_mode) == 0o600
+        assert stat.S_IMODE(os.stat(str(tmp_path / "sc")).st_mode) == 0o700
+
+    def test_is_changed(self, tmp_path):
+        store = DigestStore(str(tmp_path), "https://1.2.3.4")
+        store.set("ISO/id", "sha256:aa")
+        assert store.is_changed("ISO/id", "sha256:aa") is False
+        assert store.is_changed("ISO/id", "sha256:bb") is True
+
+    def test_is_changed_first_use(self, tmp_path):
+        # Digest of objects uploaded without checksum is recorded as baseline.
+        store = DigestStore(str(tmp_path), "https://1.2.3.4")
+        assert store.is_changed("ISO/id", "sha256:aa") is None
+        assert store.get("ISO/id") == "sha256:aa"
+        assert store.is_changed("ISO/id", "sha256:aa") is False
+
+    def test_corrupted_file(self, tmp_path):
+        store = DigestStore(str(tmp_path), "https://1.2.3.4")
+        with open(store.path, "w") as f:
+            f.write("not-json")
+        assert store.get("ISO/id") is None
+        store.set("ISO/id", "sha256:aa")
+        assert store.get("ISO/id") == "sha256:aa"
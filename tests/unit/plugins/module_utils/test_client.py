@@ -8,6 +8,7 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import io
+import os
 import sys
 
 import pytest
@@ -19,6 +20,7 @@ from ansible.module_utils.six.moves.urllib.parse import urlparse, parse_qs
 from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
     client,
     errors,
+    tracing,
 )
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
     MIN_PYTHON_VERSION,
@@ -76,6 +78,37 @@ class TestResponseInit:
 
         assert json_mock.loads.call_count == 1
 
+    @pytest.mark.parametrize(
+        "data,expected",
+        [
+            ('[{"a": 1}, {"a": 2}]', [dict(a=1), dict(a=2)]),
+            ('{"a": 1}', [dict(a=1)]),
+        ],
+    )
+    def test_iter_json(self, data, expected):
+        resp = client.Response(200, data)
+
+        assert list(resp.iter_json()) == expected
+
+    def test_iter_json_stream(self, mocker):
+        stream = mocker.MagicMock(wraps=io.BytesIO(b'[{"a": 1}, {"a": 2}]'))
+        resp = client.Response(200, None, stream=stream)
+
+        records = resp.iter_json()
+        assert next(records) == dict(a=1)
+        stream.close.assert_not_called()
+        assert list(records) == [dict(a=2)]
+        stream.close.assert_called_once()
+
+    def test_close_stream(self, mocker):
+        stream = mocker.MagicMock()
+        resp = client.Response(200, None, stream=stream)
+
+        resp.close()
+        resp.close()
+
+        stream.close.assert_called_once()
+
 
 class TestClientInit:
     @pytest.mark.parametrize("host", [None, "", "invalid", "missing.schema"])
@@ -89,6 +122,18 @@ class TestClientInit:
     def test_valid_host(self, host):
         client.Client(host, "user", "pass", None, "local")
 
+    def test_keep_alive(self, mocker):
+        c = client.Client("https://instance.com", "user", "pass", None, "local")
+        assert isinstance(c._client, client.ConnectionPool)
+        assert c.connection_stats == dict(connections_opened=0, connections_reused=0)
+
+    def test_keep_alive_disabled(self, mocker):
+        mocker.patch.object(client, "SC_HTTP_KEEP_ALIVE", False)
+        request_mock = mocker.patch.object(client, "Request")
+        c = client.Client("https://instance.com", "user", "pass", None, "local")
+        assert c._client == request_mock.return_value
+        assert c.connection_stats == {}
+
 
 class TestClientAuthHeader:
     def test_basic_auth(self, mocker):
@@ -98,7 +143,7 @@ class TestClientAuthHeader:
             '{"sessionID":"7e3a2a70-7130-41c4-9402-fc0953cc1d7b"}'.encode("utf-8")
         )
 
-        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock = mocker.patch.object(client, "ConnectionPool").return_value
         request_mock.open.return_value = resp_mock
 
         c = client.Client("https://instance.com", "user", "pass", None, "local")
@@ -107,6 +152,61 @@ class TestClientAuthHeader:
         }
 
 
+class TestClientSessionCache:
+    @staticmethod
+    def login_response(mocker, session_id):
+        resp_mock = mocker.MagicMock(status=200)
+        resp_mock.read.return_value = ('{"sessionID":"%s"}' % session_id).encode(
+            "utf-8"
+        )
+        return resp_mock
+
+    def test_cached_session_is_reused(self, mocker, tmp_path):
+        mocker.patch.dict(os.environ, dict(SC_SESSION_CACHE_DIR=str(tmp_path)))
+        request_mock = mocker.patch.object(client, "ConnectionPool").return_value
+        request_mock.open.return_value = self.login_response(mocker, "session-1")
+
+        c1 = client.Client("https://instance.com", "user", "pass", None, "local")
+        c2 = client.Client("https://instance.com", "user", "pass", None, "local")
+
+        assert c1.auth_header == {"Cookie": "sessionID=session-1"}
+        assert c2.auth_header == {"Cookie": "sessionID=session-1"}
+        request_mock.open.assert_called_once()
+
+    def test_expired_cached_session_login_again(self, mocker, tmp_path):
+        mocker.patch.dict(os.environ, dict(SC_SESSION_CACHE_DIR=str(tmp_path)))
+        request_mock = mocker.patch.object(client, "ConnectionPool").return_value
+        data_response = mocker.MagicMock(status=200)
+        data_response.read.return_value = b"[]"
+        request_mock.open.side_effect = [
+            self.login_response(mocker, "session-1"),
+            HTTPError("", 401, "Unauthorized", {}, None),
+            self.login_response(mocker, "session-2"),
+            data_response,
+        ]
+        client.Client("https://instance.com", "user", "pass", None, "local").auth_header
+
+        c = client.Client("https://instance.com", "user", "pass", None, "local")
+        resp = c.get("/rest/v1/VirDomain")
+
+        assert resp.json == []
+        assert c.auth_header == {"Cookie": "sessionID=session-2"}
+        assert request_mock.open.call_count == 4
+
+    def test_fresh_session_auth_error(self, mocker, tmp_path):
+        mocker.patch.dict(os.environ, dict(SC_SESSION_CACHE_DIR=str(tmp_path)))
+        request_mock = mocker.patch.object(client, "ConnectionPool").return_value
+        request_mock.open.side_effect = [
+            self.login_response(mocker, "session-1"),
+            HTTPError("", 401, "Unauthorized", {}, None),
+        ]
+
+        c = client.Client("https://instance.com", "user", "pass", None, "local")
+        with pytest.raises(errors.AuthError):
+            c.get("/rest/v1/VirDomain")
+        assert request_mock.open.call_count == 2
+
+
 class TestClientRequest:
     def test_request_without_data_success(self, mocker):
         c = client.Client("https://instance.com", "user", "pass", None, "local")
@@ -125,6 +225,7 @@ class TestClientRequest:
             data=None,
             headers=dict(Accept="application/json", **c.auth_header),
             timeout=None,
+            stream=False,
         )
         assert resp == mock_response
 
@@ -153,7 +254,7 @@ class TestClientRequest:
         assert resp == mock_response
 
     def test_auth_error(self, mocker):
-        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock = mocker.patch.object(client, "ConnectionPool").return_value
         request_mock.open.side_effect = HTTPError("", 401, "Unauthorized", {}, None)
 
         c = client.Client("https://instance.com", "user", "pass", None, "local")
@@ -162,7 +263,7 @@ class TestClientRequest:
             c.request("GET", "api/rest/v1/some/path")
 
     def test_http_error(self, mocker):
-        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock = mocker.patch.object(client, "ConnectionPool").return_value
         request_mock.open.side_effect = HTTPError(
             "", 404, "Not Found", {}, io.StringIO(to_text("My Error"))
         )
@@ -176,7 +277,7 @@ class TestClientRequest:
         assert resp.headers == {}
 
     def test_url_error(self, mocker):
-        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock = mocker.patch.object(client, "ConnectionPool").return_value
         request_mock.open.side_effect = URLError("some error")
 
         c = client.Client("https://instance.com", "user", "pass", None, "local")
@@ -186,7 +287,7 @@ class TestClientRequest:
             c.request("GET", "api/rest/v1/some/path")
 
     def test_path_escaping(self, mocker):
-        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock = mocker.patch.object(client, "ConnectionPool").return_value
         raw_request = mocker.MagicMock(status=200)
         raw_request.read.return_value = "{}"
 
@@ -200,7 +301,7 @@ class TestClientRequest:
 
     @pytest.mark.parametrize("query", [None, {}])
     def test_path_without_query(self, mocker, query):
-        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock = mocker.patch.object(client, "ConnectionPool").return_value
         raw_request = mocker.MagicMock(status=200)
         raw_request.read.return_value = "{}"
 
@@ -221,7 +322,7 @@ class TestClientRequest:
         ],
     )
     def test_path_with_query(self, mocker, query):
-        request_mock = mocker.patch.object(client, "Request").return_value
+        request_mock = mocker.patch.object(client, "ConnectionPool").return_value
         raw_request = mocker.MagicMock(status=200)
         raw_request.read.return_value = "{}"
 
@@ -257,6 +358,7 @@ class TestClientRequest:
                 {"Accept": "image/apng", "Content-type": "text/plain"}, **c.auth_header
             ),
             timeout=None,
+            stream=False,
         )
         assert resp == mock_response
 
@@ -299,9 +401,232 @@ class TestClientGet:
         c.get("api/rest/v1/table/incident/1", query=dict(a="1"))
 
         request_mock.assert_called_with(
-            "GET", "api/rest/v1/table/incident/1", query=dict(a="1"), timeout=None
+            "GET",
+            "api/rest/v1/table/incident/1",
+            query=dict(a="1"),
+            timeout=None,
+            stream=False,
+        )
+
+    def test_stream(self, mocker):
+        c = client.Client("https://instance.com", "user", "pass", None, "local")
+        request_mock = mocker.patch.object(c, "request")
+        request_mock.return_value = client.Response(200, None, None, stream=None)
+
+        c.get("api/rest/v1/VirDomain", stream=True)
+
+        request_mock.assert_called_with(
+            "GET", "api/rest/v1/VirDomain", query=None, timeout=None, stream=True
+        )
+
+
+class TestClientStream:
+    def test_pool_stream(self, mocker):
+        c = client.Client("https://instance.com", "user", "pass", None, "local")
+        raw_resp = mocker.MagicMock(status=200, headers=[])
+        open_mock = mocker.patch.object(c._client, "open", return_value=raw_resp)
+
+        resp = c._request_no_log("GET", "https://instance.com/x", stream=True)
+
+        assert open_mock.call_args.kwargs["stream"] is True
+        assert resp.data is None
+        raw_resp.read.assert_not_called()
+        resp.close()
+        raw_resp.close.assert_called_once()
+
+    def test_request_stream(self, mocker):
+        mocker.patch.object(client, "SC_HTTP_KEEP_ALIVE", False)
+        request_mock = mocker.patch.object(client, "Request")
+        raw_resp = mocker.MagicMock(status=200, headers=[])
+        request_mock.return_value.open.return_value = raw_resp
+        c = client.Client("https://instance.com", "user", "pass", None, "local")
+
+        resp = c._request_no_log("GET", "https://instance.com/x", stream=True)
+
+        # Request.open() has no stream parameter.
+        assert "stream" not in request_mock.return_value.open.call_args.kwargs
+        raw_resp.read.assert_not_called()
+        assert resp._stream == raw_resp
+
+    def test_stream_unexpected_status_is_read(self, mocker):
+        c = client.Client("https://instance.com", "user", "pass", None, "local")
+        raw_resp = mocker.MagicMock(status=204, headers=[])
+        raw_resp.read.return_value = b""
+        mocker.patch.object(c._client, "open", return_value=raw_resp)
+
+        resp = c._request_no_log("GET", "https://instance.com/x", stream=True)
+
+        assert resp.status == 204
+        assert resp.data == b""
+        raw_resp.close.assert_called_once()
+
+
+class TestClientConditionalGet:
+    @staticmethod
+    def get_client(mocker, *responses):
+        c = client.Client("https://instance.com", "user", "pass", None, "local")
+        c._auth_header = {"Cookie": "sessionID=id"}
+        request_mock = mocker.patch.object(c, "_request", side_effect=responses)
+        return c, request_mock
+
+    def test_unchanged_body(self, mocker):
+        c, request_mock = self.get_client(
+            mocker,
+            client.Response(200, '[{"state": "RUNNING"}]'),
+            client.Response(200, '[{"state": "RUNNING"}]'),
+        )
+
+        first = c.get("/rest/v1/TaskTag/1", conditional=True)
+        second = c.get("/rest/v1/TaskTag/1", conditional=True)
+
+        assert second is first
+        assert request_mock.call_count == 2
+        assert c.conditional_stats == dict(conditional_hits=1, conditional_misses=1)
+
+    def test_changed_body(self, mocker):
+        c, request_mock = self.get_client(
+            mocker,
+            client.Response(200, '[{"state": "RUNNING"}]'),
+            client.Response(200, '[{"state": "COMPLETE"}]'),
+        )
+
+        c.get("/rest/v1/TaskTag/1", conditional=True)
+        resp = c.get("/rest/v1/TaskTag/1", conditional=True)
+
+        assert resp.json == [{"state": "COMPLETE"}]
+        assert c.conditional_stats == dict(conditional_hits=0, conditional_misses=2)
+
+    def test_not_modified(self, mocker):
+        c, request_mock = self.get_client(
+            mocker,
+            client.Response(
+                200,
+                '[{"state": "RUNNING"}]',
+                [("ETag", '"v1"'), ("Last-Modified", "Sun, 18 Oct 2026 10:00:00 GMT")],
+            ),
+            client.Response(304, ""),
+        )
+
+        first = c.get("/rest/v1/TaskTag/1", conditional=True)
+        second = c.get("/rest/v1/TaskTag/1", conditional=True)
+
+        assert second is first
+        assert "If-None-Match" not in request_mock.call_args_list[0].kwargs["headers"]
+        headers = request_mock.call_args_list[1].kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Sun, 18 Oct 2026 10:00:00 GMT"
+        assert headers["Cookie"] == "sessionID=id"
+
+    def test_urls_are_separate(self, mocker):
+        c, request_mock = self.get_client(
+            mocker,
+            client.Response(200, "[]"),
+            client.Response(200, "[]"),
         )
 
+        c.get("/rest/v1/TaskTag/1", conditional=True)
+        c.get("/rest/v1/TaskTag/2", conditional=True)
+
+        assert c.conditional_stats == dict(conditional_hits=0, conditional_misses=2)
+
+    def test_missing_is_not_stored(self, mocker):
+        c, request_mock = self.get_client(
+            mocker,
+            client.Response(404, "[]"),
+            client.Response(404, "[]"),
+        )
+
+        c.get("/rest/v1/TaskTag/1", conditional=True)
+        resp = c.get("/rest/v1/TaskTag/1", conditional=True)
+
+        assert resp.status == 404
+        assert c.conditional_stats == dict(conditional_hits=0, conditional_misses=2)
+
+    def test_not_conditional(self, mocker):
+        c, request_mock = self.get_client(
+            mocker,
+            client.Response(200, "[]"),
+            client.Response(200, "[]"),
+        )
+
+        c.get("/rest/v1/TaskTag/1")
+        c.get("/rest/v1/TaskTag/1", conditional=True)
+
+        assert c.conditional_stats == dict(conditional_hits=0, conditional_misses=1)
+
+    def test_bounded(self, mocker):
+        mocker.patch.object(client, "CONDITIONAL_GET_MAXSIZE", 2)
+        c, request_mock = self.get_client(
+            mocker, *[client.Response(200, "[]") for i in range(4)]
+        )
+
+        for path in ("/a", "/b", "/c", "/a"):
+            c.get(path, conditional=True)
+
+        assert list(c._conditional_responses) == [
+            "https://instance.com/c",
+            "https://instance.com/a",
+        ]
+        assert c.conditional_stats == dict(conditional_hits=0, conditional_misses=4)
+
+
+class TestClientTracing:
+    def test_disabled(self, monkeypatch):
+        monkeypatch.delenv("SC_TRACE_FILE", raising=False)
+        c = client.Client("https://instance.com", "user", "pass", None, "local")
+
+        assert c.tracer is None
+        assert c.trace_summary == {}
+
+    def test_request(self, mocker):
+        c = client.Client("https://instance.com", "user", "pass", None, "local")
+        c.tracer = tracing.Tracer()
+        raw_resp = mocker.MagicMock(status=200, headers=[])
+        raw_resp.read.return_value = b'[{"a": 1}]'
+        raw_resp.timing = dict(connect=0.1, tls=0.2, ttfb=0.3, retries=0)
+        mocker.patch.object(c._client, "open", return_value=raw_resp)
+        record_mock = mocker.spy(c.tracer, "record")
+
+        resp = c._request("POST", "https://instance.com/rest/v1/TaskTag/1", data="{}")
+
+        assert resp.timing == raw_resp.timing
+        record_mock.assert_called_once_with(
+            "POST",
+            "https://instance.com/rest/v1/TaskTag/1",
+            200,
+            2,
+            10,
+            mocker.ANY,
+            raw_resp.timing,
+        )
+        assert c.trace_summary["requests"] == 1
+        assert (
+            c.trace_summary["endpoints"][0]["endpoint"] == "POST /rest/v1/TaskTag/{id}"
+        )
+
+    def test_http_error(self, mocker):
+        c = client.Client("https://instance.com", "user", "pass", None, "local")
+        c.tracer = tracing.Tracer()
+        error = HTTPError("", 404, "Not Found", {}, io.StringIO(to_text("Not found")))
+        error.timing = dict(connect=None, tls=None, ttfb=0.1, retries=0)
+        mocker.patch.object(c._client, "open", side_effect=error)
+
+        resp = c._request("GET", "https://instance.com/rest/v1/VirDomain/id")
+
+        assert resp.status == 404
+        assert resp.timing == error.timing
+        assert c.trace_summary["endpoints"][0]["errors"] == 1
+
+    def test_exception(self, mocker):
+        c = client.Client("https://instance.com", "user", "pass", None, "local")
+        c.tracer = tracing.Tracer()
+        mocker.patch.object(c._client, "open", side_effect=TimeoutError("timeout"))
+
+        with pytest.raises(TimeoutError):
+            c._request("GET", "https://instance.com/rest/v1/VirDomain")
+
+        assert c.trace_summary["endpoints"][0]["errors"] == 1
+
 
 class TestClientPost:
     def test_ok(self, mocker):
@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import io
+import socket
+import sys
+import threading
+from time import monotonic
+from http.client import RemoteDisconnected
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
+
+from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
+    connection_pool,
+    errors,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.upload import (
+    UploadMonitor,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+
+def raw_response(mocker, status=200, body=b"{}", will_close=False):
+    resp = mocker.MagicMock(status=status, reason="OK", will_close=will_close)
+    resp.read.return_value = body
+    resp.getheaders.return_value = [("Content-Type", "application/json")]
+    return resp
+
+
+@pytest.fixture
+def https_connection(mocker):
+    mocker.patch.object(connection_pool, "getproxies", return_value={})
+    return mocker.patch.object(connection_pool, "TimedHTTPSConnection")
+
+
+class TestConnectionPool:
+    def test_connection_is_reused(self, mocker, https_connection):
+        conn = https_connection.return_value
+        conn.getresponse.return_value = raw_response(mocker, body=b'{"a": 1}')
+        pool = connection_pool.ConnectionPool()
+
+        resp = pool.open("GET", "https://10.5.11.200/rest/v1/VirDomain")
+        pool.open("GET", "https://10.5.11.200/rest/v1/Node?a=b", timeout=20)
+
+        assert resp.status == 200
+        assert resp.read() == b'{"a": 1}'
+        assert https_connection.call_count == 1
+        assert pool.stats == dict(connections_opened=1, connections_reused=1)
+        assert conn.request.call_args_list[0].args == ("GET", "/rest/v1/VirDomain")
+        assert conn.request.call_args_list[1].args == ("GET", "/rest/v1/Node?a=b")
+
+    def test_connection_per_host(self, mocker, https_connection):
+        conn = https_connection.return_value
+        conn.getresponse.return_value = raw_response(mocker)
+        pool = connection_pool.ConnectionPool()
+
+        pool.open("GET", "https://10.5.11.200/rest/v1/VirDomain")
+        pool.open("GET", "https://10.5.11.201/rest/v1/VirDomain")
+
+        assert pool.stats == dict(connections_opened=2, connections_reused=0)
+
+    def test_closed_connection_is_not_reused(self, mocker, https_connection):
+        conn = https_connection.return_value
+        conn.getresponse.return_value = raw_response(mocker, will_close=True)
+        pool = connection_pool.ConnectionPool()
+
+        pool.open("GET", "https://10.5.11.200/rest/v1/VirDomain")
+        pool.open("GET", "https://10.5.11.200/rest/v1/VirDomain")
+
+        assert pool.stats == dict(connections_opened=2, connections_reused=0)
+        assert conn.close.call_count == 2
+
+    def test_maxsize(self, mocker, https_connection):
+        pool = connection_pool.ConnectionPool(maxsize=1)
+        conn_a = mocker.MagicMock()
+        conn_b = mocker.MagicMock()
+
+        pool._checkin(("https", "10.5.11.200", 443), conn_a)
+        pool._checkin(("https", "10.5.11.200", 443), conn_b)
+
+        conn_a.close.assert_not_called()
+        conn_b.close.assert_called_once()
+
+    @pytest.mark.parametrize("method", ["GET", "HEAD", "PUT"])
+    def test_stale_connection_is_retried(self, mocker, https_connection, method):
+        stale_conn = mocker.MagicMock()
+        stale_conn.getresponse.side_effect = RemoteDisconnected("closed")
+        fresh_conn = https_connection.return_value
+        fresh_conn.getresponse.return_value = raw_response(mocker)
+        pool = connection_pool.ConnectionPool()
+        pool._checkin(("https", "10.5.11.200", 443), stale_conn)
+
+        resp = pool.open(method, "https://10.5.11.200/rest/v1/VirDomain", data="{}")
+
+        assert resp.status == 200
+        stale_conn.close.assert_called_once()
+        fresh_conn.request.assert_called_once_with(
+            method, "/rest/v1/VirDomain", body=b"{}", headers={}
+        )
+
+    @pytest.mark.parametrize("method", ["POST", "PATCH", "DELETE"])
+    def test_sent_request_is_not_retried(self, mocker, https_connection, method):
+        # HyperCore might have processed the request, before closing the connection.
+        stale_conn = mocker.MagicMock()
+        stale_conn.getresponse.side_effect = RemoteDisconnected("closed")
+        pool = connection_pool.ConnectionPool()
+        pool._checkin(("https", "10.5.11.200", 443), stale_conn)
+
+        with pytest.raises(RemoteDisconnected):
+            pool.open(method, "https://10.5.11.200/rest/v1/VirDomain", data="{}")
+        stale_conn.close.assert_called()
+        https_connection.assert_not_called()
+
+    def test_unsent_request_is_retried(self, mocker, https_connection):
+        stale_conn = mocker.MagicMock()
+        stale_conn.request.side_effect = BrokenPipeError()
+        fresh_conn = https_connection.return_value
+        fresh_conn.getresponse.return_value = raw_response(mocker)
+        pool = connection_pool.ConnectionPool()
+        pool._checkin(("https", "10.5.11.200", 443), stale_conn)
+
+        resp = pool.open("POST", "https://10.5.11.200/rest/v1/VirDomain", data="{}")
+
+        assert resp.status == 200
+        stale_conn.getresponse.assert_not_called()
+        fresh_conn.request.assert_called_once_with(
+            "POST", "/rest/v1/VirDomain", body=b"{}", headers={}
+        )
+
+    def test_stream_body_is_not_retried(self, mocker, https_connection):
+        stale_conn = mocker.MagicMock(blocksize=8192)
+        stale_conn.getresponse.side_effect = RemoteDisconnected("closed")
+        pool = connection_pool.ConnectionPool()
+        pool._checkin(("https", "10.5.11.200", 443), stale_conn)
+        body = UploadMonitor().wrap(io.BytesIO(b"data"))
+
+        with pytest.raises(RemoteDisconnected):
+            pool.open("PUT", "https://10.5.11.200/rest/v1/ISO/id/data", data=body)
+        https_connection.assert_not_called()
+
+    def test_upload_send_timeout(self, mocker, https_connection):
+        conn = https_connection.return_value
+        conn.blocksize = 8192
+        conn.sock = mocker.MagicMock()
+        conn.getresponse.return_value = raw_response(mocker)
+        pool = connection_pool.ConnectionPool()
+        body = UploadMonitor(min_rate=1000, window=30).wrap(io.BytesIO(b"data"))
+
+        pool.open(
+            "PUT", "https://10.5.11.200/rest/v1/ISO/id/data", data=body, timeout=3600
+        )
+
+        # Stall window while the body is sent, request timeout for the response.
+        assert [c.args for c in conn.sock.settimeout.call_args_list] == [
+            (3600,),
+            (30,),
+            (3600,),
+        ]
+
+    def test_upload_send_blocked(self, mocker):
+        # Server accepts the connection, but never reads the request.
+        mocker.patch.object(connection_pool, "getproxies", return_value={})
+        server = socket.socket()
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        pool = connection_pool.ConnectionPool()
+        url = f"http://127.0.0.1:{server.getsockname()[1]}/rest/v1/ISO/id/data"
+        body = UploadMonitor(min_rate=100000, window=0.5).wrap(
+            io.BytesIO(b"x" * 64 * 1024 * 1024)
+        )
+        start = monotonic()
+        try:
+            with pytest.raises(
+                errors.UploadStalledError,
+                match="Send did not make progress in 0.5 seconds",
+            ):
+                pool.open("PUT", url, data=body, timeout=3600)
+        finally:
+            pool.close()
+            server.close()
+
+        assert monotonic() - start < 60
+
+    def test_stream(self, mocker, https_connection):
+        conn = https_connection.return_value
+        conn.getresponse.return_value = raw_response(mocker, body=b"[1, 2]")
+        conn.getresponse.return_value.isclosed.return_value = True
+        pool = connection_pool.ConnectionPool()
+
+        with pool.open("GET", "https://10.5.11.200/rest/v1/VM", stream=True) as resp:
+            assert resp.status == 200
+            assert resp.read(100) == b"[1, 2]"
+            # Connection is in use until the response is closed.
+            assert pool._idle == {}
+        pool.open("GET", "https://10.5.11.200/rest/v1/VM")
+
+        assert pool.stats == dict(connections_opened=1, connections_reused=1)
+        conn.close.assert_not_called()
+
+    def test_stream_not_consumed(self, mocker, https_connection):
+        conn = https_connection.return_value
+        conn.getresponse.return_value = raw_response(mocker)
+        conn.getresponse.return_value.isclosed.return_value = False
+        pool = connection_pool.ConnectionPool()
+
+        resp = pool.open("GET", "https://10.5.11.200/rest/v1/VM", stream=True)
+        resp.close()
+        resp.close()
+
+        # Unread body is left on the connection, it cannot be reused.
+        conn.close.assert_called_once()
+        assert pool._idle == {}
+
+    def test_timing(self, mocker, https_connection):
+        conn = https_connection.return_value
+        conn.sock = None
+        conn.connect_time = 0.25
+        conn.tls_time = 0.5
+        conn.getresponse.return_value = raw_response(mocker)
+        pool = connection_pool.ConnectionPool()
+
+        resp = pool.open("GET", "https://10.5.11.200/rest/v1/VirDomain")
+
+        conn.connect.assert_called_once()
+        assert resp.timing["connect"] == 0.25
+        assert resp.timing["tls"] == 0.5
+        assert resp.timing["ttfb"] >= 0
+        assert resp.timing["retries"] == 0
+
+    def test_timing_reused_connection(self, mocker, https_connection):
+        conn = https_connection.return_value
+        conn.getresponse.return_value = raw_response(mocker)
+        pool = connection_pool.ConnectionPool()
+
+        resp = pool.open("GET", "https://10.5.11.200/rest/v1/VirDomain")
+
+        # Connection is already open.
+        conn.connect.assert_not_called()
+        assert resp.timing["connect"] is None
+        assert resp.timing["tls"] is None
+
+    def test_timing_retries(self, mocker, https_connection):
+        stale_conn = mocker.MagicMock()
+        stale_conn.getresponse.side_effect = RemoteDisconnected("closed")
+        https_connection.return_value.getresponse.return_value = raw_response(mocker)
+        pool = connection_pool.ConnectionPool()
+        pool._checkin(("https", "10.5.11.200", 443), stale_conn)
+
+        resp = pool.open("GET", "https://10.5.11.200/rest/v1/VirDomain")
+
+        assert resp.timing["retries"] == 1
+
+    def test_http_error_timing(self, mocker, https_connection):
+        conn = https_connection.return_value
+        conn.getresponse.return_value = raw_response(mocker, status=404, body=b"x")
+        pool = connection_pool.ConnectionPool()
+
+        with pytest.raises(HTTPError) as exc_info:
+            pool.open("GET", "https://10.5.11.200/rest/v1/VirDomain/missing")
+
+        assert exc_info.value.timing["retries"] == 0
+
+    def test_stream_http_error_is_read(self, mocker, https_connection):
+        conn = https_connection.return_value
+        conn.getresponse.return_value = raw_response(mocker, status=404, body=b"x")
+        pool = connection_pool.ConnectionPool()
+
+        with pytest.raises(HTTPError) as exc:
+            pool.open("GET", "https://10.5.11.200/rest/v1/VM/a", stream=True)
+
+        assert exc.value.code == 404
+        assert exc.value.read() == b"x"
+
+    def test_http_error(self, mocker, https_connection):
+        conn = https_connection.return_value
+        conn.getresponse.return_value = raw_response(
+            mocker, status=404, body=b"Not Found"
+        )
+        pool = connection_pool.ConnectionPool()
+
+        with pytest.raises(HTTPError) as exc_info:
+            pool.open("GET", "https://10.5.11.200/rest/v1/VirDomain/missing")
+
+        assert exc_info.value.code == 404
+        assert exc_info.value.read() == b"Not Found"
+        # Response was fully read, connection can be used again.
+        assert pool.stats == dict(connections_opened=1, connections_reused=0)
+        assert len(pool._idle[("https", "10.5.11.200", 443)]) == 1
+
+    def test_connection_error(self, mocker, https_connection):
+        conn = https_connection.return_value
+        conn.request.side_effect = ConnectionRefusedError("refused")
+        pool = connection_pool.ConnectionPool()
+
+        with pytest.raises(URLError) as exc_info:
+            pool.open("GET", "https://10.5.11.200/rest/v1/VirDomain")
+
+        assert isinstance(exc_info.value.args[0], ConnectionRefusedError)
+        conn.close.assert_called_once()
+
+    def test_proxy_uses_request(self, mocker):
+        mocker.patch.object(
+            connection_pool, "getproxies", return_value=dict(https="http://proxy:3128")
+        )
+        mocker.patch.object(connection_pool, "proxy_bypass", return_value=False)
+        request_mock = mocker.patch.object(connection_pool, "Request").return_value
+        https_connection = mocker.patch.object(connection_pool, "TimedHTTPSConnection")
+        pool = connection_pool.ConnectionPool()
+
+        pool.open("GET", "https://10.5.11.200/rest/v1/VirDomain", timeout=5)
+
+        https_connection.assert_not_called()
+        request_mock.open.assert_called_once_with(
+            "GET",
+            "https://10.5.11.200/rest/v1/VirDomain",
+            data=None,
+            headers=None,
+            validate_certs=True,
+            timeout=5,
+        )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"[]")
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTimedHTTPConnection:
+    def test_timing(self, mocker):
+        mocker.patch.object(connection_pool, "getproxies", return_value={})
+        server = HTTPServer(("127.0.0.1", 0), _Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        pool = connection_pool.ConnectionPool()
+        url = f"http://127.0.0.1:{server.server_port}/rest/v1/VirDomain"
+        try:
+            first = pool.open("GET", url, timeout=5)
+            second = pool.open("GET", url, timeout=5)
+        finally:
+            pool.close()
+            server.shutdown()
+            server.server_close()
+
+        assert first.read() == b"[]"
+        assert first.timing["connect"] >= 0
+        assert first.timing["tls"] is None
+        assert first.timing["ttfb"] >= 0
+        assert second.timing["connect"] is None
+        assert pool.stats == dict(connections_opened=1, connections_reused=1)
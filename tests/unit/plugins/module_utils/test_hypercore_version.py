@@ -8,6 +8,7 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import sys
+import ssl
 import pytest
 import json
 
@@ -19,6 +20,10 @@ from ansible_collections.scale_computing.hypercore.plugins.module_utils.hypercor
     Update,
     UpdateStatus,
 )
+from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
+    errors,
+    wait,
+)
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
     MIN_PYTHON_VERSION,
 )
@@ -405,3 +410,72 @@ class TestUpdateStatus:
         rest_client.client.get.assert_called_with("update/update_status.json")
 
         assert update_status is None
+
+
+class TestUpdateStatusWaitFinished:
+    @staticmethod
+    def update_status(status):
+        return UpdateStatus(
+            from_build="207183",
+            percent="100",
+            prepare_status="",
+            update_status=status,
+            update_status_details="",
+            usernotes="",
+            to_build="209840",
+            to_version="9.1.18.209840",
+        )
+
+    def test_wait_finished(self, rest_client, mocker):
+        mocker.patch.object(wait, "sleep")
+        get_mock = mocker.patch.object(UpdateStatus, "get")
+        get_mock.side_effect = [
+            self.update_status("IN PROGRESS"),
+            ConnectionRefusedError("HyperCore is restarting"),
+            self.update_status("COMPLETE"),
+        ]
+
+        status = UpdateStatus.wait_finished(rest_client, 600)
+
+        assert status == self.update_status("COMPLETE")
+        assert get_mock.call_count == 3
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            ssl.SSLEOFError("EOF occurred in violation of protocol"),
+            ssl.SSLZeroReturnError("TLS/SSL connection has been closed"),
+            # Client raises other URLErrors as ScaleComputingError
+            errors.ScaleComputingError("[Errno 113] No route to host"),
+        ],
+    )
+    def test_wait_finished_url_error(self, rest_client, mocker, error):
+        mocker.patch.object(wait, "sleep")
+        get_mock = mocker.patch.object(UpdateStatus, "get")
+        get_mock.side_effect = [error, self.update_status("COMPLETE")]
+
+        status = UpdateStatus.wait_finished(rest_client, 600)
+
+        assert status == self.update_status("COMPLETE")
+        assert get_mock.call_count == 2
+
+    def test_wait_finished_auth_error(self, rest_client, mocker):
+        mocker.patch.object(wait, "sleep")
+        mocker.patch.object(UpdateStatus, "get").side_effect = errors.AuthError(
+            "Failed to authenticate with the instance"
+        )
+
+        with pytest.raises(errors.AuthError):
+            UpdateStatus.wait_finished(rest_client, 600)
+
+    def test_wait_finished_timeout(self, rest_client, mocker):
+        mocker.patch.object(wait, "sleep")
+        mocker.patch.object(wait, "monotonic", side_effect=[0, 10, 700])
+        mocker.patch.object(UpdateStatus, "get").side_effect = [
+            self.update_status("IN PROGRESS"),
+            ConnectionRefusedError("HyperCore is restarting"),
+        ]
+
+        status = UpdateStatus.wait_finished(rest_client, 600)
+
+        assert status == self.update_status("IN PROGRESS")
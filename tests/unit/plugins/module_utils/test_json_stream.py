@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import io
+import json
+import sys
+
+import pytest
+
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.errors import (
+    ApiResponseNotJson,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.json_stream import (
+    iter_json_array,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+RECORDS = [
+    dict(uuid="id-1", name='vm [1], "a"', tags="a,b", blockDevs=[dict(size=1)]),
+    dict(uuid="id-2", name="vm-čšž-\U0001F600", tags="", blockDevs=[]),
+    12345678,
+    -1.5e10,
+    None,
+    True,
+    "]",
+    [],
+]
+
+
+class TestIterJsonArray:
+    @pytest.mark.parametrize("read_size", [1, 2, 3, 7, 64 * 1024])
+    def test_records(self, read_size):
+        body = json.dumps(RECORDS, ensure_ascii=False).encode("utf-8")
+
+        records = list(iter_json_array(io.BytesIO(body).read, read_size=read_size))
+
+        assert records == RECORDS
+
+    @pytest.mark.parametrize("body", [b"[]", b"  [ \n ]  ", b"[\n]"])
+    def test_empty(self, body):
+        assert list(iter_json_array(io.BytesIO(body).read, read_size=1)) == []
+
+    def test_whitespace(self):
+        body = b' [ {"a": 1} ,\n\t2 , "x" ] '
+
+        assert list(iter_json_array(io.BytesIO(body).read, read_size=2)) == [
+            dict(a=1),
+            2,
+            "x",
+        ]
+
+    def test_is_lazy(self, mocker):
+        read = mocker.MagicMock(side_effect=[b'[{"a": 1}, ', b'{"a": 2}]', b""])
+
+        records = iter_json_array(read)
+
+        assert next(records) == dict(a=1)
+        assert read.call_count == 1
+        assert list(records) == [dict(a=2)]
+
+    def test_large_record_is_read_in_growing_chunks(self, mocker):
+        body = json.dumps([dict(data="x" * 10000)]).encode("utf-8")
+        stream = io.BytesIO(body)
+        read = mocker.MagicMock(side_effect=stream.read)
+
+        assert list(iter_json_array(read, read_size=10)) == [dict(data="x" * 10000)]
+        # Read size is doubled, instead of reading 1000 chunks of 10 bytes.
+        assert read.call_count < 20
+
+    def test_not_array(self):
+        body = b' {"sessionID": "abc"} '
+
+        assert list(iter_json_array(io.BytesIO(body).read, read_size=3)) == [
+            dict(sessionID="abc")
+        ]
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            b"",
+            b"not-json",
+            b"[1, 2",
+            b'[{"a": 1}',
+            b"[1 2]",
+            b"[1,, 2]",
+            b"[,1]",
+            b"[1,]",
+            b'[{"a": }]',
+        ],
+    )
+    def test_invalid(self, body):
+        with pytest.raises(ApiResponseNotJson):
+            list(iter_json_array(io.BytesIO(body).read, read_size=2))
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+
+from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
+    response_cache,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.response_cache import (
+    ResponseCache,
+    affected_collections,
+    collection_of,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+
+@pytest.mark.parametrize(
+    "endpoint, expected",
+    [
+        ("/rest/v1/VirDomain", "/rest/v1/VirDomain"),
+        ("/rest/v1/VirDomain/", "/rest/v1/VirDomain"),
+        ("/rest/v1/VirDomain/vm-uuid", "/rest/v1/VirDomain"),
+        ("/rest/v1/VirDomain/vm-uuid/clone", "/rest/v1/VirDomain"),
+        ("rest/v1/ISO/iso-uuid/data", "/rest/v1/ISO"),
+    ],
+)
+def test_collection_of(endpoint, expected):
+    assert collection_of(endpoint) == expected
+
+
+def test_affected_collections():
+    assert affected_collections("/rest/v1/VirDomainNetDevice/nic-uuid") == (
+        "/rest/v1/VirDomainNetDevice",
+        "/rest/v1/VirDomain",
+    )
+    assert affected_collections("/rest/v1/Node") == ("/rest/v1/Node",)
+
+
+class TestResponseCache:
+    def test_get_set(self):
+        cache = ResponseCache()
+
+        assert cache.get("/rest/v1/VirDomain") is None
+        cache.set("/rest/v1/VirDomain", [dict(uuid="vm")])
+
+        assert cache.get("/rest/v1/VirDomain") == [dict(uuid="vm")]
+        assert cache.stats == dict(hits=1, misses=1, size=1)
+
+    def test_not_cacheable(self):
+        cache = ResponseCache()
+
+        cache.set("/rest/v1/TaskTag/123", dict(state="RUNNING"))
+
+        assert cache.is_cacheable("/rest/v1/TaskTag/123") is False
+        assert cache.get("/rest/v1/TaskTag/123") is None
+
+    def test_ttl(self, mocker):
+        monotonic = mocker.patch.object(response_cache, "monotonic", return_value=100.0)
+        cache = ResponseCache(ttls={"/rest/v1/VirDomain": 10.0, "/rest/v1/Node": 60.0})
+        cache.set("/rest/v1/VirDomain", [])
+        cache.set("/rest/v1/Node", [])
+
+        monotonic.return_value = 109.9
+        assert cache.get("/rest/v1/VirDomain") == []
+        monotonic.return_value = 110.0
+        assert cache.get("/rest/v1/VirDomain") is None
+        assert cache.get("/rest/v1/Node") == []
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(maxsize=2)
+        cache.set("/rest/v1/VirDomain/a", [1])
+        cache.set("/rest/v1/VirDomain/b", [2])
+        # "a" is used, so "b" is the least recently used one.
+        cache.get("/rest/v1/VirDomain/a")
+        cache.set("/rest/v1/VirDomain/c", [3])
+
+        assert cache.get("/rest/v1/VirDomain/a") == [1]
+        assert cache.get("/rest/v1/VirDomain/b") is None
+        assert cache.get("/rest/v1/VirDomain/c") == [3]
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(AssertionError):
+            ResponseCache(maxsize=0)
+
+    def test_write_invalidates_related(self):
+        cache = ResponseCache()
+        cache.set("/rest/v1/VirDomain", [])
+        cache.set("/rest/v1/VirDomain/vm-uuid", [])
+        cache.set("/rest/v1/ISO", [])
+        cache.set("/rest/v1/Node", [])
+
+        cache.write_submitted("/rest/v1/VirDomainBlockDevice/disk-uuid", None)
+
+        assert cache.get("/rest/v1/VirDomain") is None
+        assert cache.get("/rest/v1/VirDomain/vm-uuid") is None
+        assert cache.get("/rest/v1/ISO") is None
+        assert cache.get("/rest/v1/Node") == []
+        # Without a task, data can be cached again immediately.
+        assert cache.is_cacheable("/rest/v1/VirDomain") is True
+
+    def test_pending_task(self):
+        cache = ResponseCache()
+
+        cache.write_submitted("/rest/v1/VirDomain/vm-uuid", "123")
+        cache.set("/rest/v1/VirDomain", ["changing"])
+
+        assert cache.is_cacheable("/rest/v1/VirDomain") is False
+        assert cache.get("/rest/v1/VirDomain") is None
+        assert cache.is_cacheable("/rest/v1/Node") is True
+
+        cache.task_finished("123")
+
+        assert cache.is_cacheable("/rest/v1/VirDomain") is True
+
+    def test_task_finished_invalidates(self):
+        cache = ResponseCache()
+        cache.write_submitted("/rest/v1/VirDomain/vm-uuid", "123")
+        cache.write_submitted("/rest/v1/ISO/iso-uuid", "124")
+        cache.set("/rest/v1/Node", [])
+
+        cache.task_finished("124")
+
+        # VirDomain is still changed by task 123.
+        assert cache.is_cacheable("/rest/v1/VirDomain") is False
+        assert cache.is_cacheable("/rest/v1/ISO") is False
+        cache.task_finished("123")
+        cache.task_finished("unknown")
+        assert cache.is_cacheable("/rest/v1/ISO") is True
+        assert cache.get("/rest/v1/Node") == []
+
+    def test_clear(self):
+        cache = ResponseCache()
+        cache.set("/rest/v1/Node", [])
+        cache.write_submitted("/rest/v1/VirDomain", "123")
+
+        cache.clear()
+
+        assert cache.get("/rest/v1/Node") is None
+        assert cache.is_cacheable("/rest/v1/VirDomain") is True
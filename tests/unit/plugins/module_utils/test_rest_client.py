@@ -7,7 +7,9 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import io
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
@@ -18,6 +20,9 @@ from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.client import (
     Response,
 )
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.response_cache import (
+    ResponseCache,
+)
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
     MIN_PYTHON_VERSION,
 )
@@ -64,6 +69,287 @@ class TestTableListRecords:
         )
 
 
+class TestPlanQuery:
+    @pytest.mark.parametrize(
+        "endpoint,query,expected",
+        [
+            (
+                "/rest/v1/Node",
+                dict(uuid="node-uuid"),
+                ("/rest/v1/Node/node-uuid", True),
+            ),
+            (
+                "/rest/v1/Node/",
+                dict(uuid="node-uuid"),
+                ("/rest/v1/Node/node-uuid", True),
+            ),
+            ("/rest/v1/Node", dict(lanIP="10.0.0.1"), ("/rest/v1/Node", False)),
+            ("/rest/v1/Node", dict(uuid=""), ("/rest/v1/Node", False)),
+            ("/rest/v1/Node", None, ("/rest/v1/Node", False)),
+            (
+                "/rest/v1/Cluster",
+                dict(uuid="cluster-uuid"),
+                ("/rest/v1/Cluster", False),
+            ),
+            (
+                "/rest/v1/VirDomain/vm-uuid",
+                dict(uuid="vm-uuid"),
+                ("/rest/v1/VirDomain/vm-uuid", False),
+            ),
+        ],
+    )
+    def test_plan_query(self, endpoint, query, expected):
+        assert rest_client.plan_query(endpoint, query) == expected
+
+
+class TestTableListRecordsPlanned:
+    def test_uuid_lookup(self, client):
+        client.get.return_value = Response(
+            200, '[{"uuid": "node-uuid", "lanIP": "10.0.0.1"}]'
+        )
+        t = rest_client.RestClient(client)
+
+        records = t.list_records("/rest/v1/Node", dict(uuid="node-uuid"))
+
+        assert records == [{"uuid": "node-uuid", "lanIP": "10.0.0.1"}]
+        client.get.assert_called_once_with(path="/rest/v1/Node/node-uuid", timeout=None)
+
+    def test_uuid_lookup_missing(self, client):
+        client.get.return_value = Response(404, '{"error": "not found"}')
+        t = rest_client.RestClient(client)
+
+        assert t.list_records("/rest/v1/Node", dict(uuid="node-uuid")) == []
+
+    def test_uuid_lookup_remaining_query(self, client):
+        client.get.return_value = Response(
+            200, '[{"uuid": "node-uuid", "lanIP": "10.0.0.1"}]'
+        )
+        t = rest_client.RestClient(client)
+
+        records = t.list_records(
+            "/rest/v1/Node", dict(uuid="node-uuid", lanIP="10.0.0.2")
+        )
+
+        assert records == []
+
+
+class TestTableIterRecords:
+    def test_stream(self, client, mocker):
+        stream = mocker.MagicMock(
+            wraps=io.BytesIO(
+                b'[{"uuid": "vm-1", "name": "a", "blockDevs": []}, {"uuid": "vm-2", "name": "b", "blockDevs": []}]'
+            )
+        )
+        client.get.return_value = Response(200, None, stream=stream)
+        t = rest_client.RestClient(client)
+
+        records = t.iter_records("/rest/v1/VirDomain", dict(name="b"))
+
+        assert list(records) == [{"uuid": "vm-2", "name": "b", "blockDevs": []}]
+        client.get.assert_called_once_with(
+            path="/rest/v1/VirDomain", timeout=None, stream=True
+        )
+        stream.close.assert_called_once()
+
+    def test_closed_early(self, client, mocker):
+        stream = mocker.MagicMock(
+            wraps=io.BytesIO(b'[{"uuid": "vm-1"}, {"uuid": "vm-2"}]')
+        )
+        client.get.return_value = Response(200, None, stream=stream)
+        t = rest_client.RestClient(client)
+
+        records = t.iter_records("/rest/v1/VirDomain")
+        assert next(records) == {"uuid": "vm-1"}
+        records.close()
+
+        stream.close.assert_called_once()
+
+    def test_uuid_lookup_missing(self, client):
+        client.get.return_value = Response(404, '{"error": "not found"}')
+        t = rest_client.RestClient(client)
+
+        assert list(t.iter_records("/rest/v1/Node", dict(uuid="node-uuid"))) == []
+        client.get.assert_called_once_with(
+            path="/rest/v1/Node/node-uuid", timeout=None, stream=True
+        )
+
+    def test_timeout(self, client, mocker):
+        stream = mocker.MagicMock()
+        stream.read.side_effect = TimeoutError("timed out")
+        client.get.return_value = Response(200, None, stream=stream)
+        t = rest_client.RestClient(client)
+
+        with pytest.raises(errors.ScaleTimeoutError):
+            list(t.iter_records("/rest/v1/VirDomain"))
+        stream.close.assert_called_once()
+
+    def test_cached_rest_client(self, client):
+        client.get.return_value = Response(200, '[{"uuid": "vm-1"}, {"uuid": "vm-2"}]')
+        t = rest_client.CachedRestClient(client)
+
+        assert list(t.iter_records("/rest/v1/VirDomain", dict(uuid="vm-2"))) == [
+            {"uuid": "vm-2"}
+        ]
+        assert list(t.iter_records("/rest/v1/VirDomain")) == [
+            {"uuid": "vm-1"},
+            {"uuid": "vm-2"},
+        ]
+        client.get.assert_called_once()
+
+
+class TestResponseCache:
+    def test_records_are_reused(self, client):
+        client.get.return_value = Response(
+            200, '[{"uuid": "vm-1", "name": "a"}, {"uuid": "vm-2", "name": "b"}]'
+        )
+        t = rest_client.RestClient(client, response_cache=ResponseCache())
+
+        assert t.list_records("/rest/v1/VirDomain", dict(name="a")) == [
+            {"uuid": "vm-1", "name": "a"}
+        ]
+        assert t.get_record("/rest/v1/VirDomain", dict(name="b")) == {
+            "uuid": "vm-2",
+            "name": "b",
+        }
+        assert list(t.iter_records("/rest/v1/VirDomain")) == [
+            {"uuid": "vm-1", "name": "a"},
+            {"uuid": "vm-2", "name": "b"},
+        ]
+        client.get.assert_called_once_with(path="/rest/v1/VirDomain", timeout=None)
+        assert t.response_cache.stats == dict(hits=2, misses=1, size=1)
+
+    def test_returned_records_are_copies(self, client):
+        client.get.return_value = Response(200, '[{"uuid": "vm-1", "tags": "a"}]')
+        t = rest_client.RestClient(client, response_cache=ResponseCache())
+
+        t.list_records("/rest/v1/VirDomain")[0]["tags"] = "changed"
+
+        assert t.list_records("/rest/v1/VirDomain") == [{"uuid": "vm-1", "tags": "a"}]
+
+    def test_uuid_lookup_missing(self, client):
+        client.get.return_value = Response(404, '{"error": "not found"}')
+        t = rest_client.RestClient(client, response_cache=ResponseCache())
+
+        assert t.list_records("/rest/v1/VirDomain", dict(uuid="vm-1")) == []
+        assert t.list_records("/rest/v1/VirDomain", dict(uuid="vm-1")) == []
+        # Missing records are not cached.
+        assert client.get.call_count == 2
+
+    def test_not_cached_endpoint(self, client):
+        client.get.return_value = Response(200, '[{"uuid": "123", "state": "RUNNING"}]')
+        t = rest_client.RestClient(client, response_cache=ResponseCache())
+
+        t.get_record("/rest/v1/TaskTag/123")
+        t.get_record("/rest/v1/TaskTag/123")
+
+        assert client.get.call_count == 2
+
+    @pytest.mark.parametrize(
+        "write",
+        [
+            lambda t: t.create_record("/rest/v1/VirDomainNetDevice", {}, False),
+            lambda t: t.update_record("/rest/v1/VirDomain/vm-1", {}, False),
+            lambda t: t.delete_record("/rest/v1/VirDomainBlockDevice/disk", False),
+            lambda t: t.put_record("/rest/v1/VirDomain/vm-1", {}, False),
+        ],
+    )
+    def test_write_invalidates(self, client, write):
+        records = Response(200, '[{"uuid": "vm-1"}]')
+        task_tag = Response(200, '{"taskTag": 123, "createdUUID": ""}')
+        client.get.return_value = records
+        client.post.return_value = client.patch.return_value = task_tag
+        client.delete.return_value = client.put.return_value = task_tag
+        t = rest_client.RestClient(client, response_cache=ResponseCache())
+        t.list_records("/rest/v1/VirDomain")
+
+        write(t)
+        t.list_records("/rest/v1/VirDomain")
+        # Not cached until the task finishes.
+        t.list_records("/rest/v1/VirDomain")
+        t.task_finished("123")
+        t.list_records("/rest/v1/VirDomain")
+        t.list_records("/rest/v1/VirDomain")
+
+        assert client.get.call_count == 4
+
+    def test_check_mode_does_not_invalidate(self, client):
+        client.get.return_value = Response(200, '[{"uuid": "vm-1"}]')
+        t = rest_client.RestClient(client, response_cache=ResponseCache())
+        t.list_records("/rest/v1/VirDomain")
+
+        t.update_record("/rest/v1/VirDomain/vm-1", {}, True)
+        t.list_records("/rest/v1/VirDomain")
+
+        client.get.assert_called_once()
+
+    def test_binary_upload_invalidates(self, client):
+        client.get.return_value = Response(200, '[{"uuid": "iso-1"}]')
+        client.put.return_value = Response(200, "not-json")
+        t = rest_client.RestClient(client, response_cache=ResponseCache())
+        t.list_records("/rest/v1/ISO")
+
+        with pytest.raises(errors.ApiResponseNotJson):
+            t.put_record("/rest/v1/ISO/iso-1/data", None, False, binary_data=b"x")
+        t.list_records("/rest/v1/ISO")
+
+        assert client.get.call_count == 2
+
+    def test_invalidate(self, client):
+        client.get.return_value = Response(200, '[{"uuid": "vm-1"}]')
+        t = rest_client.RestClient(client, response_cache=ResponseCache())
+        t.list_records("/rest/v1/VirDomain/vm-1")
+
+        t.invalidate("/rest/v1/VirDomain/vm-1")
+        t.list_records("/rest/v1/VirDomain/vm-1")
+
+        assert client.get.call_count == 2
+
+    def test_without_cache(self, client):
+        client.get.return_value = Response(200, '[{"uuid": "vm-1"}]')
+        t = rest_client.RestClient(client)
+
+        t.list_records("/rest/v1/VirDomain")
+        t.invalidate("/rest/v1/VirDomain")
+        t.task_finished("123")
+        t.list_records("/rest/v1/VirDomain")
+
+        assert client.get.call_count == 2
+
+
+class TestWrites:
+    def test_writes(self, client):
+        client.patch.return_value = Response(200, '{"taskTag": "1"}')
+        client.delete.return_value = Response(200, '{"taskTag": "2"}')
+        t = rest_client.RestClient(client)
+
+        t.update_record("/rest/v1/VirDomain/vm-1", {}, False)
+        t.delete_record("/rest/v1/VirDomainBlockDevice/disk-1", False)
+
+        # VirDomain records contain disks, so both writes changed VirDomain.
+        assert t.writes("/rest/v1/VirDomain/vm-1") == 2
+        assert t.writes("/rest/v1/VirDomainNetDevice") == 1
+        assert t.writes("/rest/v1/Node") == 0
+
+    def test_concurrent_writes(self, client):
+        client.delete.return_value = Response(200, '{"taskTag": "1"}')
+        t = rest_client.RestClient(client)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for i in range(200):
+                executor.submit(
+                    t.delete_record, f"/rest/v1/VirDomainSnapshot/snap-{i}", False
+                )
+
+        assert t.writes("/rest/v1/VirDomainSnapshot") == 200
+
+    def test_check_mode_is_not_write(self, client):
+        t = rest_client.RestClient(client)
+
+        t.update_record("/rest/v1/VirDomain/vm-1", {}, True)
+
+        assert t.writes("/rest/v1/VirDomain") == 0
+
+
 class TestTableListRecordsRaw:
     def test_empty_response(self, client):
         client.get.return_value = Response(
@@ -106,6 +392,41 @@ class TestTableGetRecord:
             t.get_record("my_table", dict(our="query"), must_exist=True)
 
 
+class TestTablePollRecord:
+    def test_record(self, client):
+        client.get.return_value = Response(200, '[{"state": "RUNNING"}]')
+        t = rest_client.RestClient(client, response_cache=ResponseCache())
+
+        assert t.poll_record("/rest/v1/VirDomain/id") == {"state": "RUNNING"}
+        assert t.poll_record("/rest/v1/VirDomain/id") == {"state": "RUNNING"}
+
+        # Response cache is bypassed.
+        assert client.get.call_count == 2
+        client.get.assert_called_with(
+            path="/rest/v1/VirDomain/id", timeout=None, conditional=True
+        )
+
+    def test_missing(self, client):
+        client.get.return_value = Response(404, "{}")
+        t = rest_client.RestClient(client)
+
+        assert t.poll_record("/rest/v1/TaskTag/1") is None
+
+    def test_missing_fail(self, client):
+        client.get.return_value = Response(404, "{}")
+        t = rest_client.RestClient(client)
+
+        with pytest.raises(errors.ScaleComputingError, match="No"):
+            t.poll_record("/rest/v1/VirDomain/id", must_exist=True)
+
+    def test_timeout(self, client):
+        client.get.side_effect = TimeoutError("timed out")
+        t = rest_client.RestClient(client)
+
+        with pytest.raises(errors.ScaleTimeoutError):
+            t.poll_record("/rest/v1/TaskTag/1")
+
+
 class TestTableCreateRecord:
     def test_normal_mode(self, client):
         client.post.return_value = Response(201, '{"result": {"a": 3, "b": "sys_id"}}')
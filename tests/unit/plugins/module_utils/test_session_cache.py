@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import stat
+import sys
+
+import pytest
+
+from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
+    session_cache,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.session_cache import (
+    SessionCache,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+
+class TestSessionCache:
+    def test_from_env_disabled(self, mocker):
+        mocker.patch.dict(os.environ, {}, clear=True)
+        assert SessionCache.from_env("https://1.2.3.4", "admin", "local") is None
+
+    def test_from_env(self, mocker, tmp_path):
+        mocker.patch.dict(
+            os.environ,
+            dict(SC_SESSION_CACHE_DIR=str(tmp_path), SC_SESSION_CACHE_TTL="60"),
+        )
+        cache = SessionCache.from_env("https://1.2.3.4", "admin", "local")
+        assert cache.directory == str(tmp_path)
+        assert cache.ttl == 60.0
+
+    def test_key(self, tmp_path):
+        cache_a = SessionCache(str(tmp_path), "https://1.2.3.4", "admin", "local")
+        cache_b = SessionCache(str(tmp_path), "https://1.2.3.4", "admin", "oidc")
+        cache_c = SessionCache(str(tmp_path), "https://1.2.3.5", "admin", "local")
+        assert len({cache_a.path, cache_b.path, cache_c.path}) == 3
+        assert "admin" not in cache_a.path
+
+    def test_login_once(self, mocker, tmp_path):
+        login = mocker.MagicMock(return_value="session-1")
+        cache = SessionCache(str(tmp_path / "sc"), "https://1.2.3.4", "admin", "local")
+
+        assert cache.get_or_login(login) == ("session-1", False)
+        assert cache.get_or_login(login) == ("session-1", True)
+        login.assert_called_once()
+        assert stat.S_IMODE(os.stat(cache.path).st_mode) == 0o600
+        assert stat.S_IMODE(os.stat(str(tmp_path / "sc")).st_mode) == 0o700
+
+    def test_ttl_expired(self, mocker, tmp_path):
+        time_mock = mocker.patch.object(session_cache, "time", return_value=1000.0)
+        login = mocker.MagicMock(side_effect=["session-1", "session-2"])
+        cache = SessionCache(str(tmp_path), "https://1.2.3.4", "admin", "local", 10)
+
+        assert cache.get_or_login(login) == ("session-1", False)
+        time_mock.return_value = 1010.0
+        assert cache.get_or_login(login) == ("session-2", False)
+
+    def test_invalidate(self, mocker, tmp_path):
+        login = mocker.MagicMock(side_effect=["session-1", "session-2"])
+        cache = SessionCache(str(tmp_path), "https://1.2.3.4", "admin", "local")
+        cache.get_or_login(login)
+
+        cache.invalidate("session-1")
+
+        assert cache.get_or_login(login) == ("session-2", False)
+
+    def test_invalidate_keeps_newer_session(self, mocker, tmp_path):
+        login = mocker.MagicMock(return_value="session-2")
+        cache = SessionCache(str(tmp_path), "https://1.2.3.4", "admin", "local")
+        cache.get_or_login(login)
+
+        cache.invalidate("session-1")
+
+        assert cache.get_or_login(login) == ("session-2", True)
+
+    def test_corrupted_file(self, mocker, tmp_path):
+        login = mocker.MagicMock(return_value="session-1")
+        cache = SessionCache(str(tmp_path), "https://1.2.3.4", "admin", "local")
+        with open(cache.path, "w") as f:
+            f.write("not-json")
+
+        assert cache.get_or_login(login) == ("session-1", False)
@@ -14,7 +14,10 @@ import pytest
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.task_tag import (
     TaskTag,
 )
-from ansible_collections.scale_computing.hypercore.plugins.module_utils import errors
+from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
+    errors,
+    wait,
+)
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
     MIN_PYTHON_VERSION,
 )
@@ -62,17 +65,182 @@ class TestTaskTag:
     def test_wait_task_ok(self, mocker):
         task = dict(taskTag=10)
         rest_client = mocker.MagicMock()
-        rest_client.get_record.return_value = ok_task_tag
+        rest_client.poll_record.return_value = ok_task_tag
         TaskTag.wait_task(rest_client, task)
 
     def test_wait_task_error(self, mocker):
         # Ensure a meaningful error message is shown in ansible stderr if tasktag fails.
         task = dict(taskTag=36199)
         rest_client = mocker.MagicMock()
-        rest_client.get_record.return_value = error_task_tag
+        rest_client.poll_record.return_value = error_task_tag
         with pytest.raises(
             errors.ScaleComputingError,
             match="There was a problem during this task execution. Task details: "
             + '{"taskTag": "36199", "progressPercent": 0, "state": "ERROR",',
         ):
             TaskTag.wait_task(rest_client, task)
+
+    def test_wait_task_running(self, mocker):
+        task = dict(taskTag=10)
+        rest_client = mocker.MagicMock()
+        rest_client.poll_record.side_effect = [
+            dict(ok_task_tag, state="QUEUED"),
+            dict(ok_task_tag, state="RUNNING"),
+            ok_task_tag,
+        ]
+        sleep_mock = mocker.patch.object(wait, "sleep")
+
+        TaskTag.wait_task(rest_client, task)
+
+        assert rest_client.poll_record.call_count == 3
+        # First polls are done in less than a second.
+        assert sum(c.args[0] for c in sleep_mock.call_args_list) < 1
+        # Cached data changed by the task is invalidated only once, when it is finished.
+        rest_client.task_finished.assert_called_once_with(10)
+
+    def test_wait_task_error_finished(self, mocker):
+        task = dict(taskTag=36199)
+        rest_client = mocker.MagicMock()
+        rest_client.poll_record.return_value = error_task_tag
+
+        with pytest.raises(errors.TaskTagError):
+            TaskTag.wait_task(rest_client, task)
+        rest_client.task_finished.assert_called_once_with(36199)
+
+    def test_wait_task_timeout(self, mocker):
+        task = dict(taskTag=10)
+        rest_client = mocker.MagicMock()
+        rest_client.poll_record.return_value = dict(ok_task_tag, state="RUNNING")
+        mocker.patch.object(wait, "sleep")
+        mocker.patch.object(wait, "monotonic", side_effect=[0, 1, 2])
+
+        with pytest.raises(errors.ScaleTimeoutError, match="TaskTag 10 finished"):
+            TaskTag.wait_task(rest_client, task, timeout=2)
+        assert rest_client.poll_record.call_count == 2
+
+
+class TestWaitTasks:
+    def test_wait_tasks(self, mocker):
+        statuses = {
+            "1": [dict(ok_task_tag, state="RUNNING"), ok_task_tag],
+            "2": [
+                dict(ok_task_tag, state="QUEUED"),
+                dict(ok_task_tag, state="RUNNING"),
+                ok_task_tag,
+            ],
+        }
+        rest_client = mocker.MagicMock()
+        rest_client.poll_record.side_effect = lambda endpoint: statuses[
+            endpoint.split("/")[-1]
+        ].pop(0)
+        sleep_mock = mocker.patch.object(wait, "sleep")
+
+        TaskTag.wait_tasks(
+            rest_client, [dict(taskTag="1"), dict(taskTag="2"), dict(taskTag="1")]
+        )
+
+        # Both tasks are polled in the same loop, finished task is not polled again.
+        assert [c.args[0] for c in rest_client.poll_record.call_args_list] == [
+            "/rest/v1/TaskTag/1",
+            "/rest/v1/TaskTag/2",
+            "/rest/v1/TaskTag/1",
+            "/rest/v1/TaskTag/2",
+            "/rest/v1/TaskTag/2",
+        ]
+        assert sleep_mock.call_count == 2
+
+    def test_wait_tasks_error_after_all_finished(self, mocker):
+        statuses = {
+            "36199": [error_task_tag],
+            "10": [dict(ok_task_tag, state="RUNNING"), ok_task_tag],
+        }
+        rest_client = mocker.MagicMock()
+        rest_client.poll_record.side_effect = lambda endpoint: statuses[
+            endpoint.split("/")[-1]
+        ].pop(0)
+        mocker.patch.object(wait, "sleep")
+
+        with pytest.raises(errors.TaskTagError) as exc_info:
+            TaskTag.wait_tasks(rest_client, [dict(taskTag="36199"), dict(taskTag="10")])
+
+        assert exc_info.value.task_status == error_task_tag
+        assert statuses == {"36199": [], "10": []}
+
+    def test_wait_tasks_nothing_to_wait(self, mocker):
+        rest_client = mocker.MagicMock()
+
+        TaskTag.wait_tasks(rest_client, [None, dict(taskTag="")])
+        TaskTag.wait_tasks(rest_client, [dict(taskTag="1")], check_mode=True)
+
+        rest_client.poll_record.assert_not_called()
+
+
+class TestSubmitAndWait:
+    def test_submit_and_wait(self, mocker):
+        # "36199" fails, "20" has no TaskTag record, "30" has no task tag.
+        statuses = {"36199": [error_task_tag], "10": [ok_task_tag], "20": [None]}
+        rest_client = mocker.MagicMock()
+        rest_client.poll_record.side_effect = lambda endpoint: statuses[
+            endpoint.split("/")[-1]
+        ].pop(0)
+
+        def submit(item):
+            if item == "bad":
+                raise errors.ScaleComputingError("submit failed")
+            return dict(taskTag=item)
+
+        item_errors = TaskTag.submit_and_wait(
+            rest_client, submit, ["10", "36199", "bad", "20", ""], 2
+        )
+
+        assert [str(error) if error else None for error in item_errors] == [
+            None,
+            str(errors.TaskTagError(error_task_tag)),
+            "submit failed",
+            None,
+            None,
+        ]
+        assert isinstance(item_errors[1], errors.TaskTagError)
+        # Tasks of each batch are polled before the next batch is submitted.
+        assert [c.args[0] for c in rest_client.poll_record.call_args_list] == [
+            "/rest/v1/TaskTag/10",
+            "/rest/v1/TaskTag/36199",
+            "/rest/v1/TaskTag/20",
+        ]
+        assert statuses == {"36199": [], "10": [], "20": []}
+
+    def test_submit_and_wait_unexpected_error(self, mocker):
+        # An unexpected error of one item does not skip waiting for the other tasks.
+        statuses = {
+            "10": [dict(ok_task_tag, state="RUNNING"), ok_task_tag],
+            "20": [error_task_tag],
+        }
+        rest_client = mocker.MagicMock()
+        rest_client.poll_record.side_effect = lambda endpoint: statuses[
+            endpoint.split("/")[-1]
+        ].pop(0)
+        mocker.patch.object(wait, "sleep")
+
+        def submit(item):
+            if item == "key":
+                raise KeyError("uuid")
+            if item == "invalid":
+                return "not a task"
+            return dict(taskTag=item)
+
+        item_errors = TaskTag.submit_and_wait(
+            rest_client, submit, ["key", "10", "invalid", "20"], 4
+        )
+
+        assert isinstance(item_errors[0], KeyError)
+        assert item_errors[1] is None
+        assert str(item_errors[2]) == "task should be dictionary."
+        assert isinstance(item_errors[3], errors.TaskTagError)
+        assert statuses == {"10": [], "20": []}
+
+    def test_submit_and_wait_no_items(self, mocker):
+        rest_client = mocker.MagicMock()
+        submit = mocker.MagicMock()
+
+        assert TaskTag.submit_and_wait(rest_client, submit, [], 4) == []
+        submit.assert_not_called()
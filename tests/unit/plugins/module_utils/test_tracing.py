@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import io
+import json
+import sys
+
+import pytest
+
+from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
+    tracing,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.tracing import (
+    Tracer,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+UUID = "7542f2d1-8f5e-4a2c-a6f6-2f5a2b1e9d3c"
+
+
+class TestEndpointTemplate:
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("https://host/rest/v1/VirDomain", "/rest/v1/VirDomain"),
+            (f"https://host/rest/v1/VirDomain/{UUID}", "/rest/v1/VirDomain/{uuid}"),
+            (
+                f"https://host/rest/v1/VirDomain/{UUID}/clone?a=b",
+                "/rest/v1/VirDomain/{uuid}/clone",
+            ),
+            # Snapshot and block device uuids have a suffix.
+            (
+                f"https://host/rest/v1/VirDomainSnapshot/{UUID}:snap",
+                "/rest/v1/VirDomainSnapshot/{uuid}",
+            ),
+            ("https://host/rest/v1/TaskTag/1234", "/rest/v1/TaskTag/{id}"),
+            ("https://host/rest/v1/login", "/rest/v1/login"),
+        ],
+    )
+    def test_endpoint_template(self, url, expected):
+        assert tracing.endpoint_template(url) == expected
+
+
+class TestBodySize:
+    @pytest.mark.parametrize(
+        "data,headers,expected",
+        [
+            (None, None, 0),
+            ("čć", None, 4),
+            (b"abc", None, 3),
+            (io.BytesIO(b"abc"), {"Content-Length": "42"}, 42),
+            (io.BytesIO(b"abc"), {"content-length": "42"}, 42),
+            (io.BytesIO(b"abc"), {}, None),
+        ],
+    )
+    def test_body_size(self, data, headers, expected):
+        assert tracing.body_size(data, headers) == expected
+
+
+class TestTracer:
+    def test_from_env_disabled(self, monkeypatch):
+        monkeypatch.delenv("SC_TRACE_FILE", raising=False)
+
+        assert Tracer.from_env() is None
+
+    def test_from_env(self, monkeypatch, mocker, tmp_path):
+        register_mock = mocker.patch.object(tracing.atexit, "register")
+        monkeypatch.setenv("SC_TRACE_FILE", str(tmp_path / "trace.jsonl"))
+
+        tracer = Tracer.from_env()
+
+        assert tracer.path == str(tmp_path / "trace.jsonl")
+        register_mock.assert_called_once_with(tracer.write_summary)
+
+    def test_record(self):
+        tracer = Tracer()
+
+        trace = tracer.record(
+            "GET",
+            f"https://host/rest/v1/VirDomain/{UUID}",
+            200,
+            0,
+            100,
+            0.5,
+            dict(connect=0.1, tls=0.2, ttfb=0.1, retries=1),
+        )
+
+        assert trace == dict(
+            method="GET",
+            endpoint="/rest/v1/VirDomain/{uuid}",
+            status=200,
+            bytes_out=0,
+            bytes_in=100,
+            connect=0.1,
+            tls=0.2,
+            ttfb=0.1,
+            total=0.5,
+            retries=1,
+            error=None,
+        )
+
+    def test_summary(self):
+        tracer = Tracer()
+        tracer.record("GET", "https://host/rest/v1/TaskTag/1", 200, 0, 10, 0.25)
+        tracer.record("GET", "https://host/rest/v1/TaskTag/2", 200, 0, 20, 0.5)
+        tracer.record("POST", "https://host/rest/v1/VirDomain", 200, 30, 40, 2.0)
+        tracer.record("GET", "https://host/rest/v1/TaskTag/3", 404, 0, 5, 0.25)
+        tracer.record(
+            "GET", "https://host/rest/v1/TaskTag/4", None, 0, None, 0.0, error="X"
+        )
+
+        assert tracer.summary == dict(
+            requests=5,
+            total=3.0,
+            endpoints=[
+                dict(
+                    endpoint="POST /rest/v1/VirDomain",
+                    count=1,
+                    errors=0,
+                    total=2.0,
+                    max=2.0,
+                    bytes_out=30,
+                    bytes_in=40,
+                ),
+                dict(
+                    endpoint="GET /rest/v1/TaskTag/{id}",
+                    count=4,
+                    errors=2,
+                    total=1.0,
+                    max=0.5,
+                    bytes_out=0,
+                    bytes_in=35,
+                ),
+            ],
+        )
+
+    def test_json_lines(self, mocker, tmp_path):
+        mocker.patch.object(tracing.atexit, "register")
+        path = tmp_path / "trace.jsonl"
+        tracer = Tracer(str(path))
+
+        tracer.record("GET", "https://host/rest/v1/TaskTag/1", 200, 0, 10, 0.25)
+        tracer.record("GET", "https://host/rest/v1/TaskTag/2", 200, 0, 10, 0.25)
+        tracer.write_summary()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["type"] for line in lines] == ["request", "request", "summary"]
+        assert lines[0]["endpoint"] == "/rest/v1/TaskTag/{id}"
+        assert lines[2]["requests"] == 2
+        assert oct(path.stat().st_mode & 0o777) == oct(0o600)
+
+    def test_no_summary_without_requests(self, mocker, tmp_path):
+        mocker.patch.object(tracing.atexit, "register")
+        path = tmp_path / "trace.jsonl"
+
+        Tracer(str(path)).write_summary()
+
+        assert not path.exists()
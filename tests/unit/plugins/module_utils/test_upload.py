@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import io
+import sys
+
+import pytest
+
+from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
+    errors,
+    upload,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.upload import (
+    UploadMonitor,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+
+@pytest.fixture
+def monotonic(mocker):
+    return mocker.patch.object(upload, "monotonic", return_value=100.0)
+
+
+class TestUploadMonitor:
+    def test_from_module_params(self):
+        monitor = UploadMonitor.from_module_params(
+            dict(upload_min_rate=10, upload_stall_window=5)
+        )
+        assert (monitor.min_rate, monitor.window) == (10, 5)
+
+        monitor = UploadMonitor.from_module_params(dict())
+        assert (monitor.min_rate, monitor.window) == (1000, 30)
+
+    def test_stream(self, monotonic):
+        monitor = UploadMonitor(chunk_size=4)
+        stream = monitor.wrap(io.BytesIO(b"0123456789"))
+
+        chunks = [stream.read(), stream.read(3), stream.read(100), stream.read()]
+        monotonic.return_value = 102.0
+        assert stream.read(8192) == b""
+
+        assert chunks == [b"0123", b"456", b"789", b""]
+        assert monitor.stats == dict(bytes_sent=10, elapsed=2.0, average_rate=5.0)
+
+    def test_stats_nothing_sent(self):
+        assert UploadMonitor().stats is None
+
+    def test_min_rate_ok(self, monotonic):
+        monitor = UploadMonitor(min_rate=100, window=10)
+        monitor.update(500)
+        monotonic.return_value = 110.0
+        monitor.update(500)  # 1000 bytes in 10 seconds
+        monotonic.return_value = 115.0
+        monitor.update(0)  # window not finished yet
+
+    def test_min_rate_stalled(self, monotonic):
+        monitor = UploadMonitor(min_rate=100, window=10)
+        monitor.update(5000)
+        monotonic.return_value = 110.0
+        monitor.update(5000)
+        monotonic.return_value = 120.0
+
+        with pytest.raises(
+            errors.UploadStalledError,
+            match="500 bytes sent in the last 10 seconds, required is at least 100 bytes/sec",
+        ):
+            monitor.update(500)
+
+    def test_min_rate_disabled(self, monotonic):
+        monitor = UploadMonitor(min_rate=0, window=10)
+        monitor.update(10)
+        monotonic.return_value = 1000.0
+        monitor.update(0)
+
+    @pytest.mark.parametrize(
+        "min_rate, window, expected",
+        [
+            (1000, 30, 30),
+            # A single block at min_rate takes longer than the window.
+            (100, 30, 81.92),
+            (0, 30, None),
+        ],
+    )
+    def test_send_timeout(self, min_rate, window, expected):
+        stream = UploadMonitor(min_rate=min_rate, window=window).wrap(io.BytesIO())
+
+        assert stream.send_timeout(8192) == expected
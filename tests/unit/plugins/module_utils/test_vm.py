@@ -11,14 +11,25 @@ from ansible_collections.scale_computing.hypercore.plugins.module_utils.vm impor
     ManageVMParams,
     ManageVMDisks,
     ManageVMNics,
+    ManageVMPower,
+    ManageVMFleet,
+    FleetSnapshot,
+    VMState,
 )
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.node import Node
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.errors import (
     ScaleComputingError,
 )
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.disk import Disk
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.task_tag import (
+    TaskTag,
+)
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.nic import Nic
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.iso import ISO
-from ansible_collections.scale_computing.hypercore.plugins.module_utils import errors
+from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
+    errors,
+    wait,
+)
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.snapshot_schedule import (
     SnapshotSchedule,
 )
@@ -151,6 +162,81 @@ class TestVM:
         vm_from_hypercore = VM.from_hypercore(vm_dict, rest_client)
         assert vm == vm_from_hypercore
 
+    @staticmethod
+    def _vm_dict(uuid, preferred_node_uuid, snapshot_schedule_uuid):
+        return dict(
+            uuid=uuid,
+            nodeUUID="node-1",
+            name=f"VM-{uuid}",
+            tags="",
+            description="desc",
+            mem=42,
+            state="RUNNING",
+            numVCPU=2,
+            netDevs=[],
+            blockDevs=[],
+            bootDevices=[],
+            attachGuestToolsISO=False,
+            operatingSystem=None,
+            affinityStrategy={
+                "strictAffinity": False,
+                "preferredNodeUUID": preferred_node_uuid,
+                "backupNodeUUID": "",
+            },
+            snapshotScheduleUUID=snapshot_schedule_uuid,
+            machineType="scale-7.2",
+            sourceVirDomainUUID="",
+            snapUUIDs=[],
+        )
+
+    def test_vm_from_hypercore_many(self, rest_client):
+        vm_dicts = [
+            self._vm_dict("vm-1", "node-1", "schedule-1"),
+            self._vm_dict("vm-2", "node-2", ""),
+            self._vm_dict("vm-3", "", "schedule-1"),
+        ]
+        rest_client.list_records.side_effect = [
+            [
+                dict(uuid="node-1", backplaneIP="10.0.0.1", lanIP="10.0.1.1", peerID=1),
+                dict(uuid="node-2", backplaneIP="10.0.0.2", lanIP="10.0.1.2", peerID=2),
+            ],
+            [dict(uuid="schedule-1", name="daily", rrules=[])],
+        ]
+
+        vms = VM.from_hypercore_many(vm_dicts, rest_client)
+
+        assert rest_client.list_records.call_count == 2
+        rest_client.get_record.assert_not_called()
+        assert [vm.uuid for vm in vms] == ["vm-1", "vm-2", "vm-3"]
+        assert [vm.snapshot_schedule for vm in vms] == ["daily", "", "daily"]
+        assert [vm.node_affinity["preferred_node"]["node_uuid"] for vm in vms] == [
+            "node-1",
+            "node-2",
+            "",
+        ]
+        assert vms[1].node_affinity["preferred_node"]["peer_id"] == 2
+
+    def test_vm_from_hypercore_many_single_vm(self, rest_client, mocker):
+        get_node = mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.Node.get_node"
+        )
+        get_node.return_value = None
+        mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.SnapshotSchedule.get_snapshot_schedule"
+        ).return_value = None
+
+        vms = VM.from_hypercore_many(
+            [self._vm_dict("vm-1", "node-1", "schedule-1")], rest_client
+        )
+
+        assert [vm.uuid for vm in vms] == ["vm-1"]
+        rest_client.list_records.assert_not_called()
+        assert get_node.call_count == 2
+
+    def test_vm_from_hypercore_many_empty(self, rest_client):
+        assert VM.from_hypercore_many([], rest_client) == []
+        rest_client.list_records.assert_not_called()
+
     def test_vm_to_hypercore(self, hcversion):
         vm = VM(
             uuid=None,  # No uuid when creating object from ansible
@@ -1207,6 +1293,209 @@ class TestNic:
         assert results[1].connected is True
 
 
+class TestVMWaitShutdown:
+    @staticmethod
+    def running_vm():
+        return VM(
+            uuid="id",
+            name="VM-name",
+            memory=42,
+            vcpu=2,
+            power_state="started",
+        )
+
+    def test_wait_shutdown(self, create_module, rest_client, mocker):
+        module = create_module(params=dict(shutdown_timeout=300))
+        rest_client.get_record.return_value = dict(state="RUNNING")
+        rest_client.poll_record.side_effect = [
+            dict(state="RUNNING"),
+            dict(state="SHUTOFF"),
+        ]
+        mocker.patch.object(VM, "update_vm_power_state")
+        sleep_mock = mocker.patch.object(wait, "sleep")
+        vm = self.running_vm()
+
+        assert vm.wait_shutdown(module, rest_client) is True
+        assert vm._did_nice_shutdown_work is True
+        # VM state is checked after ~1 second, not after 10 seconds.
+        assert sleep_mock.call_count == 1
+        assert sleep_mock.call_args.args[0] < 2
+
+    def test_wait_shutdown_timeout(self, create_module, rest_client, mocker):
+        module = create_module(params=dict(shutdown_timeout=300))
+        rest_client.get_record.return_value = dict(state="RUNNING")
+        rest_client.poll_record.return_value = dict(state="RUNNING")
+        mocker.patch.object(VM, "update_vm_power_state")
+        mocker.patch.object(wait, "sleep")
+        mocker.patch.object(wait, "monotonic", side_effect=[0, 100, 300])
+        vm = self.running_vm()
+
+        assert vm.wait_shutdown(module, rest_client) is False
+        assert vm._did_nice_shutdown_work is False
+        assert rest_client.get_record.call_count == 1
+        assert rest_client.poll_record.call_count == 2
+
+
+class TestVMState:
+    @staticmethod
+    def record(state="RUNNING", preferred_node_uuid="", snapshot_schedule_uuid=""):
+        return dict(
+            uuid="id",
+            nodeUUID="node-id",
+            name="VM-name",
+            tags="XLAB-test-tag1",
+            description="desc",
+            mem=42,
+            state=state,
+            numVCPU=2,
+            netDevs=[],
+            blockDevs=[],
+            bootDevices=[],
+            attachGuestToolsISO=False,
+            operatingSystem="os_other",
+            affinityStrategy=dict(
+                strictAffinity=False,
+                preferredNodeUUID=preferred_node_uuid,
+                backupNodeUUID="",
+            ),
+            snapshotScheduleUUID=snapshot_schedule_uuid,
+            machineType="scale-7.2",
+            sourceVirDomainUUID="",
+            snapUUIDs=[],
+        )
+
+    def test_get_by_old_or_new_name(self, rest_client):
+        rest_client.get_record.return_value = self.record()
+
+        vm_state = VMState.get_by_old_or_new_name(
+            dict(vm_name="VM-name", vm_name_new=None), rest_client
+        )
+
+        assert vm_state.uuid == "id"
+        rest_client.get_record.assert_called_once_with(
+            "/rest/v1/VirDomain", {"name": "VM-name"}, must_exist=False
+        )
+
+    def test_get_by_name_missing(self, rest_client):
+        rest_client.get_record.return_value = None
+
+        assert VMState.get_by_name(dict(vm_name="VM-name"), rest_client) is None
+
+    def test_vm_not_read_again(self, rest_client, mocker):
+        node = Node(node_uuid="node-id", backplane_ip="", lan_ip="", peer_id=1)
+        get_node = mocker.patch.object(Node, "get_node", return_value=node)
+        get_snapshot_schedule = mocker.patch.object(
+            SnapshotSchedule, "get_snapshot_schedule", return_value=None
+        )
+        vm_state = VMState(rest_client, self.record(preferred_node_uuid="node-id"))
+
+        vm_1 = vm_state.vm()
+        vm_2 = vm_state.vm()
+
+        assert vm_1 is not vm_2
+        assert vm_1 == vm_2
+        assert vm_1.vm_state is vm_state
+        assert vm_1.node_affinity["preferred_node"]["node_uuid"] == "node-id"
+        rest_client.get_record.assert_not_called()
+        # Node is read once, empty backup node and snapshot schedule are not read.
+        get_node.assert_called_once_with(
+            query={"uuid": "node-id"}, rest_client=rest_client
+        )
+        get_snapshot_schedule.assert_not_called()
+
+    def test_vm_read_again_after_write(self, rest_client):
+        vm_state = VMState(rest_client, self.record())
+        # Some step changed the VM.
+        rest_client.update_record("/rest/v1/VirDomain/id", {}, False)
+        rest_client.get_record.return_value = self.record(state="SHUTOFF")
+
+        assert vm_state.vm()._power_state == "stopped"
+        assert vm_state.vm()._power_state == "stopped"
+        rest_client.invalidate.assert_called_once_with("/rest/v1/VirDomain/id")
+        rest_client.get_record.assert_called_once_with(
+            "/rest/v1/VirDomain/id", must_exist=True
+        )
+
+    def test_refresh(self, rest_client):
+        vm_state = VMState(rest_client, self.record())
+        rest_client.get_record.return_value = self.record(state="SHUTDOWN")
+
+        assert vm_state.refresh()["state"] == "SHUTDOWN"
+        assert vm_state.record["state"] == "SHUTDOWN"
+        assert rest_client.get_record.call_count == 1
+
+    def test_update(self, rest_client):
+        vm_state = VMState(rest_client, self.record())
+        record = self.record(state="SHUTOFF")
+
+        vm_state.update(record)
+        record["state"] = "RUNNING"
+
+        assert vm_state.record["state"] == "SHUTOFF"
+        rest_client.get_record.assert_not_called()
+
+    def test_vm_power_up_running(self, create_module, rest_client, mocker):
+        module = create_module(params=dict(power_state="start"))
+        update_vm_power_state = mocker.patch.object(VM, "update_vm_power_state")
+        vm = VMState(rest_client, self.record()).vm()
+        rest_client.get_record.return_value = self.record()
+
+        vm.vm_power_up(module, rest_client)
+
+        update_vm_power_state.assert_not_called()
+
+    def test_vm_power_up_shutdown_by_guest(self, create_module, rest_client, mocker):
+        # Guest OS shut down the VM after it was read, VM is read again before skipping.
+        module = create_module(params=dict(power_state="start"))
+        update_vm_power_state = mocker.patch.object(VM, "update_vm_power_state")
+        vm = VMState(rest_client, self.record()).vm()
+        rest_client.get_record.return_value = self.record(state="SHUTOFF")
+
+        vm.vm_power_up(module, rest_client)
+
+        rest_client.get_record.assert_called_once_with(
+            "/rest/v1/VirDomain/id", must_exist=True
+        )
+        update_vm_power_state.assert_called_once_with(
+            module, rest_client, "start", False
+        )
+
+    def test_vm_power_up_stopped(self, create_module, rest_client, mocker):
+        module = create_module(params=dict(power_state="start"))
+        update_vm_power_state = mocker.patch.object(VM, "update_vm_power_state")
+        vm = VMState(rest_client, self.record(state="SHUTOFF")).vm()
+        rest_client.get_record.return_value = self.record(state="SHUTOFF")
+
+        vm.vm_power_up(module, rest_client)
+
+        update_vm_power_state.assert_called_once_with(
+            module, rest_client, "start", False
+        )
+
+    def test_wait_shutdown_updates_state(self, create_module, rest_client, mocker):
+        module = create_module(params=dict(shutdown_timeout=300))
+        rest_client.get_record.return_value = self.record()
+        rest_client.poll_record.return_value = self.record(state="SHUTOFF")
+        mocker.patch.object(VM, "update_vm_power_state")
+        mocker.patch.object(wait, "sleep")
+        vm_state = VMState(rest_client, self.record())
+        vm = vm_state.vm()
+
+        assert vm.wait_shutdown(module, rest_client) is True
+        assert vm_state.vm()._power_state == "stopped"
+        assert rest_client.get_record.call_count == 1
+
+    def test_get_vm_by_name_served_by_state(self, create_module, rest_client):
+        module = create_module(params=dict(vm_name="VM-name", vm_name_new=None))
+        vm = VMState(rest_client, self.record()).vm()
+
+        updated_vm, disks = ManageVMDisks.get_vm_by_name(module, rest_client, vm)
+
+        assert updated_vm == vm
+        assert disks == []
+        rest_client.get_record.assert_not_called()
+
+
 class TestVMExport:
     def test_create_export_or_import_vm_payload_when_export(self):
         ansible_dict = {
@@ -2149,6 +2438,661 @@ class TestManageVMParams:
         assert vm_before.was_vm_rebooted() is False
 
 
+class TestManageVMParamsMany:
+    @staticmethod
+    def _module(create_module, **params):
+        return create_module(
+            params=dict(
+                dict(
+                    cluster_instance=dict(
+                        host="https://0.0.0.0",
+                        username="admin",
+                        password="admin",
+                    ),
+                    vm_name=None,
+                    vm_name_new=None,
+                    description=None,
+                    tags=None,
+                    memory=None,
+                    vcpu=None,
+                    power_state=None,
+                    snapshot_schedule=None,
+                    operating_system=None,
+                    machine_type=None,
+                    force_reboot=False,
+                    shutdown_timeout=300,
+                ),
+                **params,
+            ),
+            check_mode=False,
+        )
+
+    @staticmethod
+    def _vm(name, description):
+        return VM(
+            uuid=f"{name}-uuid",
+            node_uuid="node_uuid",
+            name=name,
+            tags=["Xlab"],
+            description=description,
+            memory=512,
+            power_state="started",
+            vcpu=2,
+            snapshot_schedule="",
+        )
+
+    def test_only_changed_vms_are_updated(self, create_module, rest_client, mocker):
+        module = self._module(create_module, description="new")
+        rest_client.update_record.return_value = {"taskTag": "1234"}
+        rest_client.list_records.return_value = [
+            dict(uuid="vm-a-uuid"),
+            dict(uuid="vm-b-uuid"),
+        ]
+        mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.TaskTag.wait_task"
+        )
+        from_hypercore_many = mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.VM.from_hypercore_many"
+        )
+        from_hypercore_many.return_value = [self._vm("vm-a", "new")]
+
+        results = ManageVMParams.set_vm_params_many(
+            module, rest_client, [self._vm("vm-a", "old"), self._vm("vm-b", "new")]
+        )
+
+        assert results == [
+            dict(
+                vm_name="vm-a",
+                uuid="vm-a-uuid",
+                changed=True,
+                vm_rebooted=False,
+                diff=dict(
+                    before=dict(description="old"), after=dict(description="new")
+                ),
+                error=None,
+            ),
+            dict(
+                vm_name="vm-b",
+                uuid="vm-b-uuid",
+                changed=False,
+                vm_rebooted=False,
+                diff=dict(before=None, after=None),
+                error=None,
+            ),
+        ]
+        rest_client.update_record.assert_called_once_with(
+            "/rest/v1/VirDomain/vm-a-uuid", dict(description="new"), False
+        )
+        # Only updated VMs are read again, with a single VirDomain request.
+        rest_client.list_records.assert_called_once_with("/rest/v1/VirDomain")
+        from_hypercore_many.assert_called_once_with(
+            [dict(uuid="vm-a-uuid")], rest_client
+        )
+
+    def test_no_change(self, create_module, rest_client):
+        module = self._module(create_module, description="same")
+
+        results = ManageVMParams.set_vm_params_many(
+            module, rest_client, [self._vm("vm-a", "same"), self._vm("vm-b", "same")]
+        )
+
+        assert [result["changed"] for result in results] == [False, False]
+        rest_client.update_record.assert_not_called()
+        rest_client.list_records.assert_not_called()
+
+    def test_failed_vm_does_not_stop_others(self, create_module, rest_client, mocker):
+        module = self._module(create_module, description="new")
+
+        def update_record(endpoint, payload, check_mode):
+            if endpoint.endswith("vm-b-uuid"):
+                raise errors.ScaleComputingError("PATCH failed")
+            return {"taskTag": endpoint}
+
+        rest_client.update_record.side_effect = update_record
+        rest_client.list_records.return_value = [
+            dict(uuid="vm-a-uuid"),
+            dict(uuid="vm-b-uuid"),
+        ]
+        mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.TaskTag.wait_task"
+        )
+        mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.VM.from_hypercore_many"
+        ).return_value = [self._vm("vm-a", "new"), self._vm("vm-b", "old")]
+
+        results = ManageVMParams.set_vm_params_many(
+            module,
+            rest_client,
+            [self._vm("vm-a", "old"), self._vm("vm-b", "old")],
+        )
+
+        assert rest_client.update_record.call_count == 2
+        assert [
+            (result["vm_name"], result["changed"], result["error"])
+            for result in results
+        ] == [("vm-a", True, None), ("vm-b", True, "PATCH failed")]
+        # Diff of the failed VM shows it was not changed.
+        assert results[1]["diff"] == dict(
+            before=dict(description="old"), after=dict(description="old")
+        )
+
+
+class TestManageVMPower:
+    @pytest.fixture
+    def clock(self, mocker):
+        # Fake time, which advances only when wait_until sleeps.
+        now = [0.0]
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        mocker.patch.object(wait, "sleep", side_effect=sleep)
+        mocker.patch.object(wait, "monotonic", side_effect=lambda: now[0])
+        mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.monotonic",
+            side_effect=lambda: now[0],
+        )
+        return now
+
+    @pytest.fixture
+    def ignored_actions(self):
+        # (VM uuid, actionType) which do not change VM state.
+        return []
+
+    @pytest.fixture
+    def states(self, rest_client, ignored_actions):
+        # HyperCore VM states, changed by power actions sent to rest_client.
+        states = dict(vm_a="RUNNING", vm_b="RUNNING")
+
+        def create_record(endpoint, payload, check_mode):
+            assert endpoint == "/rest/v1/VirDomain/action"
+            for action in payload:
+                key = (action["virDomainUUID"], action["actionType"])
+                if key not in ignored_actions:
+                    states[action["virDomainUUID"]] = dict(
+                        START="RUNNING", SHUTDOWN="SHUTOFF", STOP="SHUTOFF"
+                    ).get(action["actionType"], "RUNNING")
+            return {"taskTag": ""}
+
+        rest_client.create_record.side_effect = create_record
+        rest_client.list_records.side_effect = lambda endpoint: [
+            dict(uuid=uuid, name=uuid, state=state) for uuid, state in states.items()
+        ]
+        return states
+
+    @staticmethod
+    def _module(create_module, check_mode=False, **params):
+        return create_module(
+            params=dict(
+                dict(
+                    power_state="shutdown",
+                    shutdown_timeout=10.0,
+                    force_stop=False,
+                    concurrency=2,
+                ),
+                **params,
+            ),
+            check_mode=check_mode,
+        )
+
+    @staticmethod
+    def _vm_dicts(states):
+        return [
+            dict(uuid="vm_a", name="vm_a", state=states["vm_a"]),
+            dict(uuid="vm_b", name="vm_b", state=states["vm_b"]),
+        ]
+
+    @pytest.mark.parametrize(
+        "power_action,state,expected",
+        [
+            ("start", "RUNNING", False),
+            ("start", "SHUTOFF", True),
+            ("shutdown", "RUNNING", True),
+            ("shutdown", "SHUTDOWN", False),
+            ("shutdown", "SHUTOFF", False),
+            ("stop", "SHUTDOWN", True),
+            ("stop", "SHUTOFF", False),
+            ("reboot", "RUNNING", True),
+            ("reboot", "SHUTOFF", False),
+            ("reset", "RUNNING", True),
+            ("reset", "SHUTOFF", False),
+        ],
+    )
+    def test_needs_action(self, power_action, state, expected):
+        assert ManageVMPower._needs_action(power_action, dict(state=state)) is expected
+
+    def test_check_mode(self, create_module, rest_client, states):
+        module = self._module(create_module, check_mode=True)
+
+        results = ManageVMPower.set_power_state_many(
+            module, rest_client, self._vm_dicts(states)
+        )
+
+        assert [result["changed"] for result in results] == [True, True]
+        rest_client.create_record.assert_not_called()
+
+    def test_start(self, create_module, rest_client, states, clock):
+        states["vm_a"] = "SHUTOFF"
+        module = self._module(create_module, power_state="start")
+
+        results = ManageVMPower.set_power_state_many(
+            module, rest_client, self._vm_dicts(states)
+        )
+
+        assert results == [
+            dict(
+                vm_name="vm_a",
+                uuid="vm_a",
+                changed=True,
+                forced=False,
+                power_state_before="stopped",
+                power_state="started",
+                duration=0.0,
+                error=None,
+            ),
+            dict(
+                vm_name="vm_b",
+                uuid="vm_b",
+                changed=False,
+                forced=False,
+                power_state_before="started",
+                power_state="started",
+                duration=None,
+                error=None,
+            ),
+        ]
+        rest_client.create_record.assert_called_once()
+
+    def test_shutdown(self, create_module, rest_client, states, clock):
+        module = self._module(create_module)
+
+        results = ManageVMPower.set_power_state_many(
+            module, rest_client, self._vm_dicts(states)
+        )
+
+        assert [result["power_state"] for result in results] == ["stopped"] * 2
+        assert [result["forced"] for result in results] == [False, False]
+        # Both VMs are checked with a single VirDomain read.
+        rest_client.list_records.assert_called_once_with("/rest/v1/VirDomain")
+
+    def test_shutdown_escalates_to_stop(
+        self, create_module, rest_client, states, ignored_actions, clock
+    ):
+        ignored_actions.append(("vm_b", "SHUTDOWN"))
+        module = self._module(create_module, force_stop=True)
+
+        results = ManageVMPower.set_power_state_many(
+            module, rest_client, self._vm_dicts(states)
+        )
+
+        assert [result["power_state"] for result in results] == ["stopped"] * 2
+        assert [result["forced"] for result in results] == [False, True]
+        assert results[0]["duration"] == 0.0
+        assert results[1]["duration"] >= 10.0
+        assert results[1]["error"] is None
+        stop_payload = rest_client.create_record.call_args_list[-1].args[1]
+        assert stop_payload == [
+            dict(virDomainUUID="vm_b", actionType="STOP", cause="INTERNAL")
+        ]
+
+    def test_shutdown_timeout(
+        self, create_module, rest_client, states, ignored_actions, clock
+    ):
+        ignored_actions.append(("vm_b", "SHUTDOWN"))
+        module = self._module(create_module)
+
+        results = ManageVMPower.set_power_state_many(
+            module, rest_client, self._vm_dicts(states)
+        )
+
+        assert results[0]["error"] is None
+        assert results[1]["error"] == "did not power off within 10.0 seconds."
+        assert results[1]["power_state"] == "started"
+        assert rest_client.create_record.call_count == 2
+
+    def test_failed_action(self, create_module, rest_client, states, clock):
+        rest_client.create_record.side_effect = errors.ScaleComputingError("failed")
+        module = self._module(create_module, power_state="reboot")
+
+        results = ManageVMPower.set_power_state_many(
+            module, rest_client, self._vm_dicts(states)
+        )
+
+        assert [result["error"] for result in results] == ["failed", "failed"]
+        assert rest_client.create_record.call_count == 2
+
+
+class TestManageVMFleet:
+    @staticmethod
+    def record(uuid, name, state="RUNNING", description=""):
+        return dict(
+            uuid=uuid,
+            nodeUUID="",
+            name=name,
+            tags="web",
+            description=description,
+            mem=42,
+            state=state,
+            numVCPU=2,
+            netDevs=[
+                dict(
+                    uuid=f"{uuid}-nic",
+                    virDomainUUID=uuid,
+                    type="VIRTIO",
+                    macAddress="7C:4C:58:01:02:03",
+                    vlan=10,
+                    connected=True,
+                    ipv4Addresses=[],
+                )
+            ],
+            blockDevs=[
+                dict(
+                    uuid=f"{uuid}-disk",
+                    virDomainUUID=uuid,
+                    type="VIRTIO_DISK",
+                    cacheMode="WRITETHROUGH",
+                    capacity=100,
+                    slot=0,
+                    name="",
+                    path="",
+                    disableSnapshotting=False,
+                    tieringPriorityFactor=8,
+                    mountPoints=[],
+                    readOnly=False,
+                )
+            ],
+            bootDevices=[],
+            attachGuestToolsISO=False,
+            operatingSystem="os_other",
+            affinityStrategy=dict(
+                strictAffinity=False,
+                preferredNodeUUID="",
+                backupNodeUUID="",
+            ),
+            snapshotScheduleUUID="",
+            machineType="scale-7.2",
+            sourceVirDomainUUID="",
+            snapUUIDs=[],
+        )
+
+    @staticmethod
+    def spec(vm_name, **params):
+        # vm_fleet "vms" item, after argument parsing.
+        return dict(
+            dict(
+                vm_name=vm_name,
+                state="present",
+                description="",
+                memory=42,
+                vcpu=2,
+                power_state="start",
+                snapshot_schedule=None,
+                tags=["web"],
+                disks=[
+                    dict(
+                        type="virtio_disk",
+                        disk_slot=0,
+                        size=100,
+                        iso_name=None,
+                        cache_mode=None,
+                    )
+                ],
+                nics=[dict(vlan=10, type="virtio", connected=True, mac=None)],
+                boot_devices=None,
+                attach_guest_tools_iso=False,
+                operating_system="os_other",
+                cloud_init={},
+                machine_type=None,
+            ),
+            **params,
+        )
+
+    @staticmethod
+    def _module(create_module, vms, check_mode=False):
+        return create_module(
+            params=dict(
+                vms=vms, force_reboot=False, shutdown_timeout=10.0, concurrency=2
+            ),
+            check_mode=check_mode,
+        )
+
+    @pytest.fixture
+    def records(self, rest_client):
+        # VirDomain records, returned by rest_client.
+        records = [
+            self.record("a", "vm-a"),
+            self.record("b", "vm-b"),
+            self.record("c", "vm-c", state="SHUTOFF"),
+        ]
+        rest_client.list_records.side_effect = lambda endpoint: (
+            records if endpoint == "/rest/v1/VirDomain" else []
+        )
+        return records
+
+    def test_plan(self, create_module, rest_client, records):
+        module = self._module(
+            create_module,
+            [
+                self.spec("vm-a"),
+                self.spec("vm-b", description="new", memory=84),
+                self.spec("vm-new"),
+                dict(vm_name="vm-c", state="absent"),
+                dict(vm_name="vm-missing", state="absent"),
+            ],
+        )
+
+        fleet = ManageVMFleet.plan(module, rest_client, FleetSnapshot(rest_client))
+
+        assert [(vm.vm_name, vm.result["action"]) for vm in fleet] == [
+            ("vm-a", "none"),
+            ("vm-b", "update"),
+            ("vm-new", "create"),
+            ("vm-c", "delete"),
+            ("vm-missing", "none"),
+        ]
+        assert fleet[1].result["changes"] == ["description", "memory"]
+        # VMs, nodes and snapshot schedules are read once for all VMs.
+        assert rest_client.list_records.call_count == 3
+        rest_client.get_record.assert_not_called()
+
+    def test_plan_duplicated_names(self, create_module, rest_client, records):
+        module = self._module(create_module, [self.spec("vm-a"), self.spec("vm-a")])
+
+        with pytest.raises(ScaleComputingError, match="duplicated names: vm-a"):
+            ManageVMFleet.plan(module, rest_client, FleetSnapshot(rest_client))
+
+    def test_plan_name_not_unique_on_cluster(self, create_module, rest_client, records):
+        records.append(self.record("a2", "vm-a"))
+        module = self._module(create_module, [self.spec("vm-a"), self.spec("vm-b")])
+
+        fleet = ManageVMFleet.plan(module, rest_client, FleetSnapshot(rest_client))
+
+        assert fleet[0].result["error"] == "There are 2 VMs with name vm-a."
+        assert fleet[1].result["error"] is None
+
+    @pytest.mark.parametrize(
+        "disks,expected",
+        [
+            ([dict(type="virtio_disk", disk_slot=0, size=100)], False),
+            ([dict(type="virtio_disk", disk_slot=0, size=None)], False),
+            ([dict(type="virtio_disk", disk_slot=0, size=200)], True),
+            ([dict(type="virtio_disk", disk_slot=0, cache_mode="none")], True),
+            ([dict(type="ide_disk", disk_slot=0, size=100)], True),
+            (
+                [
+                    dict(type="virtio_disk", disk_slot=0, size=100),
+                    dict(type="ide_cdrom", disk_slot=0, iso_name="a.iso"),
+                ],
+                True,
+            ),
+            # Not listed disk is removed.
+            ([], True),
+        ],
+    )
+    def test_disks_changed(self, disks, expected):
+        vm = VM._from_hypercore_resolved(self.record("a", "vm-a"), None, None, None)
+
+        assert ManageVMFleet._disks_changed(disks, vm) is expected
+
+    @pytest.mark.parametrize(
+        "nics,expected",
+        [
+            ([dict(vlan=10, type="virtio")], False),
+            ([dict(vlan=10, type="INTEL_E1000")], True),
+            ([dict(vlan=11, type="virtio")], True),
+            ([dict(vlan=10, type="virtio"), dict(vlan=11, type="virtio")], True),
+            # Not listed nic is removed.
+            ([], True),
+        ],
+    )
+    def test_nics_changed(self, nics, expected):
+        vm = VM._from_hypercore_resolved(self.record("a", "vm-a"), None, None, None)
+
+        assert ManageVMFleet._nics_changed(nics, vm) is expected
+
+    def test_reconcile_check_mode(self, create_module, rest_client, records):
+        module = self._module(
+            create_module,
+            [
+                self.spec("vm-a"),
+                self.spec("vm-b", vcpu=4),
+                self.spec("vm-new"),
+                dict(vm_name="vm-c", state="absent"),
+            ],
+            check_mode=True,
+        )
+
+        results, summary = ManageVMFleet.reconcile(module, rest_client)
+
+        assert summary == dict(
+            create=["vm-new"],
+            update=["vm-b"],
+            delete=["vm-c"],
+            unchanged=["vm-a"],
+            failed=[],
+        )
+        assert not any(result["changed"] for result in results)
+        assert rest_client.writes("/rest/v1/VirDomain") == 0
+
+    def test_delete(self, create_module, rest_client, records, mocker):
+        module = self._module(
+            create_module,
+            [
+                dict(vm_name="vm-a", state="absent"),
+                dict(vm_name="vm-c", state="absent"),
+            ],
+        )
+        send_actions = mocker.patch.object(ManageVMPower, "_send_actions")
+        rest_client.delete_record.side_effect = lambda endpoint, check_mode: dict(
+            taskTag=endpoint
+        )
+        wait_tasks = mocker.patch.object(TaskTag, "_wait_tasks", return_value={})
+
+        results, summary = ManageVMFleet.reconcile(module, rest_client)
+
+        assert [result["changed"] for result in results] == [True, True]
+        # Only running VM is stopped, VMs are deleted concurrently and waited for together.
+        send_actions.assert_called_once_with(rest_client, ["a"], "stop")
+        assert sorted(
+            call.args[0] for call in rest_client.delete_record.call_args_list
+        ) == ["/rest/v1/VirDomain/a", "/rest/v1/VirDomain/c"]
+        wait_tasks.assert_called_once()
+        assert sorted(task["taskTag"] for task in wait_tasks.call_args.args[1]) == [
+            "/rest/v1/VirDomain/a",
+            "/rest/v1/VirDomain/c",
+        ]
+
+    def test_delete_failed(self, create_module, rest_client, records, mocker):
+        module = self._module(
+            create_module,
+            [
+                dict(vm_name="vm-b", state="absent"),
+                dict(vm_name="vm-c", state="absent"),
+            ],
+        )
+        mocker.patch.object(ManageVMPower, "_send_actions")
+
+        def delete_record(endpoint, check_mode):
+            if endpoint.endswith("/b"):
+                raise KeyError("taskTag")
+            return dict(taskTag=endpoint)
+
+        rest_client.delete_record.side_effect = delete_record
+        mocker.patch.object(
+            TaskTag,
+            "_wait_tasks",
+            return_value={
+                "/rest/v1/VirDomain/c": errors.TaskTagError(dict(state="ERROR"))
+            },
+        )
+
+        results, summary = ManageVMFleet.reconcile(module, rest_client)
+
+        assert [result["changed"] for result in results] == [False, False]
+        assert results[0]["error"] == "'taskTag'"
+        assert "problem during this task execution" in results[1]["error"]
+        assert summary["failed"] == ["vm-b", "vm-c"]
+
+    @pytest.mark.parametrize("left_behind", [False, True])
+    def test_create_failed(
+        self, create_module, rest_client, records, mocker, left_behind
+    ):
+        module = self._module(
+            create_module, [self.spec("vm-new-1"), self.spec("vm-new-2")]
+        )
+        mocker.patch.object(
+            VM,
+            "post_vm_payload",
+            side_effect=lambda rest_client, params: dict(name=params["vm_name"]),
+        )
+        send_actions = mocker.patch.object(ManageVMPower, "_send_actions")
+        rest_client.create_record.side_effect = lambda endpoint, payload, check: dict(
+            taskTag=payload["name"]
+        )
+
+        def wait_tasks(rest_client, tasks):
+            records.append(self.record("new-1", "vm-new-1", state="SHUTOFF"))
+            if left_behind:
+                records.append(self.record("new-2", "vm-new-2", state="SHUTOFF"))
+            return {"vm-new-2": errors.TaskTagError(dict(state="ERROR"))}
+
+        mocker.patch.object(TaskTag, "_wait_tasks", side_effect=wait_tasks)
+
+        results, summary = ManageVMFleet.reconcile(module, rest_client)
+
+        assert results[0]["changed"] is True
+        assert results[0]["error"] is None
+        # Failed task is reported on its VM, also if the VM was left behind.
+        assert results[1]["changed"] is left_behind
+        assert "problem during this task execution" in results[1]["error"]
+        assert summary["failed"] == ["vm-new-2"]
+        assert rest_client.create_record.call_count == 2
+        # Only successfully created VMs are started, with a single request.
+        send_actions.assert_called_once_with(rest_client, ["new-1"], "start")
+
+    def test_update(self, create_module, rest_client, records, mocker):
+        module = self._module(
+            create_module, [self.spec("vm-a"), self.spec("vm-b", description="new")]
+        )
+        set_vm_params = mocker.patch.object(
+            ManageVMParams, "set_vm_params", return_value=(True, {}, {})
+        )
+        mocker.patch.object(ManageVMDisks, "ensure_present_or_set", return_value=False)
+        mocker.patch.object(ManageVMNics, "ensure_present_or_set", return_value=False)
+        mocker.patch.object(VM, "vm_power_up")
+
+        results, summary = ManageVMFleet.reconcile(module, rest_client)
+
+        assert [result["changed"] for result in results] == [False, True]
+        assert summary["update"] == ["vm-b"]
+        # Only vm-b is updated, machine_type first and other params last.
+        assert [call.args[3] for call in set_vm_params.call_args_list] == [
+            ["machine_type"],
+            [],
+        ]
+        assert set_vm_params.call_args.args[2].name == "vm-b"
+
+
 class TestManageVMDisks:
     def test_get_vm_by_name_disks_empty(self, create_module, rest_client, mocker):
         module = create_module(
@@ -2709,6 +3653,143 @@ class TestManageVMDisks:
         )
         assert changed
 
+    def test_apply_block_device_changes(self, create_module, rest_client, mocker):
+        module = create_module(params=dict(vm_name="VM-name"))
+        vm = VM(name="vm-name", memory=42, vcpu=2, uuid="id", power_state="started")
+        disks_to_create = [
+            Disk(type="virtio_disk", slot=slot, size=4200) for slot in range(5)
+        ]
+        existing_disk = Disk(type="virtio_disk", slot=5, uuid="disk-5", size=4200)
+        desired_disk = Disk(type="virtio_disk", slot=5, size=8400)
+        rest_client.create_record.side_effect = [
+            dict(taskTag=str(ii), createdUUID="") for ii in range(5)
+        ]
+        rest_client.update_record.return_value = dict(taskTag="5", createdUUID="")
+        do_shutdown_steps_mock = mocker.patch.object(VM, "do_shutdown_steps")
+        wait_tasks_mock = mocker.patch.object(TaskTag, "wait_tasks")
+
+        ManageVMDisks._apply_block_device_changes(
+            module,
+            rest_client,
+            vm,
+            disks_to_create,
+            [(desired_disk, existing_disk)],
+        )
+
+        assert rest_client.create_record.call_count == 5
+        rest_client.update_record.assert_called_once()
+        assert rest_client.update_record.call_args.args[0] == (
+            "/rest/v1/VirDomainBlockDevice/disk-5"
+        )
+        # At most MAX_CONCURRENT_DISK_TASKS tasks are running at the same time.
+        assert [
+            [task["taskTag"] for task in c.args[1]]
+            for c in wait_tasks_mock.call_args_list
+        ] == [["0", "1", "2", "3"], ["4", "5"]]
+        do_shutdown_steps_mock.assert_not_called()
+
+    def test_apply_block_device_changes_shutdown_once(
+        self, create_module, rest_client, mocker
+    ):
+        module = create_module(params=dict(vm_name="VM-name"))
+        vm = VM(name="vm-name", memory=42, vcpu=2, uuid="id", power_state="started")
+        disks_to_update = [
+            (
+                Disk(type="ide_disk", slot=slot),
+                Disk(type="virtio_disk", slot=slot, uuid=f"disk-{slot}"),
+            )
+            for slot in range(2)
+        ]
+        rest_client.update_record.return_value = dict(taskTag="1", createdUUID="")
+        do_shutdown_steps_mock = mocker.patch.object(VM, "do_shutdown_steps")
+        mocker.patch.object(TaskTag, "wait_tasks")
+
+        ManageVMDisks._apply_block_device_changes(
+            module, rest_client, vm, [], disks_to_update
+        )
+
+        do_shutdown_steps_mock.assert_called_once_with(module, rest_client)
+        assert rest_client.update_record.call_count == 2
+
+    def test_delete_not_used_disks_wait_together(
+        self, create_module, rest_client, mocker
+    ):
+        module = create_module(params=dict(vm_name="VM-name", items=[]))
+        disks = [
+            Disk(type="virtio_disk", slot=slot, uuid=f"disk-{slot}", vm_uuid="vm-id")
+            for slot in range(3)
+        ]
+        vm = mocker.MagicMock(uuid="vm-id")
+        mocker.patch.object(
+            ManageVMDisks,
+            "get_vm_by_name",
+            return_value=(vm, [disk.to_ansible() for disk in disks]),
+        )
+        rest_client.delete_record.side_effect = [
+            dict(taskTag="1"),
+            dict(taskTag="2"),
+            dict(taskTag="3"),
+        ]
+        wait_tasks_mock = mocker.patch.object(TaskTag, "wait_tasks")
+
+        changed = ManageVMDisks._delete_not_used_disks(
+            module, rest_client, vm, False, "items"
+        )
+
+        assert changed is True
+        assert rest_client.delete_record.call_count == 3
+        wait_tasks_mock.assert_called_once_with(
+            rest_client,
+            [dict(taskTag="1"), dict(taskTag="2"), dict(taskTag="3")],
+            False,
+        )
+        vm.do_shutdown_steps.assert_not_called()
+
+    def test_delete_not_used_disks_retry_after_shutdown(
+        self, create_module, rest_client, mocker
+    ):
+        module = create_module(params=dict(vm_name="VM-name", items=[]))
+        disks = [
+            Disk(type="virtio_disk", slot=slot, uuid=f"disk-{slot}", vm_uuid="vm-id")
+            for slot in range(2)
+        ]
+        vm = mocker.MagicMock(uuid="vm-id")
+        mocker.patch.object(
+            ManageVMDisks,
+            "get_vm_by_name",
+            return_value=(vm, [disk.to_ansible() for disk in disks]),
+        )
+        rest_client.delete_record.side_effect = [
+            dict(taskTag="1"),
+            dict(taskTag="2"),
+            dict(taskTag="3"),
+        ]
+        # disk-0 was removed, disk-1 is still in use.
+        rest_client.get_record.return_value = dict(
+            state="RUNNING", blockDevs=[dict(uuid="disk-1")]
+        )
+        task_error = errors.TaskTagError(
+            dict(
+                taskTag="2",
+                state="ERROR",
+                formattedMessage="Unable to delete block device from VM '%@': Still in use",
+            )
+        )
+        wait_tasks_mock = mocker.patch.object(
+            TaskTag, "wait_tasks", side_effect=[task_error, None]
+        )
+
+        changed = ManageVMDisks._delete_not_used_disks(
+            module, rest_client, vm, False, "items"
+        )
+
+        assert changed is True
+        vm.do_shutdown_steps.assert_called_once_with(module, rest_client)
+        rest_client.delete_record.assert_called_with(
+            "/rest/v1/VirDomainBlockDevice/disk-1", False
+        )
+        assert wait_tasks_mock.call_args_list[1].args[1] == [dict(taskTag="3")]
+
     def test_force_remove_all_disks_disks_present(
         self, create_module, rest_client, mocker
     ):
@@ -243,9 +243,49 @@ class TestVMSnapshot:
         print([self.ansible_dict])
         assert vm_snapshot_from_hypercore == [self.ansible_dict]
 
-    # =============================
-    # "filter_snapshots_by_params" function is already being tested with integration tests... should I still make unit tests for it?
-    # =============================
+    @pytest.mark.parametrize(
+        "params, expected_count",
+        [
+            (dict(vm_name=None, serial=None, label=None), 2),
+            (dict(vm_name="test-vm", serial=None, label=None), 1),
+            (dict(vm_name="other-vm", serial=None, label=None), 1),
+            (dict(vm_name="missing-vm", serial=None, label=None), 0),
+            (dict(vm_name=None, serial=1, label=None), 1),
+            (dict(vm_name=None, serial=None, label="other-label"), 1),
+            (dict(vm_name="test-vm", serial=None, label="other-label"), 0),
+            (dict(vm_name=None, serial=None, label=None, since_timestamp=100), 2),
+            (dict(vm_name=None, serial=None, label=None, since_timestamp=123), 1),
+            (dict(vm_name=None, serial=None, label=None, since_timestamp=124), 0),
+        ],
+    )
+    def test_filter_snapshots_by_params(
+        self, rest_client, mocker, params, expected_count
+    ):
+        other_dict = dict(
+            self.from_hypercore_dict,
+            uuid="other-snapshot",
+            label="other-label",
+            timestamp=100,
+            domain=dict(
+                self.from_hypercore_dict["domain"],
+                name="other-vm",
+                snapshotSerialNumber=42,
+            ),
+        )
+        rest_client.iter_records.return_value = iter(
+            [dict(**self.from_hypercore_dict), other_dict]
+        )
+        from_hypercore = mocker.spy(VMSnapshot, "from_hypercore")
+
+        snapshots, filter_stats = VMSnapshot.filter_snapshots_by_params(
+            params, rest_client
+        )
+
+        assert len(snapshots) == expected_count
+        assert filter_stats == dict(scanned=2, returned=expected_count)
+        # Only matching snapshots are converted.
+        assert from_hypercore.call_count == expected_count
+        rest_client.iter_records.assert_called_once_with("/rest/v1/VirDomainSnapshot")
 
     def test_hypercore_disk_to_ansible(self):
         hypercore_disk_to_ansible = VMSnapshot.hypercore_disk_to_ansible(
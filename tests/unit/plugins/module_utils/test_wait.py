@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+from itertools import islice
+
+import pytest
+
+from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
+    errors,
+    wait,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.wait import (
+    Backoff,
+    wait_until,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+
+@pytest.fixture
+def clock(mocker):
+    # Fake clock, sleep() moves time forward.
+    now = [100.0]
+    mocker.patch.object(wait, "monotonic", side_effect=lambda: now[0])
+
+    def fake_sleep(seconds):
+        now[0] += seconds
+
+    return mocker.patch.object(wait, "sleep", side_effect=fake_sleep)
+
+
+class TestBackoff:
+    def test_intervals(self):
+        backoff = Backoff(initial_interval=1, max_interval=5, factor=2, jitter=0)
+        assert list(islice(backoff.intervals(), 5)) == [1, 2, 4, 5, 5]
+
+    def test_intervals_jitter(self):
+        backoff = Backoff(initial_interval=1, max_interval=1, factor=2, jitter=0.1)
+        for interval in islice(backoff.intervals(), 50):
+            assert 0.9 <= interval <= 1.1
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            dict(initial_interval=0),
+            dict(initial_interval=2, max_interval=1),
+            dict(factor=0.5),
+            dict(jitter=1),
+        ],
+    )
+    def test_invalid(self, kwargs):
+        with pytest.raises(AssertionError):
+            Backoff(**kwargs)
+
+
+class TestWaitUntil:
+    def test_first_poll(self, mocker, clock):
+        poll = mocker.MagicMock(return_value="done")
+
+        assert wait_until(poll) == "done"
+        clock.assert_not_called()
+
+    def test_backoff(self, mocker, clock):
+        poll = mocker.MagicMock(side_effect=[None, None, None, False])
+        backoff = Backoff(initial_interval=0.5, max_interval=1, factor=2, jitter=0)
+
+        # False is a result, only None means "not yet".
+        assert wait_until(poll, backoff=backoff) is False
+        assert [c.args[0] for c in clock.call_args_list] == [0.5, 1, 1]
+
+    def test_timeout(self, mocker, clock):
+        poll = mocker.MagicMock(return_value=None)
+        backoff = Backoff(initial_interval=2, max_interval=4, factor=2, jitter=0)
+
+        with pytest.raises(errors.ScaleTimeoutError, match="VM off not reached"):
+            wait_until(poll, timeout=7, backoff=backoff, description="VM off")
+        # Last sleep is shortened to the deadline, and poll is done at deadline.
+        assert [c.args[0] for c in clock.call_args_list] == [2, 4, 1]
+        assert poll.call_count == 4
+
+    def test_progress(self, mocker, clock):
+        poll = mocker.MagicMock(side_effect=[None, None, "done"])
+        progress = mocker.MagicMock()
+        backoff = Backoff(initial_interval=1, max_interval=1, jitter=0)
+
+        wait_until(poll, backoff=backoff, progress=progress)
+
+        assert [c.args for c in progress.call_args_list] == [(1, 0), (2, 1)]
+
+    def test_poll_exception(self, mocker, clock):
+        poll = mocker.MagicMock(side_effect=[None, errors.ScaleComputingError("bad")])
+
+        with pytest.raises(errors.ScaleComputingError, match="bad"):
+            wait_until(poll)
@@ -13,6 +13,16 @@ import pytest
 
 from ansible_collections.scale_computing.hypercore.plugins.modules import iso
 from unittest.mock import patch, mock_open
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.checksum import (
+    DigestStore,
+    file_digest,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.errors import (
+    ScaleComputingError,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.upload import (
+    UploadStream,
+)
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
     MIN_PYTHON_VERSION,
 )
@@ -125,6 +135,10 @@ class TestEnsurePresent:
         rest_client.create_record.assert_called_once()
         rest_client.put_record.assert_called_once()
         rest_client.update_record.assert_called_once()
+        # File is sent through UploadStream, to detect stalled uploads.
+        assert isinstance(
+            rest_client.put_record.call_args.kwargs["binary_data"], UploadStream
+        )
 
         assert result == (
             True,
@@ -195,3 +209,114 @@ class TestEnsurePresent:
             },
             {},
         )
+
+    @pytest.mark.parametrize(
+        "stored_digest, size, expected_changed",
+        [
+            # Same content as local file.
+            ("same", 4, False),
+            # First run with checksum, only size is compared.
+            (None, 4, False),
+            (None, 1234, True),
+            # Size differs.
+            ("same", 1234, True),
+            # Content differs.
+            ("sha256:other", 4, True),
+        ],
+    )
+    def test_ensure_present_checksum(
+        self,
+        create_module,
+        rest_client,
+        task_wait,
+        tmp_path,
+        stored_digest,
+        size,
+        expected_changed,
+    ):
+        source = tmp_path / "image.iso"
+        source.write_bytes(b"data")
+        module = create_module(
+            params=dict(
+                cluster_instance=dict(
+                    host="https://0.0.0.0",
+                    username="admin",
+                    password="admin",
+                ),
+                name="iso-image-name",
+                source=str(source),
+                state="present",
+                checksum=True,
+                checksum_dir=str(tmp_path / "checksums"),
+            ),
+        )
+        store = DigestStore.from_module_params(module.params)
+        digest = file_digest(str(source))
+        if stored_digest:
+            store.set("ISO/id", digest if stored_digest == "same" else stored_digest)
+        iso_before = dict(
+            name="iso-image-name",
+            readyForInsert=True,
+            uuid="id",
+            size=size,
+            mounts=[],
+            path="/path/",
+        )
+        iso_after = dict(iso_before, uuid="new-id", size=4)
+        rest_client.get_record.side_effect = [iso_before, iso_after]
+        rest_client.delete_record.return_value = dict(taskTag="1")
+        rest_client.create_record.return_value = dict(createdUUID="new-id", taskTag="2")
+        rest_client.update_record.return_value = dict(taskTag="3")
+
+        changed, record, diff = iso.ensure_present(module, rest_client)
+
+        assert changed is expected_changed
+        if expected_changed:
+            rest_client.delete_record.assert_called_once()
+            assert rest_client.delete_record.call_args.kwargs["endpoint"] == (
+                "/rest/v1/ISO/id"
+            )
+            rest_client.put_record.assert_called_once()
+            assert record["uuid"] == "new-id"
+            assert diff["before"]["uuid"] == "id"
+            assert store.get("ISO/id") is None
+            assert store.get("ISO/new-id") == digest
+        else:
+            rest_client.delete_record.assert_not_called()
+            rest_client.put_record.assert_not_called()
+            assert store.get("ISO/id") == digest
+        # Baseline adopted without digest comparison is reported.
+        assert module.warn.called is (stored_digest is None and size == 4)
+
+    def test_ensure_present_checksum_changed_iso_attached(
+        self, create_module, rest_client, tmp_path
+    ):
+        source = tmp_path / "image.iso"
+        source.write_bytes(b"data")
+        module = create_module(
+            params=dict(
+                cluster_instance=dict(
+                    host="https://0.0.0.0",
+                    username="admin",
+                    password="admin",
+                ),
+                name="iso-image-name",
+                source=str(source),
+                state="present",
+                checksum=True,
+                checksum_dir=str(tmp_path / "checksums"),
+            ),
+        )
+        DigestStore.from_module_params(module.params).set("ISO/id", "sha256:other")
+        rest_client.get_record.return_value = dict(
+            name="iso-image-name",
+            readyForInsert=True,
+            uuid="id",
+            size=4,
+            mounts=[dict(vmName="vm-name-1", vmUUID="vm-uuid-1")],
+            path="/path/",
+        )
+
+        with pytest.raises(ScaleComputingError, match="attached to VMs vm-name-1"):
+            iso.ensure_present(module, rest_client)
+        rest_client.delete_record.assert_not_called()
@@ -63,3 +63,18 @@ class TestRun:
         record = version_update_status_info.run(rest_client)
 
         assert record is None
+
+    def test_run_wait_timeout(self, rest_client, mocker):
+        get_mock = mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.modules.version_update_status_info.UpdateStatus.get"
+        )
+        wait_mock = mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.modules.version_update_status_info.UpdateStatus.wait_finished"
+        )
+        wait_mock.return_value = None
+
+        record = version_update_status_info.run(rest_client, 600)
+
+        assert record is None
+        wait_mock.assert_called_once_with(rest_client, 600)
+        get_mock.assert_not_called()
@@ -10,6 +10,10 @@ from ansible_collections.scale_computing.hypercore.plugins.modules import virtua
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.virtual_disk import (
     VirtualDisk,
 )
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.checksum import (
+    DigestStore,
+    file_digest,
+)
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.errors import (
     ScaleComputingError,
 )
@@ -1210,6 +1214,82 @@ class TestEnsurePresent:
             assert isinstance(result, tuple)
             assert result == expected_result
 
+    @pytest.mark.parametrize(
+        "stored_digest, expected_changed",
+        [
+            ("same", False),
+            (None, False),
+            ("sha256:other", True),
+        ],
+    )
+    def test_ensure_present_checksum(
+        self,
+        create_module,
+        rest_client,
+        mocker,
+        task_wait,
+        tmp_path,
+        stored_digest,
+        expected_changed,
+    ):
+        source = tmp_path / "foobar.qcow2"
+        source.write_bytes(b"data")
+        module = create_module(
+            params=dict(
+                cluster_instance=dict(
+                    host="https://my.host.name", username="user", password="pass"
+                ),
+                name="foobar.qcow2",
+                source=str(source),
+                state="present",
+                checksum=True,
+                checksum_dir=str(tmp_path / "checksums"),
+            )
+        )
+        store = DigestStore.from_module_params(module.params)
+        digest = file_digest(str(source))
+        if stored_digest:
+            store.set(
+                "VirtualDisk/id",
+                digest if stored_digest == "same" else stored_digest,
+            )
+        vd_dict = dict(
+            uuid="id",
+            name="foobar.qcow2",
+            blockSize=1048576,
+            capacityBytes=4,
+            replicationFactor=2,
+        )
+        vd_before = VirtualDisk.from_hypercore(vd_dict)
+        vd_after = VirtualDisk.from_hypercore(dict(vd_dict, uuid="new-id"))
+        rest_client.delete_record.return_value = dict(taskTag="1")
+        send_upload_request = mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.module_utils.virtual_disk.VirtualDisk.send_upload_request"
+        )
+        send_upload_request.return_value = dict(createdUUID="new-id", taskTag="2")
+        mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.modules.virtual_disk.wait_task_and_get_updated"
+        ).return_value = vd_after.to_ansible()
+
+        changed, record, diff = virtual_disk.ensure_present(
+            module, rest_client, vd_before
+        )
+
+        assert changed is expected_changed
+        if expected_changed:
+            rest_client.delete_record.assert_called_once()
+            send_upload_request.assert_called_once()
+            assert record["uuid"] == "new-id"
+            assert diff["before"]["uuid"] == "id"
+            assert store.get("VirtualDisk/id") is None
+            assert store.get("VirtualDisk/new-id") == digest
+        else:
+            rest_client.delete_record.assert_not_called()
+            send_upload_request.assert_not_called()
+            assert store.get("VirtualDisk/id") == digest
+        # Baseline adopted without digest comparison is reported.
+        assert module.warn.called is (stored_digest is None)
+
 
 # Test ensure_absent() module function.
 class TestEnsureAbsent:
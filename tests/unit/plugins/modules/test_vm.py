@@ -602,12 +602,10 @@ class TestEnsurePresent:
             replication_source_vm_uuid="",
         )
 
+        # vm_a is read before the changes, vm_b after them.
         mocker.patch(
-            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.VM.get_by_old_or_new_name"
-        ).side_effect = [vm_a, vm_b]
-        mocker.patch(
-            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.VM.get_by_name"
-        ).side_effect = [vm_b]
+            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.VMState.get_by_old_or_new_name"
+        ).return_value.vm.side_effect = [vm_a, vm_b]
 
         mocker.patch(
             "ansible_collections.scale_computing.hypercore.plugins.modules.vm._set_vm_params"
@@ -798,11 +796,8 @@ class TestEnsurePresent:
             replication_source_vm_uuid="",
         )
         mocker.patch(
-            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.VM.get_by_old_or_new_name"
-        ).side_effect = [vm_a, vm_a]
-        mocker.patch(
-            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.VM.get_by_name"
-        ).side_effect = [vm_a]
+            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.VMState.get_by_old_or_new_name"
+        ).return_value.vm.side_effect = [vm_a, vm_a]
 
         mocker.patch(
             "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.Node.get_node"
@@ -948,6 +943,45 @@ class TestEnsurePresent:
                 sourceVirDomainUUID="",
                 snapUUIDs=[],
             ),
+            # VM is read again before it is started.
+            dict(
+                uuid="id",
+                nodeUUID="",
+                name="VM-name-unique",
+                tags="XLAB-test-tag1,XLAB-test-tag2",
+                description="desc",
+                mem=42,
+                state="SHUTDOWN",
+                numVCPU=2,
+                netDevs=[],
+                blockDevs=[
+                    dict(
+                        uuid="id",
+                        virDomainUUID="vm-id",
+                        type="VIRTIO_DISK",
+                        cacheMode="NONE",
+                        capacity=4200,
+                        slot=0,
+                        name="jc1-disk-0",
+                        disableSnapshotting=False,
+                        tieringPriorityFactor=8,
+                        mountPoints=[],
+                        readOnly=False,
+                    ),
+                ],
+                bootDevices=[],
+                attachGuestToolsISO=False,
+                operatingSystem=None,
+                affinityStrategy={
+                    "strictAffinity": False,
+                    "preferredNodeUUID": "",
+                    "backupNodeUUID": "",
+                },
+                snapshotScheduleUUID="shapshot-id",
+                machineType="scale-7.2",
+                sourceVirDomainUUID="",
+                snapUUIDs=[],
+            ),
         ]
         mocker.patch(
             "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.Node.get_node"
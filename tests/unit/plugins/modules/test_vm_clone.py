@@ -9,6 +9,9 @@ import pytest
 from ansible_collections.scale_computing.hypercore.plugins.modules import vm_clone
 from ansible_collections.scale_computing.hypercore.plugins.module_utils import errors
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.vm import VM
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.task_tag import (
+    TaskTag,
+)
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
     MIN_PYTHON_VERSION,
 )
@@ -38,6 +41,19 @@ class TestMain:
         assert success is True
         assert results == {"changed": False, "msg": []}
 
+    def test_vm_name_and_clones(self, run_main_info):
+        params = dict(
+            cluster_instance=dict(
+                host="https://my.host.name", username="user", password="pass"
+            ),
+            vm_name="XLAB-test-vm-clone",
+            source_vm_name="XLAB-test-vm",
+            clones=[dict(vm_name="XLAB-test-vm-clone-2")],
+        )
+        success, results = run_main_info(vm_clone, params)
+        assert success is False
+        assert "mutually exclusive: vm_name|clones" in results["msg"]
+
 
 class TestRun:
     @classmethod
@@ -152,7 +168,8 @@ class TestRun:
                 source_snapshot_uuid=None,
             )
         )
-        rest_client.get_record.side_effect = [None, None, {}, {"state": "COMPLETE"}]
+        rest_client.get_record.side_effect = [None, None, {"state": "COMPLETE"}]
+        rest_client.poll_record.return_value = {}
         rest_client.create_record.return_value = {"taskTag": "1234"}
         rest_client.list_records.side_effect = [[], [self._get_empty_vm()]]
         mocker.patch(
@@ -189,7 +206,8 @@ class TestRun:
                 source_snapshot_uuid=None,
             )
         )
-        rest_client.get_record.side_effect = [None, None, {}, {"state": "COMPLETE"}]
+        rest_client.get_record.side_effect = [None, None, {"state": "COMPLETE"}]
+        rest_client.poll_record.return_value = {}
         rest_client.create_record.return_value = {"taskTag": "1234"}
         rest_client.list_records.side_effect = [[], [self._get_empty_vm()]]
         mocker.patch(
@@ -224,7 +242,8 @@ class TestRun:
                 source_snapshot_uuid=None,
             )
         )
-        rest_client.get_record.side_effect = [None, None, {}, {"state": "COMPLETE"}]
+        rest_client.get_record.side_effect = [None, None, {"state": "COMPLETE"}]
+        rest_client.poll_record.return_value = {}
         rest_client.create_record.return_value = {"taskTag": "1234"}
         rest_client.list_records.side_effect = [[], [self._get_empty_vm()]]
         mocker.patch(
@@ -310,3 +329,168 @@ class TestGetSnapshot:
 
         results = vm_clone.get_snapshot(module, rest_client, mock_vm_obj)
         assert results.params["hypercore_snapshot_uuid"] == expected_result
+
+
+class TestRunMany:
+    @staticmethod
+    def _vm_dict(uuid, name):
+        return dict(TestRun._get_empty_vm(), uuid=uuid, name=name, tags="XLAB,template")
+
+    @staticmethod
+    def _module(create_module, clones, concurrency=4):
+        return create_module(
+            params=dict(
+                vm_name=None,
+                source_vm_name="XLAB-template",
+                tags=["all"],
+                cloud_init=dict(user_data=None, meta_data=None),
+                preserve_mac_address=False,
+                source_snapshot_label=None,
+                source_snapshot_uuid=None,
+                clones=clones,
+                concurrency=concurrency,
+            )
+        )
+
+    @pytest.fixture
+    def source(self, rest_client, mocker):
+        rest_client.list_records.return_value = [
+            self._vm_dict("template-uuid", "XLAB-template"),
+            self._vm_dict("existing-uuid", "XLAB-existing"),
+        ]
+        rest_client.create_record.side_effect = (
+            lambda endpoint, payload, check_mode, timeout: dict(
+                taskTag=payload["template"]["name"]
+            )
+        )
+        mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.Node.get_node"
+        ).return_value = None
+        mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.module_utils.vm.SnapshotSchedule.get_snapshot_schedule"
+        ).return_value = None
+
+    def test_get_clone_params(self, create_module):
+        module = self._module(create_module, [])
+        cloud_init = dict(user_data="data", meta_data=None)
+
+        assert vm_clone.get_clone_params(
+            module, dict(vm_name="a", tags=None, cloud_init=None)
+        ) == dict(module.params, vm_name="a")
+        assert vm_clone.get_clone_params(
+            module, dict(vm_name="b", tags=["b"], cloud_init=cloud_init)
+        ) == dict(module.params, vm_name="b", tags=["b"], cloud_init=cloud_init)
+
+    def test_run_many(self, create_module, rest_client, mocker, source):
+        module = self._module(
+            create_module,
+            [
+                dict(vm_name="clone-1", tags=None, cloud_init=None),
+                dict(vm_name="XLAB-existing", tags=None, cloud_init=None),
+                dict(vm_name="clone-2", tags=["db"], cloud_init=None),
+                dict(vm_name="clone-3", tags=None, cloud_init=None),
+            ],
+            concurrency=2,
+        )
+        wait_tasks = mocker.patch.object(TaskTag, "_wait_tasks", return_value={})
+
+        changed, msg, clones = vm_clone.run_many(module, rest_client)
+
+        assert changed is True
+        assert msg == (
+            "Virtual machine - XLAB-template - cloning complete to - "
+            "clone-1, clone-2, clone-3."
+        )
+        assert clones == [
+            dict(vm_name="clone-1", changed=True, error=None),
+            dict(vm_name="XLAB-existing", changed=False, error=None),
+            dict(vm_name="clone-2", changed=True, error=None),
+            dict(vm_name="clone-3", changed=True, error=None),
+        ]
+        # Source VM is looked up once, in the same listing as existing VMs.
+        rest_client.list_records.assert_called_once_with("/rest/v1/VirDomain")
+        payloads = {
+            call.kwargs["payload"]["template"]["name"]: call.kwargs["payload"]
+            for call in rest_client.create_record.call_args_list
+        }
+        assert sorted(payloads) == ["clone-1", "clone-2", "clone-3"]
+        # Tags of one clone are not added to the next clone.
+        assert payloads["clone-1"]["template"]["tags"] == "XLAB,template,all"
+        assert payloads["clone-2"]["template"]["tags"] == "XLAB,template,db"
+        assert payloads["clone-3"]["template"]["tags"] == "XLAB,template,all"
+        # Clone tasks are submitted and waited for in batches of concurrency.
+        assert [
+            sorted(task["taskTag"] for task in call.args[1])
+            for call in wait_tasks.call_args_list
+        ] == [["clone-1", "clone-2"], ["clone-3"]]
+
+    def test_run_many_failed_clone(self, create_module, rest_client, mocker, source):
+        module = self._module(
+            create_module,
+            [
+                dict(vm_name="clone-1", tags=None, cloud_init=None),
+                dict(vm_name="clone-2", tags=None, cloud_init=None),
+            ],
+        )
+        mocker.patch.object(
+            TaskTag,
+            "_wait_tasks",
+            return_value={"clone-2": errors.TaskTagError(dict(state="ERROR"))},
+        )
+
+        changed, msg, clones = vm_clone.run_many(module, rest_client)
+
+        assert changed is True
+        assert clones == [
+            dict(vm_name="clone-1", changed=True, error=None),
+            dict(
+                vm_name="clone-2",
+                changed=False,
+                error="There was a problem during cloning of XLAB-template, cloning failed.",
+            ),
+        ]
+
+    def test_run_many_source_not_found(self, create_module, rest_client):
+        module = self._module(
+            create_module, [dict(vm_name="clone-1", tags=None, cloud_init=None)]
+        )
+        rest_client.list_records.return_value = []
+
+        with pytest.raises(
+            errors.VMNotFound,
+            match="Virtual machine - {'name': 'XLAB-template'} - not found",
+        ):
+            vm_clone.run_many(module, rest_client)
+
+    def test_run_many_duplicated_names(self, create_module, rest_client, source):
+        module = self._module(
+            create_module,
+            [
+                dict(vm_name="clone-1", tags=None, cloud_init=None),
+                dict(vm_name="clone-2", tags=None, cloud_init=None),
+                dict(vm_name="clone-1", tags=None, cloud_init=None),
+            ],
+        )
+
+        with pytest.raises(
+            errors.ScaleComputingError,
+            match="Clone names must be unique, duplicated names: clone-1.",
+        ):
+            vm_clone.run_many(module, rest_client)
+        rest_client.create_record.assert_not_called()
+
+    def test_run_many_source_not_unique(self, create_module, rest_client, source):
+        module = self._module(
+            create_module, [dict(vm_name="clone-1", tags=None, cloud_init=None)]
+        )
+        rest_client.list_records.return_value = [
+            self._vm_dict("template-uuid-1", "XLAB-template"),
+            self._vm_dict("template-uuid-2", "XLAB-template"),
+        ]
+
+        with pytest.raises(
+            errors.ScaleComputingError,
+            match="2 VMs are named XLAB-template, source VM must be unique.",
+        ):
+            vm_clone.run_many(module, rest_client)
+        rest_client.create_record.assert_not_called()
@@ -133,7 +133,8 @@ class TestRun:
             )
         )
         rest_client.list_records.side_effect = [[vm_dict], [smb_dict]]
-        rest_client.get_record.side_effect = [{}, {"state": "COMPLETE"}]
+        rest_client.get_record.side_effect = [{"state": "COMPLETE"}]
+        rest_client.poll_record.return_value = {}
         rest_client.create_record.return_value = {
             "taskTag": "1234",
             "createdUUID": "uuid",
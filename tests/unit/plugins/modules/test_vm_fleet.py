@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+
+from ansible_collections.scale_computing.hypercore.plugins.modules import vm_fleet
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+
+class TestMain:
+    def test_all_params(self, run_main):
+        params = dict(
+            cluster_instance=dict(
+                host="https://0.0.0.0",
+                username="admin",
+                password="admin",
+            ),
+            vms=[
+                dict(
+                    vm_name="vm-a",
+                    memory=1024,
+                    vcpu=2,
+                    disks=[dict(type="virtio_disk", disk_slot=0, size=1024)],
+                    nics=[dict(vlan=10)],
+                    boot_devices=[dict(type="virtio_disk", disk_slot=0)],
+                    tags=["web"],
+                    machine_type="BIOS",
+                ),
+                dict(vm_name="vm-b", state="absent"),
+            ],
+            force_reboot=True,
+            shutdown_timeout=60,
+            concurrency=4,
+        )
+        success, result = run_main(vm_fleet, params)
+
+        assert success is True
+
+    def test_present_requires_memory(self, run_main):
+        params = dict(
+            cluster_instance=dict(
+                host="https://0.0.0.0",
+                username="admin",
+                password="admin",
+            ),
+            vms=[dict(vm_name="vm-a", vcpu=2, disks=[], nics=[])],
+        )
+        success, result = run_main(vm_fleet, params)
+
+        assert success is False
+        assert "state is present but all of the following are missing: memory" in (
+            result["msg"]
+        )
+
+    def test_invalid_concurrency(self, run_main):
+        params = dict(
+            cluster_instance=dict(
+                host="https://0.0.0.0",
+                username="admin",
+                password="admin",
+            ),
+            vms=[dict(vm_name="vm-b", state="absent")],
+            concurrency=0,
+        )
+        success, result = run_main(vm_fleet, params)
+
+        assert success is False
+        assert result["msg"] == "concurrency must be at least 1."
+
+
+class TestRun:
+    @pytest.mark.parametrize(
+        "check_mode,expected_changed",
+        [
+            # In check mode, VMs with a planned action would be changed.
+            (True, True),
+            (False, False),
+        ],
+    )
+    def test_run(
+        self, create_module, rest_client, mocker, check_mode, expected_changed
+    ):
+        module = create_module(params=dict(vms=[]), check_mode=check_mode)
+        vms = [
+            dict(vm_name="vm-a", action="update", changed=False, error=None),
+            dict(vm_name="vm-b", action="none", changed=False, error=None),
+        ]
+        plan = dict(create=[], update=["vm-a"], delete=[], unchanged=["vm-b"])
+        reconcile = mocker.patch.object(vm_fleet.ManageVMFleet, "reconcile")
+        reconcile.return_value = vms, plan
+
+        changed, result_vms, result_plan = vm_fleet.run(module, rest_client)
+
+        assert changed is expected_changed
+        assert result_vms == vms
+        assert result_plan == plan
+        reconcile.assert_called_once_with(module, rest_client)
@@ -131,7 +131,8 @@ class TestRun:
                 http_uri=None,
             )
         )
-        rest_client.get_record.side_effect = [{}, {"state": "COMPLETE"}]
+        rest_client.get_record.side_effect = [{"state": "COMPLETE"}]
+        rest_client.poll_record.return_value = {}
         rest_client.list_records.side_effect = [[], [smb_dict], [vm_dict]]
         rest_client.create_record.return_value = {
             "taskTag": "1234",
@@ -224,7 +225,8 @@ class TestRun:
                 http_uri=None,
             )
         )
-        rest_client.get_record.side_effect = [{}, {"status": "ERROR"}]
+        rest_client.get_record.side_effect = [{"status": "ERROR"}]
+        rest_client.poll_record.return_value = {}
         rest_client.list_records.side_effect = [[], []]
         rest_client.create_record.return_value = {
             "taskTag": "1234",
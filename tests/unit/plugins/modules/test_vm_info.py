@@ -102,6 +102,60 @@ class TestRun:
             }
         ]
 
+    def test_run_many_records(self, create_module, rest_client):
+        module = create_module(
+            params=dict(
+                cluster_instance=dict(
+                    host="https://0.0.0.0",
+                    username="admin",
+                    password="admin",
+                ),
+                vm_name=None,
+            ),
+        )
+        vm_dicts = [
+            dict(
+                uuid=f"id-{ii}",
+                nodeUUID="node_id",
+                name=f"VM-{ii}",
+                tags="",
+                description="desc",
+                mem=42,
+                state="SHUTOFF",
+                numVCPU=2,
+                netDevs=[],
+                blockDevs=[],
+                bootDevices=[],
+                attachGuestToolsISO=False,
+                operatingSystem=None,
+                affinityStrategy={
+                    "strictAffinity": False,
+                    "preferredNodeUUID": "node_id",
+                    "backupNodeUUID": "",
+                },
+                snapshotScheduleUUID="snapshot_schedule_id",
+                machineType="scale-7.2",
+                sourceVirDomainUUID="",
+                snapUUIDs=[],
+            )
+            for ii in range(10)
+        ]
+        rest_client.list_records.side_effect = [
+            vm_dicts,
+            [dict(uuid="node_id", backplaneIP="10.0.0.1", lanIP="10.0.1.1", peerID=1)],
+            [dict(uuid="snapshot_schedule_id", name="daily", rrules=[])],
+        ]
+
+        result = vm_info.run(module, rest_client)
+
+        # VirDomain, Node and VirDomainSnapshotSchedule - regardless of VM count.
+        assert rest_client.list_records.call_count == 3
+        assert [vm["vm_name"] for vm in result] == [f"VM-{ii}" for ii in range(10)]
+        assert {vm["snapshot_schedule"] for vm in result} == {"daily"}
+        assert {vm["node_affinity"]["preferred_node"]["lan_ip"] for vm in result} == {
+            "10.0.1.1"
+        }
+
     def test_run_records_absent(self, create_module, rest_client):
         module = create_module(
             params=dict(
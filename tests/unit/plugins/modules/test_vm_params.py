@@ -7,6 +7,7 @@ import sys
 import pytest
 
 from ansible_collections.scale_computing.hypercore.plugins.modules import vm_params
+from ansible_collections.scale_computing.hypercore.plugins.module_utils import errors
 from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
     MIN_PYTHON_VERSION,
 )
@@ -55,4 +56,195 @@ class TestMain:
         success, result = run_main(vm_params)
 
         assert success is False
-        assert "missing required arguments: vm_name" in result["msg"]
+        assert (
+            "one of the following is required: vm_name, vm_names, vm_tags"
+            in result["msg"]
+        )
+
+    def test_vm_names(self, run_main, mocker):
+        mocker.patch.object(vm_params, "run_many").return_value = (
+            False,
+            False,
+            dict(before={}, after={}),
+            [],
+        )
+        params = dict(
+            cluster_instance=dict(
+                host="https://0.0.0.0",
+                username="admin",
+                password="admin",
+            ),
+            vm_names=["vm-a", "vm-b"],
+            description="Updated parameters",
+        )
+        success, result = run_main(vm_params, params)
+
+        assert success is True
+        assert result["vms"] == []
+
+    def test_vm_names_failed(self, run_main, mocker):
+        vms = [
+            dict(vm_name="vm-a", changed=True, error=None),
+            dict(vm_name="vm-b", changed=True, error="PATCH failed"),
+        ]
+        mocker.patch.object(vm_params, "run_many").return_value = (
+            True,
+            False,
+            dict(before={}, after={}),
+            vms,
+        )
+        params = dict(
+            cluster_instance=dict(
+                host="https://0.0.0.0",
+                username="admin",
+                password="admin",
+            ),
+            vm_names=["vm-a", "vm-b"],
+            description="Updated parameters",
+        )
+        success, result = run_main(vm_params, params)
+
+        assert success is False
+        assert result["msg"] == "Failed to update VMs - vm-b: PATCH failed"
+        assert result["changed"] is True
+        assert result["vms"] == vms
+
+    def test_vm_tags_with_vm_name_new(self, run_main):
+        params = dict(
+            cluster_instance=dict(
+                host="https://0.0.0.0",
+                username="admin",
+                password="admin",
+            ),
+            vm_tags=["web"],
+            vm_name_new="renamed",
+        )
+        success, result = run_main(vm_params, params)
+
+        assert success is False
+        assert "mutually exclusive: vm_name_new|vm_tags" in result["msg"]
+
+
+class TestGetVms:
+    @staticmethod
+    def _module(create_module, **params):
+        return create_module(
+            params=dict(
+                dict(
+                    cluster_instance=dict(
+                        host="https://0.0.0.0",
+                        username="admin",
+                        password="admin",
+                    ),
+                    vm_names=None,
+                    vm_tags=None,
+                ),
+                **params,
+            )
+        )
+
+    @pytest.fixture
+    def vm_dicts(self, rest_client, mocker):
+        rest_client.list_records.return_value = [
+            dict(name="vm-a", tags="web,prod"),
+            dict(name="vm-b", tags="web"),
+            dict(name="vm-c", tags=""),
+        ]
+        return mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.modules.vm_params.VM.from_hypercore_many"
+        )
+
+    def test_by_names(self, create_module, rest_client, vm_dicts):
+        module = self._module(create_module, vm_names=["vm-c", "vm-a", "vm-c"])
+
+        vm_params.get_vms(module, rest_client)
+
+        rest_client.list_records.assert_called_once_with("/rest/v1/VirDomain")
+        vm_dicts.assert_called_once_with(
+            [dict(name="vm-c", tags=""), dict(name="vm-a", tags="web,prod")],
+            rest_client,
+        )
+
+    def test_by_names_missing(self, create_module, rest_client, vm_dicts):
+        module = self._module(create_module, vm_names=["vm-a", "vm-x", "vm-y"])
+
+        with pytest.raises(errors.VMNotFound, match="vm_names=vm-x,vm-y"):
+            vm_params.get_vms(module, rest_client)
+
+    def test_by_names_duplicated(self, create_module, rest_client, vm_dicts):
+        rest_client.list_records.return_value.append(dict(name="vm-a", tags=""))
+        module = self._module(create_module, vm_names=["vm-a", "vm-b"])
+
+        with pytest.raises(
+            errors.ScaleComputingError,
+            match="Multiple VMs match vm_names=vm-a, VM names are not unique.",
+        ):
+            vm_params.get_vms(module, rest_client)
+        vm_dicts.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "vm_tags,expected_names",
+        [
+            (["web"], ["vm-a", "vm-b"]),
+            (["web", "prod"], ["vm-a"]),
+            (["db"], []),
+        ],
+    )
+    def test_by_tags(
+        self, create_module, rest_client, vm_dicts, vm_tags, expected_names
+    ):
+        module = self._module(create_module, vm_tags=vm_tags)
+
+        vm_params.get_vms(module, rest_client)
+
+        selected = vm_dicts.call_args.args[0]
+        assert [vm_dict["name"] for vm_dict in selected] == expected_names
+
+    def test_by_tags_empty(self, create_module, rest_client, vm_dicts):
+        module = self._module(create_module, vm_tags=[])
+
+        with pytest.raises(
+            errors.ScaleComputingError, match="vm_tags must not be empty"
+        ):
+            vm_params.get_vms(module, rest_client)
+        vm_dicts.assert_not_called()
+
+    def test_by_names_empty(self, create_module, rest_client, vm_dicts):
+        module = self._module(create_module, vm_names=[])
+
+        vm_params.get_vms(module, rest_client)
+
+        vm_dicts.assert_called_once_with([], rest_client)
+
+
+class TestRunMany:
+    def test_run_many(self, create_module, rest_client, mocker):
+        module = create_module(params=dict(vm_names=["vm-a", "vm-b"]))
+        mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.modules.vm_params.get_vms"
+        )
+        mocker.patch(
+            "ansible_collections.scale_computing.hypercore.plugins.modules.vm_params.ManageVMParams.set_vm_params_many"
+        ).return_value = [
+            dict(
+                vm_name="vm-a",
+                uuid="vm-a-uuid",
+                changed=True,
+                vm_rebooted=True,
+                diff=dict(before=dict(vcpu=2), after=dict(vcpu=4)),
+            ),
+            dict(
+                vm_name="vm-b",
+                uuid="vm-b-uuid",
+                changed=False,
+                vm_rebooted=False,
+                diff=dict(before=None, after=None),
+            ),
+        ]
+
+        changed, reboot, diff, vms = vm_params.run_many(module, rest_client)
+
+        assert changed is True
+        assert reboot is True
+        assert diff == dict(before={"vm-a": dict(vcpu=2)}, after={"vm-a": dict(vcpu=4)})
+        assert [vm["vm_name"] for vm in vms] == ["vm-a", "vm-b"]
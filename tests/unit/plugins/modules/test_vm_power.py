@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+
+from ansible_collections.scale_computing.hypercore.plugins.modules import vm_power
+from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
+    errors,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+
+class TestMain:
+    def test_all_params(self, run_main_info):
+        params = dict(
+            cluster_instance=dict(
+                host="https://0.0.0.0",
+                username="admin",
+                password="admin",
+            ),
+            vm_tags=["web"],
+            power_state="shutdown",
+            shutdown_timeout=60,
+            force_stop=True,
+            concurrency=4,
+        )
+        success, result = run_main_info(vm_power, params)
+
+        assert success is True
+        assert result["vms"] == []
+
+    def test_names_and_tags(self, run_main_info):
+        params = dict(
+            cluster_instance=dict(
+                host="https://0.0.0.0",
+                username="admin",
+                password="admin",
+            ),
+            vm_names=["vm-a"],
+            vm_tags=["web"],
+            power_state="start",
+        )
+        success, result = run_main_info(vm_power, params)
+
+        assert success is False
+        assert "mutually exclusive: vm_names|vm_tags" in result["msg"]
+
+    def test_invalid_concurrency(self, run_main_info):
+        params = dict(
+            cluster_instance=dict(
+                host="https://0.0.0.0",
+                username="admin",
+                password="admin",
+            ),
+            vm_names=["vm-a"],
+            power_state="start",
+            concurrency=0,
+        )
+        success, result = run_main_info(vm_power, params)
+
+        assert success is False
+        assert result["msg"] == "concurrency must be at least 1."
+
+
+class TestRun:
+    def test_run(self, create_module, rest_client, mocker):
+        module = create_module(
+            params=dict(vm_names=None, vm_tags=["web"], power_state="start")
+        )
+        rest_client.list_records.return_value = [
+            dict(uuid="a", name="vm-a", tags="web", state="SHUTOFF"),
+            dict(uuid="b", name="vm-b", tags="db", state="SHUTOFF"),
+        ]
+        set_power_state_many = mocker.patch.object(
+            vm_power.ManageVMPower, "set_power_state_many"
+        )
+        set_power_state_many.return_value = [dict(vm_name="vm-a", changed=True)]
+
+        changed, vms = vm_power.run(module, rest_client)
+
+        assert changed is True
+        assert vms == [dict(vm_name="vm-a", changed=True)]
+        set_power_state_many.assert_called_once_with(
+            module,
+            rest_client,
+            [dict(uuid="a", name="vm-a", tags="web", state="SHUTOFF")],
+        )
+
+    @pytest.mark.parametrize("power_state", ["stop", "reset"])
+    def test_run_empty_tags(self, create_module, rest_client, mocker, power_state):
+        # An empty tag list must not select (and power cycle) every VM.
+        module = create_module(
+            params=dict(vm_names=None, vm_tags=[], power_state=power_state)
+        )
+        rest_client.list_records.return_value = [
+            dict(uuid="a", name="vm-a", tags="web", state="RUNNING"),
+        ]
+        set_power_state_many = mocker.patch.object(
+            vm_power.ManageVMPower, "set_power_state_many"
+        )
+
+        with pytest.raises(
+            errors.ScaleComputingError, match="vm_tags must not be empty"
+        ):
+            vm_power.run(module, rest_client)
+        set_power_state_many.assert_not_called()
+
+    def test_run_empty_names(self, create_module, rest_client, mocker):
+        module = create_module(
+            params=dict(vm_names=[], vm_tags=None, power_state="stop")
+        )
+        rest_client.list_records.return_value = [
+            dict(uuid="a", name="vm-a", tags="web", state="RUNNING"),
+        ]
+        set_power_state_many = mocker.patch.object(
+            vm_power.ManageVMPower, "set_power_state_many"
+        )
+        set_power_state_many.return_value = []
+
+        changed, vms = vm_power.run(module, rest_client)
+
+        assert (changed, vms) == (False, [])
+        set_power_state_many.assert_called_once_with(module, rest_client, [])
@@ -38,6 +38,7 @@ class TestRun:
             vm_name=None,
             serial=None,
             label=None,
+            since_timestamp=None,
         )
 
     def test_run_present(self, create_module, rest_client):
@@ -80,7 +81,7 @@ class TestRun:
             replication=True,
         )
 
-        rest_client.list_records.return_value = [hypercore_dict]
+        rest_client.iter_records.return_value = iter([hypercore_dict])
 
         expected = dict(
             snapshot_uuid="test",
@@ -117,9 +118,10 @@ class TestRun:
             replication=True,
         )
 
-        result = vm_snapshot_info.run(module, rest_client)[
-            0
-        ]  # this is safe, since these tests only have one snapshot
+        records, filter_stats, cursor = vm_snapshot_info.run(module, rest_client)
+        result = records[0]  # this is safe, since these tests only have one snapshot
+        assert filter_stats == dict(scanned=1, returned=1)
+        assert cursor == 123
 
         result_sorted_block_devices = [
             dict(sorted(bd.items(), key=lambda item: item[0]))
@@ -164,7 +166,54 @@ class TestRun:
         module = create_module(
             self.params,
         )
-        rest_client.list_records.return_value = []
+        rest_client.iter_records.return_value = iter([])
 
         result = vm_snapshot_info.run(module, rest_client)
-        assert result == []
+        assert result == ([], dict(scanned=0, returned=0), 0)
+
+    @pytest.mark.parametrize(
+        "since_timestamp, expected_uuids, expected_cursor",
+        [
+            (None, ["snap-100", "snap-200", "snap-300"], 300),
+            # Cursor is inclusive, snapshots from the same second are returned again.
+            (100, ["snap-100", "snap-200", "snap-300"], 300),
+            (300, ["snap-300"], 300),
+            (301, [], 301),
+        ],
+    )
+    def test_run_since_timestamp(
+        self,
+        create_module,
+        rest_client,
+        since_timestamp,
+        expected_uuids,
+        expected_cursor,
+    ):
+        module = create_module(
+            params=dict(self.params, since_timestamp=since_timestamp),
+        )
+        rest_client.iter_records.return_value = iter(
+            [
+                dict(
+                    uuid=f"snap-{timestamp}",
+                    domainUUID="vm-uuid",
+                    domain=dict(name="vm-name", snapshotSerialNumber=1, blockDevs=[]),
+                    deviceSnapshots=[],
+                    timestamp=timestamp,
+                    label="snapshot",
+                    type="USER",
+                    automatedTriggerTimestamp=0,
+                    localRetainUntilTimestamp=0,
+                    remoteRetainUntilTimestamp=0,
+                    blockCountDiffFromSerialNumber=0,
+                    replication=True,
+                )
+                for timestamp in (200, 100, 300)
+            ]
+        )
+
+        records, filter_stats, cursor = vm_snapshot_info.run(module, rest_client)
+
+        assert sorted(record["snapshot_uuid"] for record in records) == expected_uuids
+        assert filter_stats == dict(scanned=3, returned=len(expected_uuids))
+        assert cursor == expected_cursor
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+# # Copyright: (c) 2024, XLAB Steampunk <steampunk@xlab.si>
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+
+import pytest
+
+from ansible_collections.scale_computing.hypercore.plugins.modules import (
+    vm_snapshot_retention,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils import (
+    errors,
+)
+from ansible_collections.scale_computing.hypercore.plugins.module_utils.utils import (
+    MIN_PYTHON_VERSION,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < MIN_PYTHON_VERSION,
+    reason=f"requires python{MIN_PYTHON_VERSION[0]}.{MIN_PYTHON_VERSION[1]} or higher",
+)
+
+DAY = vm_snapshot_retention.SECONDS_PER_DAY
+NOW = 1700000000
+
+
+def snapshot_dict(uuid, vm_name, timestamp, label="snap", type="USER", retain=0):
+    return dict(
+        uuid=uuid,
+        domainUUID=f"{vm_name}-uuid",
+        domain=dict(name=vm_name),
+        label=label,
+        type=type,
+        timestamp=timestamp,
+        localRetainUntilTimestamp=retain,
+    )
+
+
+def get_params(**kwargs):
+    params = dict(
+        cluster_instance=dict(
+            host="https://0.0.0.0",
+            username="admin",
+            password="admin",
+        ),
+        vm_names=None,
+        label_pattern=None,
+        types=["user"],
+        keep_last=None,
+        max_age_days=None,
+        concurrency=8,
+    )
+    params.update(kwargs)
+    return params
+
+
+class TestGetViolations:
+    def setup_method(self):
+        self.snapshots = [
+            snapshot_dict("a-1", "vm-a", NOW - 1 * DAY),
+            snapshot_dict("a-3", "vm-a", NOW - 3 * DAY),
+            snapshot_dict("a-2", "vm-a", NOW - 2 * DAY),
+            snapshot_dict("b-1", "vm-b", NOW - 1 * DAY),
+            snapshot_dict("b-5", "vm-b", NOW - 5 * DAY, label="manual"),
+            snapshot_dict("b-6", "vm-b", NOW - 6 * DAY, type="AUTOMATED"),
+        ]
+
+    @pytest.mark.parametrize(
+        "params, expected_uuids",
+        [
+            # Newest snapshots are kept on each VM separately.
+            (dict(keep_last=1), ["a-3", "a-2", "b-5"]),
+            (dict(keep_last=2), ["a-3"]),
+            (dict(keep_last=0), ["a-3", "a-2", "a-1", "b-5", "b-1"]),
+            (dict(max_age_days=2), ["a-3", "b-5"]),
+            (dict(keep_last=2, max_age_days=4), ["a-3", "b-5"]),
+            (dict(keep_last=0, vm_names=["vm-b"]), ["b-5", "b-1"]),
+            # Empty vm_names selects nothing.
+            (dict(keep_last=0, vm_names=[]), []),
+            (dict(keep_last=0, label_pattern="^man"), ["b-5"]),
+            (dict(keep_last=0, types=["automated"]), ["b-6"]),
+            (
+                dict(keep_last=1, types=["user", "automated"]),
+                ["a-3", "a-2", "b-6", "b-5"],
+            ),
+        ],
+    )
+    def test_violations(self, params, expected_uuids):
+        results = vm_snapshot_retention.get_violations(
+            get_params(**params), self.snapshots, NOW
+        )
+
+        assert [result["snapshot_uuid"] for result in results] == expected_uuids
+        assert all(result["changed"] for result in results)
+
+    def test_reasons(self):
+        results = vm_snapshot_retention.get_violations(
+            get_params(keep_last=1, max_age_days=2, vm_names=["vm-a"]),
+            self.snapshots,
+            NOW,
+        )
+
+        assert results == [
+            dict(
+                snapshot_uuid="a-3",
+                vm_name="vm-a",
+                vm_uuid="vm-a-uuid",
+                label="snap",
+                timestamp=NOW - 3 * DAY,
+                reasons=["keep_last", "max_age_days"],
+                retained_until=None,
+                changed=True,
+                error=None,
+            ),
+            dict(
+                snapshot_uuid="a-2",
+                vm_name="vm-a",
+                vm_uuid="vm-a-uuid",
+                label="snap",
+                timestamp=NOW - 2 * DAY,
+                reasons=["keep_last"],
+                retained_until=None,
+                changed=True,
+                error=None,
+            ),
+        ]
+
+    def test_local_retain_until_timestamp(self):
+        snapshots = [
+            snapshot_dict("retained", "vm-a", NOW - 3 * DAY, retain=NOW + DAY),
+            snapshot_dict("expired", "vm-a", NOW - 2 * DAY, retain=NOW - DAY),
+        ]
+
+        results = vm_snapshot_retention.get_violations(
+            get_params(keep_last=0), snapshots, NOW
+        )
+
+        assert [
+            (result["snapshot_uuid"], result["retained_until"], result["changed"])
+            for result in results
+        ] == [("retained", NOW + DAY, False), ("expired", None, True)]
+
+
+class TestRun:
+    def setup_method(self):
+        self.snapshots = [
+            snapshot_dict(f"snap-{i}", "vm-a", NOW - i * DAY) for i in range(5)
+        ]
+
+    def test_run(self, create_module, rest_client, mocker):
+        module = create_module(params=get_params(keep_last=1, concurrency=2))
+        rest_client.iter_records.return_value = iter(self.snapshots)
+        rest_client.delete_record.side_effect = lambda endpoint, check_mode: dict(
+            taskTag=endpoint.split("/")[-1], createdUUID=""
+        )
+        wait_tasks = mocker.patch.object(
+            vm_snapshot_retention.TaskTag, "_wait_tasks", return_value={}
+        )
+
+        changed, snapshots = vm_snapshot_retention.run(module, rest_client)
+
+        assert changed is True
+        assert [
+            (snapshot["snapshot_uuid"], snapshot["changed"]) for snapshot in snapshots
+        ] == [("snap-4", True), ("snap-3", True), ("snap-2", True), ("snap-1", True)]
+        rest_client.iter_records.assert_called_once_with("/rest/v1/VirDomainSnapshot")
+        # Deletes are sent and waited for in batches of concurrency.
+        assert [
+            sorted(task["taskTag"] for task in call.args[1])
+            for call in wait_tasks.call_args_list
+        ] == [["snap-3", "snap-4"], ["snap-1", "snap-2"]]
+
+    def test_run_failed_delete(self, create_module, rest_client, mocker):
+        module = create_module(params=get_params(keep_last=2))
+
+        def delete_record(endpoint, check_mode):
+            if endpoint.endswith("snap-3"):
+                raise errors.ScaleComputingError("delete failed")
+            return dict(taskTag=endpoint.split("/")[-1], createdUUID="")
+
+        rest_client.iter_records.return_value = iter(self.snapshots)
+        rest_client.delete_record.side_effect = delete_record
+        mocker.patch.object(
+            vm_snapshot_retention.TaskTag,
+            "_wait_tasks",
+            return_value={"snap-4": errors.TaskTagError(dict(state="ERROR"))},
+        )
+
+        changed, snapshots = vm_snapshot_retention.run(module, rest_client)
+
+        assert changed is True
+        assert [
+            (snapshot["snapshot_uuid"], snapshot["changed"], snapshot["error"])
+            for snapshot in snapshots
+        ] == [
+            ("snap-4", False, "Snapshot delete task failed."),
+            ("snap-3", False, "delete failed"),
+            ("snap-2", True, None),
+        ]
+
+    def test_run_check_mode(self, create_module, rest_client, mocker):
+        module = create_module(params=get_params(keep_last=3), check_mode=True)
+        rest_client.iter_records.return_value = iter(self.snapshots)
+        submit_and_wait = mocker.patch.object(
+            vm_snapshot_retention.TaskTag, "submit_and_wait"
+        )
+
+        changed, snapshots = vm_snapshot_retention.run(module, rest_client)
+
+        assert changed is True
+        assert len(snapshots) == 2
+        submit_and_wait.assert_not_called()
+
+    def test_run_no_violations(self, create_module, rest_client, mocker):
+        module = create_module(params=get_params(keep_last=5))
+        rest_client.iter_records.return_value = iter(self.snapshots)
+        submit_and_wait = mocker.patch.object(
+            vm_snapshot_retention.TaskTag, "submit_and_wait"
+        )
+
+        changed, snapshots = vm_snapshot_retention.run(module, rest_client)
+
+        assert changed is False
+        assert snapshots == []
+        submit_and_wait.assert_not_called()
+
+
+class TestMain:
+    def test_all_params(self, run_main_info):
+        params = get_params(
+            vm_names=["vm-a"],
+            label_pattern="^nightly-",
+            types=["user", "automated"],
+            keep_last=3,
+            max_age_days=30,
+            concurrency=4,
+        )
+        success, result = run_main_info(vm_snapshot_retention, params)
+
+        assert success is True
+        assert result["snapshots"] == []
+
+    @pytest.mark.parametrize(
+        "scope",
+        [dict(vm_names=["vm-a"]), dict(vm_names=[]), dict(label_pattern="^tmp-")],
+    )
+    def test_keep_last_zero_with_scope(self, run_main_info, scope):
+        success, result = run_main_info(
+            vm_snapshot_retention, get_params(keep_last=0, **scope)
+        )
+
+        assert success is True
+
+    def test_missing_policy(self, run_main_info):
+        params = get_params()
+        del params["keep_last"], params["max_age_days"]
+        success, result = run_main_info(vm_snapshot_retention, params)
+
+        assert success is False
+        assert "one of the following is required: keep_last, max_age_days" in (
+            result["msg"]
+        )
+
+    @pytest.mark.parametrize(
+        "params, expected_msg",
+        [
+            (dict(keep_last=1, concurrency=0), "concurrency must be at least 1."),
+            (dict(keep_last=-1), "keep_last must not be negative."),
+            (dict(max_age_days=-1), "max_age_days must not be negative."),
+            (
+                dict(keep_last=0),
+                "keep_last=0 deletes all snapshots, it requires vm_names or label_pattern.",
+            ),
+            (
+                dict(max_age_days=0),
+                "max_age_days=0 deletes all snapshots, "
+                "it requires vm_names or label_pattern.",
+            ),
+            (dict(keep_last=1, label_pattern="("), "Invalid label_pattern"),
+        ],
+    )
+    def test_invalid_params(self, run_main_info, params, expected_msg):
+        success, result = run_main_info(vm_snapshot_retention, get_params(**params))
+
+        assert success is False
+        assert expected_msg in result["msg"]